@@ -4,31 +4,21 @@ Flask endpoints for team statistics and game history
 """
 
 from flask import Blueprint, jsonify, request
-import psycopg2
 from psycopg2.extras import RealDictCursor
-import os
 from datetime import datetime
 from dotenv import load_dotenv
 from team_abbreviations import to_canonical_abbr, to_hcl_abbr, sql_to_canonical_case
+from db_pool import get_db_connection
+from response_cache import conditional_get
 
 load_dotenv()
 
-# Database connection - Use environment variable for database name
-# Defaults to production database (nfl_analytics)
-def get_db_connection():
-    """Connect to HCL historical data database"""
-    db_name = os.getenv('DB_NAME', 'nfl_analytics')  # Default to production
-    return psycopg2.connect(
-        dbname=db_name,
-        user=os.getenv('DB_USER', 'postgres'),
-        password=os.getenv('DB_PASSWORD', ''),
-        host=os.getenv('DB_HOST', 'localhost'),
-        port=os.getenv('DB_PORT', '5432')
-    )
-
 # Create blueprint
 hcl_bp = Blueprint('hcl', __name__, url_prefix='/api/hcl')
 
+# Every HCL read comes from these tables (analytics views are plain views over them).
+HCL_TABLES = ('hcl.games', 'hcl.team_game_stats', 'public.teams')
+
 
 def get_latest_completed_season(cur):
     """Return latest season with completed games, fallback to current year."""
@@ -81,6 +71,7 @@ def analytics_view_unavailable_payload(view_name, season=None):
     return payload
 
 @hcl_bp.route('/teams', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_teams():
     """
     Get list of all NFL teams with basic season stats
@@ -156,6 +147,7 @@ def get_teams():
 
 
 @hcl_bp.route('/teams/<team_abbr>', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_team_details(team_abbr):
     """
     Get detailed season statistics for a specific team
@@ -288,6 +280,7 @@ def get_team_details(team_abbr):
 
 
 @hcl_bp.route('/teams/<team_abbr>/games', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_team_games(team_abbr):
     """
     Get full season schedule for a specific team (both completed and upcoming games)
@@ -407,6 +400,7 @@ def get_team_games(team_abbr):
 
 
 @hcl_bp.route('/teams/<team_abbr>/sos', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_team_strength_of_schedule(team_abbr):
     """
     Get weighted strength of schedule for a team in a season.
@@ -644,6 +638,7 @@ def get_team_strength_of_schedule(team_abbr):
 
 
 @hcl_bp.route('/games/<game_id>', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_game_details(game_id):
     """
     Get complete game details including betting lines and weather
@@ -752,6 +747,7 @@ def get_game_details(game_id):
 
 
 @hcl_bp.route('/games/week/<int:season>/<int:week>', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=60)
 def get_week_games(season, week):
     """
     Get all games for a specific week with betting lines
@@ -821,6 +817,7 @@ def get_week_games(season, week):
 # ============================================================================
 
 @hcl_bp.route('/analytics/betting', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=300)
 def get_betting_performance():
     """
     Get team betting performance (ATS records, O/U trends)
@@ -908,6 +905,7 @@ def get_betting_performance():
 
 
 @hcl_bp.route('/analytics/weather', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=300)
 def get_weather_impact():
     """
     Get weather impact on scoring and performance
@@ -999,6 +997,7 @@ def get_weather_impact():
 
 
 @hcl_bp.route('/analytics/rest', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=300)
 def get_rest_advantage():
     """
     Get team performance by days of rest
@@ -1076,6 +1075,7 @@ def get_rest_advantage():
 
 
 @hcl_bp.route('/analytics/referees', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=300)
 def get_referee_tendencies():
     """
     Get referee officiating patterns and tendencies
@@ -1165,6 +1165,7 @@ def get_referee_tendencies():
 
 
 @hcl_bp.route('/analytics/summary', methods=['GET'])
+@conditional_get(HCL_TABLES, max_age=300)
 def get_analytics_summary():
     """
     Get summary statistics from all analytical views
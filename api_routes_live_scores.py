@@ -1,33 +1,47 @@
 """
 Live Scores API - Fetches current week's games from ESPN with AI predictions
 """
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request
 import requests
 from datetime import datetime
-import psycopg2
 import os
+import time
 import logging
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
 from team_abbreviations import to_hcl_abbr
+from db_pool import get_db_connection
+from scoreboard_feed import scoreboard_feed
+from live_score_events import STREAM_MAX_SECONDS, LiveScoreBroadcaster
 
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-def get_db_connection():
-    """Connect to database"""
-    db_name = os.getenv('DB_NAME', 'nfl_analytics')
-    return psycopg2.connect(
-        dbname=db_name,
-        user=os.getenv('DB_USER', 'postgres'),
-        password=os.getenv('DB_PASSWORD', ''),
-        host=os.getenv('DB_HOST', 'localhost'),
-        port=os.getenv('DB_PORT', '5432')
-    )
-
 live_scores_api = Blueprint('live_scores_api', __name__)
 
-ESPN_SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+# Per-(season, week) prediction maps, reused until the week's schedule/spread/Elo
+# fingerprint changes. The max age picks up stat corrections to earlier weeks.
+PREDICTION_CACHE_SIZE = 8
+PREDICTION_CACHE_MAX_AGE_SECONDS = int(os.getenv('LIVE_PREDICTIONS_MAX_AGE_SECONDS', '3600'))
+_prediction_cache = OrderedDict()
+_prediction_cache_lock = threading.Lock()
+_prediction_build_locks = {}
+
+WEEK_FINGERPRINT_SQL = """
+    SELECT
+        (SELECT md5(COALESCE(string_agg(
+                    concat_ws('|', game_id, game_date, home_team, away_team, spread_line, total_line),
+                    ',' ORDER BY game_id), ''))
+         FROM hcl.games
+         WHERE season = %(season)s AND week = %(week)s),
+        (SELECT md5(COALESCE(string_agg(
+                    concat_ws('|', game_id, elo_spread, predicted_winner),
+                    ',' ORDER BY game_id), ''))
+         FROM hcl.ml_predictions_elo
+         WHERE season = %(season)s AND week = %(week)s)
+"""
 
 
 def get_latest_completed_season():
@@ -57,16 +71,67 @@ def get_latest_completed_season():
         if conn:
             conn.close()
 
+def get_shared_predictor():
+    """ml_api's process-wide WeeklyPredictor, so the XGBoost models load once per worker"""
+    from api_routes_ml import get_predictor
+    return get_predictor()
+
+def _week_fingerprint(season, week):
+    """Hash of the week's schedule, Vegas lines and Elo rows"""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(WEEK_FINGERPRINT_SQL, {'season': season, 'week': week})
+        fingerprint = cur.fetchone()
+        cur.close()
+        return fingerprint
+    finally:
+        conn.close()
+
 def get_predictions_for_week(week, season=None):
-    """Fetch AI, ELO, and Vegas predictions"""
+    """Fetch AI, ELO, and Vegas predictions, cached per (season, week)"""
     try:
         if season is None:
             season = get_latest_completed_season()
-
-        # Import the ML predictor directly instead of making HTTP call
-        from ml.predict_week import WeeklyPredictor
+        predictor = get_shared_predictor()
+    except Exception as e:
+        logger.error(f"Error fetching predictions: {e}")
+        return {}
+    
+    try:
+        fingerprint = (id(predictor),) + tuple(_week_fingerprint(season, week))
+    except Exception as e:
+        logger.warning(f"Prediction cache bypassed; week fingerprint failed: {e}")
+        return build_predictions_for_week(predictor, week, season)
+    
+    key = (season, week)
+    with _prediction_cache_lock:
+        build_lock = _prediction_build_locks.setdefault(key, threading.Lock())
+    
+    # One request rebuilds a stale week; concurrent ones wait and reuse it
+    with build_lock:
+        with _prediction_cache_lock:
+            entry = _prediction_cache.get(key)
+            if entry and entry[0] == fingerprint and time.monotonic() - entry[1] < PREDICTION_CACHE_MAX_AGE_SECONDS:
+                _prediction_cache.move_to_end(key)
+                return entry[2]
         
-        predictor = WeeklyPredictor()
+        predictions = build_predictions_for_week(predictor, week, season)
+        if predictions:
+            with _prediction_cache_lock:
+                _prediction_cache[key] = (fingerprint, time.monotonic(), predictions)
+                _prediction_cache.move_to_end(key)
+                while len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+                    _prediction_cache.popitem(last=False)
+        return predictions
+
+def clear_prediction_cache():
+    with _prediction_cache_lock:
+        _prediction_cache.clear()
+
+def build_predictions_for_week(predictor, week, season):
+    """Run the XGBoost predictor for the week and merge in stored ELO predictions"""
+    try:
         predictions_data = predictor.predict_week(season=season, week=week)
         
         # Handle both dict and list returns (list when no games found)
@@ -133,223 +198,227 @@ def get_predictions_for_week(week, season=None):
         logger.error(f"Error fetching predictions: {e}")
         return {}
 
-@live_scores_api.route('/api/live-scores', methods=['GET'])
-def get_live_scores():
-    """Fetch current week's NFL games with live scores from ESPN"""
-    try:
-        # Fetch from ESPN API
-        response = requests.get(ESPN_SCOREBOARD_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Extract games
-        games = []
-        week_info = None
-        
-        if 'week' in data and 'number' in data['week']:
-            week_info = {
-                'week': data['week']['number'],
-                'season': data.get('season', {}).get('year', get_latest_completed_season())
+def build_live_games(data):
+    """Turn an ESPN scoreboard payload into (games, week_info) with predictions and outcomes"""
+    # Extract games
+    games = []
+    week_info = None
+
+    if 'week' in data and 'number' in data['week']:
+        week_info = {
+            'week': data['week']['number'],
+            'season': data.get('season', {}).get('year', get_latest_completed_season())
+        }
+
+    # Fetch predictions if we have week info
+    predictions = {}
+    if week_info:
+        predictions = get_predictions_for_week(week_info['week'], week_info['season'])
+
+    for event in data.get('events', []):
+        try:
+            competition = event['competitions'][0]
+            competitors = competition['competitors']
+
+            # Get home and away teams
+            home_team = next((c for c in competitors if c['homeAway'] == 'home'), None)
+            away_team = next((c for c in competitors if c['homeAway'] == 'away'), None)
+
+            if not home_team or not away_team:
+                continue
+
+            # Get status
+            status_type = competition['status']['type']['name'].lower()
+            period = competition['status'].get('period', 0)
+            clock = competition['status'].get('displayClock', '')
+
+            # Map status
+            if status_type in ['status_in_progress', 'status_halftime']:
+                if 'half' in status_type:
+                    game_status = 'halftime'
+                else:
+                    game_status = 'in_progress'
+            elif status_type in ['status_final', 'status_end_period']:
+                game_status = 'final'
+            else:
+                game_status = 'scheduled'
+
+            # Get period text
+            period_text = ''
+            if game_status == 'in_progress':
+                if period == 1:
+                    period_text = '1st Qtr'
+                elif period == 2:
+                    period_text = '2nd Qtr'
+                elif period == 3:
+                    period_text = '3rd Qtr'
+                elif period == 4:
+                    period_text = '4th Qtr'
+                elif period > 4:
+                    period_text = f'OT{period - 4}' if period > 5 else 'OT'
+
+            # Get game time if scheduled
+            game_time = ''
+            game_date_str = ''
+            if game_status == 'scheduled':
+                game_date = event.get('date', '')
+                if game_date:
+                    try:
+                        # Parse ISO datetime from ESPN (UTC)
+                        from datetime import timedelta
+                        dt_utc = datetime.fromisoformat(game_date.replace('Z', '+00:00'))
+                        # Convert UTC to ET (EST is UTC-5, EDT is UTC-4)
+                        # November is EST (UTC-5)
+                        dt_et = dt_utc - timedelta(hours=5)
+                        # Format time in ET
+                        game_time = dt_et.strftime('%I:%M %p ET')
+                        # Format date
+                        game_date_str = dt_et.strftime('%a %b %d')  # e.g., "Sun Nov 23"
+                    except:
+                        game_time = 'TBD'
+                        game_date_str = ''
+
+            game_data = {
+                'home_team': home_team['team']['abbreviation'],
+                'away_team': away_team['team']['abbreviation'],
+                'home_score': int(home_team.get('score', 0)),
+                'away_score': int(away_team.get('score', 0)),
+                'status': game_status,
+                'period': period_text,
+                'clock': clock,
+                'time': game_time,
+                'game_date': game_date_str,
+                'game_id': event.get('id', ''),
             }
-        
-        # Fetch predictions if we have week info
-        predictions = {}
-        if week_info:
-            predictions = get_predictions_for_week(week_info['week'], week_info['season'])
-        
-        for event in data.get('events', []):
-            try:
-                competition = event['competitions'][0]
-                competitors = competition['competitors']
-                
-                # Get home and away teams
-                home_team = next((c for c in competitors if c['homeAway'] == 'home'), None)
-                away_team = next((c for c in competitors if c['homeAway'] == 'away'), None)
-                
-                if not home_team or not away_team:
-                    continue
-                
-                # Get status
-                status_type = competition['status']['type']['name'].lower()
-                period = competition['status'].get('period', 0)
-                clock = competition['status'].get('displayClock', '')
-                
-                # Map status
-                if status_type in ['status_in_progress', 'status_halftime']:
-                    if 'half' in status_type:
-                        game_status = 'halftime'
+
+            # Add AI prediction and Vegas data if available.
+            # Try hcl-normalized key first, then raw ESPN key as fallback.
+            home_hcl = to_hcl_abbr(game_data['home_team'])
+            away_hcl = to_hcl_abbr(game_data['away_team'])
+            matchup_keys = [
+                f"{away_hcl}@{home_hcl}",
+                f"{game_data['away_team']}@{game_data['home_team']}",
+            ]
+
+            pred = None
+            for matchup_key in matchup_keys:
+                if matchup_key in predictions:
+                    pred = predictions[matchup_key]
+                    break
+
+            if pred:
+                game_data['ai_prediction'] = pred.get('ai_predicted_winner')
+                game_data['ai_spread'] = pred.get('ai_spread')
+                game_data['elo_prediction'] = pred.get('elo_predicted_winner')
+                game_data['elo_spread'] = pred.get('elo_spread')
+                game_data['vegas_spread'] = pred.get('vegas_spread')
+                game_data['vegas_total'] = pred.get('vegas_total')
+
+                # Determine if AI prediction was correct (only for final games)
+                if game_status == 'final':
+                    if game_data['home_score'] > game_data['away_score']:
+                        actual_winner = home_hcl
+                    elif game_data['away_score'] > game_data['home_score']:
+                        actual_winner = away_hcl
                     else:
-                        game_status = 'in_progress'
-                elif status_type in ['status_final', 'status_end_period']:
-                    game_status = 'final'
-                else:
-                    game_status = 'scheduled'
-                
-                # Get period text
-                period_text = ''
-                if game_status == 'in_progress':
-                    if period == 1:
-                        period_text = '1st Qtr'
-                    elif period == 2:
-                        period_text = '2nd Qtr'
-                    elif period == 3:
-                        period_text = '3rd Qtr'
-                    elif period == 4:
-                        period_text = '4th Qtr'
-                    elif period > 4:
-                        period_text = f'OT{period - 4}' if period > 5 else 'OT'
-                
-                # Get game time if scheduled
-                game_time = ''
-                game_date_str = ''
-                if game_status == 'scheduled':
-                    game_date = event.get('date', '')
-                    if game_date:
-                        try:
-                            # Parse ISO datetime from ESPN (UTC)
-                            from datetime import timedelta
-                            dt_utc = datetime.fromisoformat(game_date.replace('Z', '+00:00'))
-                            # Convert UTC to ET (EST is UTC-5, EDT is UTC-4)
-                            # November is EST (UTC-5)
-                            dt_et = dt_utc - timedelta(hours=5)
-                            # Format time in ET
-                            game_time = dt_et.strftime('%I:%M %p ET')
-                            # Format date
-                            game_date_str = dt_et.strftime('%a %b %d')  # e.g., "Sun Nov 23"
-                        except:
-                            game_time = 'TBD'
-                            game_date_str = ''
-                
-                game_data = {
-                    'home_team': home_team['team']['abbreviation'],
-                    'away_team': away_team['team']['abbreviation'],
-                    'home_score': int(home_team.get('score', 0)),
-                    'away_score': int(away_team.get('score', 0)),
-                    'status': game_status,
-                    'period': period_text,
-                    'clock': clock,
-                    'time': game_time,
-                    'game_date': game_date_str,
-                    'game_id': event.get('id', ''),
-                }
-                
-                # Add AI prediction and Vegas data if available.
-                # Try hcl-normalized key first, then raw ESPN key as fallback.
-                home_hcl = to_hcl_abbr(game_data['home_team'])
-                away_hcl = to_hcl_abbr(game_data['away_team'])
-                matchup_keys = [
-                    f"{away_hcl}@{home_hcl}",
-                    f"{game_data['away_team']}@{game_data['home_team']}",
-                ]
-
-                pred = None
-                for matchup_key in matchup_keys:
-                    if matchup_key in predictions:
-                        pred = predictions[matchup_key]
-                        break
-
-                if pred:
-                    game_data['ai_prediction'] = pred.get('ai_predicted_winner')
-                    game_data['ai_spread'] = pred.get('ai_spread')
-                    game_data['elo_prediction'] = pred.get('elo_predicted_winner')
-                    game_data['elo_spread'] = pred.get('elo_spread')
-                    game_data['vegas_spread'] = pred.get('vegas_spread')
-                    game_data['vegas_total'] = pred.get('vegas_total')
-                    
-                    # Determine if AI prediction was correct (only for final games)
-                    if game_status == 'final':
-                        if game_data['home_score'] > game_data['away_score']:
-                            actual_winner = home_hcl
-                        elif game_data['away_score'] > game_data['home_score']:
-                            actual_winner = away_hcl
-                        else:
-                            actual_winner = 'TIE'
-                        
-                        game_data['ai_correct'] = (pred.get('ai_predicted_winner') == actual_winner)
-                        game_data['elo_correct'] = (pred.get('elo_predicted_winner') == actual_winner)
-                        
-                        # Calculate spread coverage
-                        actual_margin = game_data['home_score'] - game_data['away_score']
-                        
-                        # Calculate Vegas spread coverage
-                        vegas_spread = pred.get('vegas_spread')
-                        
-                        if vegas_spread is not None:
-                            # Check if it's a push
-                            if actual_margin == -vegas_spread:
-                                game_data['vegas_covered'] = 'push'
-                            elif vegas_spread < 0:
-                                # Home team favored - need to win by MORE than spread
-                                game_data['vegas_covered'] = 'yes' if actual_margin > abs(vegas_spread) else 'no'
-                            else:
-                                # Away team favored - need to win by MORE than spread
-                                game_data['vegas_covered'] = 'yes' if actual_margin < -abs(vegas_spread) else 'no'
-                        else:
-                            game_data['vegas_covered'] = None
-                        
-                        # Calculate AI spread coverage (XGBoost)
-                        ai_spread = pred.get('ai_spread')
-                        
-                        if ai_spread is not None:
-                            # AI spreads are decimals, so no pushes
-                            if ai_spread < 0:
-                                # Home team favored - need to win by MORE than spread
-                                game_data['ai_spread_covered'] = 'yes' if actual_margin > abs(ai_spread) else 'no'
-                            else:
-                                # Away team favored - need to win by MORE than spread
-                                game_data['ai_spread_covered'] = 'yes' if actual_margin < -abs(ai_spread) else 'no'
-                        else:
-                            game_data['ai_spread_covered'] = None
-                        
-                        # Calculate ELO spread coverage
-                        elo_spread = pred.get('elo_spread')
-                        
-                        if elo_spread is not None:
-                            # ELO spreads are decimals, so no pushes
-                            if elo_spread < 0:
-                                # Home team favored - need to win by MORE than spread
-                                game_data['elo_spread_covered'] = 'yes' if actual_margin > abs(elo_spread) else 'no'
-                            else:
-                                # Away team favored - need to win by MORE than spread
-                                game_data['elo_spread_covered'] = 'yes' if actual_margin < -abs(elo_spread) else 'no'
+                        actual_winner = 'TIE'
+
+                    game_data['ai_correct'] = (pred.get('ai_predicted_winner') == actual_winner)
+                    game_data['elo_correct'] = (pred.get('elo_predicted_winner') == actual_winner)
+
+                    # Calculate spread coverage
+                    actual_margin = game_data['home_score'] - game_data['away_score']
+
+                    # Calculate Vegas spread coverage
+                    vegas_spread = pred.get('vegas_spread')
+
+                    if vegas_spread is not None:
+                        # Check if it's a push
+                        if actual_margin == -vegas_spread:
+                            game_data['vegas_covered'] = 'push'
+                        elif vegas_spread < 0:
+                            # Home team favored - need to win by MORE than spread
+                            game_data['vegas_covered'] = 'yes' if actual_margin > abs(vegas_spread) else 'no'
                         else:
-                            game_data['elo_spread_covered'] = None
+                            # Away team favored - need to win by MORE than spread
+                            game_data['vegas_covered'] = 'yes' if actual_margin < -abs(vegas_spread) else 'no'
                     else:
-                        game_data['ai_correct'] = None
-                        game_data['elo_correct'] = None
                         game_data['vegas_covered'] = None
+
+                    # Calculate AI spread coverage (XGBoost)
+                    ai_spread = pred.get('ai_spread')
+
+                    if ai_spread is not None:
+                        # AI spreads are decimals, so no pushes
+                        if ai_spread < 0:
+                            # Home team favored - need to win by MORE than spread
+                            game_data['ai_spread_covered'] = 'yes' if actual_margin > abs(ai_spread) else 'no'
+                        else:
+                            # Away team favored - need to win by MORE than spread
+                            game_data['ai_spread_covered'] = 'yes' if actual_margin < -abs(ai_spread) else 'no'
+                    else:
                         game_data['ai_spread_covered'] = None
+
+                    # Calculate ELO spread coverage
+                    elo_spread = pred.get('elo_spread')
+
+                    if elo_spread is not None:
+                        # ELO spreads are decimals, so no pushes
+                        if elo_spread < 0:
+                            # Home team favored - need to win by MORE than spread
+                            game_data['elo_spread_covered'] = 'yes' if actual_margin > abs(elo_spread) else 'no'
+                        else:
+                            # Away team favored - need to win by MORE than spread
+                            game_data['elo_spread_covered'] = 'yes' if actual_margin < -abs(elo_spread) else 'no'
+                    else:
                         game_data['elo_spread_covered'] = None
                 else:
-                    game_data['ai_prediction'] = None
-                    game_data['ai_spread'] = None
-                    game_data['elo_prediction'] = None
-                    game_data['elo_spread'] = None
-                    game_data['vegas_spread'] = None
-                    game_data['vegas_total'] = None
                     game_data['ai_correct'] = None
                     game_data['elo_correct'] = None
+                    game_data['vegas_covered'] = None
                     game_data['ai_spread_covered'] = None
                     game_data['elo_spread_covered'] = None
-                
-                games.append(game_data)
-                
-            except Exception as e:
-                logger.error(f"Error parsing game: {e}")
-                continue
-        
-        # Sort games: live first, then final, then scheduled
-        def sort_key(game):
-            if game['status'] == 'in_progress':
-                return 0
-            elif game['status'] == 'halftime':
-                return 1
-            elif game['status'] == 'final':
-                return 2
             else:
-                return 3
+                game_data['ai_prediction'] = None
+                game_data['ai_spread'] = None
+                game_data['elo_prediction'] = None
+                game_data['elo_spread'] = None
+                game_data['vegas_spread'] = None
+                game_data['vegas_total'] = None
+                game_data['ai_correct'] = None
+                game_data['elo_correct'] = None
+                game_data['ai_spread_covered'] = None
+                game_data['elo_spread_covered'] = None
+
+            games.append(game_data)
+
+        except Exception as e:
+            logger.error(f"Error parsing game: {e}")
+            continue
+
+    # Sort games: live first, then final, then scheduled
+    def sort_key(game):
+        if game['status'] == 'in_progress':
+            return 0
+        elif game['status'] == 'halftime':
+            return 1
+        elif game['status'] == 'final':
+            return 2
+        else:
+            return 3
+
+    games.sort(key=sort_key)
+        
+    return games, week_info
+
+@live_scores_api.route('/api/live-scores', methods=['GET'])
+def get_live_scores():
+    """Fetch current week's NFL games with live scores from ESPN"""
+    try:
+        # Shared ESPN snapshot; only a cold or very stale cache waits on ESPN
+        data = scoreboard_feed.get()
         
-        games.sort(key=sort_key)
+        games, week_info = build_live_games(data)
         
         return jsonify({
             'success': True,
@@ -374,3 +443,39 @@ def get_live_scores():
             'games': [],
             'week_info': None
         }), 500
+
+
+live_score_broadcaster = LiveScoreBroadcaster(scoreboard_feed, build_live_games)
+
+
+def _stream_unavailable(error, retry_after):
+    """503 telling the client to poll /api/live-scores and retry the stream later"""
+    response = jsonify({'success': False, 'error': error})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+@live_scores_api.route('/api/live-scores/stream', methods=['GET'])
+def stream_live_scores():
+    """Server-Sent Events: a snapshot, then score/status/clock/prediction/result changes"""
+    # A gunicorn sync worker serves one request at a time, so a stream would pin it for
+    # LIVE_STREAM_MAX_SECONDS; threaded/async workers set wsgi.multithread.
+    if 'gunicorn.socket' in request.environ and not request.environ.get('wsgi.multithread'):
+        return _stream_unavailable('Live stream unavailable on sync workers; poll /api/live-scores', 300)
+
+    # EventSource sends Last-Event-ID on reconnect; the query param covers manual resumes
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    events = live_score_broadcaster.stream(last_event_id)
+    if events is None:
+        # Above LIVE_STREAM_MAX_SUBSCRIBERS; a slot frees once an open stream recycles
+        return _stream_unavailable('Live stream at capacity; poll /api/live-scores',
+                                   max(1, int(STREAM_MAX_SECONDS)))
+    return Response(
+        events,
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # nginx must not buffer the stream
+        },
+    )
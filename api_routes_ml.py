@@ -15,7 +15,8 @@ import io
 import csv
 import hashlib
 import contextlib
-import psycopg2
+import threading
+import time
 from psycopg2.extras import RealDictCursor
 import json
 from datetime import datetime
@@ -26,39 +27,110 @@ load_dotenv()
 # Add ml directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'ml'))
 from predict_week import WeeklyPredictor
+from team_rolling_features import refresh_team_rolling_features, season_versions
+from model_performance import (
+    completed_seasons,
+    ensure_model_performance,
+    fetch_performance_totals,
+    fetch_performance_weeks,
+    model_performance_installed,
+    refresh_model_performance,
+)
 from predict_elo import EloPredictionSystem
-from elo_tracker import EloTracker
+from model_registry import model_registry
+from elo_tracker import RATINGS_FILE as ELO_RATINGS_FILE, EloTracker, update_elo_ratings
 from team_abbreviations import to_canonical_abbr
+from db_pool import get_db_connection
+from prediction_writer import save_xgb_predictions
+from response_cache import cached_response, conditional_get, skip_caching
 
 # Create Blueprint
 ml_api = Blueprint('ml_api', __name__)
 
-# Initialize predictors (singletons)
-predictor = None
+# Initialize predictors (singletons); the XGBoost predictor lives in model_registry
+model_registry.connect = get_db_connection
 elo_predictor = None
 elo_tracker = None
+elo_ratings_mtime = None  # mtime of ELO_RATINGS_FILE when the Elo singletons were loaded
+
+# Tables behind the ML read endpoints, grouped for conditional_get/cached_response.
+PREDICTION_TABLES = ('hcl.games', 'hcl.ml_predictions')
+REPLAY_TABLES = ('hcl.games', 'hcl.ml_predictions', 'hcl.team_game_stats')
+COMBINED_TABLES = ('hcl.games', 'hcl.team_game_stats', 'hcl.ml_predictions', 'hcl.ml_predictions_elo')
+
+
+def _model_etag_salt():
+    """Serving model version and spread calibration for ETags/cache keys (changes on hot swap)."""
+    return '|'.join([
+        os.getenv('AI_SPREAD_CAL_BIAS', '0'),
+        os.getenv('AI_SPREAD_CAL_SCALE', '1'),
+        model_registry.version(),
+    ])
+
+
+def _prediction_etag_salt():
+    """Model salt plus the Elo ratings file mtime, for every endpoint whose body comes from predictions."""
+    try:
+        elo_mtime = str(os.path.getmtime(ELO_RATINGS_FILE))
+    except OSError:
+        elo_mtime = 'none'
+    return f"{_model_etag_salt()}|elo:{elo_mtime}"
+
+# Simulated-replay results per season, reused while the data fingerprint is unchanged.
+SIMULATED_REPLAY_CACHE_SIZE = 16
+_simulated_replay_cache = {}
+_simulated_replay_lock = threading.Lock()
+
+# /api/ml/performance-stats reads hcl.model_performance_weekly (0 = aggregate per request).
+PERFORMANCE_AGGREGATES_ENABLED = os.getenv('PERFORMANCE_AGGREGATES', '1') != '0'
+_performance_aggregates_ready = False
 
 def get_predictor():
-    """Lazy load the XGBoost predictor"""
-    global predictor
-    if predictor is None:
-        predictor = WeeklyPredictor()
-    return predictor
+    """Current XGBoost predictor from the shared registry (preloaded by api_server)"""
+    return model_registry.get_predictor()
+
+def preload_models():
+    """Load the XGBoost models and Elo ratings before gunicorn forks; returns load timings."""
+    registry_info = model_registry.preload()
+    started = time.perf_counter()
+    get_elo_predictor()
+    get_elo_tracker()
+    return {
+        'xgb': registry_info['current'],
+        'elo_load_seconds': round(time.perf_counter() - started, 4),
+    }
+
+def _sync_elo_ratings():
+    """Drop the Elo singletons when another process has rewritten the ratings file."""
+    global elo_predictor, elo_tracker, elo_ratings_mtime
+    try:
+        mtime = os.path.getmtime(ELO_RATINGS_FILE)
+    except OSError:
+        mtime = None
+    if mtime != elo_ratings_mtime:
+        elo_predictor = None
+        elo_tracker = None
+        elo_ratings_mtime = mtime
 
 def get_elo_predictor():
     """Lazy load the Elo predictor"""
     global elo_predictor
-    if elo_predictor is None:
-        elo_predictor = EloPredictionSystem()
-    return elo_predictor
+    _sync_elo_ratings()
+    current = elo_predictor
+    if current is None:
+        current = elo_predictor = EloPredictionSystem(connect=get_db_connection)
+    return current
 
 def get_elo_tracker():
     """Lazy load the Elo tracker"""
     global elo_tracker
-    if elo_tracker is None:
-        elo_tracker = EloTracker()
-        elo_tracker.load_current_ratings()
-    return elo_tracker
+    _sync_elo_ratings()
+    current = elo_tracker
+    if current is None:
+        current = EloTracker(connect=get_db_connection)
+        current.load_current_ratings()
+        elo_tracker = current
+    return current
 
 
 def get_latest_completed_season():
@@ -68,7 +140,7 @@ def get_latest_completed_season():
     cur = None
 
     try:
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor()
         cur.execute(
             """
@@ -139,30 +211,42 @@ def did_home_cover(spread, actual_margin):
     return result > 0
 
 
-def compute_simulated_ai_vs_vegas_rollup(conn, season, week=None):
+def _team_stats_fingerprint(conn, season):
+    """Identify the team_game_stats state that replayed features for `season` depend on."""
+    if table_exists(conn, 'hcl', 'team_rolling_features_state'):
+        # Source version covers the team_game_stats fallback, built version the rows predictions read.
+        source_version, built_version = season_versions(conn, season)
+        return f"v{source_version}:b{built_version}"
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT md5(COALESCE(string_agg(t::text, '|' ORDER BY t.game_id, t.team), ''))
+        FROM hcl.team_game_stats t
+        WHERE t.season IN (%s, %s)
+        """,
+        (season, season - 1)
+    )
+    digest = cur.fetchone()[0]
+    cur.close()
+    return digest
+
+
+def replay_completed_games(conn, season, week=None):
     """
-    Compute ATS head-to-head results by replaying completed games.
+    Replay the XGBoost models over a season's completed regular-season games.
 
-    This keeps one denominator/outcome set for public AI-vs-Vegas surfaces.
+    All games are predicted in one predict_games batch. The result is cached per
+    season under a fingerprint of the game rows (scores, spreads) and the team
+    stats feeding the features, so repeat calls only pay for the fingerprint
+    queries. Returns [(game, prediction)] in week/date order, filtered to `week`.
     """
-    cur = None
+    cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
-        where_clauses = [
-            "season = %s",
-            "home_score IS NOT NULL",
-            "away_score IS NOT NULL",
-            "COALESCE(is_postseason, FALSE) = FALSE",
-            "spread_line IS NOT NULL"
-        ]
-        params = [season]
-        if week is not None:
-            where_clauses.append("week = %s")
-            params.append(week)
-
-        cur = conn.cursor(cursor_factory=RealDictCursor)
         cur.execute(
-            f"""
+            """
             SELECT
+                game_id,
                 week,
                 home_team,
                 away_team,
@@ -170,74 +254,164 @@ def compute_simulated_ai_vs_vegas_rollup(conn, season, week=None):
                 away_score,
                 spread_line
             FROM hcl.games
-            WHERE {' AND '.join(where_clauses)}
+            WHERE season = %s
+              AND home_score IS NOT NULL
+              AND away_score IS NOT NULL
+              AND COALESCE(is_postseason, FALSE) = FALSE
             ORDER BY week ASC, game_date ASC
             """,
-            tuple(params)
+            (season,)
         )
-        completed_games = cur.fetchall() or []
+        games = [game for game in (cur.fetchall() or []) if game.get('week') is not None]
+    finally:
+        cur.close()
 
-        if not completed_games:
-            return {
-                'ai_wins': 0,
-                'vegas_wins': 0,
-                'ties': 0,
-                'total_games': 0,
-                'data_source': 'simulated_historical',
-                'vegas_spread_source': 'games.spread_line'
+    pred = get_predictor()
+    digest = hashlib.sha256()
+    digest.update(
+        f"{_team_stats_fingerprint(conn, season)}|{pred.ai_spread_cal_bias}|{pred.ai_spread_cal_scale}|{pred.bundle.version}".encode('utf-8')
+    )
+    for game in games:
+        digest.update(
+            "|{game_id}:{week}:{home_team}:{away_team}:{home_score}:{away_score}:{spread_line}".format(**game).encode('utf-8')
+        )
+    fingerprint = digest.hexdigest()
+
+    with _simulated_replay_lock:
+        cached = _simulated_replay_cache.get(season)
+    if cached is not None and cached[0] == fingerprint:
+        pairs = cached[1]
+    else:
+        games_frame = WeeklyPredictor.build_games_frame([
+            {
+                'season': season,
+                'week': int(game.get('week')),
+                'home_team': game.get('home_team'),
+                'away_team': game.get('away_team'),
+                'spread_line': game.get('spread_line'),
+                'total_line': None
             }
+            for game in games
+        ])
 
-        pred = get_predictor()
-        ai_wins = 0
-        vegas_wins = 0
-        ties = 0
-        total_games = 0
+        # One batched replay for the whole season; games predict_games can't score are left out.
+        # Anything else (pool/statement timeout, DB error) is raised uncached so the next call retries.
+        try:
+            predictions = pred.predict_games(games_frame)
+        except Exception as e:
+            print(f"❌ Simulated replay for season {season} failed: {e}")
+            raise
+        pairs = [(game, prediction) for game, prediction in zip(games, predictions) if prediction is not None]
 
-        for game in completed_games:
-            game_week = game.get('week')
-            if game_week is None:
-                continue
+        with _simulated_replay_lock:
+            _simulated_replay_cache.pop(season, None)
+            _simulated_replay_cache[season] = (fingerprint, pairs)
+            while len(_simulated_replay_cache) > SIMULATED_REPLAY_CACHE_SIZE:
+                _simulated_replay_cache.pop(next(iter(_simulated_replay_cache)))
 
-            try:
-                prediction = pred.predict_game(
-                    season,
-                    int(game_week),
-                    game.get('home_team'),
-                    game.get('away_team'),
-                    game.get('spread_line'),
-                    None
-                )
-            except Exception:
-                continue
+    if week is None:
+        return list(pairs)
+    return [(game, prediction) for game, prediction in pairs if game.get('week') == week]
 
-            ai_spread = prediction.get('ai_spread')
-            vegas_spread = game.get('spread_line')
-            if ai_spread is None or vegas_spread is None:
-                continue
 
-            actual_margin = game.get('home_score') - game.get('away_score')
-            ai_covered = did_home_cover(ai_spread, actual_margin)
-            vegas_covered = did_home_cover(vegas_spread, actual_margin)
+def refresh_performance_aggregates(conn, wait=True):
+    """
+    Rebuild the hcl.model_performance_weekly weeks made stale by a write.
 
-            total_games += 1
-            if ai_covered is True and vegas_covered is False:
-                ai_wins += 1
-            elif ai_covered is False and vegas_covered is True:
-                vegas_wins += 1
-            else:
-                ties += 1
+    Called by writers only (update-results; the weekly pipeline does the same);
+    /api/ml/performance-stats just reads. Installs the table and its triggers on
+    first use. Returns {season: [weeks rebuilt]}.
+    """
+    if not PERFORMANCE_AGGREGATES_ENABLED:
+        return {}
+    try:
+        if not model_performance_installed(conn):
+            ensure_model_performance(conn)
+        return refresh_model_performance(conn, wait=wait)
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Could not refresh performance aggregates: {e}")
+        return {}
 
-        return {
-            'ai_wins': ai_wins,
-            'vegas_wins': vegas_wins,
-            'ties': ties,
-            'total_games': total_games,
-            'data_source': 'simulated_historical',
-            'vegas_spread_source': 'games.spread_line'
-        }
-    finally:
-        if cur:
-            cur.close()
+
+def performance_aggregates_available(conn):
+    """True when performance-stats can read hcl.model_performance_weekly instead of aggregating live."""
+    global _performance_aggregates_ready
+    if not PERFORMANCE_AGGREGATES_ENABLED:
+        return False
+    if not _performance_aggregates_ready:
+        _performance_aggregates_ready = model_performance_installed(conn)
+    return _performance_aggregates_ready
+
+
+def refresh_elo_ratings(conn):
+    """
+    Apply newly completed games to the saved Elo ratings.
+
+    Returns the number of games applied; 0 when ratings are already current,
+    another worker is updating them, or the update fails.
+    """
+    try:
+        result = update_elo_ratings(conn, filepath=ELO_RATINGS_FILE, wait=False)
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Could not update Elo ratings: {e}")
+        return 0
+    return result['games_applied']
+
+
+def refresh_rolling_features(conn):
+    """
+    Rebuild the team_rolling_features seasons that writes made stale.
+
+    Returns {season: rows}; {} when nothing is stale, another worker is
+    rebuilding, or the table is not installed.
+    """
+    try:
+        return refresh_team_rolling_features(conn, wait=False)
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Could not refresh team rolling features: {e}")
+        return {}
+
+
+def compute_simulated_ai_vs_vegas_rollup(conn, season, week=None):
+    """
+    Compute ATS head-to-head results by replaying completed games.
+
+    This keeps one denominator/outcome set for public AI-vs-Vegas surfaces.
+    """
+    ai_wins = 0
+    vegas_wins = 0
+    ties = 0
+    total_games = 0
+
+    for game, prediction in replay_completed_games(conn, season, week):
+        ai_spread = prediction.get('ai_spread')
+        vegas_spread = game.get('spread_line')
+        if ai_spread is None or vegas_spread is None:
+            continue
+
+        actual_margin = game.get('home_score') - game.get('away_score')
+        ai_covered = did_home_cover(ai_spread, actual_margin)
+        vegas_covered = did_home_cover(vegas_spread, actual_margin)
+
+        total_games += 1
+        if ai_covered is True and vegas_covered is False:
+            ai_wins += 1
+        elif ai_covered is False and vegas_covered is True:
+            vegas_wins += 1
+        else:
+            ties += 1
+
+    return {
+        'ai_wins': ai_wins,
+        'vegas_wins': vegas_wins,
+        'ties': ties,
+        'total_games': total_games,
+        'data_source': 'simulated_historical',
+        'vegas_spread_source': 'games.spread_line'
+    }
 
 
 def build_outcome_fingerprint(outcomes_by_game_id):
@@ -270,6 +444,7 @@ def build_season_chain_fingerprint(fingerprints_by_season, start_season, end_sea
 
 
 @ml_api.route('/api/ml/predict-week/<int:season>/<int:week>', methods=['GET'])
+@conditional_get(('hcl.games', 'hcl.team_game_stats'), max_age=60, salt=_prediction_etag_salt)
 def predict_week(season, week):
     """
     Predict all games for a given week
@@ -341,56 +516,16 @@ def predict_upcoming():
         
         # Automatically save predictions to tracking table
         try:
-            conn = psycopg2.connect(**pred.db_config)
+            conn = get_db_connection()
             cur = conn.cursor()
             
-            saved_count = 0
-            for p in predictions:
-                insert_sql = """
-                    INSERT INTO hcl.ml_predictions (
-                        game_id, season, week, home_team, away_team, game_date,
-                        predicted_winner, win_confidence, home_win_prob, away_win_prob,
-                        predicted_home_score, predicted_away_score, predicted_margin, ai_spread,
-                        vegas_spread, vegas_total
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (game_id) DO UPDATE SET
-                        predicted_winner = EXCLUDED.predicted_winner,
-                        win_confidence = EXCLUDED.win_confidence,
-                        home_win_prob = EXCLUDED.home_win_prob,
-                        away_win_prob = EXCLUDED.away_win_prob,
-                        predicted_home_score = EXCLUDED.predicted_home_score,
-                        predicted_away_score = EXCLUDED.predicted_away_score,
-                        predicted_margin = EXCLUDED.predicted_margin,
-                        ai_spread = EXCLUDED.ai_spread,
-                        vegas_spread = EXCLUDED.vegas_spread,
-                        vegas_total = EXCLUDED.vegas_total,
-                        predicted_at = NOW()
-                """
-                
-                cur.execute(insert_sql, (
-                    p.get('game_id'),
-                    p.get('season'),
-                    p.get('week'),
-                    p.get('home_team'),
-                    p.get('away_team'),
-                    p.get('game_date'),
-                    p.get('predicted_winner'),
-                    p.get('confidence'),
-                    p.get('home_win_prob'),
-                    p.get('away_win_prob'),
-                    p.get('predicted_home_score'),
-                    p.get('predicted_away_score'),
-                    p.get('predicted_margin'),
-                    p.get('ai_spread'),
-                    p.get('vegas_spread'),
-                    p.get('total_line')
-                ))
-                saved_count += 1
+            saved = save_xgb_predictions(cur, predictions)
             
             conn.commit()
             cur.close()
             conn.close()
-            print(f"✅ Auto-saved {saved_count} predictions to tracking table")
+            print(f"✅ Auto-saved {saved['rows']} predictions to tracking table "
+                  f"({saved['inserted']} new, {saved['updated']} updated)")
             
         except Exception as save_err:
             print(f"⚠️ Failed to save predictions: {save_err}")
@@ -532,6 +667,17 @@ def model_info():
     })
 
 
+@ml_api.route('/api/ml/model-registry', methods=['GET'])
+def model_registry_info():
+    """
+    Serving XGBoost model version, per-artifact load timings and hot-swap counters
+
+    Example: GET /api/ml/model-registry
+    """
+    get_predictor()
+    return jsonify(model_registry.info())
+
+
 @ml_api.route('/api/predictions/current-week', methods=['GET'])
 def get_current_week_predictions():
     """
@@ -577,6 +723,7 @@ def get_current_week_predictions():
 
 
 @ml_api.route('/api/ml/model-performance', methods=['GET'])
+@conditional_get(REPLAY_TABLES, max_age=60, salt=_prediction_etag_salt)
 def get_model_performance():
     """
     Calculate and return model performance statistics
@@ -592,7 +739,7 @@ def get_model_performance():
         season = request.args.get('season', type=int)
         week = request.args.get('week', type=int)
         
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         if season is None:
@@ -729,22 +876,27 @@ def get_model_performance():
                 'regression': {'mae': 0, 'ai_covers': 0, 'vegas_covers': 0, 'total': 0}
             })
 
-        pred = get_predictor()
+        games_frame = WeeklyPredictor.build_games_frame([
+            {
+                'season': season,
+                'week': game['week'],
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'spread_line': game['vegas_spread'],
+                'total_line': None
+            }
+            for game in games
+        ])
+        predictions = get_predictor().predict_games(games_frame)
+        # Games predict_games could not build features for are not scored.
+        scored = [(game, prediction) for game, prediction in zip(games, predictions) if prediction is not None]
+
         classification_correct = 0
         regression_errors = []
         ai_covers = 0
         vegas_covers = 0
 
-        for game in games:
-            prediction = pred.predict_game(
-                season,
-                game['week'],
-                game['home_team'],
-                game['away_team'],
-                game['vegas_spread'],
-                None
-            )
-
+        for game, prediction in scored:
             if prediction.get('predicted_winner') == game['actual_winner']:
                 classification_correct += 1
 
@@ -763,7 +915,7 @@ def get_model_performance():
                 elif ai_covered is False and vegas_covered is True:
                     vegas_covers += 1
 
-        total_games = len(games)
+        total_games = len(scored)
         mae = sum(regression_errors) / len(regression_errors) if regression_errors else 0
 
         return jsonify({
@@ -862,51 +1014,10 @@ def save_predictions():
         if not predictions:
             return jsonify({'success': False, 'error': 'No predictions provided'}), 400
         
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor()
         
-        saved_count = 0
-        for pred in predictions:
-            insert_sql = """
-                INSERT INTO hcl.ml_predictions (
-                    game_id, season, week, home_team, away_team, game_date,
-                    predicted_winner, win_confidence, home_win_prob, away_win_prob,
-                    predicted_home_score, predicted_away_score, predicted_margin, ai_spread,
-                    vegas_spread, vegas_total
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (game_id) DO UPDATE SET
-                    predicted_winner = EXCLUDED.predicted_winner,
-                    win_confidence = EXCLUDED.win_confidence,
-                    home_win_prob = EXCLUDED.home_win_prob,
-                    away_win_prob = EXCLUDED.away_win_prob,
-                    predicted_home_score = EXCLUDED.predicted_home_score,
-                    predicted_away_score = EXCLUDED.predicted_away_score,
-                    predicted_margin = EXCLUDED.predicted_margin,
-                    ai_spread = EXCLUDED.ai_spread,
-                    vegas_spread = EXCLUDED.vegas_spread,
-                    vegas_total = EXCLUDED.vegas_total,
-                    predicted_at = NOW()
-            """
-            
-            cur.execute(insert_sql, (
-                pred.get('game_id'),
-                pred.get('season'),
-                pred.get('week'),
-                pred.get('home_team'),
-                pred.get('away_team'),
-                pred.get('game_date'),
-                pred.get('predicted_winner'),
-                pred.get('confidence'),
-                pred.get('home_win_prob'),
-                pred.get('away_win_prob'),
-                pred.get('predicted_home_score'),
-                pred.get('predicted_away_score'),
-                pred.get('predicted_margin'),
-                pred.get('ai_spread'),
-                pred.get('vegas_spread'),
-                pred.get('total_line')
-            ))
-            saved_count += 1
+        saved = save_xgb_predictions(cur, predictions)
         
         conn.commit()
         cur.close()
@@ -914,8 +1025,10 @@ def save_predictions():
         
         return jsonify({
             'success': True,
-            'saved': saved_count,
-            'message': f'Saved {saved_count} predictions to tracking table'
+            'saved': saved['rows'],
+            'inserted': saved['inserted'],
+            'updated': saved['updated'],
+            'message': f"Saved {saved['rows']} predictions to tracking table"
         })
         
     except Exception as e:
@@ -923,6 +1036,8 @@ def save_predictions():
 
 
 @ml_api.route('/api/ml/season-ai-vs-vegas/<int:season>', methods=['GET'])
+@conditional_get(REPLAY_TABLES, max_age=60, salt=_prediction_etag_salt)
+@cached_response(REPLAY_TABLES, salt=_prediction_etag_salt)
 def get_season_ai_vs_vegas(season):
     """
     Get season-to-date AI vs Vegas spread performance
@@ -932,7 +1047,7 @@ def get_season_ai_vs_vegas(season):
     cur = None
     try:
         allow_simulated_fallback = str(request.args.get('allow_simulated_fallback', 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         has_games_closing_spread = table_has_column(conn, 'hcl', 'games', 'closing_spread')
@@ -1054,6 +1169,7 @@ def get_season_ai_vs_vegas(season):
 
 
 @ml_api.route('/api/ml/season-ai-vs-vegas-audit/<int:season>', methods=['GET'])
+@conditional_get(PREDICTION_TABLES, max_age=60, salt=_prediction_etag_salt)
 def get_season_ai_vs_vegas_audit(season):
     """
     Return per-game ATS head-to-head outcomes for AI vs Vegas.
@@ -1088,7 +1204,7 @@ def get_season_ai_vs_vegas_audit(season):
             limit = 500
         limit = max(1, min(limit, 2000))
 
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         has_games_closing_spread = table_has_column(conn, 'hcl', 'games', 'closing_spread')
@@ -1324,7 +1440,7 @@ def update_results():
     conn = None
     cur = None
     try:
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor()
 
         # Update all XGBoost predictions that have results but haven't been scored yet
@@ -1396,10 +1512,22 @@ def update_results():
 
         conn.commit()
 
+        # Recompute performance-stats aggregates for the weeks just scored.
+        if updated_count or updated_elo_count:
+            refresh_performance_aggregates(conn, wait=True)
+
+        # Advance Elo ratings by the games that finished since the last update.
+        elo_games_applied = refresh_elo_ratings(conn)
+
+        # Rebuild pre-game features for seasons whose team stats changed.
+        rolling_features_refreshed = refresh_rolling_features(conn)
+
         return jsonify({
             'success': True,
             'updated': updated_count,
             'updated_elo': updated_elo_count,
+            'elo_games_applied': elo_games_applied,
+            'rolling_feature_seasons_refreshed': sorted(rolling_features_refreshed),
             'message': f'Updated {updated_count} XGBoost and {updated_elo_count} Elo predictions with actual results'
         })
 
@@ -1413,6 +1541,7 @@ def update_results():
 
 
 @ml_api.route('/api/ml/ai-vs-vegas-reconciliation', methods=['GET'])
+@conditional_get(REPLAY_TABLES, max_age=60, salt=_prediction_etag_salt, season_arg=None)
 def get_ai_vs_vegas_reconciliation():
     """
     Run season-range consistency checks for AI-vs-Vegas ATS scoring.
@@ -1474,7 +1603,7 @@ def get_ai_vs_vegas_reconciliation():
         if start_season > end_season:
             start_season, end_season = end_season, start_season
 
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         has_games_closing_spread = table_has_column(conn, 'hcl', 'games', 'closing_spread')
@@ -1896,6 +2025,7 @@ def get_ai_vs_vegas_reconciliation():
 
 
 @ml_api.route('/api/ml/ai-vs-vegas-seasons', methods=['GET'])
+@conditional_get(PREDICTION_TABLES, max_age=60, salt=_prediction_etag_salt, season_arg=None)
 def get_ai_vs_vegas_seasons():
     """
     Return seasons available for the AI-vs-Vegas page.
@@ -1908,7 +2038,7 @@ def get_ai_vs_vegas_seasons():
     conn = None
     cur = None
     try:
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         has_games_closing_spread = table_has_column(conn, 'hcl', 'games', 'closing_spread')
@@ -1949,7 +2079,7 @@ def get_ai_vs_vegas_seasons():
             for row in rows
         ]
 
-        display_seasons = [row for row in all_seasons_raw if row['season'] >= 2020]
+        display_seasons = [row for row in all_seasons_raw if row['season'] >= 2020]
 
         return jsonify({
             'success': True,
@@ -1968,6 +2098,8 @@ def get_ai_vs_vegas_seasons():
 
 
 @ml_api.route('/api/ml/ai-vs-vegas-scoreboard/<int:season>', methods=['GET'])
+@conditional_get(PREDICTION_TABLES, max_age=60, salt=_prediction_etag_salt)
+@cached_response(PREDICTION_TABLES, salt=_prediction_etag_salt)
 def get_ai_vs_vegas_scoreboard(season):
     """
     Bettor-focused weekly + yearly ATS scoreboard using closing spread.
@@ -1981,7 +2113,7 @@ def get_ai_vs_vegas_scoreboard(season):
     conn = None
     cur = None
     try:
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
 
         has_games_closing_spread = table_has_column(conn, 'hcl', 'games', 'closing_spread')
@@ -2234,753 +2366,629 @@ def get_ai_vs_vegas_scoreboard(season):
             conn.close()
 
 
-@ml_api.route('/api/ml/performance-stats', methods=['GET'])
-def get_performance_stats():
+def _flag_arg(name):
+    return str(request.args.get(name, 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+def _int(value):
+    return int(value or 0)
+
+
+def _float(value):
+    return float(value or 0.0)
+
+
+def _pct(numerator, denominator):
+    if not denominator:
+        return 0.0
+    return round((numerator / denominator) * 100.0, 2)
+
+
+def _scored_model_summary(totals, predicted_games):
+    return {
+        'predicted_games': predicted_games,
+        'scored_games': _int(totals.get('scored_games')),
+        'correct_predictions': _int(totals.get('correct_predictions')),
+        'win_accuracy': _float(totals.get('win_accuracy')),
+        'avg_margin_error': _float(totals.get('avg_margin_error')),
+        'first_week': totals.get('first_week'),
+        'latest_week': totals.get('latest_week')
+    }
+
+
+def _xgb_performance(scopes, weeks, completed_games):
     """
-    Get model performance statistics from tracking table
-    Returns win/loss accuracy and spread prediction accuracy
-    
-    Query params:
-        season: Filter by season (default: latest completed season)
-        week: Filter by week (optional)
+    XGBoost summary and weekly rows from the strict pregame `xgb` scope.
+
+    Legacy historical rows were scored without result_recorded_at or pregame
+    timestamp evidence; when strict rows cover under half of the completed games
+    the `xgb_legacy` scope stands in. Returns (summary, week_rows, legacy_mode).
     """
-    try:
-        season = request.args.get('season', type=int)
-        if season is None:
-            season = get_latest_completed_season()
-        week = request.args.get('week', type=int)
-        allow_simulated_recompute = str(request.args.get('allow_simulated_recompute', 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
-        include_trend = str(request.args.get('include_trend', 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
-        include_coverage_contract = str(request.args.get('include_coverage_contract', 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
-        include_integrity = str(request.args.get('include_integrity', 'false')).strip().lower() in {'1', 'true', 'yes', 'on'}
+    strict = scopes.get('xgb') or {}
+    predicted = _int(strict.get('predicted_games'))
+    scored = _int(strict.get('scored_games'))
+    if completed_games > 0 and (scored == 0 or _pct(scored, completed_games) < 50.0):
+        legacy = scopes.get('xgb_legacy') or {}
+        legacy_scored = _int(legacy.get('scored_games'))
+        if legacy_scored > 0:
+            return _scored_model_summary(legacy, max(predicted, legacy_scored)), weeks['xgb_legacy'], True
+    return _scored_model_summary(strict, predicted), weeks['xgb'], False
+
+
+def _simulated_xgb_performance(conn, season, week):
+    """
+    Score a replay of the current model over the completed games.
 
-        conn = psycopg2.connect(**get_predictor().db_config)
-        elo_table_ready = table_exists(conn, 'hcl', 'ml_predictions_elo')
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+    Returns (summary, week_rows, spread_h2h) or None when nothing could be replayed.
+    """
+    total = 0
+    correct = 0
+    mae_sum = 0.0
+    mae_count = 0
+    week_rollup = {}
+    spread_rollup = {'total_games': 0, 'ai_wins': 0, 'vegas_wins': 0, 'ties': 0}
+
+    for game, prediction in replay_completed_games(conn, season, week):
+        home_score = game.get('home_score')
+        away_score = game.get('away_score')
+        if home_score is None or away_score is None:
+            continue
+
+        actual_margin = home_score - away_score
+        if home_score > away_score:
+            actual_winner = game.get('home_team')
+        elif away_score > home_score:
+            actual_winner = game.get('away_team')
+        else:
+            actual_winner = 'TIE'
+        is_correct = int(prediction.get('predicted_winner') == actual_winner)
+
+        week_value = _int(game.get('week'))
+        row = week_rollup.setdefault(week_value, {'scored_games': 0, 'correct_predictions': 0, 'mae_sum': 0.0, 'mae_count': 0})
+        total += 1
+        correct += is_correct
+        row['scored_games'] += 1
+        row['correct_predictions'] += is_correct
+
+        predicted_margin = prediction.get('predicted_margin')
+        if predicted_margin is None:
+            predicted_margin = prediction.get('ai_spread')
+        if predicted_margin is not None:
+            margin_error = abs(predicted_margin - actual_margin)
+            mae_sum += margin_error
+            mae_count += 1
+            row['mae_sum'] += margin_error
+            row['mae_count'] += 1
+
+        ai_spread = prediction.get('ai_spread')
+        vegas_spread = game.get('spread_line')
+        if ai_spread is not None and vegas_spread is not None:
+            ai_covered = did_home_cover(ai_spread, actual_margin)
+            vegas_covered = did_home_cover(vegas_spread, actual_margin)
+            spread_rollup['total_games'] += 1
+            if ai_covered is True and vegas_covered is False:
+                spread_rollup['ai_wins'] += 1
+            elif ai_covered is False and vegas_covered is True:
+                spread_rollup['vegas_wins'] += 1
+            else:
+                spread_rollup['ties'] += 1
+
+    if total == 0:
+        return None
+
+    summary = {
+        'predicted_games': total,
+        'scored_games': total,
+        'correct_predictions': correct,
+        'win_accuracy': _pct(correct, total),
+        'avg_margin_error': round(mae_sum / mae_count, 2) if mae_count else 0.0,
+        'first_week': min(week_rollup),
+        'latest_week': max(week_rollup)
+    }
+    week_rows = [
+        {
+            'week': week_value,
+            'scored_games': row['scored_games'],
+            'correct_predictions': row['correct_predictions'],
+            'win_accuracy': _pct(row['correct_predictions'], row['scored_games']),
+            'avg_margin_error': round(row['mae_sum'] / row['mae_count'], 1) if row['mae_count'] else 0.0
+        }
+        for week_value, row in sorted(week_rollup.items())
+    ]
+    return summary, week_rows, spread_rollup
+
+
+def _agreement_performance(totals):
+    """XGBoost vs Elo pick agreement on games both models scored before kickoff."""
+    both_models_games = _int(totals.get('scored_games'))
+    agreements = _int(totals.get('agreements'))
+    agreed_correct = _int(totals.get('agreed_correct'))
+    split_games = max(0, both_models_games - agreements)
+    xgb_head_to_head_wins = _int(totals.get('xgb_head_to_head_wins'))
+    elo_head_to_head_wins = _int(totals.get('elo_head_to_head_wins'))
+    return {
+        'both_models_games': both_models_games,
+        'agreements': agreements,
+        'agreement_rate': _pct(agreements, both_models_games),
+        'agreed_correct': agreed_correct,
+        'agreed_accuracy': _pct(agreed_correct, agreements),
+        'split_games': split_games,
+        'xgb_head_to_head_wins': xgb_head_to_head_wins,
+        'elo_head_to_head_wins': elo_head_to_head_wins,
+        'head_to_head_ties': max(0, split_games - (xgb_head_to_head_wins + elo_head_to_head_wins))
+    }
 
-        def _int(value):
-            return int(value or 0)
 
-        def _float(value):
-            return float(value or 0.0)
+def _spread_counts(totals):
+    total_games = _int(totals.get('spread_games'))
+    ai_wins = _int(totals.get('spread_ai_wins'))
+    vegas_wins = _int(totals.get('spread_vegas_wins'))
+    return {
+        'total_games': total_games,
+        'ai_wins': ai_wins,
+        'vegas_wins': vegas_wins,
+        'ties': total_games - ai_wins - vegas_wins
+    }
 
-        def _pct(numerator, denominator):
-            if not denominator:
-                return 0.0
-            return round((numerator / denominator) * 100.0, 2)
 
-        # Legacy fallback flags used to annotate response warnings.
-        xgb_legacy_mode = False
-        xgb_simulation_mode = False
-        trend_legacy_mode = False
-        spread_h2h_legacy_mode = False
-        coverage_legacy_mode = False
-        legacy_xgb_where = None
-        legacy_xgb_params = None
-        simulated_spread_h2h = None
+def _spread_h2h_performance(scopes, xgb_legacy_mode, simulated_spread_h2h):
+    """
+    ATS head-to-head, in parity with /api/ml/season-ai-vs-vegas/<season>.
 
-        xgb_pregame_clause = (
-            "x.predicted_at IS NOT NULL "
-            "AND ((g.kickoff_time_utc IS NOT NULL AND x.predicted_at <= g.kickoff_time_utc) "
-            "OR (g.kickoff_time_utc IS NULL "
-            "AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL "
-            "AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)))"
-        )
-        elo_pregame_clause = (
-            "e.prediction_date IS NOT NULL "
-            "AND ((g.kickoff_time_utc IS NOT NULL AND e.prediction_date <= g.kickoff_time_utc) "
-            "OR (g.kickoff_time_utc IS NULL "
-            "AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL "
-            "AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)))"
-        )
+    Tracked rows stay primary for stable historical outputs; legacy rows stand in
+    when the XGBoost summary already fell back to them, and the simulated replay
+    only when no tracked ATS rows exist. Returns (spread_h2h, legacy_mode).
+    """
+    counts = _spread_counts(scopes.get('xgb') or {})
+    legacy_mode = False
+    if not counts['total_games'] and xgb_legacy_mode:
+        counts = _spread_counts(scopes.get('xgb_legacy') or {})
+        legacy_mode = counts['total_games'] > 0
+
+    data_source = 'tracked_rows'
+    vegas_spread_source = 'ml_predictions.vegas_spread with games.spread_line fallback'
+    if counts['total_games'] == 0 and simulated_spread_h2h:
+        counts = dict(simulated_spread_h2h)
+        data_source = 'simulated_historical'
+        vegas_spread_source = 'games.spread_line'
+
+    return {
+        **counts,
+        'ai_percentage': _pct(counts['ai_wins'], counts['total_games']),
+        'vegas_percentage': _pct(counts['vegas_wins'], counts['total_games']),
+        'vegas_spread_source': vegas_spread_source,
+        'data_source': data_source
+    }, legacy_mode
+
+
+def _week_map(week_rows):
+    return {
+        _int(row.get('week')): {
+            'week': _int(row.get('week')),
+            'scored_games': _int(row.get('scored_games')),
+            'correct_predictions': _int(row.get('correct_predictions')),
+            'win_accuracy': _float(row.get('win_accuracy')),
+            'avg_margin_error': _float(row.get('avg_margin_error'))
+        }
+        for row in week_rows
+    }
 
-        game_where = [
-            "season = %s",
-            "home_score IS NOT NULL",
-            "away_score IS NOT NULL",
-            "COALESCE(is_postseason, FALSE) = FALSE"
-        ]
-        game_params = [season]
-        if week is not None:
-            game_where.append("week = %s")
-            game_params.append(week)
 
-        cur.execute(
-            f"""
-            SELECT
-                COUNT(*) AS completed_games,
-                MIN(week) AS first_week,
-                MAX(week) AS latest_week
-            FROM hcl.games
-            WHERE {' AND '.join(game_where)}
-            """,
-            tuple(game_params)
-        )
-        games_summary = cur.fetchone() or {}
-        completed_games = _int(games_summary.get('completed_games'))
+def _season_trend(conn, live):
+    """
+    Per-season summary of the last six completed seasons (game-date pregame rule).
 
-        xgb_where = [
-            "x.season = %s",
-            "COALESCE(g.is_postseason, FALSE) = FALSE",
-            xgb_pregame_clause
-        ]
-        xgb_params = [season]
-        if week is not None:
-            xgb_where.append("x.week = %s")
-            xgb_params.append(week)
+    Returns (season_trend, legacy_mode); legacy scoring fills in when no season
+    has strict tracked XGBoost rows.
+    """
+    trend_seasons = completed_seasons(conn, limit=6, live=live)
+    if not trend_seasons:
+        return [], False
+    trend_totals = fetch_performance_totals(conn, trend_seasons, live=live)
+
+    legacy_mode = False
+    use_legacy = all(
+        _int((trend_totals.get(s, {}).get('xgb_dated') or {}).get('scored_games')) == 0
+        for s in trend_seasons
+    )
+    # Final games without kickoff evidence stand in when no pregame ATS rows exist.
+    spread_scope = 'xgb_final' if any(
+        _int((scopes.get('xgb_final') or {}).get('spread_games'))
+        for scopes in trend_totals.values()
+    ) else 'xgb_any'
+
+    season_trend = []
+    for trend_season in trend_seasons:
+        scopes = trend_totals.get(trend_season, {})
+        vegas = scopes.get('vegas') or {}
+        xgb_dated = scopes.get('xgb_dated') or {}
+        elo_dated = scopes.get('elo_dated') or {}
+        agreement_dated = scopes.get('agreement_dated') or {}
+        completed = _int(vegas.get('completed_games'))
+
+        xgb_predicted = _int(xgb_dated.get('predicted_games'))
+        xgb_scored = _int(xgb_dated.get('scored_games'))
+        xgb_correct = _int(xgb_dated.get('correct_predictions'))
+        legacy = scopes.get('xgb_legacy') or {}
+        if use_legacy and _int(legacy.get('scored_games')) > 0:
+            legacy_mode = True
+            xgb_scored = _int(legacy.get('scored_games'))
+            xgb_correct = _int(legacy.get('correct_predictions'))
+            xgb_predicted = max(xgb_predicted, xgb_scored)
+
+        elo_scored = _int(elo_dated.get('scored_games'))
+        elo_correct = _int(elo_dated.get('correct_predictions'))
+        both_models_games = _int(agreement_dated.get('scored_games'))
+        agreements = _int(agreement_dated.get('agreements'))
+        vegas_evaluable = _int(vegas.get('scored_games'))
+        vegas_correct = _int(vegas.get('correct_predictions'))
+        spread = _spread_counts(scopes.get(spread_scope) or {})
+
+        season_trend.append({
+            'season': trend_season,
+            'completed_games': completed,
+            'xgb': {
+                'predicted_games': xgb_predicted,
+                'scored_games': xgb_scored,
+                'correct_predictions': xgb_correct,
+                'win_accuracy': _pct(xgb_correct, xgb_scored),
+                'coverage_pct': _pct(xgb_scored, completed)
+            },
+            'elo': {
+                'predicted_games': _int(elo_dated.get('predicted_games')),
+                'scored_games': elo_scored,
+                'correct_predictions': elo_correct,
+                'win_accuracy': _pct(elo_correct, elo_scored),
+                'coverage_pct': _pct(elo_scored, completed)
+            },
+            'agreement': {
+                'both_models_games': both_models_games,
+                'agreements': agreements,
+                'agreement_rate': _pct(agreements, both_models_games)
+            },
+            'vegas': {
+                'evaluable_games': vegas_evaluable,
+                'correct_predictions': vegas_correct,
+                'win_accuracy': _pct(vegas_correct, vegas_evaluable)
+            },
+            'spread_h2h': {
+                **spread,
+                'ai_percentage': _pct(spread['ai_wins'], spread['total_games']),
+                'vegas_percentage': _pct(spread['vegas_wins'], spread['total_games'])
+            }
+        })
+    return season_trend, legacy_mode
+
+
+def _empty_coverage_contract():
+    return {
+        'start_season': None,
+        'end_season': None,
+        'seasons': [],
+        'totals': {
+            'completed_games': 0,
+            'xgb_predicted_games': 0,
+            'xgb_scored_games': 0,
+            'elo_predicted_games': 0,
+            'elo_scored_games': 0,
+            'both_models_games': 0,
+            'xgb_predicted_coverage_pct': 0.0,
+            'xgb_scored_coverage_pct': 0.0,
+            'elo_predicted_coverage_pct': 0.0,
+            'elo_scored_coverage_pct': 0.0,
+            'both_models_coverage_pct': 0.0
+        }
+    }
+
+
+def _coverage_contract(conn, live, coverage_start, coverage_end):
+    """
+    Prediction coverage per season over [coverage_start, coverage_end] (game-date pregame rule).
+
+    Returns (coverage_contract, legacy_mode); legacy scoring fills in seasons
+    without any tracked XGBoost rows.
+    """
+    coverage_contract = _empty_coverage_contract()
+    if coverage_end is None:
+        coverage_end = get_latest_completed_season()
+    if coverage_start is None:
+        coverage_start = max(2021, coverage_end - 4)
+    if coverage_start > coverage_end:
+        coverage_start, coverage_end = coverage_end, coverage_start
+    coverage_contract['start_season'] = coverage_start
+    coverage_contract['end_season'] = coverage_end
+
+    legacy_mode = False
+    coverage_totals = fetch_performance_totals(conn, range(coverage_start, coverage_end + 1), live=live)
+    for coverage_season in range(coverage_start, coverage_end + 1):
+        season_totals = coverage_totals.get(coverage_season, {})
+        completed = _int((season_totals.get('vegas') or {}).get('completed_games'))
+
+        xgb_dated = season_totals.get('xgb_dated') or {}
+        xgb_predicted = _int(xgb_dated.get('predicted_games'))
+        xgb_scored = _int(xgb_dated.get('scored_games'))
+        xgb_correct = _int(xgb_dated.get('correct_predictions'))
+        if completed > 0 and xgb_predicted == 0 and xgb_scored == 0:
+            legacy = season_totals.get('xgb_legacy') or {}
+            if _int(legacy.get('scored_games')) > 0:
+                xgb_predicted = xgb_scored = _int(legacy.get('scored_games'))
+                xgb_correct = _int(legacy.get('correct_predictions'))
+                legacy_mode = True
+
+        elo_dated = season_totals.get('elo_dated') or {}
+        elo_predicted = _int(elo_dated.get('predicted_games'))
+        elo_scored = _int(elo_dated.get('scored_games'))
+        elo_correct = _int(elo_dated.get('correct_predictions'))
+        both_models_games = _int((season_totals.get('agreement_dated') or {}).get('predicted_games'))
+
+        coverage_contract['seasons'].append({
+            'season': coverage_season,
+            'completed_games': completed,
+            'xgb': {
+                'predicted_games': xgb_predicted,
+                'scored_games': xgb_scored,
+                'correct_predictions': xgb_correct,
+                'win_accuracy': _pct(xgb_correct, xgb_scored),
+                'predicted_coverage_pct': _pct(xgb_predicted, completed),
+                'scored_coverage_pct': _pct(xgb_scored, completed)
+            },
+            'elo': {
+                'predicted_games': elo_predicted,
+                'scored_games': elo_scored,
+                'correct_predictions': elo_correct,
+                'win_accuracy': _pct(elo_correct, elo_scored),
+                'predicted_coverage_pct': _pct(elo_predicted, completed),
+                'scored_coverage_pct': _pct(elo_scored, completed)
+            },
+            'agreement': {
+                'both_models_games': both_models_games,
+                'both_models_coverage_pct': _pct(both_models_games, completed)
+            }
+        })
+
+    seasons = coverage_contract['seasons']
+    totals = coverage_contract['totals']
+    totals['completed_games'] = sum(s['completed_games'] for s in seasons)
+    totals['xgb_predicted_games'] = sum(s['xgb']['predicted_games'] for s in seasons)
+    totals['xgb_scored_games'] = sum(s['xgb']['scored_games'] for s in seasons)
+    totals['elo_predicted_games'] = sum(s['elo']['predicted_games'] for s in seasons)
+    totals['elo_scored_games'] = sum(s['elo']['scored_games'] for s in seasons)
+    totals['both_models_games'] = sum(s['agreement']['both_models_games'] for s in seasons)
+    totals['xgb_predicted_coverage_pct'] = _pct(totals['xgb_predicted_games'], totals['completed_games'])
+    totals['xgb_scored_coverage_pct'] = _pct(totals['xgb_scored_games'], totals['completed_games'])
+    totals['elo_predicted_coverage_pct'] = _pct(totals['elo_predicted_games'], totals['completed_games'])
+    totals['elo_scored_coverage_pct'] = _pct(totals['elo_scored_games'], totals['completed_games'])
+    totals['both_models_coverage_pct'] = _pct(totals['both_models_games'], totals['completed_games'])
+    return coverage_contract, legacy_mode
+
+
+def _empty_integrity():
+    return {
+        'leakage': {
+            'rows_checked': 0,
+            'predicted_after_game_date_count': 0,
+            'predicted_after_game_date_pct': 0.0,
+            'threshold_pct': 5.0
+        },
+        'margin_sign': {
+            'rows_checked': 0,
+            'inconsistent_count': 0,
+            'inconsistent_pct': 0.0,
+            'threshold_pct': 0.0
+        },
+        'totals_line_lock': {
+            'rows_checked': 0,
+            'line_locked_count': 0,
+            'line_locked_pct': 0.0,
+            'threshold_pct': 95.0
+        }
+    }
+
+
+def _performance_integrity(conn, season, week):
+    """Leakage / margin-sign / totals line-lock checks on tracked XGBoost rows. Returns (integrity, warnings)."""
+    integrity = _empty_integrity()
+    integrity_where = ["mp.season = %s"]
+    integrity_params = [season]
+    if week is not None:
+        integrity_where.append("mp.week = %s")
+        integrity_params.append(week)
 
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
         cur.execute(
             f"""
-            SELECT COUNT(*) AS predicted_games
-            FROM hcl.ml_predictions x
-            JOIN hcl.games g ON g.game_id = x.game_id
-            WHERE {' AND '.join(xgb_where)}
+            SELECT
+                COUNT(*) FILTER (
+                    WHERE mp.predicted_at IS NOT NULL
+                      AND COALESCE(mp.game_date::date, g.game_date::date) IS NOT NULL
+                ) AS rows_checked,
+                COALESCE(
+                    SUM(
+                        CASE
+                            WHEN mp.predicted_at IS NOT NULL
+                             AND COALESCE(mp.game_date::date, g.game_date::date) IS NOT NULL
+                             AND mp.predicted_at::date > COALESCE(mp.game_date::date, g.game_date::date)
+                            THEN 1 ELSE 0
+                        END
+                    ),
+                    0
+                ) AS predicted_after_game_date_count
+            FROM hcl.ml_predictions mp
+            JOIN hcl.games g ON g.game_id = mp.game_id
+            WHERE {' AND '.join(integrity_where)}
+              AND COALESCE(g.is_postseason, FALSE) = FALSE
             """,
-            tuple(xgb_params)
+            tuple(integrity_params)
         )
-        xgb_predicted = _int((cur.fetchone() or {}).get('predicted_games'))
+        leakage_row = cur.fetchone() or {}
 
-        xgb_scored_where = list(xgb_where) + ["x.result_recorded_at IS NOT NULL"]
         cur.execute(
             f"""
             SELECT
-                COUNT(*) AS scored_games,
-                COALESCE(SUM(CASE WHEN x.win_prediction_correct THEN 1 ELSE 0 END), 0) AS correct_predictions,
-                COALESCE(CAST(AVG(CASE WHEN x.win_prediction_correct THEN 100.0 ELSE 0.0 END) AS NUMERIC(10,2)), 0) AS win_accuracy,
-                COALESCE(CAST(AVG(x.margin_prediction_error) AS NUMERIC(10,2)), 0) AS avg_margin_error,
-                MIN(x.week) AS first_week,
-                MAX(x.week) AS latest_week
-            FROM hcl.ml_predictions x
-            JOIN hcl.games g ON g.game_id = x.game_id
-            WHERE {' AND '.join(xgb_scored_where)}
+                COUNT(*) AS rows_checked,
+                COALESCE(
+                    SUM(
+                        CASE
+                            WHEN mp.actual_winner = mp.away_team AND mp.actual_margin > 0 THEN 1
+                            WHEN mp.actual_winner = mp.home_team AND mp.actual_margin < 0 THEN 1
+                            ELSE 0
+                        END
+                    ),
+                    0
+                ) AS inconsistent_count
+            FROM hcl.ml_predictions mp
+            WHERE {' AND '.join(integrity_where)}
+              AND mp.result_recorded_at IS NOT NULL
+              AND mp.actual_winner IN (mp.home_team, mp.away_team)
+              AND mp.actual_margin IS NOT NULL
             """,
-            tuple(xgb_params)
+            tuple(integrity_params)
         )
-        xgb_summary = cur.fetchone() or {}
+        margin_row = cur.fetchone() or {}
 
         cur.execute(
             f"""
             SELECT
-                x.week,
-                COUNT(*) AS scored_games,
-                COALESCE(SUM(CASE WHEN x.win_prediction_correct THEN 1 ELSE 0 END), 0) AS correct_predictions,
-                COALESCE(CAST(AVG(CASE WHEN x.win_prediction_correct THEN 100.0 ELSE 0.0 END) AS NUMERIC(10,1)), 0) AS win_accuracy,
-                COALESCE(CAST(AVG(x.margin_prediction_error) AS NUMERIC(10,1)), 0) AS avg_margin_error
-            FROM hcl.ml_predictions x
-            JOIN hcl.games g ON g.game_id = x.game_id
-            WHERE {' AND '.join(xgb_scored_where)}
-            GROUP BY x.week
-            ORDER BY x.week ASC
-            """,
-            tuple(xgb_params)
-        )
-        xgb_week_rows = cur.fetchall() or []
-
-        # Fallback for legacy historical rows that were scored without
-        # result_recorded_at and/or strict pregame timestamp evidence.
-        xgb_scored_games = _int(xgb_summary.get('scored_games'))
-        xgb_scored_coverage_pct = _pct(xgb_scored_games, completed_games)
-        if completed_games > 0 and (
-            xgb_scored_games == 0
-            or xgb_scored_coverage_pct < 50.0
-        ):
-            legacy_xgb_where = [
-                "x.season = %s",
-                "COALESCE(g.is_postseason, FALSE) = FALSE",
-                "x.predicted_winner IS NOT NULL",
-                "g.home_score IS NOT NULL",
-                "g.away_score IS NOT NULL"
-            ]
-            legacy_xgb_params = [season]
-            if week is not None:
-                legacy_xgb_where.append("x.week = %s")
-                legacy_xgb_params.append(week)
-
-            legacy_correct_case = (
-                "CASE "
-                "WHEN (g.home_score > g.away_score AND x.predicted_winner = g.home_team) "
-                "  OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team) "
-                "THEN 1 ELSE 0 END"
-            )
-            legacy_margin_error_expr = (
-                "COALESCE(x.margin_prediction_error, "
-                "ABS(COALESCE(x.predicted_margin, x.ai_spread, 0) - (g.home_score - g.away_score)))"
-            )
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) AS scored_games,
-                    COALESCE(SUM({legacy_correct_case}), 0) AS correct_predictions,
-                    COALESCE(
-                        CAST(AVG(CASE WHEN ({legacy_correct_case}) = 1 THEN 100.0 ELSE 0.0 END) AS NUMERIC(10,2)),
-                        0
-                    ) AS win_accuracy,
-                    COALESCE(CAST(AVG({legacy_margin_error_expr}) AS NUMERIC(10,2)), 0) AS avg_margin_error,
-                    MIN(x.week) AS first_week,
-                    MAX(x.week) AS latest_week
-                FROM hcl.ml_predictions x
-                JOIN hcl.games g ON g.game_id = x.game_id
-                WHERE {' AND '.join(legacy_xgb_where)}
-                """,
-                tuple(legacy_xgb_params)
-            )
-            legacy_xgb_summary = cur.fetchone() or {}
-            legacy_scored_games = _int(legacy_xgb_summary.get('scored_games'))
-
-            if legacy_scored_games > 0:
-                xgb_legacy_mode = True
-                xgb_predicted = max(xgb_predicted, legacy_scored_games)
-                xgb_summary = {
-                    'scored_games': legacy_scored_games,
-                    'correct_predictions': _int(legacy_xgb_summary.get('correct_predictions')),
-                    'win_accuracy': _float(legacy_xgb_summary.get('win_accuracy')),
-                    'avg_margin_error': _float(legacy_xgb_summary.get('avg_margin_error')),
-                    'first_week': legacy_xgb_summary.get('first_week'),
-                    'latest_week': legacy_xgb_summary.get('latest_week')
-                }
-
-                cur.execute(
-                    f"""
-                    SELECT
-                        x.week,
-                        COUNT(*) AS scored_games,
-                        COALESCE(SUM({legacy_correct_case}), 0) AS correct_predictions,
-                        COALESCE(
-                            CAST(AVG(CASE WHEN ({legacy_correct_case}) = 1 THEN 100.0 ELSE 0.0 END) AS NUMERIC(10,1)),
-                            0
-                        ) AS win_accuracy,
-                        COALESCE(CAST(AVG({legacy_margin_error_expr}) AS NUMERIC(10,1)), 0) AS avg_margin_error
-                    FROM hcl.ml_predictions x
-                    JOIN hcl.games g ON g.game_id = x.game_id
-                    WHERE {' AND '.join(legacy_xgb_where)}
-                    GROUP BY x.week
-                    ORDER BY x.week ASC
-                    """,
-                    tuple(legacy_xgb_params)
-                )
-                xgb_week_rows = cur.fetchall() or []
-
-        # Single-equation guard: if scored rows do not match completed-game denominator,
-        # recompute from completed games so output cannot flip between sources.
-        xgb_scored_for_sim = _int(xgb_summary.get('scored_games'))
-        if allow_simulated_recompute and completed_games > 0 and xgb_scored_for_sim != completed_games:
-            sim_where = [
-                "season = %s",
-                "home_score IS NOT NULL",
-                "away_score IS NOT NULL",
-                "COALESCE(is_postseason, FALSE) = FALSE"
-            ]
-            sim_params = [season]
-            if week is not None:
-                sim_where.append("week = %s")
-                sim_params.append(week)
-
-            cur.execute(
-                f"""
-                SELECT
-                    game_id,
-                    week,
-                    home_team,
-                    away_team,
-                    home_score,
-                    away_score,
-                    spread_line
-                FROM hcl.games
-                WHERE {' AND '.join(sim_where)}
-                ORDER BY week ASC, game_date ASC
-                """,
-                tuple(sim_params)
-            )
-            simulated_games = cur.fetchall() or []
-
-            if simulated_games:
-                pred = get_predictor()
-                simulated_total = 0
-                simulated_correct = 0
-                simulated_mae_sum = 0.0
-                simulated_mae_count = 0
-                simulated_first_week = None
-                simulated_last_week = None
-                week_rollup = {}
-                spread_rollup = {
-                    'total_games': 0,
-                    'ai_wins': 0,
-                    'vegas_wins': 0,
-                    'ties': 0
-                }
-
-                for game in simulated_games:
-                    try:
-                        prediction = pred.predict_game(
-                            season,
-                            _int(game.get('week')),
-                            game.get('home_team'),
-                            game.get('away_team'),
-                            game.get('spread_line'),
-                            None
-                        )
-                    except Exception:
-                        continue
-
-                    week_value = _int(game.get('week'))
-                    home_score = game.get('home_score')
-                    away_score = game.get('away_score')
-                    if home_score is None or away_score is None:
-                        continue
-
-                    actual_margin = home_score - away_score
-                    if home_score > away_score:
-                        actual_winner = game.get('home_team')
-                    elif away_score > home_score:
-                        actual_winner = game.get('away_team')
-                    else:
-                        actual_winner = 'TIE'
-
-                    predicted_winner = prediction.get('predicted_winner')
-                    is_correct = int(predicted_winner == actual_winner)
-                    predicted_margin = prediction.get('predicted_margin')
-                    if predicted_margin is None:
-                        predicted_margin = prediction.get('ai_spread')
-
-                    simulated_total += 1
-                    simulated_correct += is_correct
-                    if simulated_first_week is None or week_value < simulated_first_week:
-                        simulated_first_week = week_value
-                    if simulated_last_week is None or week_value > simulated_last_week:
-                        simulated_last_week = week_value
-
-                    if week_value not in week_rollup:
-                        week_rollup[week_value] = {
-                            'week': week_value,
-                            'scored_games': 0,
-                            'correct_predictions': 0,
-                            'mae_sum': 0.0,
-                            'mae_count': 0
-                        }
-
-                    week_rollup[week_value]['scored_games'] += 1
-                    week_rollup[week_value]['correct_predictions'] += is_correct
-
-                    if predicted_margin is not None:
-                        margin_error = abs(predicted_margin - actual_margin)
-                        simulated_mae_sum += margin_error
-                        simulated_mae_count += 1
-                        week_rollup[week_value]['mae_sum'] += margin_error
-                        week_rollup[week_value]['mae_count'] += 1
-
-                    ai_spread = prediction.get('ai_spread')
-                    vegas_spread = game.get('spread_line')
-                    if ai_spread is not None and vegas_spread is not None:
-                        ai_covered = did_home_cover(ai_spread, actual_margin)
-                        vegas_covered = did_home_cover(vegas_spread, actual_margin)
-                        spread_rollup['total_games'] += 1
-                        if ai_covered is True and vegas_covered is False:
-                            spread_rollup['ai_wins'] += 1
-                        elif ai_covered is False and vegas_covered is True:
-                            spread_rollup['vegas_wins'] += 1
-                        else:
-                            spread_rollup['ties'] += 1
-
-                if simulated_total > 0:
-                    xgb_simulation_mode = True
-                    xgb_predicted = max(xgb_predicted, simulated_total)
-                    xgb_summary = {
-                        'scored_games': simulated_total,
-                        'correct_predictions': simulated_correct,
-                        'win_accuracy': _pct(simulated_correct, simulated_total),
-                        'avg_margin_error': (
-                            round(simulated_mae_sum / simulated_mae_count, 2)
-                            if simulated_mae_count
-                            else 0.0
-                        ),
-                        'first_week': simulated_first_week,
-                        'latest_week': simulated_last_week
-                    }
-
-                    xgb_week_rows = []
-                    for week_value in sorted(week_rollup.keys()):
-                        row = week_rollup[week_value]
-                        week_games = _int(row.get('scored_games'))
-                        week_correct = _int(row.get('correct_predictions'))
-                        week_mae_count = _int(row.get('mae_count'))
-                        week_mae_avg = (
-                            round(float(row.get('mae_sum') or 0.0) / week_mae_count, 1)
-                            if week_mae_count
-                            else 0.0
-                        )
-                        xgb_week_rows.append({
-                            'week': week_value,
-                            'scored_games': week_games,
-                            'correct_predictions': week_correct,
-                            'win_accuracy': _pct(week_correct, week_games),
-                            'avg_margin_error': week_mae_avg
-                        })
-
-                    simulated_spread_h2h = spread_rollup
-
-        elo_summary = {
-            'predicted_games': 0,
-            'scored_games': 0,
-            'correct_predictions': 0,
-            'win_accuracy': 0,
-            'avg_margin_error': 0,
-            'first_week': None,
-            'latest_week': None
-        }
-        elo_week_rows = []
-
-        if elo_table_ready:
-            elo_where = [
-                "e.season = %s",
-                "COALESCE(g.is_postseason, FALSE) = FALSE",
-                elo_pregame_clause
-            ]
-            elo_params = [season]
-            if week is not None:
-                elo_where.append("e.week = %s")
-                elo_params.append(week)
-
-            cur.execute(
-                f"""
-                SELECT COUNT(*) AS predicted_games
-                FROM hcl.ml_predictions_elo e
-                JOIN hcl.games g ON g.game_id = e.game_id
-                WHERE {' AND '.join(elo_where)}
-                """,
-                tuple(elo_params)
-            )
-            elo_summary['predicted_games'] = _int((cur.fetchone() or {}).get('predicted_games'))
-
-            elo_scored_where = list(elo_where) + [
-                "e.predicted_winner IS NOT NULL",
-                "g.home_score IS NOT NULL",
-                "g.away_score IS NOT NULL"
-            ]
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) AS scored_games,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                  OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS correct_predictions,
-                    COALESCE(
-                        CAST(
-                            AVG(
-                                CASE
-                                    WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                      OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                    THEN 100.0 ELSE 0.0
-                                END
-                            ) AS NUMERIC(10,2)
-                        ),
-                        0
-                    ) AS win_accuracy,
-                    COALESCE(CAST(AVG(ABS(e.elo_spread - (g.home_score - g.away_score))) AS NUMERIC(10,2)), 0) AS avg_margin_error,
-                    MIN(e.week) AS first_week,
-                    MAX(e.week) AS latest_week
-                FROM hcl.ml_predictions_elo e
-                JOIN hcl.games g ON g.game_id = e.game_id
-                WHERE {' AND '.join(elo_scored_where)}
-                """,
-                tuple(elo_params)
-            )
-            elo_scored_summary = cur.fetchone() or {}
-
-            elo_summary.update({
-                'scored_games': _int(elo_scored_summary.get('scored_games')),
-                'correct_predictions': _int(elo_scored_summary.get('correct_predictions')),
-                'win_accuracy': _float(elo_scored_summary.get('win_accuracy')),
-                'avg_margin_error': _float(elo_scored_summary.get('avg_margin_error')),
-                'first_week': elo_scored_summary.get('first_week'),
-                'latest_week': elo_scored_summary.get('latest_week')
-            })
-
-            cur.execute(
-                f"""
-                SELECT
-                    e.week,
-                    COUNT(*) AS scored_games,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                  OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS correct_predictions,
-                    COALESCE(
-                        CAST(
-                            AVG(
-                                CASE
-                                    WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                      OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                    THEN 100.0 ELSE 0.0
-                                END
-                            ) AS NUMERIC(10,1)
-                        ),
-                        0
-                    ) AS win_accuracy,
-                    COALESCE(CAST(AVG(ABS(e.elo_spread - (g.home_score - g.away_score))) AS NUMERIC(10,1)), 0) AS avg_margin_error
-                FROM hcl.ml_predictions_elo e
-                JOIN hcl.games g ON g.game_id = e.game_id
-                WHERE {' AND '.join(elo_scored_where)}
-                GROUP BY e.week
-                ORDER BY e.week ASC
-                """,
-                tuple(elo_params)
-            )
-            elo_week_rows = cur.fetchall() or []
-
-        agreement_summary = {
-            'both_models_games': 0,
-            'agreements': 0,
-            'agreement_rate': 0.0,
-            'agreed_correct': 0,
-            'agreed_accuracy': 0.0,
-            'split_games': 0,
-            'xgb_head_to_head_wins': 0,
-            'elo_head_to_head_wins': 0,
-            'head_to_head_ties': 0
-        }
-
-        if elo_table_ready:
-            agreement_where = [
-                "x.season = %s",
-                "x.result_recorded_at IS NOT NULL",
-                "x.predicted_winner IS NOT NULL",
-                "e.predicted_winner IS NOT NULL",
-                "g.home_score IS NOT NULL",
-                "g.away_score IS NOT NULL",
-                "COALESCE(g.is_postseason, FALSE) = FALSE",
-                xgb_pregame_clause,
-                elo_pregame_clause
-            ]
-            agreement_params = [season]
-            if week is not None:
-                agreement_where.append("x.week = %s")
-                agreement_params.append(week)
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) AS both_models_games,
-                    COALESCE(SUM(CASE WHEN x.predicted_winner = e.predicted_winner THEN 1 ELSE 0 END), 0) AS agreements,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN x.predicted_winner = e.predicted_winner
-                                 AND (
-                                    (g.home_score > g.away_score AND x.predicted_winner = g.home_team)
-                                    OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team)
-                                 )
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS agreed_correct,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN x.predicted_winner <> e.predicted_winner
-                                 AND (
-                                    (g.home_score > g.away_score AND x.predicted_winner = g.home_team)
-                                    OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team)
-                                 )
-                                 AND NOT (
-                                    (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                    OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                 )
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS xgb_head_to_head_wins,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN x.predicted_winner <> e.predicted_winner
-                                 AND (
-                                    (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                    OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                 )
-                                 AND NOT (
-                                    (g.home_score > g.away_score AND x.predicted_winner = g.home_team)
-                                    OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team)
-                                 )
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS elo_head_to_head_wins
-                FROM hcl.ml_predictions x
-                JOIN hcl.ml_predictions_elo e ON e.game_id = x.game_id
-                JOIN hcl.games g ON g.game_id = x.game_id
-                WHERE {' AND '.join(agreement_where)}
-                """,
-                tuple(agreement_params)
-            )
-            agreement_raw = cur.fetchone() or {}
-
-            both_models_games = _int(agreement_raw.get('both_models_games'))
-            agreements = _int(agreement_raw.get('agreements'))
-            agreed_correct = _int(agreement_raw.get('agreed_correct'))
-            split_games = max(0, both_models_games - agreements)
-            xgb_head_to_head_wins = _int(agreement_raw.get('xgb_head_to_head_wins'))
-            elo_head_to_head_wins = _int(agreement_raw.get('elo_head_to_head_wins'))
-            head_to_head_ties = max(0, split_games - (xgb_head_to_head_wins + elo_head_to_head_wins))
-
-            agreement_summary.update({
-                'both_models_games': both_models_games,
-                'agreements': agreements,
-                'agreement_rate': _pct(agreements, both_models_games),
-                'agreed_correct': agreed_correct,
-                'agreed_accuracy': _pct(agreed_correct, agreements),
-                'split_games': split_games,
-                'xgb_head_to_head_wins': xgb_head_to_head_wins,
-                'elo_head_to_head_wins': elo_head_to_head_wins,
-                'head_to_head_ties': head_to_head_ties
-            })
-
-        cur.execute(
-            f"""
-            SELECT
-                COALESCE(SUM(CASE WHEN spread_line IS NOT NULL AND spread_line <> 0 THEN 1 ELSE 0 END), 0) AS evaluable_games,
+                COUNT(*) AS rows_checked,
                 COALESCE(
                     SUM(
                         CASE
-                            WHEN spread_line IS NULL OR spread_line = 0 THEN 0
-                            WHEN spread_line > 0 AND home_score > away_score THEN 1
-                            WHEN spread_line < 0 AND away_score > home_score THEN 1
-                            ELSE 0
+                            WHEN mp.predicted_home_score IS NULL
+                              OR mp.predicted_away_score IS NULL
+                              OR mp.vegas_total IS NULL THEN 0
+                            WHEN ROUND((mp.predicted_home_score + mp.predicted_away_score)::NUMERIC, 1)
+                               = ROUND(mp.vegas_total::NUMERIC, 1)
+                            THEN 1 ELSE 0
                         END
                     ),
                     0
-                ) AS correct_predictions
-            FROM hcl.games
-            WHERE {' AND '.join(game_where)}
+                ) AS line_locked_count
+            FROM hcl.ml_predictions mp
+            WHERE {' AND '.join(integrity_where)}
             """,
-            tuple(game_params)
+            tuple(integrity_params)
         )
-        vegas_raw = cur.fetchone() or {}
-        vegas_evaluable = _int(vegas_raw.get('evaluable_games'))
-        vegas_correct = _int(vegas_raw.get('correct_predictions'))
+        line_lock_row = cur.fetchone() or {}
+    finally:
+        cur.close()
 
-        # ATS head-to-head parity with /api/ml/season-ai-vs-vegas/<season>.
-        cur.execute(
-            f"""
-            SELECT
-                x.ai_spread,
-                COALESCE(x.vegas_spread, g.spread_line) AS vegas_spread,
-                g.home_score,
-                g.away_score
-            FROM hcl.ml_predictions x
-            JOIN hcl.games g ON g.game_id = x.game_id
-            WHERE {' AND '.join(xgb_scored_where)}
-              AND x.ai_spread IS NOT NULL
-              AND COALESCE(x.vegas_spread, g.spread_line) IS NOT NULL
-            """,
-            tuple(xgb_params)
+    leakage_checked = _int(leakage_row.get('rows_checked'))
+    leakage_count = _int(leakage_row.get('predicted_after_game_date_count'))
+    leakage_pct = _pct(leakage_count, leakage_checked)
+    integrity['leakage'].update({
+        'rows_checked': leakage_checked,
+        'predicted_after_game_date_count': leakage_count,
+        'predicted_after_game_date_pct': leakage_pct
+    })
+
+    margin_checked = _int(margin_row.get('rows_checked'))
+    margin_count = _int(margin_row.get('inconsistent_count'))
+    margin_pct = _pct(margin_count, margin_checked)
+    integrity['margin_sign'].update({
+        'rows_checked': margin_checked,
+        'inconsistent_count': margin_count,
+        'inconsistent_pct': margin_pct
+    })
+
+    line_lock_checked = _int(line_lock_row.get('rows_checked'))
+    line_lock_count = _int(line_lock_row.get('line_locked_count'))
+    line_lock_pct = _pct(line_lock_count, line_lock_checked)
+    integrity['totals_line_lock'].update({
+        'rows_checked': line_lock_checked,
+        'line_locked_count': line_lock_count,
+        'line_locked_pct': line_lock_pct
+    })
+
+    warnings = []
+    if leakage_pct > integrity['leakage']['threshold_pct']:
+        warnings.append(
+            f"Integrity warning: {leakage_pct}% of tracked XGBoost rows have predicted_at after game_date"
+        )
+    if margin_pct > integrity['margin_sign']['threshold_pct']:
+        warnings.append(
+            f"Integrity warning: {margin_pct}% of scored XGBoost rows have inconsistent actual_margin sign"
+        )
+    if line_lock_pct >= integrity['totals_line_lock']['threshold_pct']:
+        warnings.append(
+            f"Integrity warning: {line_lock_pct}% of rows have predicted total locked to vegas_total"
         )
-        spread_h2h_rows = cur.fetchall() or []
+    return integrity, warnings
 
-        if not spread_h2h_rows and xgb_legacy_mode and legacy_xgb_where and legacy_xgb_params:
-            cur.execute(
-                f"""
-                SELECT
-                    x.ai_spread,
-                    COALESCE(x.vegas_spread, g.spread_line) AS vegas_spread,
-                    g.home_score,
-                    g.away_score
-                FROM hcl.ml_predictions x
-                JOIN hcl.games g ON g.game_id = x.game_id
-                WHERE {' AND '.join(legacy_xgb_where)}
-                  AND x.ai_spread IS NOT NULL
-                  AND COALESCE(x.vegas_spread, g.spread_line) IS NOT NULL
-                """,
-                tuple(legacy_xgb_params)
-            )
-            spread_h2h_rows = cur.fetchall() or []
-            spread_h2h_legacy_mode = bool(spread_h2h_rows)
 
-        spread_h2h_total = 0
-        spread_h2h_ai = 0
-        spread_h2h_vegas = 0
-        spread_h2h_ties = 0
-        spread_h2h_data_source = 'tracked_rows'
-        spread_h2h_vegas_source = 'ml_predictions.vegas_spread with games.spread_line fallback'
+@ml_api.route('/api/ml/performance-stats', methods=['GET'])
+@conditional_get(
+    REPLAY_TABLES + ('hcl.ml_predictions_elo', 'hcl.model_performance_weekly'),
+    max_age=60,
+    salt=_prediction_etag_salt
+)
+def get_performance_stats():
+    """
+    Get model performance statistics from tracking table
+    Returns win/loss accuracy and spread prediction accuracy
+    
+    Query params:
+        season: Filter by season (default: latest completed season)
+        week: Filter by week (optional)
+    """
+    conn = None
+    try:
+        season = request.args.get('season', type=int)
+        if season is None:
+            season = get_latest_completed_season()
+        week = request.args.get('week', type=int)
+        allow_simulated_recompute = _flag_arg('allow_simulated_recompute')
+        include_trend = _flag_arg('include_trend')
+        include_coverage_contract = _flag_arg('include_coverage_contract')
+        include_integrity = _flag_arg('include_integrity')
 
-        for row in spread_h2h_rows:
-            actual_margin = None
-            if row.get('home_score') is not None and row.get('away_score') is not None:
-                actual_margin = row['home_score'] - row['away_score']
+        conn = get_db_connection()
+        elo_table_ready = table_exists(conn, 'hcl', 'ml_predictions_elo')
 
-            ai_covered = did_home_cover(row.get('ai_spread'), actual_margin)
-            vegas_covered = did_home_cover(row.get('vegas_spread'), actual_margin)
+        # Every section reads the same scope rows: hcl.model_performance_weekly with
+        # any week still marked stale aggregated live, or, while the table is not
+        # installed, every week aggregated from the tracking tables.
+        live = not performance_aggregates_available(conn)
+        scopes = fetch_performance_totals(conn, [season], week, live=live).get(season, {})
+        scope_weeks = fetch_performance_weeks(conn, season, ('xgb', 'xgb_legacy', 'elo'), week, live=live)
+        completed_games = _int((scopes.get('vegas') or {}).get('completed_games'))
 
-            spread_h2h_total += 1
-            if ai_covered is True and vegas_covered is False:
-                spread_h2h_ai += 1
-            elif ai_covered is False and vegas_covered is True:
-                spread_h2h_vegas += 1
-            else:
-                spread_h2h_ties += 1
+        xgb_summary, xgb_week_rows, xgb_legacy_mode = _xgb_performance(scopes, scope_weeks, completed_games)
 
-        if spread_h2h_total == 0 and simulated_spread_h2h:
-            spread_h2h_total = _int(simulated_spread_h2h.get('total_games'))
-            spread_h2h_ai = _int(simulated_spread_h2h.get('ai_wins'))
-            spread_h2h_vegas = _int(simulated_spread_h2h.get('vegas_wins'))
-            spread_h2h_ties = _int(simulated_spread_h2h.get('ties'))
-            spread_h2h_data_source = 'simulated_historical'
-            spread_h2h_vegas_source = 'games.spread_line'
+        # Single-equation guard: if scored rows do not match completed-game denominator,
+        # recompute from completed games so output cannot flip between sources.
+        xgb_simulation_mode = False
+        simulated_spread_h2h = None
+        if allow_simulated_recompute and completed_games > 0 and xgb_summary['scored_games'] != completed_games:
+            simulated = _simulated_xgb_performance(conn, season, week)
+            if simulated:
+                simulated_summary, xgb_week_rows, simulated_spread_h2h = simulated
+                simulated_summary['predicted_games'] = max(
+                    xgb_summary['predicted_games'], simulated_summary['predicted_games']
+                )
+                xgb_summary = simulated_summary
+                xgb_simulation_mode = True
 
-        # Keep tracked rows as primary for stable historical outputs.
-        # Simulation is only used as fallback when no tracked ATS rows are available.
+        elo_totals = scopes.get('elo') or {}
+        elo_summary = _scored_model_summary(elo_totals, _int(elo_totals.get('predicted_games')))
+        spread_h2h, spread_h2h_legacy_mode = _spread_h2h_performance(scopes, xgb_legacy_mode, simulated_spread_h2h)
+        vegas_totals = scopes.get('vegas') or {}
+        vegas_evaluable = _int(vegas_totals.get('scored_games'))
+        vegas_correct = _int(vegas_totals.get('correct_predictions'))
 
         model_breakdown = {
             'xgb': {
-                'predicted_games': xgb_predicted,
-                'scored_games': _int(xgb_summary.get('scored_games')),
-                'correct_predictions': _int(xgb_summary.get('correct_predictions')),
-                'win_accuracy': _float(xgb_summary.get('win_accuracy')),
-                'avg_margin_error': _float(xgb_summary.get('avg_margin_error')),
-                'coverage_pct': _pct(_int(xgb_summary.get('scored_games')), completed_games),
-                'predicted_coverage_pct': _pct(xgb_predicted, completed_games),
-                'first_week': xgb_summary.get('first_week'),
-                'latest_week': xgb_summary.get('latest_week')
+                **xgb_summary,
+                'coverage_pct': _pct(xgb_summary['scored_games'], completed_games),
+                'predicted_coverage_pct': _pct(xgb_summary['predicted_games'], completed_games)
             },
             'elo': {
-                'predicted_games': _int(elo_summary.get('predicted_games')),
-                'scored_games': _int(elo_summary.get('scored_games')),
-                'correct_predictions': _int(elo_summary.get('correct_predictions')),
-                'win_accuracy': _float(elo_summary.get('win_accuracy')),
-                'avg_margin_error': _float(elo_summary.get('avg_margin_error')),
-                'coverage_pct': _pct(_int(elo_summary.get('scored_games')), completed_games),
-                'predicted_coverage_pct': _pct(_int(elo_summary.get('predicted_games')), completed_games),
-                'first_week': elo_summary.get('first_week'),
-                'latest_week': elo_summary.get('latest_week')
-            },
-            'agreement': agreement_summary,
-            'spread_h2h': {
-                'total_games': spread_h2h_total,
-                'ai_wins': spread_h2h_ai,
-                'vegas_wins': spread_h2h_vegas,
-                'ties': spread_h2h_ties,
-                'ai_percentage': _pct(spread_h2h_ai, spread_h2h_total),
-                'vegas_percentage': _pct(spread_h2h_vegas, spread_h2h_total),
-                'vegas_spread_source': spread_h2h_vegas_source,
-                'data_source': spread_h2h_data_source
+                **elo_summary,
+                'coverage_pct': _pct(elo_summary['scored_games'], completed_games),
+                'predicted_coverage_pct': _pct(elo_summary['predicted_games'], completed_games)
             },
+            'agreement': _agreement_performance(scopes.get('agreement') or {}),
+            'spread_h2h': spread_h2h,
             'vegas': {
                 'evaluable_games': vegas_evaluable,
                 'correct_predictions': vegas_correct,
@@ -2988,62 +2996,73 @@ def get_performance_stats():
             }
         }
 
-        xgb_week_map = {
-            _int(row.get('week')): {
-                'week': _int(row.get('week')),
-                'scored_games': _int(row.get('scored_games')),
-                'correct_predictions': _int(row.get('correct_predictions')),
-                'win_accuracy': _float(row.get('win_accuracy')),
-                'avg_margin_error': _float(row.get('avg_margin_error'))
-            }
-            for row in xgb_week_rows
-        }
-        elo_week_map = {
-            _int(row.get('week')): {
-                'week': _int(row.get('week')),
-                'scored_games': _int(row.get('scored_games')),
-                'correct_predictions': _int(row.get('correct_predictions')),
-                'win_accuracy': _float(row.get('win_accuracy')),
-                'avg_margin_error': _float(row.get('avg_margin_error'))
-            }
-            for row in elo_week_rows
-        }
-
-        all_weeks = sorted(set(list(xgb_week_map.keys()) + list(elo_week_map.keys())))
-        by_week_models = []
-        for week_value in all_weeks:
-            by_week_models.append({
-                'week': week_value,
-                'xgb': xgb_week_map.get(week_value),
-                'elo': elo_week_map.get(week_value)
-            })
+        xgb_week_map = _week_map(xgb_week_rows)
+        elo_week_map = _week_map(scope_weeks['elo'])
+        by_week_models = [
+            {'week': week_value, 'xgb': xgb_week_map.get(week_value), 'elo': elo_week_map.get(week_value)}
+            for week_value in sorted(set(xgb_week_map) | set(elo_week_map))
+        ]
 
-        xgb_scored_games = model_breakdown['xgb']['scored_games']
-        elo_scored_games = model_breakdown['elo']['scored_games']
-        if xgb_scored_games > 0:
-            primary_model = 'xgb'
-            primary_summary = model_breakdown['xgb']
-            primary_week_map = xgb_week_map
-        elif elo_scored_games > 0:
-            primary_model = 'elo'
-            primary_summary = model_breakdown['elo']
-            primary_week_map = elo_week_map
+        if model_breakdown['xgb']['scored_games'] > 0:
+            primary_model, primary_week_map = 'xgb', xgb_week_map
+        elif model_breakdown['elo']['scored_games'] > 0:
+            primary_model, primary_week_map = 'elo', elo_week_map
         else:
-            primary_model = 'xgb'
-            primary_summary = model_breakdown['xgb']
-            primary_week_map = {}
-
-        by_week = []
-        for week_value in sorted(primary_week_map.keys(), reverse=True):
-            row = primary_week_map[week_value]
-            by_week.append({
+            primary_model, primary_week_map = 'xgb', {}
+        primary_summary = model_breakdown[primary_model]
+
+        by_week = [
+            {
                 'week': week_value,
                 'games': row['scored_games'],
                 'correct': row['correct_predictions'],
                 'accuracy': round(row['win_accuracy'], 1),
                 'mae': round(row['avg_margin_error'], 1),
                 'model': primary_model
-            })
+            }
+            for week_value, row in sorted(primary_week_map.items(), reverse=True)
+        ]
+
+        overall = {
+            'total_games': primary_summary.get('scored_games', 0),
+            'correct_predictions': primary_summary.get('correct_predictions', 0),
+            'win_accuracy': round(_float(primary_summary.get('win_accuracy')), 2),
+            'avg_margin_error': round(_float(primary_summary.get('avg_margin_error')), 2),
+            'avg_home_score_error': None,
+            'avg_away_score_error': None,
+            'first_week': primary_summary.get('first_week'),
+            'latest_week': primary_summary.get('latest_week'),
+            'model': primary_model
+        }
+
+        warnings = []
+        if xgb_legacy_mode:
+            warnings.append(
+                "Coverage note: using legacy XGBoost scoring fallback because strict pregame tracked rows are unavailable for this season."
+            )
+        if xgb_simulation_mode:
+            warnings.append(
+                "Coverage note: using simulated historical XGBoost scoring from completed games because tracked row coverage is currently insufficient for this season."
+            )
+        if spread_h2h_legacy_mode:
+            warnings.append(
+                "Coverage note: spread head-to-head metrics are using legacy fallback rows without strict pregame timestamp evidence."
+            )
+
+        payload = {
+            'success': True,
+            'season': season,
+            'week': week,
+            'completed_games': completed_games,
+            'overall': overall,
+            'by_week': by_week,
+            'by_week_models': by_week_models,
+            'model_breakdown': model_breakdown,
+            'season_trend': [],
+            'coverage_contract': _empty_coverage_contract(),
+            'elo_table_ready': elo_table_ready,
+            'warnings': warnings
+        }
 
         # Fast path for UI season tab loads: return tracked DB-backed metrics only.
         # This avoids expensive multi-season/integrity scans that can trigger gateway timeouts.
@@ -3054,66 +3073,8 @@ def get_performance_stats():
             and not include_integrity
             and not allow_simulated_recompute
         ):
-            fast_warnings = []
-            if xgb_legacy_mode:
-                fast_warnings.append(
-                    "Coverage note: using legacy XGBoost scoring fallback because strict pregame tracked rows are unavailable for this season."
-                )
-            if xgb_simulation_mode:
-                fast_warnings.append(
-                    "Coverage note: using simulated historical XGBoost scoring from completed games because tracked row coverage is currently insufficient for this season."
-                )
-            if spread_h2h_legacy_mode:
-                fast_warnings.append(
-                    "Coverage note: spread head-to-head metrics are using legacy fallback rows without strict pregame timestamp evidence."
-                )
-
-            overall = {
-                'total_games': primary_summary.get('scored_games', 0),
-                'correct_predictions': primary_summary.get('correct_predictions', 0),
-                'win_accuracy': round(_float(primary_summary.get('win_accuracy')), 2),
-                'avg_margin_error': round(_float(primary_summary.get('avg_margin_error')), 2),
-                'avg_home_score_error': None,
-                'avg_away_score_error': None,
-                'first_week': primary_summary.get('first_week'),
-                'latest_week': primary_summary.get('latest_week'),
-                'model': primary_model
-            }
-
-            cur.close()
-            conn.close()
-
-            return jsonify({
-                'success': True,
-                'season': season,
-                'week': week,
-                'completed_games': completed_games,
-                'overall': overall,
-                'by_week': by_week,
-                'by_week_models': by_week_models,
-                'model_breakdown': model_breakdown,
-                'season_trend': [],
-                'coverage_contract': {
-                    'start_season': None,
-                    'end_season': None,
-                    'seasons': [],
-                    'totals': {
-                        'completed_games': 0,
-                        'xgb_predicted_games': 0,
-                        'xgb_scored_games': 0,
-                        'elo_predicted_games': 0,
-                        'elo_scored_games': 0,
-                        'both_models_games': 0,
-                        'xgb_predicted_coverage_pct': 0.0,
-                        'xgb_scored_coverage_pct': 0.0,
-                        'elo_predicted_coverage_pct': 0.0,
-                        'elo_scored_coverage_pct': 0.0,
-                        'both_models_coverage_pct': 0.0
-                    }
-                },
-                'elo_table_ready': elo_table_ready,
+            payload.update({
                 'integrity': None,
-                'warnings': fast_warnings,
                 'data_quality': {
                     'strict_pregame_xgb': not (xgb_legacy_mode or xgb_simulation_mode),
                     'strict_pregame_spread_h2h': not spread_h2h_legacy_mode,
@@ -3122,847 +3083,44 @@ def get_performance_stats():
                 'generated_at': datetime.now().isoformat(),
                 'perf_version': 'v4'
             })
+            return jsonify(payload)
 
-        trend_seasons = []
-        season_trend = []
         if week is None and include_trend:
-            cur.execute(
-                """
-                SELECT DISTINCT season
-                FROM hcl.games
-                WHERE home_score IS NOT NULL
-                  AND away_score IS NOT NULL
-                                    AND COALESCE(is_postseason, FALSE) = FALSE
-                ORDER BY season DESC
-                LIMIT 6
-                """
-            )
-            trend_seasons = [_int(row.get('season')) for row in (cur.fetchall() or [])]
-
-            if trend_seasons:
-                cur.execute(
-                    """
-                    SELECT season, COUNT(*) AS completed_games
-                    FROM hcl.games
-                    WHERE home_score IS NOT NULL
-                      AND away_score IS NOT NULL
-                                            AND COALESCE(is_postseason, FALSE) = FALSE
-                      AND season = ANY(%s)
-                    GROUP BY season
-                    """,
-                    (trend_seasons,)
-                )
-                trend_games_map = {
-                    _int(row.get('season')): _int(row.get('completed_games'))
-                    for row in (cur.fetchall() or [])
-                }
-
-                cur.execute(
-                    """
-                                        SELECT x.season, COUNT(*) AS predicted_games
-                                        FROM hcl.ml_predictions x
-                                        JOIN hcl.games g ON g.game_id = x.game_id
-                                        WHERE x.season = ANY(%s)
-                                            AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                            AND x.predicted_at IS NOT NULL
-                                            AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                            AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                                        GROUP BY x.season
-                    """,
-                    (trend_seasons,)
-                )
-                trend_xgb_pred_map = {
-                    _int(row.get('season')): _int(row.get('predicted_games'))
-                    for row in (cur.fetchall() or [])
-                }
-
-                cur.execute(
-                    """
-                    SELECT
-                                                x.season,
-                        COUNT(*) AS scored_games,
-                                                COALESCE(SUM(CASE WHEN x.win_prediction_correct THEN 1 ELSE 0 END), 0) AS correct_predictions
-                                        FROM hcl.ml_predictions x
-                                        JOIN hcl.games g ON g.game_id = x.game_id
-                                        WHERE x.result_recorded_at IS NOT NULL
-                                            AND x.season = ANY(%s)
-                                            AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                            AND x.predicted_at IS NOT NULL
-                                            AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                            AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                                        GROUP BY x.season
-                    """,
-                    (trend_seasons,)
-                )
-                trend_xgb_scored_map = {
-                    _int(row.get('season')): {
-                        'scored_games': _int(row.get('scored_games')),
-                        'correct_predictions': _int(row.get('correct_predictions'))
-                    }
-                    for row in (cur.fetchall() or [])
-                }
-
-                if trend_seasons and all(
-                    _int((trend_xgb_scored_map.get(s) or {}).get('scored_games')) == 0
-                    for s in trend_seasons
-                ):
-                    legacy_trend_correct_case = (
-                        "CASE "
-                        "WHEN (g.home_score > g.away_score AND x.predicted_winner = g.home_team) "
-                        "  OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team) "
-                        "THEN 1 ELSE 0 END"
-                    )
-                    cur.execute(
-                        f"""
-                        SELECT
-                            x.season,
-                            COUNT(*) AS scored_games,
-                            COALESCE(SUM({legacy_trend_correct_case}), 0) AS correct_predictions
-                        FROM hcl.ml_predictions x
-                        JOIN hcl.games g ON g.game_id = x.game_id
-                        WHERE x.season = ANY(%s)
-                          AND COALESCE(g.is_postseason, FALSE) = FALSE
-                          AND x.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                        GROUP BY x.season
-                        """,
-                        (trend_seasons,)
-                    )
-                    legacy_trend_rows = cur.fetchall() or []
-                    for row in legacy_trend_rows:
-                        trend_season = _int(row.get('season'))
-                        legacy_scored = _int(row.get('scored_games'))
-                        legacy_correct = _int(row.get('correct_predictions'))
-                        if legacy_scored > 0:
-                            trend_xgb_scored_map[trend_season] = {
-                                'scored_games': legacy_scored,
-                                'correct_predictions': legacy_correct
-                            }
-                            trend_xgb_pred_map[trend_season] = max(
-                                _int(trend_xgb_pred_map.get(trend_season)),
-                                legacy_scored
-                            )
-                    trend_legacy_mode = bool(legacy_trend_rows)
-
-                trend_elo_pred_map = {}
-                trend_elo_scored_map = {}
-                trend_agreement_map = {}
-                trend_spread_h2h_map = {}
-
-                if elo_table_ready:
-                    cur.execute(
-                        """
-                                                SELECT e.season, COUNT(*) AS predicted_games
-                                                FROM hcl.ml_predictions_elo e
-                                                JOIN hcl.games g ON g.game_id = e.game_id
-                                                WHERE e.season = ANY(%s)
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                                                GROUP BY e.season
-                        """,
-                        (trend_seasons,)
-                    )
-                    trend_elo_pred_map = {
-                        _int(row.get('season')): _int(row.get('predicted_games'))
-                        for row in (cur.fetchall() or [])
-                    }
-
-                    cur.execute(
-                        """
-                        SELECT
-                            e.season,
-                            COUNT(*) AS scored_games,
-                            COALESCE(
-                                SUM(
-                                    CASE
-                                        WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                          OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                        THEN 1 ELSE 0
-                                    END
-                                ),
-                                0
-                            ) AS correct_predictions
-                        FROM hcl.ml_predictions_elo e
-                        JOIN hcl.games g ON g.game_id = e.game_id
-                        WHERE e.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                          AND e.season = ANY(%s)
-                        GROUP BY e.season
-                        """,
-                        (trend_seasons,)
-                    )
-                    trend_elo_scored_map = {
-                        _int(row.get('season')): {
-                            'scored_games': _int(row.get('scored_games')),
-                            'correct_predictions': _int(row.get('correct_predictions'))
-                        }
-                        for row in (cur.fetchall() or [])
-                    }
-
-                    cur.execute(
-                        """
-                        SELECT
-                            x.season,
-                            COUNT(*) AS both_models_games,
-                            COALESCE(SUM(CASE WHEN x.predicted_winner = e.predicted_winner THEN 1 ELSE 0 END), 0) AS agreements
-                        FROM hcl.ml_predictions x
-                        JOIN hcl.ml_predictions_elo e ON e.game_id = x.game_id
-                        JOIN hcl.games g ON g.game_id = x.game_id
-                        WHERE x.result_recorded_at IS NOT NULL
-                          AND x.predicted_winner IS NOT NULL
-                          AND e.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND x.predicted_at IS NOT NULL
-                                                    AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                          AND x.season = ANY(%s)
-                        GROUP BY x.season
-                        """,
-                        (trend_seasons,)
-                    )
-                    trend_agreement_map = {
-                        _int(row.get('season')): {
-                            'both_models_games': _int(row.get('both_models_games')),
-                            'agreements': _int(row.get('agreements'))
-                        }
-                        for row in (cur.fetchall() or [])
-                    }
-
-                cur.execute(
-                    """
-                    SELECT
-                        season,
-                        COALESCE(SUM(CASE WHEN spread_line IS NOT NULL AND spread_line <> 0 THEN 1 ELSE 0 END), 0) AS evaluable_games,
-                        COALESCE(
-                            SUM(
-                                CASE
-                                    WHEN spread_line IS NULL OR spread_line = 0 THEN 0
-                                    WHEN spread_line > 0 AND home_score > away_score THEN 1
-                                    WHEN spread_line < 0 AND away_score > home_score THEN 1
-                                    ELSE 0
-                                END
-                            ),
-                            0
-                        ) AS correct_predictions
-                    FROM hcl.games
-                    WHERE home_score IS NOT NULL
-                      AND away_score IS NOT NULL
-                                            AND COALESCE(is_postseason, FALSE) = FALSE
-                      AND season = ANY(%s)
-                    GROUP BY season
-                    """,
-                    (trend_seasons,)
-                )
-                trend_vegas_map = {
-                    _int(row.get('season')): {
-                        'evaluable_games': _int(row.get('evaluable_games')),
-                        'correct_predictions': _int(row.get('correct_predictions'))
-                    }
-                    for row in (cur.fetchall() or [])
-                }
-
-                cur.execute(
-                    """
-                    SELECT
-                        x.season,
-                        x.ai_spread,
-                        COALESCE(x.vegas_spread, g.spread_line) AS vegas_spread,
-                        g.home_score,
-                        g.away_score
-                    FROM hcl.ml_predictions x
-                    JOIN hcl.games g ON g.game_id = x.game_id
-                    WHERE x.season = ANY(%s)
-                      AND g.home_score IS NOT NULL
-                      AND g.away_score IS NOT NULL
-                      AND COALESCE(g.is_postseason, FALSE) = FALSE
-                      AND x.ai_spread IS NOT NULL
-                      AND COALESCE(x.vegas_spread, g.spread_line) IS NOT NULL
-                      AND x.predicted_at IS NOT NULL
-                      AND (
-                            (
-                                g.kickoff_time_utc IS NOT NULL
-                                AND x.predicted_at <= g.kickoff_time_utc
-                            )
-                            OR (
-                                g.kickoff_time_utc IS NULL
-                                AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                            )
-                      )
-                    """,
-                    (trend_seasons,)
+            payload['season_trend'], trend_legacy_mode = _season_trend(conn, live)
+            if trend_legacy_mode:
+                warnings.append(
+                    "Coverage note: multi-season trend includes legacy fallback scoring for historical seasons lacking strict pregame tracked rows."
                 )
-                for row in (cur.fetchall() or []):
-                    trend_season = _int(row.get('season'))
-                    actual_margin = row.get('home_score') - row.get('away_score')
-                    ai_covered = did_home_cover(row.get('ai_spread'), actual_margin)
-                    vegas_covered = did_home_cover(row.get('vegas_spread'), actual_margin)
-
-                    if trend_season not in trend_spread_h2h_map:
-                        trend_spread_h2h_map[trend_season] = {
-                            'total_games': 0,
-                            'ai_wins': 0,
-                            'vegas_wins': 0,
-                            'ties': 0
-                        }
-
-                    trend_spread_h2h_map[trend_season]['total_games'] += 1
-                    if ai_covered is True and vegas_covered is False:
-                        trend_spread_h2h_map[trend_season]['ai_wins'] += 1
-                    elif ai_covered is False and vegas_covered is True:
-                        trend_spread_h2h_map[trend_season]['vegas_wins'] += 1
-                    else:
-                        trend_spread_h2h_map[trend_season]['ties'] += 1
-
-                if trend_seasons and not trend_spread_h2h_map:
-                    cur.execute(
-                        """
-                        SELECT
-                            x.season,
-                            x.ai_spread,
-                            COALESCE(x.vegas_spread, g.spread_line) AS vegas_spread,
-                            g.home_score,
-                            g.away_score
-                        FROM hcl.ml_predictions x
-                        JOIN hcl.games g ON g.game_id = x.game_id
-                        WHERE x.season = ANY(%s)
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                          AND COALESCE(g.is_postseason, FALSE) = FALSE
-                          AND x.ai_spread IS NOT NULL
-                          AND COALESCE(x.vegas_spread, g.spread_line) IS NOT NULL
-                        """,
-                        (trend_seasons,)
-                    )
-                    for row in (cur.fetchall() or []):
-                        trend_season = _int(row.get('season'))
-                        actual_margin = row.get('home_score') - row.get('away_score')
-                        ai_covered = did_home_cover(row.get('ai_spread'), actual_margin)
-                        vegas_covered = did_home_cover(row.get('vegas_spread'), actual_margin)
-
-                        if trend_season not in trend_spread_h2h_map:
-                            trend_spread_h2h_map[trend_season] = {
-                                'total_games': 0,
-                                'ai_wins': 0,
-                                'vegas_wins': 0,
-                                'ties': 0
-                            }
-
-                        trend_spread_h2h_map[trend_season]['total_games'] += 1
-                        if ai_covered is True and vegas_covered is False:
-                            trend_spread_h2h_map[trend_season]['ai_wins'] += 1
-                        elif ai_covered is False and vegas_covered is True:
-                            trend_spread_h2h_map[trend_season]['vegas_wins'] += 1
-                        else:
-                            trend_spread_h2h_map[trend_season]['ties'] += 1
-
-                for trend_season in trend_seasons:
-                    trend_completed = trend_games_map.get(trend_season, 0)
-
-                    trend_xgb = trend_xgb_scored_map.get(trend_season, {'scored_games': 0, 'correct_predictions': 0})
-                    trend_xgb_scored = _int(trend_xgb.get('scored_games'))
-                    trend_xgb_correct = _int(trend_xgb.get('correct_predictions'))
-
-                    trend_elo = trend_elo_scored_map.get(trend_season, {'scored_games': 0, 'correct_predictions': 0})
-                    trend_elo_scored = _int(trend_elo.get('scored_games'))
-                    trend_elo_correct = _int(trend_elo.get('correct_predictions'))
-
-                    trend_agreement = trend_agreement_map.get(trend_season, {'both_models_games': 0, 'agreements': 0})
-                    trend_vegas = trend_vegas_map.get(trend_season, {'evaluable_games': 0, 'correct_predictions': 0})
-                    trend_spread_h2h = trend_spread_h2h_map.get(
-                        trend_season,
-                        {'total_games': 0, 'ai_wins': 0, 'vegas_wins': 0, 'ties': 0}
-                    )
-
-                    season_trend.append({
-                        'season': trend_season,
-                        'completed_games': trend_completed,
-                        'xgb': {
-                            'predicted_games': trend_xgb_pred_map.get(trend_season, 0),
-                            'scored_games': trend_xgb_scored,
-                            'correct_predictions': trend_xgb_correct,
-                            'win_accuracy': _pct(trend_xgb_correct, trend_xgb_scored),
-                            'coverage_pct': _pct(trend_xgb_scored, trend_completed)
-                        },
-                        'elo': {
-                            'predicted_games': trend_elo_pred_map.get(trend_season, 0),
-                            'scored_games': trend_elo_scored,
-                            'correct_predictions': trend_elo_correct,
-                            'win_accuracy': _pct(trend_elo_correct, trend_elo_scored),
-                            'coverage_pct': _pct(trend_elo_scored, trend_completed)
-                        },
-                        'agreement': {
-                            'both_models_games': _int(trend_agreement.get('both_models_games')),
-                            'agreements': _int(trend_agreement.get('agreements')),
-                            'agreement_rate': _pct(
-                                _int(trend_agreement.get('agreements')),
-                                _int(trend_agreement.get('both_models_games'))
-                            )
-                        },
-                        'vegas': {
-                            'evaluable_games': _int(trend_vegas.get('evaluable_games')),
-                            'correct_predictions': _int(trend_vegas.get('correct_predictions')),
-                            'win_accuracy': _pct(
-                                _int(trend_vegas.get('correct_predictions')),
-                                _int(trend_vegas.get('evaluable_games'))
-                            )
-                        },
-                        'spread_h2h': {
-                            'total_games': _int(trend_spread_h2h.get('total_games')),
-                            'ai_wins': _int(trend_spread_h2h.get('ai_wins')),
-                            'vegas_wins': _int(trend_spread_h2h.get('vegas_wins')),
-                            'ties': _int(trend_spread_h2h.get('ties')),
-                            'ai_percentage': _pct(
-                                _int(trend_spread_h2h.get('ai_wins')),
-                                _int(trend_spread_h2h.get('total_games'))
-                            ),
-                            'vegas_percentage': _pct(
-                                _int(trend_spread_h2h.get('vegas_wins')),
-                                _int(trend_spread_h2h.get('total_games'))
-                            )
-                        }
-                    })
-
-        coverage_contract = {
-            'start_season': None,
-            'end_season': None,
-            'seasons': [],
-            'totals': {
-                'completed_games': 0,
-                'xgb_predicted_games': 0,
-                'xgb_scored_games': 0,
-                'elo_predicted_games': 0,
-                'elo_scored_games': 0,
-                'both_models_games': 0,
-                'xgb_predicted_coverage_pct': 0.0,
-                'xgb_scored_coverage_pct': 0.0,
-                'elo_predicted_coverage_pct': 0.0,
-                'elo_scored_coverage_pct': 0.0,
-                'both_models_coverage_pct': 0.0
-            }
-        }
 
         if week is None and include_coverage_contract:
-            coverage_start = request.args.get('coverage_start_season', type=int)
-            coverage_end = request.args.get('coverage_end_season', type=int)
-
-            latest_completed_season = get_latest_completed_season()
-            if coverage_end is None:
-                coverage_end = latest_completed_season
-            if coverage_start is None:
-                coverage_start = max(2021, coverage_end - 4)
-
-            if coverage_start > coverage_end:
-                coverage_start, coverage_end = coverage_end, coverage_start
-
-            coverage_contract['start_season'] = coverage_start
-            coverage_contract['end_season'] = coverage_end
-
-            for coverage_season in range(coverage_start, coverage_end + 1):
-                cur.execute(
-                    """
-                    SELECT COUNT(*) AS completed_games
-                    FROM hcl.games
-                    WHERE season = %s
-                      AND home_score IS NOT NULL
-                      AND away_score IS NOT NULL
-                                            AND COALESCE(is_postseason, FALSE) = FALSE
-                    """,
-                    (coverage_season,)
-                )
-                completed = _int((cur.fetchone() or {}).get('completed_games'))
-
-                cur.execute(
-                    """
-                                        SELECT COUNT(*) AS predicted_games
-                                        FROM hcl.ml_predictions x
-                                        JOIN hcl.games g ON g.game_id = x.game_id
-                                        WHERE x.season = %s
-                                            AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                            AND x.predicted_at IS NOT NULL
-                                            AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                            AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                    """,
-                    (coverage_season,)
-                )
-                xgb_predicted = _int((cur.fetchone() or {}).get('predicted_games'))
-
-                cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) AS scored_games,
-                                                COALESCE(SUM(CASE WHEN x.win_prediction_correct THEN 1 ELSE 0 END), 0) AS correct_predictions
-                                        FROM hcl.ml_predictions x
-                                        JOIN hcl.games g ON g.game_id = x.game_id
-                                        WHERE x.season = %s
-                                            AND x.result_recorded_at IS NOT NULL
-                                            AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                            AND x.predicted_at IS NOT NULL
-                                            AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                            AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                    """,
-                    (coverage_season,)
-                )
-                xgb_row = cur.fetchone() or {}
-                xgb_scored = _int(xgb_row.get('scored_games'))
-                xgb_correct = _int(xgb_row.get('correct_predictions'))
-
-                if completed > 0 and xgb_predicted == 0 and xgb_scored == 0:
-                    legacy_coverage_correct_case = (
-                        "CASE "
-                        "WHEN (g.home_score > g.away_score AND x.predicted_winner = g.home_team) "
-                        "  OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team) "
-                        "THEN 1 ELSE 0 END"
-                    )
-                    cur.execute(
-                        f"""
-                        SELECT
-                            COUNT(*) AS scored_games,
-                            COALESCE(SUM({legacy_coverage_correct_case}), 0) AS correct_predictions
-                        FROM hcl.ml_predictions x
-                        JOIN hcl.games g ON g.game_id = x.game_id
-                        WHERE x.season = %s
-                          AND COALESCE(g.is_postseason, FALSE) = FALSE
-                          AND x.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                        """,
-                        (coverage_season,)
-                    )
-                    legacy_cov_row = cur.fetchone() or {}
-                    legacy_cov_scored = _int(legacy_cov_row.get('scored_games'))
-                    if legacy_cov_scored > 0:
-                        xgb_predicted = legacy_cov_scored
-                        xgb_scored = legacy_cov_scored
-                        xgb_correct = _int(legacy_cov_row.get('correct_predictions'))
-                        coverage_legacy_mode = True
-
-                elo_predicted = 0
-                elo_scored = 0
-                elo_correct = 0
-                both_models_games = 0
-
-                if elo_table_ready:
-                    cur.execute(
-                        """
-                                                SELECT COUNT(*) AS predicted_games
-                                                FROM hcl.ml_predictions_elo e
-                                                JOIN hcl.games g ON g.game_id = e.game_id
-                                                WHERE e.season = %s
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                        """,
-                        (coverage_season,)
-                    )
-                    elo_predicted = _int((cur.fetchone() or {}).get('predicted_games'))
-
-                    cur.execute(
-                        """
-                        SELECT
-                            COUNT(*) AS scored_games,
-                            COALESCE(
-                                SUM(
-                                    CASE
-                                        WHEN (g.home_score > g.away_score AND e.predicted_winner = g.home_team)
-                                          OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team)
-                                        THEN 1 ELSE 0
-                                    END
-                                ),
-                                0
-                            ) AS correct_predictions
-                        FROM hcl.ml_predictions_elo e
-                        JOIN hcl.games g ON g.game_id = e.game_id
-                        WHERE e.season = %s
-                          AND e.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                        """,
-                        (coverage_season,)
-                    )
-                    elo_row = cur.fetchone() or {}
-                    elo_scored = _int(elo_row.get('scored_games'))
-                    elo_correct = _int(elo_row.get('correct_predictions'))
-
-                    cur.execute(
-                        """
-                        SELECT COUNT(*) AS both_models_games
-                        FROM hcl.ml_predictions x
-                        JOIN hcl.ml_predictions_elo e ON e.game_id = x.game_id
-                        JOIN hcl.games g ON g.game_id = x.game_id
-                        WHERE x.season = %s
-                          AND x.result_recorded_at IS NOT NULL
-                          AND e.predicted_winner IS NOT NULL
-                          AND g.home_score IS NOT NULL
-                          AND g.away_score IS NOT NULL
-                                                    AND COALESCE(g.is_postseason, FALSE) = FALSE
-                                                    AND x.predicted_at IS NOT NULL
-                                                    AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)
-                                                    AND e.prediction_date IS NOT NULL
-                                                    AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL
-                                                    AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)
-                        """,
-                        (coverage_season,)
-                    )
-                    both_models_games = _int((cur.fetchone() or {}).get('both_models_games'))
-
-                coverage_contract['seasons'].append({
-                    'season': coverage_season,
-                    'completed_games': completed,
-                    'xgb': {
-                        'predicted_games': xgb_predicted,
-                        'scored_games': xgb_scored,
-                        'correct_predictions': xgb_correct,
-                        'win_accuracy': _pct(xgb_correct, xgb_scored),
-                        'predicted_coverage_pct': _pct(xgb_predicted, completed),
-                        'scored_coverage_pct': _pct(xgb_scored, completed)
-                    },
-                    'elo': {
-                        'predicted_games': elo_predicted,
-                        'scored_games': elo_scored,
-                        'correct_predictions': elo_correct,
-                        'win_accuracy': _pct(elo_correct, elo_scored),
-                        'predicted_coverage_pct': _pct(elo_predicted, completed),
-                        'scored_coverage_pct': _pct(elo_scored, completed)
-                    },
-                    'agreement': {
-                        'both_models_games': both_models_games,
-                        'both_models_coverage_pct': _pct(both_models_games, completed)
-                    }
-                })
-
-            if coverage_contract['seasons']:
-                totals = coverage_contract['totals']
-                totals['completed_games'] = sum(_int(s.get('completed_games')) for s in coverage_contract['seasons'])
-                totals['xgb_predicted_games'] = sum(_int((s.get('xgb') or {}).get('predicted_games')) for s in coverage_contract['seasons'])
-                totals['xgb_scored_games'] = sum(_int((s.get('xgb') or {}).get('scored_games')) for s in coverage_contract['seasons'])
-                totals['elo_predicted_games'] = sum(_int((s.get('elo') or {}).get('predicted_games')) for s in coverage_contract['seasons'])
-                totals['elo_scored_games'] = sum(_int((s.get('elo') or {}).get('scored_games')) for s in coverage_contract['seasons'])
-                totals['both_models_games'] = sum(_int((s.get('agreement') or {}).get('both_models_games')) for s in coverage_contract['seasons'])
-                totals['xgb_predicted_coverage_pct'] = _pct(totals['xgb_predicted_games'], totals['completed_games'])
-                totals['xgb_scored_coverage_pct'] = _pct(totals['xgb_scored_games'], totals['completed_games'])
-                totals['elo_predicted_coverage_pct'] = _pct(totals['elo_predicted_games'], totals['completed_games'])
-                totals['elo_scored_coverage_pct'] = _pct(totals['elo_scored_games'], totals['completed_games'])
-                totals['both_models_coverage_pct'] = _pct(totals['both_models_games'], totals['completed_games'])
-
-        integrity = {
-            'leakage': {
-                'rows_checked': 0,
-                'predicted_after_game_date_count': 0,
-                'predicted_after_game_date_pct': 0.0,
-                'threshold_pct': 5.0
-            },
-            'margin_sign': {
-                'rows_checked': 0,
-                'inconsistent_count': 0,
-                'inconsistent_pct': 0.0,
-                'threshold_pct': 0.0
-            },
-            'totals_line_lock': {
-                'rows_checked': 0,
-                'line_locked_count': 0,
-                'line_locked_pct': 0.0,
-                'threshold_pct': 95.0
-            }
-        }
-
-        warnings = []
-
-        if xgb_legacy_mode:
-            warnings.append(
-                "Coverage note: using legacy XGBoost scoring fallback because strict pregame tracked rows are unavailable for this season."
-            )
-        if xgb_simulation_mode:
-            warnings.append(
-                "Coverage note: using simulated historical XGBoost scoring from completed games because tracked row coverage is currently insufficient for this season."
-            )
-        if spread_h2h_legacy_mode:
-            warnings.append(
-                "Coverage note: spread head-to-head metrics are using legacy fallback rows without strict pregame timestamp evidence."
-            )
-        if trend_legacy_mode:
-            warnings.append(
-                "Coverage note: multi-season trend includes legacy fallback scoring for historical seasons lacking strict pregame tracked rows."
-            )
-        if coverage_legacy_mode:
-            warnings.append(
-                "Coverage note: coverage contract includes legacy fallback scoring for one or more seasons."
-            )
-
-        if include_integrity:
-            integrity_where = ["mp.season = %s"]
-            integrity_params = [season]
-            if week is not None:
-                integrity_where.append("mp.week = %s")
-                integrity_params.append(week)
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) FILTER (
-                        WHERE mp.predicted_at IS NOT NULL
-                          AND COALESCE(mp.game_date::date, g.game_date::date) IS NOT NULL
-                    ) AS rows_checked,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN mp.predicted_at IS NOT NULL
-                                 AND COALESCE(mp.game_date::date, g.game_date::date) IS NOT NULL
-                                 AND mp.predicted_at::date > COALESCE(mp.game_date::date, g.game_date::date)
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS predicted_after_game_date_count
-                FROM hcl.ml_predictions mp
-                JOIN hcl.games g ON g.game_id = mp.game_id
-                WHERE {' AND '.join(integrity_where)}
-                                AND COALESCE(g.is_postseason, FALSE) = FALSE
-                """,
-                tuple(integrity_params)
-            )
-            leakage_row = cur.fetchone() or {}
-            leakage_checked = _int(leakage_row.get('rows_checked'))
-            leakage_count = _int(leakage_row.get('predicted_after_game_date_count'))
-            leakage_pct = _pct(leakage_count, leakage_checked)
-            integrity['leakage'].update({
-                'rows_checked': leakage_checked,
-                'predicted_after_game_date_count': leakage_count,
-                'predicted_after_game_date_pct': leakage_pct
-            })
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) AS rows_checked,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN mp.actual_winner = mp.away_team AND mp.actual_margin > 0 THEN 1
-                                WHEN mp.actual_winner = mp.home_team AND mp.actual_margin < 0 THEN 1
-                                ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS inconsistent_count
-                FROM hcl.ml_predictions mp
-                WHERE {' AND '.join(integrity_where)}
-                  AND mp.result_recorded_at IS NOT NULL
-                  AND mp.actual_winner IN (mp.home_team, mp.away_team)
-                  AND mp.actual_margin IS NOT NULL
-                """,
-                tuple(integrity_params)
-            )
-            margin_row = cur.fetchone() or {}
-            margin_checked = _int(margin_row.get('rows_checked'))
-            margin_count = _int(margin_row.get('inconsistent_count'))
-            margin_pct = _pct(margin_count, margin_checked)
-            integrity['margin_sign'].update({
-                'rows_checked': margin_checked,
-                'inconsistent_count': margin_count,
-                'inconsistent_pct': margin_pct
-            })
-
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) AS rows_checked,
-                    COALESCE(
-                        SUM(
-                            CASE
-                                WHEN mp.predicted_home_score IS NULL
-                                  OR mp.predicted_away_score IS NULL
-                                  OR mp.vegas_total IS NULL THEN 0
-                                WHEN ROUND((mp.predicted_home_score + mp.predicted_away_score)::NUMERIC, 1)
-                                   = ROUND(mp.vegas_total::NUMERIC, 1)
-                                THEN 1 ELSE 0
-                            END
-                        ),
-                        0
-                    ) AS line_locked_count
-                FROM hcl.ml_predictions mp
-                WHERE {' AND '.join(integrity_where)}
-                """,
-                tuple(integrity_params)
+            payload['coverage_contract'], coverage_legacy_mode = _coverage_contract(
+                conn,
+                live,
+                request.args.get('coverage_start_season', type=int),
+                request.args.get('coverage_end_season', type=int)
             )
-            line_lock_row = cur.fetchone() or {}
-            line_lock_checked = _int(line_lock_row.get('rows_checked'))
-            line_lock_count = _int(line_lock_row.get('line_locked_count'))
-            line_lock_pct = _pct(line_lock_count, line_lock_checked)
-            integrity['totals_line_lock'].update({
-                'rows_checked': line_lock_checked,
-                'line_locked_count': line_lock_count,
-                'line_locked_pct': line_lock_pct
-            })
-
-            if leakage_pct > integrity['leakage']['threshold_pct']:
-                warnings.append(
-                    f"Integrity warning: {leakage_pct}% of tracked XGBoost rows have predicted_at after game_date"
-                )
-            if margin_pct > integrity['margin_sign']['threshold_pct']:
+            if coverage_legacy_mode:
                 warnings.append(
-                    f"Integrity warning: {margin_pct}% of scored XGBoost rows have inconsistent actual_margin sign"
-                )
-            if line_lock_pct >= integrity['totals_line_lock']['threshold_pct']:
-                warnings.append(
-                    f"Integrity warning: {line_lock_pct}% of rows have predicted total locked to vegas_total"
+                    "Coverage note: coverage contract includes legacy fallback scoring for one or more seasons."
                 )
 
-        overall = {
-            'total_games': primary_summary.get('scored_games', 0),
-            'correct_predictions': primary_summary.get('correct_predictions', 0),
-            'win_accuracy': round(_float(primary_summary.get('win_accuracy')), 2),
-            'avg_margin_error': round(_float(primary_summary.get('avg_margin_error')), 2),
-            'avg_home_score_error': None,
-            'avg_away_score_error': None,
-            'first_week': primary_summary.get('first_week'),
-            'latest_week': primary_summary.get('latest_week'),
-            'model': primary_model
-        }
-
-        cur.close()
-        conn.close()
+        payload['integrity'] = _empty_integrity()
+        if include_integrity:
+            payload['integrity'], integrity_warnings = _performance_integrity(conn, season, week)
+            warnings.extend(integrity_warnings)
 
-        return jsonify({
-            'success': True,
-            'season': season,
-            'week': week,
-            'completed_games': completed_games,
-            'overall': overall,
-            'by_week': by_week,
-            'by_week_models': by_week_models,
-            'model_breakdown': model_breakdown,
-            'season_trend': season_trend,
-            'coverage_contract': coverage_contract,
-            'elo_table_ready': elo_table_ready,
-            'integrity': integrity,
-            'warnings': warnings
-        })
+        return jsonify(payload)
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        if conn:
+            conn.close()
 
 
 @ml_api.route('/api/ml/available-weeks', methods=['GET'])
+@conditional_get(COMBINED_TABLES, max_age=60, salt=_prediction_etag_salt, season_arg=None)
+@cached_response(COMBINED_TABLES, salt=_prediction_etag_salt)
 def get_available_weeks():
     """
     Get list of all weeks with predictions available
@@ -3970,7 +3128,7 @@ def get_available_weeks():
     Returns weeks from both XGBoost and Elo predictions
     """
     try:
-        conn = psycopg2.connect(**get_predictor().db_config)
+        conn = get_db_connection()
         elo_table_ready = table_exists(conn, 'hcl', 'ml_predictions_elo')
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
@@ -4067,10 +3225,9 @@ def get_current_elo_ratings():
             })
         
         # Load metadata from file
-        ratings_file = 'ml/models/elo_ratings_current.json'
         last_updated = None
-        if os.path.exists(ratings_file):
-            with open(ratings_file, 'r') as f:
+        if os.path.exists(ELO_RATINGS_FILE):
+            with open(ELO_RATINGS_FILE, 'r') as f:
                 data = json.load(f)
                 last_updated = data.get('last_updated')
         
@@ -4126,34 +3283,15 @@ def predict_week_elo(season, week):
             if len(games_df) == 0:
                 return []
 
-            predictions = []
-            for _, game in games_df.iterrows():
-                spread_line = game['spread_line']
-                if spread_line is not None and spread_line != spread_line:  # NaN check
-                    spread_line = None
-
-                pred = elo_pred.predict_game(
-                    game['home_team'],
-                    game['away_team'],
-                    spread_line=spread_line,
-                    is_neutral=False
-                )
-                pred['game_id'] = game['game_id']
+            predictions = elo_pred.predict_games(games_df).to_dict('records')
+            for pred in predictions:
                 pred['season'] = season
                 pred['week'] = week
-                pred['game_date'] = game['game_date']
-                predictions.append(pred)
 
             return predictions
 
         # Check if predictions already exist in database
-        conn = psycopg2.connect(
-            dbname=os.getenv('DB_NAME', 'nfl_analytics'),
-            user=os.getenv('DB_USER', 'postgres'),
-            password=os.getenv('DB_PASSWORD'),
-            host=os.getenv('DB_HOST', 'localhost'),
-            port=os.getenv('DB_PORT', '5432')
-        )
+        conn = get_db_connection()
 
         elo_table_ready = table_exists(conn, 'hcl', 'ml_predictions_elo')
 
@@ -4298,6 +3436,8 @@ def predict_week_elo(season, week):
 
 
 @ml_api.route('/api/predictions/combined/<int:season>/<int:week>', methods=['GET'])
+@conditional_get(COMBINED_TABLES, max_age=60, salt=_prediction_etag_salt)
+@cached_response(COMBINED_TABLES, salt=_prediction_etag_salt)
 def get_combined_predictions(season, week):
     """
     Get both XGBoost and Elo predictions side-by-side
@@ -4307,13 +3447,7 @@ def get_combined_predictions(season, week):
     Returns both prediction types with comparison
     """
     try:
-        conn = psycopg2.connect(
-            dbname=os.getenv('DB_NAME', 'nfl_analytics'),
-            user=os.getenv('DB_USER', 'postgres'),
-            password=os.getenv('DB_PASSWORD'),
-            host=os.getenv('DB_HOST', 'localhost'),
-            port=os.getenv('DB_PORT', '5432')
-        )
+        conn = get_db_connection()
 
         elo_table_ready = table_exists(conn, 'hcl', 'ml_predictions_elo')
         
@@ -4373,6 +3507,11 @@ def get_combined_predictions(season, week):
             )
         )
 
+        # Rows generated at request time depend on the serving models and may be
+        # partial if generation fails, so those responses are never cached.
+        if xgb_needs_refresh or elo_needs_refresh:
+            skip_caching()
+
         if xgb_needs_refresh:
             try:
                 with contextlib.redirect_stdout(io.StringIO()):
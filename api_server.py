@@ -5,7 +5,6 @@ Serves both API endpoints and production React build
 """
 from flask import Flask, jsonify, send_from_directory, request, redirect
 from flask_cors import CORS
-import psycopg2
 import sys
 import os
 import logging
@@ -31,12 +30,23 @@ except ImportError:
     register_dashboard_routes = None
     logger.warning("dashboard_api not found")
 
+from db_pool import get_db_connection, get_pool_stats
+from response_cache import get_response_cache_stats
+from scoreboard_feed import scoreboard_feed
 from api_routes_hcl import hcl_bp
 try:
-    from api_routes_ml import ml_api
+    from api_routes_ml import ml_api, preload_models
 except Exception as e:
     ml_api = None
     logger.warning(f"ML routes not loaded: {e}")
+
+# Load model artifacts at import: with `gunicorn --preload` this runs once in the
+# master and forked workers share the loaded models instead of loading on first request.
+if ml_api and os.getenv('MODEL_PRELOAD', '1') != '0':
+    try:
+        logger.info(f"Preloaded models: {preload_models()}")
+    except Exception as e:
+        logger.warning(f"Model preload failed; models will load on first request: {e}")
 from api_routes_live_scores import live_scores_api
 
 try:
@@ -161,25 +171,6 @@ def add_transport_security_headers(response):
 
     return response
 
-# Database configuration
-DB_CONFIG = {
-    'dbname': os.getenv('DB_NAME', 'nfl_analytics'),
-    'user': os.getenv('DB_USER', 'postgres'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'port': os.getenv('DB_PORT', '5432')
-}
-
-def get_db_connection():
-    """Create and return a database connection"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise
-
-
 def get_latest_completed_season(cursor):
     """Return latest season with completed games; fallback to current year."""
     try:
@@ -263,16 +254,27 @@ def health():
         return jsonify({
             "status": "healthy",
             "database": "connected",
-            "cors": "enabled"
+            "cors": "enabled",
+            "db_pool": get_pool_stats(),
+            "response_cache": get_response_cache_stats(),
+            "scoreboard_feed": scoreboard_feed.stats()
         })
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({
             "status": "unhealthy",
             "database": "disconnected",
-            "error": str(e)
+            "error": str(e),
+            "db_pool": get_pool_stats()
         }), 500
 
+
+@app.route('/health/db-pool')
+@limiter.exempt
+def health_db_pool():
+    """Per-worker connection pool metrics (checkouts, wait times, in-use/idle counts)"""
+    return jsonify(get_pool_stats())
+
 @app.route('/api/teams')
 def get_teams():
     """Get all NFL teams from database"""
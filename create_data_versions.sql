@@ -0,0 +1,45 @@
+-- Per-table data versions for response_cache.py (response cache keys and ETags)
+-- Statement-level triggers bump a table's counter in the same transaction as the write.
+-- Run once per database (psql -f create_data_versions.sql); the API only checks that it is installed
+-- and serves uncached responses until it is.
+
+CREATE TABLE IF NOT EXISTS hcl.data_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION hcl.bump_data_version()
+RETURNS trigger AS $$
+BEGIN
+    INSERT INTO hcl.data_versions AS v (table_name, version, updated_at)
+    VALUES (TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME, 1, NOW())
+    ON CONFLICT (table_name) DO UPDATE SET version = v.version + 1, updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keep this list in sync with response_cache.VERSIONED_TABLES; tables that don't exist yet are skipped
+-- (ml/model_performance.py adds the trigger when it creates hcl.model_performance_weekly later).
+DO $$
+DECLARE
+    tracked TEXT;
+BEGIN
+    FOREACH tracked IN ARRAY ARRAY[
+        'hcl.games', 'hcl.team_game_stats', 'hcl.ml_predictions', 'hcl.ml_predictions_elo', 'public.teams',
+        'hcl.model_performance_weekly'
+    ]
+    LOOP
+        IF to_regclass(tracked) IS NOT NULL THEN
+            EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', 'trg_' || split_part(tracked, '.', 2) || '_data_version', tracked);
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s '
+                'FOR EACH STATEMENT EXECUTE FUNCTION hcl.bump_data_version()',
+                'trg_' || split_part(tracked, '.', 2) || '_data_version', tracked
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
+
+COMMENT ON TABLE hcl.data_versions IS 'Write counters per table; response_cache.py keys cached API responses on them';
@@ -0,0 +1,18 @@
+-- Line-change history for Vegas lines scraped by scrape_vegas_lines.py
+-- A row is written only when a game's spread or total actually changes
+
+CREATE TABLE IF NOT EXISTS hcl.vegas_line_history (
+    history_id SERIAL PRIMARY KEY,
+    game_id TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    old_spread_line DOUBLE PRECISION,
+    new_spread_line DOUBLE PRECISION,
+    old_total_line DOUBLE PRECISION,
+    new_total_line DOUBLE PRECISION,
+    recorded_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_vegas_line_history_game ON hcl.vegas_line_history(game_id, recorded_at);
+
+COMMENT ON TABLE hcl.vegas_line_history IS 'Spread/total movements seen by the ESPN odds scraper (old and new values per change)';
@@ -7,7 +7,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Database connection settings
+# Database connection settings. Scripts connect with psycopg2.connect(**DATABASE_CONFIG);
+# the API process checks connections out of the shared pool (get_pooled_connection).
 DATABASE_CONFIG = {
     'dbname': os.getenv('DB_NAME', 'postgres'),
     'user': os.getenv('DB_USER', 'postgres'),
@@ -25,3 +26,9 @@ def get_connection_string():
         return DATABASE_URL
     
     return f"postgresql://{DATABASE_CONFIG['user']}:{DATABASE_CONFIG['password']}@{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['dbname']}"
+
+
+def get_pooled_connection():
+    """Check out a connection from the shared per-process pool (see db_pool.py)"""
+    from db_pool import get_db_connection
+    return get_db_connection()
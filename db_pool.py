@@ -0,0 +1,351 @@
+"""
+Shared PostgreSQL connection pool for the Flask API.
+
+One ThreadedConnectionPool is owned per process (gunicorn workers each get
+their own after fork). Connections are health-checked on checkout, carry a
+server-side statement_timeout, and are returned to the pool on close().
+
+Environment:
+    DB_NAME / DB_USER / DB_PASSWORD / DB_HOST / DB_PORT
+    DB_POOL_MIN                  warm connections kept open between requests (default 2)
+    DB_POOL_MAX                  maximum open connections (default 10)
+    DB_POOL_TIMEOUT              seconds to wait for a free connection (default 10)
+    DB_POOL_HEALTHCHECK_SECONDS  idle time before a checkout ping (default 30)
+    DB_STATEMENT_TIMEOUT_MS      per-statement timeout, 0 disables (default 30000)
+"""
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions, pool
+from psycopg2.extras import RealDictCursor
+
+from db_config import DATABASE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return int(default)
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+# API processes default to the production database rather than db_config's 'postgres'.
+DB_CONFIG = {**DATABASE_CONFIG, 'dbname': os.getenv('DB_NAME', 'nfl_analytics')}
+
+POOL_MIN_SIZE = max(0, _env_int('DB_POOL_MIN', 2))
+POOL_MAX_SIZE = max(1, _env_int('DB_POOL_MAX', 10), POOL_MIN_SIZE)
+POOL_TIMEOUT_SECONDS = max(0.0, _env_float('DB_POOL_TIMEOUT', 10))
+HEALTHCHECK_IDLE_SECONDS = max(0.0, _env_float('DB_POOL_HEALTHCHECK_SECONDS', 30))
+STATEMENT_TIMEOUT_MS = max(0, _env_int('DB_STATEMENT_TIMEOUT_MS', 30000))
+
+
+class PoolTimeoutError(pool.PoolError):
+    """Raised when no pooled connection frees up within DB_POOL_TIMEOUT."""
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled psycopg2 connection.
+
+    Behaves like the raw connection (cursor/commit/rollback/...), except
+    close() hands the connection back to the pool instead of closing the socket.
+    Existing route code that calls conn.close() therefore keeps working.
+    """
+
+    def __init__(self, owner, raw_conn):
+        self._owner = owner
+        self._conn = raw_conn
+
+    @property
+    def raw(self):
+        return self._conn
+
+    @property
+    def closed(self):
+        return 1 if self._conn is None else self._conn.closed
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get('_conn')
+        if conn is None:
+            raise psycopg2.InterfaceError('connection already returned to pool')
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Mirror psycopg2 semantics: the with-block scopes a transaction.
+        if self._conn is None:
+            return False
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        return False
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._owner.release(conn)
+
+    def __del__(self):
+        # Safety net for code paths that never call close() (e.g. early exceptions).
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, health-checked pool with checkout wait metrics."""
+
+    def __init__(self, minconn=POOL_MIN_SIZE, maxconn=POOL_MAX_SIZE, db_config=None,
+                 timeout=POOL_TIMEOUT_SECONDS, statement_timeout_ms=STATEMENT_TIMEOUT_MS,
+                 healthcheck_idle_seconds=HEALTHCHECK_IDLE_SECONDS):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self.healthcheck_idle_seconds = healthcheck_idle_seconds
+        self.pid = os.getpid()
+
+        connect_kwargs = dict(db_config or DB_CONFIG)
+        if statement_timeout_ms:
+            connect_kwargs['options'] = f"-c statement_timeout={int(statement_timeout_ms)}"
+
+        self._pool = pool.ThreadedConnectionPool(minconn, maxconn, **connect_kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._stats = {
+            'checkouts': 0,
+            'checkout_failures': 0,
+            'timeouts': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+            'discarded': 0,
+            'healthcheck_pings': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'total_checkout_ms': 0.0,
+            'max_checkout_ms': 0.0,
+        }
+        self._checked_out_at = {}
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or (time.monotonic() - last_used) < self.healthcheck_idle_seconds:
+            # Freshly opened or recently used connections skip the ping round trip.
+            return True
+
+        with self._lock:
+            self._stats['healthcheck_pings'] += 1
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.fetchone()
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        self._last_used.pop(id(conn), None)
+        with self._lock:
+            self._stats['discarded'] += 1
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            pass
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds for a free slot."""
+        wait_start = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolTimeoutError(
+                f'No database connection available within {self.timeout}s (pool max={self.maxconn})'
+            )
+        wait_ms = (time.monotonic() - wait_start) * 1000.0
+
+        try:
+            # A stale connection is replaced at most a couple of times before giving up.
+            for _ in range(3):
+                conn = self._pool.getconn()
+                if self._is_healthy(conn):
+                    break
+                logger.warning('Discarding unhealthy pooled database connection')
+                self._discard(conn)
+            else:
+                raise psycopg2.OperationalError('Unable to obtain a healthy database connection')
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._stats['checkout_failures'] += 1
+            raise
+
+        now = time.monotonic()
+        with self._lock:
+            self._checked_out_at[id(conn)] = now
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+            self._stats['total_wait_ms'] += wait_ms
+            self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], wait_ms)
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a raw connection to the pool, rolling back any open transaction."""
+        now = time.monotonic()
+        with self._lock:
+            started = self._checked_out_at.pop(id(conn), None)
+            self._stats['in_use'] = max(0, self._stats['in_use'] - 1)
+            if started is not None:
+                held_ms = (now - started) * 1000.0
+                self._stats['total_checkout_ms'] += held_ms
+                self._stats['max_checkout_ms'] = max(self._stats['max_checkout_ms'], held_ms)
+
+        try:
+            if conn.closed:
+                self._discard(conn)
+                return
+
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+                return
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except Exception:
+                    self._discard(conn)
+                    return
+
+            self._last_used[id(conn)] = now
+            # ThreadedConnectionPool closes anything beyond minconn on return.
+            self._pool.putconn(conn)
+            if conn.closed:
+                self._last_used.pop(id(conn), None)
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        """Return a snapshot of checkout/wait counters for monitoring."""
+        with self._lock:
+            snapshot = dict(self._stats)
+        checkouts = snapshot['checkouts']
+        snapshot['avg_wait_ms'] = round(snapshot['total_wait_ms'] / checkouts, 3) if checkouts else 0.0
+        snapshot['avg_checkout_ms'] = round(snapshot['total_checkout_ms'] / checkouts, 3) if checkouts else 0.0
+        for key in ('total_wait_ms', 'max_wait_ms', 'total_checkout_ms', 'max_checkout_ms'):
+            snapshot[key] = round(snapshot[key], 3)
+        snapshot.update({
+            'pid': self.pid,
+            'min_size': self.minconn,
+            'max_size': self.maxconn,
+            'idle': len(getattr(self._pool, '_pool', [])),
+            'timeout_seconds': self.timeout,
+            'statement_timeout_ms': self.statement_timeout_ms,
+        })
+        return snapshot
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return this process's pool, creating it lazily (and again after a fork)."""
+    global _pool
+    current = _pool
+    if current is not None and current.pid == os.getpid():
+        return current
+
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            # Sockets inherited from a parent process must not be reused; just drop them.
+            _pool = ConnectionPool()
+            logger.info(
+                f"Database pool ready (pid={_pool.pid}, min={_pool.minconn}, max={_pool.maxconn})"
+            )
+        return _pool
+
+
+def get_db_connection():
+    """Check out a pooled connection. Call close() to return it to the pool."""
+    return get_pool().getconn()
+
+
+@contextmanager
+def db_connection():
+    """
+    Context manager yielding a pooled connection.
+
+    Commits on success, rolls back on error, and always returns the connection.
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+@contextmanager
+def db_cursor(cursor_factory=RealDictCursor):
+    """Context manager yielding a cursor on a pooled connection (RealDictCursor by default)."""
+    with db_connection() as conn:
+        cur = conn.cursor(cursor_factory=cursor_factory)
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+
+def get_pool_stats():
+    """Return pool metrics, or an idle placeholder when no pool exists yet in this process."""
+    current = _pool
+    if current is None or current.pid != os.getpid():
+        return {
+            'pid': os.getpid(),
+            'initialized': False,
+            'min_size': POOL_MIN_SIZE,
+            'max_size': POOL_MAX_SIZE,
+        }
+    snapshot = current.stats()
+    snapshot['initialized'] = True
+    return snapshot
+
+
+def close_pool():
+    """Close every connection owned by this process's pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid == os.getpid():
+            _pool.closeall()
+        _pool = None
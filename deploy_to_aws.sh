@@ -75,7 +75,7 @@ Environment="DB_USER=nfl_user"
 Environment="DB_PASSWORD=${DB_PASSWORD}"
 Environment="DB_HOST=localhost"
 Environment="DB_PORT=5432"
-ExecStart=/home/ubuntu/H.C.-Lombardo-App/venv/bin/gunicorn --bind 0.0.0.0:5000 --workers 2 --timeout 120 api_server:app
+ExecStart=/home/ubuntu/H.C.-Lombardo-App/venv/bin/gunicorn --preload --bind 0.0.0.0:5000 --workers 2 --worker-class gthread --threads 16 --timeout 120 api_server:app
 Restart=always
 
 [Install]
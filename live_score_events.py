@@ -0,0 +1,263 @@
+"""
+Server-Sent Events for /api/live-scores/stream.
+
+One broadcaster thread per worker diffs successive scoreboard snapshots (built
+by the same code as /api/live-scores) and appends the resulting events to a
+bounded in-memory log. Subscribers only wait on a Condition and format new log
+entries, so the diff work does not grow with the number of clients; under
+gevent workers each subscriber is a greenlet rather than a thread.
+
+Events:
+    snapshot    full games list + week_info (first event, new week, or lost history)
+    score       home/away score changed
+    status      scheduled -> in_progress -> halftime -> final
+    clock       period/clock moved
+    prediction  AI/Elo/Vegas prediction fields changed
+    result      ai_correct, elo_correct, vegas_covered, ... resolved or changed
+
+Event ids are "<epoch>-<seq>", the epoch naming one worker's log. A client that
+reconnects with a Last-Event-ID from the same log gets exactly the events it
+missed; otherwise (another worker, a restart, an id older than the log) it gets
+a fresh snapshot. Streams end after LIVE_STREAM_MAX_SECONDS so gthread
+threads are released before the gunicorn timeout; EventSource reconnects and
+resumes on its own. The route refuses plain sync workers (see start.sh).
+
+Each gthread subscriber holds a worker thread, so a worker serves at most
+LIVE_STREAM_MAX_SUBSCRIBERS streams at once; stream() returns None above the
+cap and the route answers 503 with Retry-After, leaving the remaining threads
+for the rest of the API.
+
+Environment:
+    LIVE_STREAM_MAX_SECONDS        stream lifetime before the client reconnects (default 60)
+    LIVE_STREAM_HEARTBEAT_SECONDS  keepalive comment interval (default 15)
+    LIVE_STREAM_BUFFER_EVENTS      events kept for Last-Event-ID resume (default 1000)
+    LIVE_STREAM_MAX_SUBSCRIBERS    concurrent streams per worker, 0 = unlimited (default 8)
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STREAM_MAX_SECONDS = float(os.getenv('LIVE_STREAM_MAX_SECONDS', '60'))
+HEARTBEAT_SECONDS = float(os.getenv('LIVE_STREAM_HEARTBEAT_SECONDS', '15'))
+BUFFER_EVENTS = int(os.getenv('LIVE_STREAM_BUFFER_EVENTS', '1000'))
+MAX_SUBSCRIBERS = int(os.getenv('LIVE_STREAM_MAX_SUBSCRIBERS', '8'))
+# EventSource reconnect delay sent to clients.
+RETRY_MS = 2000
+
+SCORE_FIELDS = ('home_score', 'away_score')
+CLOCK_FIELDS = ('period', 'clock')
+PREDICTION_FIELDS = ('ai_prediction', 'ai_spread', 'elo_prediction', 'elo_spread', 'vegas_spread', 'vegas_total')
+RESULT_FIELDS = ('ai_correct', 'elo_correct', 'vegas_covered', 'ai_spread_covered', 'elo_spread_covered')
+
+
+def _changed(previous, current, fields):
+    return any(previous.get(field) != current.get(field) for field in fields)
+
+
+def diff_games(previous, current):
+    """
+    Events turning `previous` into `current` (both {game_id: game dict} with the
+    same game_ids). Returns [(event_type, payload)].
+    """
+    events = []
+    for game_id, game in current.items():
+        before = previous[game_id]
+        base = {'game_id': game_id, 'home_team': game['home_team'], 'away_team': game['away_team']}
+        if _changed(before, game, SCORE_FIELDS):
+            events.append(('score', {**base, **{f: game.get(f) for f in SCORE_FIELDS + ('status',) + CLOCK_FIELDS}}))
+        if before.get('status') != game.get('status'):
+            events.append(('status', {**base, 'status': game.get('status'), 'previous_status': before.get('status'),
+                                      **{f: game.get(f) for f in CLOCK_FIELDS}}))
+        elif not _changed(before, game, SCORE_FIELDS) and _changed(before, game, CLOCK_FIELDS):
+            events.append(('clock', {**base, **{f: game.get(f) for f in CLOCK_FIELDS}}))
+        if _changed(before, game, PREDICTION_FIELDS):
+            events.append(('prediction', {**base, **{f: game.get(f) for f in PREDICTION_FIELDS}}))
+        if _changed(before, game, RESULT_FIELDS):
+            events.append(('result', {**base, **{f: game.get(f) for f in RESULT_FIELDS + SCORE_FIELDS}}))
+    return events
+
+
+def format_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+class LiveScoreBroadcaster:
+    """Per-worker event log fed by diffing scoreboard snapshots."""
+
+    def __init__(self, feed, build_games, buffer_events=BUFFER_EVENTS, max_subscribers=MAX_SUBSCRIBERS):
+        """
+        feed: ScoreboardFeed-like object (get, snapshot, ttl, wait_for_version)
+        build_games: ESPN payload -> (games, week_info), as served by /api/live-scores
+        max_subscribers: concurrent streams allowed (0 = unlimited)
+        """
+        self.feed = feed
+        self.build_games = build_games
+        self.max_subscribers = max_subscribers
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=buffer_events)  # (seq, event_type, json data)
+        self._seq = 0
+        self._state = None
+        self._epoch = None
+        self._subscribers = 0
+        self._running_pid = None
+
+    def _reset(self):
+        """Start a fresh log; a forked worker must not reuse its parent's epoch or history."""
+        self._epoch = f"{os.getpid():x}{int(time.time()):x}"
+        self._events.clear()
+        self._seq = 0
+        self._state = None
+
+    def _subscribe(self):
+        """Take a subscriber slot; False when the worker is already at max_subscribers."""
+        with self._cond:
+            if self.max_subscribers and self._subscribers >= self.max_subscribers:
+                return False
+            self._subscribers += 1
+            if self._running_pid == os.getpid():
+                return True
+            if self._epoch is None or not self._epoch.startswith(f"{os.getpid():x}"):
+                self._reset()
+            self._running_pid = os.getpid()
+        threading.Thread(target=self._run, name='live-score-broadcaster', daemon=True).start()
+        return True
+
+    def _unsubscribe(self):
+        with self._cond:
+            self._subscribers -= 1
+
+    def _run(self):
+        version = None
+        while True:
+            with self._cond:
+                if self._subscribers <= 0:
+                    self._running_pid = None
+                    return
+            try:
+                # get() revalidates a stale snapshot; snapshot() pairs data with its version
+                self.feed.get()
+                data, current_version, _ = self.feed.snapshot()
+                if data is not None and current_version != version:
+                    games, week_info = self.build_games(data)
+                    self.publish(games, week_info)
+                    version = current_version
+            except Exception as e:
+                logger.warning(f"Live score broadcaster update failed: {e}")
+            # Failed builds are retried on the next wake-up rather than spinning
+            _, seen_version, _ = self.feed.snapshot()
+            ttl = self.feed.ttl() or HEARTBEAT_SECONDS
+            self.feed.wait_for_version(seen_version, timeout=max(1.0, min(ttl, HEARTBEAT_SECONDS)))
+
+    def publish(self, games, week_info):
+        """Diff `games` against the last snapshot and append the events to the log."""
+        current = {game['game_id']: game for game in games}
+        with self._cond:
+            if self._epoch is None:
+                self._reset()
+            previous = self._state
+            self._state = {
+                'games': games,
+                'by_id': current,
+                'week_info': week_info,
+                'timestamp': datetime.now().isoformat(),
+            }
+            if previous is None or previous['week_info'] != week_info or set(previous['by_id']) != set(current):
+                events = [('snapshot', self._snapshot_payload())]
+            else:
+                events = diff_games(previous['by_id'], current)
+            for event_type, payload in events:
+                self._seq += 1
+                self._events.append((self._seq, event_type, json.dumps(payload)))
+            if events:
+                self._cond.notify_all()
+            return len(events)
+
+    def _snapshot_payload(self):
+        state = self._state
+        return {
+            'games': state['games'],
+            'week_info': state['week_info'],
+            'total_games': len(state['games']),
+            'timestamp': state['timestamp'],
+        }
+
+    def _resume_seq(self, last_event_id):
+        """Sequence number to resume after, or None when the id can't be replayed from this log."""
+        if not last_event_id:
+            return None
+        epoch, _, seq = str(last_event_id).partition('-')
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
+
+    def _pending(self, cursor):
+        """Formatted events after `cursor` (or a snapshot) and the new cursor; caller holds the lock."""
+        if cursor is None or (self._events and self._events[0][0] > cursor + 1):
+            if self._state is None:
+                return [], cursor
+            data = json.dumps(self._snapshot_payload())
+            return [format_event(f"{self._epoch}-{self._seq}", 'snapshot', data)], self._seq
+        chunks = [
+            format_event(f"{self._epoch}-{seq}", event_type, data)
+            for seq, event_type, data in self._events
+            if seq > cursor
+        ]
+        return chunks, self._seq
+
+    def stream(self, last_event_id=None, max_seconds=STREAM_MAX_SECONDS, heartbeat_seconds=HEARTBEAT_SECONDS):
+        """
+        Generator of SSE text for one subscriber, or None when the worker is at
+        max_subscribers. The slot is taken here, before the response starts, and
+        released when the generator finishes or is closed.
+        """
+        events = self._stream(last_event_id, max_seconds, heartbeat_seconds)
+        # Run up to the first yield so close() reaches the finally even if never iterated
+        if not next(events):
+            return None
+        return events
+
+    def _stream(self, last_event_id, max_seconds, heartbeat_seconds):
+        if not self._subscribe():
+            yield False
+            return
+        try:
+            yield True
+            yield f"retry: {RETRY_MS}\n\n"
+            with self._cond:
+                cursor = self._resume_seq(last_event_id)
+            deadline = time.monotonic() + max_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._state is not None and (cursor is None or self._seq > cursor),
+                        timeout=min(heartbeat_seconds, remaining),
+                    )
+                    chunks, cursor = self._pending(cursor)
+                if chunks:
+                    yield ''.join(chunks)
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            self._unsubscribe()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'subscribers': self._subscribers,
+                'max_subscribers': self.max_subscribers,
+                'last_event_id': f"{self._epoch}-{self._seq}" if self._epoch else None,
+                'buffered_events': len(self._events),
+            }
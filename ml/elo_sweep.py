@@ -0,0 +1,295 @@
+"""
+Elo Hyperparameter Sweep
+
+Replays the completed-game history under many (k_factor, home_advantage,
+mean_reversion) combinations and ranks them by pre-game log-loss. Games are
+read from hcl.games once and handed to each worker process a single time via
+the pool initializer, so a task only carries its three parameters.
+
+Metrics use the ratings each game was played with, for seasons >= --eval-start
+(earlier seasons only warm the ratings up):
+    log_loss      home-win probability vs outcome (ties count as 0.5)
+    accuracy_pct  Elo favourite won (ties count as misses, like update-results)
+    spread_mae    |Elo spread - home margin|, spread = Elo differential / 25
+
+Usage:
+    python ml/elo_sweep.py                           # Default grid (~2,300 combinations)
+    python ml/elo_sweep.py --k 15:30:1 --home-advantage 40:80:5 --mean-reversion 0.2:0.5:0.05
+    python ml/elo_sweep.py --random 2000 --seed 7    # Random search inside the same ranges
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from elo_ratings import EloRatingSystem
+from elo_tracker import EloTracker
+
+load_dotenv()
+
+DEFAULT_OUT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs', 'sprints', 'elo_sweep'
+)
+
+# Same constants as EloRatingSystem.update_ratings / predict_spread
+PLAYOFF_K_MULTIPLIER = 1.25
+SPREAD_DIVISOR = 25.0
+LOG_LOSS_EPSILON = 1e-15
+
+PARAM_NAMES = ('k_factor', 'home_advantage', 'mean_reversion')
+
+_games = None  # Game arrays for this worker process, set once by _init_worker
+
+
+def load_games(start_season: int, end_season: int) -> dict:
+    """Completed games as flat arrays with integer team codes"""
+    df = EloTracker().load_historical_games(start_season=start_season, end_season=end_season)
+
+    home_teams = df['home_team'].str.upper()
+    away_teams = df['away_team'].str.upper()
+    team_index = pd.Index(sorted(set(home_teams) | set(away_teams)))
+
+    seasons = df['season'].to_numpy(dtype=np.int64)
+    new_season = np.zeros(len(df), dtype=bool)
+    new_season[1:] = seasons[1:] != seasons[:-1]
+
+    home_scores = df['home_score'].astype(int).to_numpy()
+    away_scores = df['away_score'].astype(int).to_numpy()
+
+    return {
+        'home_idx': team_index.get_indexer(home_teams),
+        'away_idx': team_index.get_indexer(away_teams),
+        'season': seasons,
+        'new_season': new_season,
+        'is_playoff': (pd.to_numeric(df['week'], errors='coerce').fillna(0) > 18).to_numpy(),
+        'actual_home': np.where(home_scores > away_scores, 1.0,
+                                np.where(home_scores < away_scores, 0.0, 0.5)),
+        'margin': (home_scores - away_scores).astype(np.float64),
+        'n_teams': len(team_index),
+    }
+
+
+def _init_worker(games: dict):
+    global _games
+    _games = dict(games)
+    # Plain lists make the per-game loop several times faster than numpy scalar indexing
+    for key in ('home_idx', 'away_idx', 'new_season', 'is_playoff', 'actual_home'):
+        _games[f'{key}_list'] = games[key].tolist()
+
+
+def replay(games: dict, k_factor: float, home_advantage: float, mean_reversion: float,
+           base_elo: float = 1500.0):
+    """
+    Pre-game home win probability and Elo differential for every game
+
+    Every team starts at base_elo (as after EloTracker.initialize_all_teams) and
+    all ratings regress toward it at each season boundary.
+    """
+    n_games = len(games['season'])
+    ratings = [float(base_elo)] * games['n_teams']
+    home_prob = np.empty(n_games)
+    elo_diff = np.empty(n_games)
+
+    keep = 1.0 - mean_reversion
+    pull = base_elo * mean_reversion
+    playoff_k = k_factor * PLAYOFF_K_MULTIPLIER
+
+    rows = zip(games['home_idx_list'], games['away_idx_list'], games['new_season_list'],
+               games['is_playoff_list'], games['actual_home_list'])
+    for i, (h, a, new_season, is_playoff, actual_home) in enumerate(rows):
+        if new_season:
+            ratings = [r * keep + pull for r in ratings]
+
+        home_rating = ratings[h]
+        away_rating = ratings[a]
+        home_adj = home_rating + home_advantage
+        expected_home = 1.0 / (1.0 + math.pow(10, (away_rating - home_adj) / 400.0))
+        k = playoff_k if is_playoff else k_factor
+
+        ratings[h] = home_rating + k * (actual_home - expected_home)
+        ratings[a] = away_rating + k * ((1.0 - actual_home) - (1.0 - expected_home))
+
+        home_prob[i] = expected_home
+        elo_diff[i] = home_adj - away_rating
+
+    return home_prob, elo_diff
+
+
+def score(games: dict, home_prob: np.ndarray, elo_diff: np.ndarray, eval_start: int) -> dict:
+    """Overall and per-season metrics for the games in seasons >= eval_start"""
+    mask = games['season'] >= eval_start
+    p = np.clip(home_prob[mask], LOG_LOSS_EPSILON, 1.0 - LOG_LOSS_EPSILON)
+    y = games['actual_home'][mask]
+    seasons = games['season'][mask]
+
+    log_loss = -(y * np.log(p) + (1.0 - y) * np.log(1.0 - p))
+    correct = ((p > 0.5) & (y == 1.0)) | ((p <= 0.5) & (y == 0.0))
+    abs_error = np.abs(elo_diff[mask] / SPREAD_DIVISOR - games['margin'][mask])
+
+    def summarize(select):
+        count = int(select.sum()) if select is not None else len(p)
+        if count == 0:
+            return {'games': 0, 'log_loss': None, 'accuracy_pct': None, 'spread_mae': None}
+        ll = log_loss if select is None else log_loss[select]
+        hit = correct if select is None else correct[select]
+        err = abs_error if select is None else abs_error[select]
+        return {
+            'games': count,
+            'log_loss': round(float(ll.mean()), 5),
+            'accuracy_pct': round(float(hit.mean()) * 100, 2),
+            'spread_mae': round(float(err.mean()), 3),
+        }
+
+    result = summarize(None)
+    result['seasons'] = {int(season): summarize(seasons == season) for season in np.unique(seasons)}
+    return result
+
+
+def _evaluate(task):
+    params, eval_start = task
+    home_prob, elo_diff = replay(_games, **params)
+    return {**params, **score(_games, home_prob, elo_diff, eval_start)}
+
+
+def _parse_spec(spec: str):
+    """'lo:hi:step' (inclusive range) or 'a,b,c' -> (values, (lo, hi) or None)"""
+    if ':' in spec:
+        lo, hi, step = (float(part) for part in spec.split(':'))
+        count = int(math.floor((hi - lo) / step + 1e-9)) + 1
+        return [round(lo + i * step, 6) for i in range(count)], (lo, hi)
+    return [float(part) for part in spec.split(',') if part.strip()], None
+
+
+def build_combinations(specs: dict, n_random: int = 0, seed: int = None) -> list:
+    """Full grid, or n_random draws (uniform over ranges, choice over lists)"""
+    parsed = {name: _parse_spec(spec) for name, spec in specs.items()}
+    if not n_random:
+        grids = [parsed[name][0] for name in PARAM_NAMES]
+        return [dict(zip(PARAM_NAMES, values)) for values in itertools.product(*grids)]
+
+    rng = random.Random(seed)
+    combos = []
+    for _ in range(n_random):
+        combo = {}
+        for name in PARAM_NAMES:
+            values, bounds = parsed[name]
+            combo[name] = round(rng.uniform(*bounds), 4) if bounds else rng.choice(values)
+        combos.append(combo)
+    return combos
+
+
+def run_sweep(games: dict, combos: list, eval_start: int, workers: int = None) -> list:
+    """Evaluate every combination; returns results sorted by log-loss (best first)"""
+    tasks = [(combo, eval_start) for combo in combos]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_worker(games)
+        results = [_evaluate(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(games,)) as pool:
+            results = list(pool.map(_evaluate, tasks, chunksize=chunksize))
+
+    results.sort(key=lambda r: r['log_loss'] if r['log_loss'] is not None else math.inf)
+    for rank, result in enumerate(results, 1):
+        result['rank'] = rank
+    return results
+
+
+def write_artifacts(results: list, summary: dict, out_dir: str) -> dict:
+    """Ranked CSV, per-season CSV and JSON summary; returns their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    paths = {
+        'ranked': os.path.join(out_dir, f'elo_sweep_{stamp}_ranked.csv'),
+        'by_season': os.path.join(out_dir, f'elo_sweep_{stamp}_by_season.csv'),
+        'summary': os.path.join(out_dir, f'elo_sweep_{stamp}_summary.json'),
+    }
+
+    columns = ['rank', *PARAM_NAMES, 'games', 'log_loss', 'accuracy_pct', 'spread_mae']
+    pd.DataFrame([{c: r[c] for c in columns} for r in results]).to_csv(paths['ranked'], index=False)
+    pd.DataFrame([
+        {'rank': r['rank'], **{name: r[name] for name in PARAM_NAMES}, 'season': season, **metrics}
+        for r in results
+        for season, metrics in r['seasons'].items()
+    ]).to_csv(paths['by_season'], index=False)
+
+    with open(paths['summary'], 'w') as f:
+        json.dump({**summary, 'artifacts': paths}, f, indent=2)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Elo hyperparameter sweep')
+    parser.add_argument('--start-season', type=int, default=2002)
+    parser.add_argument('--end-season', type=int, default=datetime.now().year)
+    parser.add_argument('--eval-start', type=int,
+                        help='First season scored (default: two seasons after --start-season)')
+    parser.add_argument('--k', default='10:40:2', help="k_factor values: 'lo:hi:step' or 'a,b,c'")
+    parser.add_argument('--home-advantage', default='0:100:10', help='home_advantage values')
+    parser.add_argument('--mean-reversion', default='0:0.6:0.05', help='mean_reversion values')
+    parser.add_argument('--random', type=int, default=0,
+                        help='Sample this many combinations instead of the full grid')
+    parser.add_argument('--seed', type=int, help='Random search seed')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=10, help='Combinations to print and keep in the summary')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR)
+    args = parser.parse_args()
+
+    eval_start = args.eval_start if args.eval_start is not None else args.start_season + 2
+    games = load_games(args.start_season, args.end_season)
+    if not (games['season'] >= eval_start).any():
+        print(f"❌ No completed games to score from {eval_start} on")
+        return
+
+    combos = build_combinations(
+        {'k_factor': args.k, 'home_advantage': args.home_advantage, 'mean_reversion': args.mean_reversion},
+        n_random=args.random, seed=args.seed
+    )
+    defaults = EloRatingSystem()
+    baseline = {name: float(getattr(defaults, name)) for name in PARAM_NAMES}
+    if baseline not in combos:
+        combos.append(baseline)
+
+    print(f"\n🔍 Evaluating {len(combos)} parameter combinations on {len(games['season'])} games "
+          f"(scoring seasons {eval_start}+)...")
+    started = time.perf_counter()
+    results = run_sweep(games, combos, eval_start, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    baseline_result = next(r for r in results if all(r[name] == baseline[name] for name in PARAM_NAMES))
+    summary = {
+        'generated_at': datetime.now().isoformat(),
+        'seasons': [args.start_season, args.end_season],
+        'eval_start': eval_start,
+        'games': len(games['season']),
+        'combinations': len(results),
+        'search': 'random' if args.random else 'grid',
+        'elapsed_seconds': round(elapsed, 2),
+        'baseline': baseline_result,
+        'top': results[:args.top],
+    }
+    paths = write_artifacts(results, summary, args.out_dir)
+
+    print(f"✅ Finished in {elapsed:.1f}s")
+    print(f"\n{'Rank':<6} {'K':>6} {'HFA':>6} {'Revert':>7} {'LogLoss':>9} {'Acc%':>7} {'MAE':>7}")
+    for r in results[:args.top] + ([baseline_result] if baseline_result['rank'] > args.top else []):
+        print(f"{r['rank']:<6} {r['k_factor']:>6.1f} {r['home_advantage']:>6.1f} {r['mean_reversion']:>7.3f} "
+              f"{r['log_loss']:>9.5f} {r['accuracy_pct']:>7.2f} {r['spread_mae']:>7.3f}")
+    print(f"\n💾 Ranked results: {paths['ranked']}")
+    print(f"💾 Summary: {paths['summary']}")
+
+
+if __name__ == '__main__':
+    main()
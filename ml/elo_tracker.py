@@ -6,6 +6,7 @@ Builds a complete rating history for all teams.
 
 Usage:
     python ml/elo_tracker.py --rebuild     # Rebuild from historical data
+    python ml/elo_tracker.py --update      # Apply games completed since the last run
     python ml/elo_tracker.py --current     # Show current ratings
 
 Sprint 10: Elo System Implementation
@@ -13,8 +14,10 @@ Date: December 19, 2025
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import pandas as pd
 import numpy as np
+import math
 import os
 import json
 import argparse
@@ -25,6 +28,40 @@ from team_abbreviations import to_canonical_abbr
 
 load_dotenv()
 
+RATINGS_FILE = 'ml/models/elo_ratings_current.json'
+HISTORY_TABLE = 'hcl.elo_rating_history'
+
+HISTORY_COLUMNS = [
+    'game_id', 'season', 'week', 'game_date', 'home_team', 'away_team',
+    'home_elo_pre', 'away_elo_pre', 'home_elo_post', 'away_elo_post', 'is_playoff',
+]
+
+HISTORY_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+    game_id VARCHAR(50) PRIMARY KEY,
+    season INTEGER NOT NULL,
+    week INTEGER,
+    game_date DATE,
+    home_team VARCHAR(5) NOT NULL,
+    away_team VARCHAR(5) NOT NULL,
+    home_elo_pre DOUBLE PRECISION NOT NULL,
+    away_elo_pre DOUBLE PRECISION NOT NULL,
+    home_elo_post DOUBLE PRECISION NOT NULL,
+    away_elo_post DOUBLE PRECISION NOT NULL,
+    is_playoff BOOLEAN NOT NULL DEFAULT FALSE,
+    applied_at TIMESTAMP DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_elo_rating_history_home ON {HISTORY_TABLE} (home_team, game_date);
+CREATE INDEX IF NOT EXISTS idx_elo_rating_history_away ON {HISTORY_TABLE} (away_team, game_date);
+"""
+
+_UPDATE_LOCK_KEY = "hashtext('hcl.elo_rating_history')"
+
+COMPLETED_GAME_COLUMNS = [
+    'game_id', 'season', 'week', 'game_date', 'home_team', 'away_team', 'home_score', 'away_score',
+]
+
+
 class EloTracker:
     """Track and maintain Elo ratings across all NFL games"""
     
@@ -36,7 +73,7 @@ class EloTracker:
         'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'
     ]
     
-    def __init__(self):
+    def __init__(self, connect=None):
         self.db_config = {
             'dbname': os.getenv('DB_NAME', 'nfl_analytics'),
             'user': os.getenv('DB_USER', 'postgres'),
@@ -44,9 +81,13 @@ class EloTracker:
             'host': os.getenv('DB_HOST', 'localhost'),
             'port': os.getenv('DB_PORT', '5432')
         }
+        # The API passes db_pool.get_db_connection; scripts open direct connections.
+        self._connect = connect or (lambda: psycopg2.connect(**self.db_config))
         
         self.elo = EloRatingSystem()
-        self.ratings_by_date = {}  # Store ratings at each date
+        self.history = pd.DataFrame(columns=HISTORY_COLUMNS)  # Pre/post ratings per processed game
+        self._date_index = None  # team -> (sorted game dates, post-game ratings), built on first lookup
+        self.watermark = None  # Last applied dated game: {'game_id', 'game_date', 'season'}
         
     def normalize_team(self, team: str) -> str:
         """Normalize team abbreviation"""
@@ -71,7 +112,7 @@ class EloTracker:
         """
         print(f"\n📊 Loading historical games ({start_season}-{end_season})...")
         
-        conn = psycopg2.connect(**self.db_config)
+        conn = self._connect()
         
         query = """
         SELECT 
@@ -101,72 +142,184 @@ class EloTracker:
         print(f"✅ Loaded {len(df)} games")
         return df
     
-    def process_historical_games(self, games_df: pd.DataFrame):
+    def process_historical_games(self, games_df: pd.DataFrame, previous_season: int = None):
         """
         Process all historical games to build Elo ratings
-        
+
+        Ratings live in a numpy array indexed by team code and the per-game
+        pre/post ratings are written into preallocated arrays, which become
+        self.history once the replay finishes.
+
         Args:
             games_df: DataFrame of games sorted by date
+            previous_season: Season of the last game already in the ratings, so a
+                new season at the start of games_df still gets mean reversion
         """
         print("\n⚙️  Processing historical games...")
-        
-        current_season = None
-        games_processed = 0
-        
-        for idx, game in games_df.iterrows():
-            # Check for new season (apply mean reversion)
-            if current_season is None:
-                current_season = game['season']
-                print(f"\n📅 Starting season {current_season}")
-            elif game['season'] != current_season:
-                print(f"\n🔄 Season {current_season} → {game['season']}")
+
+        n_games = len(games_df)
+        if n_games == 0:
+            self._set_history(pd.DataFrame(columns=HISTORY_COLUMNS))
+            print("\n✅ Processed 0 total games")
+            return
+
+        home_teams = games_df['home_team'].str.upper().to_numpy()
+        away_teams = games_df['away_team'].str.upper().to_numpy()
+
+        # Team codes: already-tracked teams first, then new teams by first appearance
+        # (home before away), which keeps the ratings dict in update order.
+        current = self.elo.get_all_ratings()
+        teams = list(current)
+        interleaved = np.empty(2 * n_games, dtype=object)
+        interleaved[0::2] = home_teams
+        interleaved[1::2] = away_teams
+        known = set(teams)
+        teams.extend(t for t in pd.unique(interleaved) if t not in known)
+
+        team_index = pd.Index(teams)
+        home_idx = team_index.get_indexer(home_teams)
+        away_idx = team_index.get_indexer(away_teams)
+
+        ratings = np.array([current.get(t, self.elo.base_elo) for t in teams], dtype=np.float64)
+        tracked = np.zeros(len(teams), dtype=bool)
+        tracked[:len(current)] = True
+
+        seasons = games_df['season'].to_numpy()
+        is_playoff = (pd.to_numeric(games_df['week'], errors='coerce').fillna(0) > 18).to_numpy()
+        home_scores = games_df['home_score'].astype(int).to_numpy()
+        away_scores = games_df['away_score'].astype(int).to_numpy()
+        actual_home = np.where(home_scores > away_scores, 1.0,
+                               np.where(home_scores < away_scores, 0.0, 0.5))
+        k_factors = np.where(is_playoff, self.elo.k_factor * 1.25, self.elo.k_factor).astype(np.float64)
+
+        pre_home = np.empty(n_games)
+        pre_away = np.empty(n_games)
+        post_home = np.empty(n_games)
+        post_away = np.empty(n_games)
+
+        # Neutral sites are not flagged yet, so every game gets home field advantage
+        home_advantage = self.elo.home_advantage
+        keep = 1.0 - self.elo.mean_reversion
+        pull = self.elo.base_elo * self.elo.mean_reversion
+        season_starts = set((np.flatnonzero(seasons[1:] != seasons[:-1]) + 1).tolist())
+        if previous_season is None:
+            print(f"\n📅 Starting season {seasons[0]}")
+        elif seasons[0] != previous_season:
+            season_starts.add(0)
+
+        for i in range(n_games):
+            if i in season_starts:
+                print(f"\n🔄 Season {seasons[i - 1] if i else previous_season} → {seasons[i]}")
                 print(f"   Applying mean reversion ({self.elo.mean_reversion:.1%} toward {self.elo.base_elo})")
-                self.elo.regress_to_mean()
-                current_season = game['season']
-            
-            # Determine if playoff game (week > 18)
-            is_playoff = game['week'] > 18 if pd.notna(game['week']) else False
-            
-            # Neutral site detection (Super Bowl, international games)
-            # For now, assume all regular season games have home field advantage
-            is_neutral = False
-            
-            # Update Elo ratings
-            home_team = game['home_team']
-            away_team = game['away_team']
-            home_score = int(game['home_score'])
-            away_score = int(game['away_score'])
-            
-            # Store pre-game ratings
-            pre_home = self.elo.get_rating(home_team)
-            pre_away = self.elo.get_rating(away_team)
-            
-            # Update ratings
-            post_home, post_away = self.elo.update_ratings(
-                home_team, away_team, home_score, away_score,
-                is_playoff=is_playoff, is_neutral=is_neutral
+                ratings[tracked] = ratings[tracked] * keep + pull
+
+            h = home_idx[i]
+            a = away_idx[i]
+            home_rating = ratings[h]
+            away_rating = ratings[a]
+
+            # Same arithmetic as EloRatingSystem.update_ratings
+            expected_home = 1.0 / (1.0 + math.pow(10, (away_rating - (home_rating + home_advantage)) / 400.0))
+            k = k_factors[i]
+            new_home = home_rating + k * (actual_home[i] - expected_home)
+            new_away = away_rating + k * ((1.0 - actual_home[i]) - (1.0 - expected_home))
+
+            ratings[h] = new_home
+            ratings[a] = new_away
+            tracked[h] = tracked[a] = True
+
+            pre_home[i] = home_rating
+            pre_away[i] = away_rating
+            post_home[i] = new_home
+            post_away[i] = new_away
+
+        self.elo.set_ratings({t: ratings[i] for i, t in enumerate(teams) if tracked[i]})
+
+        self._set_history(pd.DataFrame({
+            'game_id': games_df['game_id'].to_numpy(),
+            'season': seasons,
+            'week': games_df['week'].to_numpy(),
+            'game_date': pd.to_datetime(games_df['game_date']).to_numpy(),
+            'home_team': home_teams,
+            'away_team': away_teams,
+            'home_elo_pre': pre_home,
+            'away_elo_pre': pre_away,
+            'home_elo_post': post_home,
+            'away_elo_post': post_away,
+            'is_playoff': is_playoff,
+        }))
+
+        dated = self.history[self.history['game_date'].notna()]
+        if not dated.empty:
+            last = dated.iloc[-1]
+            self.watermark = {
+                'game_id': last['game_id'],
+                'game_date': last['game_date'].strftime('%Y-%m-%d'),
+                'season': int(last['season']),
+            }
+
+        print(f"\n✅ Processed {n_games} total games")
+
+    def _set_history(self, history: pd.DataFrame):
+        self.history = history
+        self._date_index = None
+
+    def _write_history_rows(self, cur):
+        """Insert self.history into HISTORY_TABLE (games already present are left alone)"""
+        h = self.history
+        game_dates = [d.date() if pd.notna(d) else None for d in pd.to_datetime(h['game_date'])]
+        weeks = [int(w) if pd.notna(w) else None for w in h['week']]
+        rows = list(zip(
+            h['game_id'].tolist(), h['season'].astype(int).tolist(), weeks, game_dates,
+            h['home_team'].tolist(), h['away_team'].tolist(),
+            h['home_elo_pre'].tolist(), h['away_elo_pre'].tolist(),
+            h['home_elo_post'].tolist(), h['away_elo_post'].tolist(),
+            h['is_playoff'].astype(bool).tolist(),
+        ))
+        execute_values(
+            cur,
+            f"INSERT INTO {HISTORY_TABLE} ({', '.join(HISTORY_COLUMNS)}) VALUES %s "
+            "ON CONFLICT (game_id) DO NOTHING",
+            rows,
+            page_size=1000
+        )
+        return len(rows)
+
+    def save_rating_history(self):
+        """Replace the persisted per-game rating history with self.history"""
+        conn = self._connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(HISTORY_SCHEMA_SQL)
+            cur.execute(f"DELETE FROM {HISTORY_TABLE}")
+            written = self._write_history_rows(cur)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+        print(f"💾 Saved {written} game rating snapshots to {HISTORY_TABLE}")
+
+    def load_rating_history(self):
+        """Load the persisted per-game rating history for point-in-time lookups"""
+        conn = self._connect()
+        try:
+            history = pd.read_sql(
+                f"SELECT {', '.join(HISTORY_COLUMNS)} FROM {HISTORY_TABLE} ORDER BY game_date, game_id",
+                conn
             )
-            
-            # Store ratings snapshot
-            game_date = game['game_date'].strftime('%Y-%m-%d') if pd.notna(game['game_date']) else 'unknown'
-            if game_date not in self.ratings_by_date:
-                self.ratings_by_date[game_date] = {}
-            
-            self.ratings_by_date[game_date][home_team] = post_home
-            self.ratings_by_date[game_date][away_team] = post_away
-            
-            games_processed += 1
-            
-            # Progress indicator
-            if games_processed % 500 == 0:
-                print(f"   Processed {games_processed} games...")
-        
-        print(f"\n✅ Processed {games_processed} total games")
-    
-    def save_current_ratings(self, filepath: str = 'ml/models/elo_ratings_current.json'):
+        finally:
+            conn.close()
+
+        self._set_history(history)
+        print(f"✅ Loaded {len(history)} game rating snapshots from {HISTORY_TABLE}")
+        return len(history) > 0
+
+    def save_current_ratings(self, filepath: str = RATINGS_FILE):
         """Save current Elo ratings to file"""
         ratings_data = {
             'last_updated': datetime.now().isoformat(),
+            'watermark': self.watermark,
             'ratings': self.elo.get_all_ratings(),
             'system_params': {
                 'base_elo': self.elo.base_elo,
@@ -177,12 +330,15 @@ class EloTracker:
         }
         
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
+        # Write then rename so API workers never read a half-written file
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(ratings_data, f, indent=2)
+        os.replace(tmp_path, filepath)
         
         print(f"\n💾 Saved current ratings to {filepath}")
     
-    def load_current_ratings(self, filepath: str = 'ml/models/elo_ratings_current.json'):
+    def load_current_ratings(self, filepath: str = RATINGS_FILE):
         """Load Elo ratings from file"""
         if not os.path.exists(filepath):
             print(f"⚠️  No saved ratings found at {filepath}")
@@ -192,10 +348,118 @@ class EloTracker:
             data = json.load(f)
         
         self.elo.set_ratings(data['ratings'])
+        self.watermark = data.get('watermark')
         print(f"✅ Loaded ratings from {filepath}")
         print(f"   Last updated: {data['last_updated']}")
         return True
     
+    def _history_watermark(self, cur):
+        """Last dated game in HISTORY_TABLE, for rating files saved before watermarks existed"""
+        cur.execute("SELECT to_regclass(%s)", (HISTORY_TABLE,))
+        if cur.fetchone()[0] is None:
+            return None
+        cur.execute(f"""
+            SELECT game_id, game_date, season FROM {HISTORY_TABLE}
+            WHERE game_date IS NOT NULL
+            ORDER BY game_date DESC, game_id DESC
+            LIMIT 1
+        """)
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return {'game_id': row[0], 'game_date': row[1].strftime('%Y-%m-%d'), 'season': int(row[2])}
+
+    def apply_new_games(self, conn, filepath: str = RATINGS_FILE, wait: bool = True) -> dict:
+        """
+        Advance the saved ratings by the games completed since the last run
+
+        Loads the ratings file, replays every scored game in hcl.games after the
+        watermark (game_date, game_id) - regressing to the mean when the season
+        changes - then appends the new games to HISTORY_TABLE and saves the file.
+        Runs are serialized with an advisory lock; with wait=False a caller that
+        finds another update in progress skips it.
+
+        Args:
+            conn: Open database connection (committed on success)
+            filepath: Ratings file to advance
+            wait: Block on a concurrent update instead of skipping
+
+        Returns:
+            dict with status ('updated', 'current', 'busy' or 'rebuild_required'),
+            games_applied, missed_games and watermark
+        """
+        result = {'status': 'rebuild_required', 'games_applied': 0, 'missed_games': 0, 'watermark': None}
+        if not os.path.exists(filepath):
+            print(f"⚠️  No saved ratings found at {filepath}")
+            return result
+
+        cur = conn.cursor()
+        try:
+            if wait:
+                cur.execute(f"SELECT pg_advisory_xact_lock({_UPDATE_LOCK_KEY})")
+            else:
+                cur.execute(f"SELECT pg_try_advisory_xact_lock({_UPDATE_LOCK_KEY})")
+                if not cur.fetchone()[0]:
+                    conn.rollback()
+                    result['status'] = 'busy'
+                    return result
+
+            # Read under the lock so a concurrent update's file is not replayed twice
+            self.load_current_ratings(filepath)
+            watermark = self.watermark or self._history_watermark(cur)
+            if watermark is None:
+                conn.rollback()
+                print(f"⚠️  {filepath} has no applied-game watermark. Run with --rebuild first.")
+                return result
+            result['watermark'] = watermark
+
+            cur.execute(HISTORY_SCHEMA_SQL)
+            # Scored games at or before the watermark that never made it into the history
+            cur.execute(f"""
+                SELECT COUNT(*)
+                FROM hcl.games g
+                WHERE g.home_score IS NOT NULL
+                  AND g.away_score IS NOT NULL
+                  AND (g.game_date, g.game_id) <= (%s::date, %s)
+                  AND g.season >= (SELECT MIN(season) FROM {HISTORY_TABLE})
+                  AND NOT EXISTS (SELECT 1 FROM {HISTORY_TABLE} h WHERE h.game_id = g.game_id)
+            """, (watermark['game_date'], watermark['game_id']))
+            result['missed_games'] = int(cur.fetchone()[0])
+            if result['missed_games']:
+                print(f"⚠️  {result['missed_games']} completed games predate the Elo watermark; "
+                      f"run --rebuild to include them")
+
+            cur.execute(f"""
+                SELECT {', '.join(COMPLETED_GAME_COLUMNS)}
+                FROM hcl.games
+                WHERE home_score IS NOT NULL
+                  AND away_score IS NOT NULL
+                  AND (game_date, game_id) > (%s::date, %s)
+                ORDER BY game_date, game_id
+            """, (watermark['game_date'], watermark['game_id']))
+            games_df = pd.DataFrame(cur.fetchall(), columns=COMPLETED_GAME_COLUMNS)
+            if games_df.empty:
+                conn.rollback()
+                result['status'] = 'current'
+                return result
+
+            games_df['home_team'] = games_df['home_team'].apply(self.normalize_team)
+            games_df['away_team'] = games_df['away_team'].apply(self.normalize_team)
+            self.watermark = watermark
+            self.process_historical_games(games_df, previous_season=watermark['season'])
+
+            self._write_history_rows(cur)
+            self.save_current_ratings(filepath)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+        result.update(status='updated', games_applied=len(games_df), watermark=self.watermark)
+        return result
+
     def display_current_ratings(self, top_n: int = 32):
         """Display current Elo ratings sorted by rating"""
         ratings = self.elo.get_all_ratings()
@@ -235,41 +499,144 @@ class EloTracker:
         
         # Save current state
         self.save_current_ratings()
+        try:
+            self.save_rating_history()
+        except psycopg2.Error as e:
+            print(f"⚠️  Could not save rating history: {e}")
         
         # Display results
         self.display_current_ratings()
         
         print("\n✅ Elo rating system rebuilt successfully!")
     
+    def _team_date_index(self) -> dict:
+        """Per-team arrays of game dates (ascending) and the post-game rating after each"""
+        if self._date_index is None:
+            h = self.history
+            dates = pd.to_datetime(h['game_date']).to_numpy(dtype='datetime64[ns]')
+            long = pd.DataFrame({
+                'team': np.concatenate([h['home_team'].to_numpy(), h['away_team'].to_numpy()]),
+                'game_date': np.concatenate([dates, dates]),
+                'rating': np.concatenate([
+                    h['home_elo_post'].to_numpy(dtype=np.float64),
+                    h['away_elo_post'].to_numpy(dtype=np.float64),
+                ]),
+                'seq': np.tile(np.arange(len(h)), 2),
+            })
+            # Games without a date never count as "on or before" any date
+            long = long[long['game_date'].notna()].sort_values(['team', 'game_date', 'seq'])
+
+            self._date_index = {
+                team: (group['game_date'].to_numpy(), group['rating'].to_numpy())
+                for team, group in long.groupby('team', sort=False)
+            }
+        return self._date_index
+
+    def _rating_from_index(self, index: dict, team: str, cutoff: np.datetime64, side: str = 'right') -> float:
+        entry = index.get(team)
+        if entry is None:
+            return self.elo.base_elo
+        dates, ratings = entry
+        pos = np.searchsorted(dates, cutoff, side=side) - 1
+        return float(ratings[pos]) if pos >= 0 else self.elo.base_elo
+
     def get_rating_at_date(self, team: str, date: str) -> float:
         """
         Get a team's Elo rating at a specific date
-        
+
+        Binary search over the team's game dates, so each lookup is O(log n).
+
         Args:
             team: Team abbreviation
             date: Date string (YYYY-MM-DD)
-        
+
         Returns:
-            Elo rating (or base_elo if no data)
+            Elo rating after the team's last game on or before date (or base_elo if no data)
         """
-        team = self.normalize_team(team)
-        
-        if date in self.ratings_by_date and team in self.ratings_by_date[date]:
-            return self.ratings_by_date[date][team]
-        
-        # Find most recent date before target
-        available_dates = sorted(self.ratings_by_date.keys())
-        for past_date in reversed(available_dates):
-            if past_date <= date and team in self.ratings_by_date[past_date]:
-                return self.ratings_by_date[past_date][team]
-        
-        return self.elo.base_elo
+        team = self.normalize_team(team).upper()
+        cutoff = pd.Timestamp(date).to_datetime64()
+        return self._rating_from_index(self._team_date_index(), team, cutoff)
+
+    def get_ratings_at_date(self, teams, date: str) -> dict:
+        """
+        Ratings for many teams at one date in a single call
+
+        Args:
+            teams: Iterable of team abbreviations
+            date: Date string (YYYY-MM-DD)
+
+        Returns:
+            {team: Elo rating}
+        """
+        index = self._team_date_index()
+        cutoff = pd.Timestamp(date).to_datetime64()
+        return {
+            team: self._rating_from_index(index, self.normalize_team(team).upper(), cutoff)
+            for team in teams
+        }
+
+    def get_ratings_for_week(self, season: int, week: int, teams=None) -> dict:
+        """
+        Every team's rating entering a week
+
+        Teams on bye get their rating from before the week's first game date.
+
+        Args:
+            season: Season year
+            week: Week number
+            teams: Optional iterable of team abbreviations (default: every team in the history)
+
+        Returns:
+            {team: Elo rating}; weeks not in the history yet use each team's latest rating
+        """
+        index = self._team_date_index()
+        h = self.history
+        week_games = h[(h['season'] == season) & (h['week'] == week)]
+
+        # Teams playing that week take the pre-game rating from their first game in it,
+        # which includes any season-boundary mean reversion.
+        entering = {}
+        for row in week_games.itertuples(index=False):
+            entering.setdefault(row.home_team, float(row.home_elo_pre))
+            entering.setdefault(row.away_team, float(row.away_elo_pre))
+
+        week_dates = pd.to_datetime(week_games['game_date']).dropna()
+        cutoff = week_dates.min().to_datetime64() if len(week_dates) else None
+
+        if teams is None:
+            teams = list(index)
+        ratings = {}
+        for team in teams:
+            code = self.normalize_team(team).upper()
+            if code in entering:
+                ratings[team] = entering[code]
+            elif cutoff is not None:
+                ratings[team] = self._rating_from_index(index, code, cutoff, side='left')
+            elif code in index:
+                ratings[team] = float(index[code][1][-1])
+            else:
+                ratings[team] = self.elo.base_elo
+        return ratings
+
+def update_elo_ratings(conn=None, filepath: str = RATINGS_FILE, wait: bool = True) -> dict:
+    """Apply newly completed games to the saved Elo ratings (see EloTracker.apply_new_games)"""
+    tracker = EloTracker()
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(**tracker.db_config)
+    try:
+        return tracker.apply_new_games(conn, filepath=filepath, wait=wait)
+    finally:
+        if own_conn:
+            conn.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description='NFL Elo Rating Tracker')
     parser.add_argument('--rebuild', action='store_true', 
                        help='Rebuild Elo ratings from historical data')
+    parser.add_argument('--update', action='store_true',
+                       help='Apply games completed since the last rebuild/update')
     parser.add_argument('--current', action='store_true',
                        help='Show current Elo ratings')
     parser.add_argument('--start-season', type=int, default=2002,
@@ -281,6 +648,15 @@ def main():
     
     if args.rebuild:
         tracker.rebuild_from_scratch(start_season=args.start_season)
+    elif args.update:
+        result = update_elo_ratings()
+        if result['status'] == 'rebuild_required':
+            print("❌ Nothing to update from. Run with --rebuild first.")
+        else:
+            print(f"✅ Elo update: {result['status']}, {result['games_applied']} games applied")
+            if result['status'] == 'updated':
+                tracker.load_current_ratings()
+                tracker.display_current_ratings()
     elif args.current:
         if tracker.load_current_ratings():
             tracker.display_current_ratings()
@@ -289,6 +665,7 @@ def main():
     else:
         print("Usage:")
         print("  python ml/elo_tracker.py --rebuild         # Rebuild from history")
+        print("  python ml/elo_tracker.py --update          # Apply newly completed games")
         print("  python ml/elo_tracker.py --current         # Show current ratings")
         print("  python ml/elo_tracker.py --rebuild --start-season 2010")
 
@@ -0,0 +1,725 @@
+"""
+Precomputed Model Performance Aggregates
+
+Persists per-(season, week, model) scoring counters in hcl.model_performance_weekly
+so /api/ml/performance-stats can assemble its payload from a few indexed reads
+instead of re-scanning hcl.ml_predictions / hcl.ml_predictions_elo on every call.
+
+Each `model` row is one scoring scope used by the endpoint:
+    xgb              XGBoost rows predicted before kickoff (strict tracked metrics)
+    xgb_final        the same rows restricted to final games (season-trend ATS)
+    xgb_dated        XGBoost rows predicted on/before the game date (trend/coverage)
+    xgb_legacy       XGBoost picks on final games without timestamp evidence
+    xgb_any          every XGBoost row on a final game (legacy trend ATS)
+    elo / elo_dated  Elo rows under the kickoff / game-date pregame rules
+    agreement        XGBoost vs Elo on games both models scored before kickoff
+    agreement_dated  the same pairing under the game-date rule
+    vegas            completed games and favourite-won counts from hcl.games
+
+Counters are stored as sums so any week range can be re-aggregated exactly.
+Statement-level triggers on hcl.games, hcl.ml_predictions and
+hcl.ml_predictions_elo bump a per-(season, week) version in
+hcl.model_performance_state; refresh_model_performance() rebuilds only the
+weeks whose version moved. Writers (/api/ml/update-results, the weekly
+pipeline, this script) refresh; readers only read, and aggregate any week still
+marked stale from the tracking tables so writes that skip the refresh (live
+score saves, backfills, loaders) show up at once. With live=True the fetch_*
+readers aggregate every week that way.
+
+Usage:
+    python ml/model_performance.py            # Create objects, refresh stale weeks
+    python ml/model_performance.py --full     # Rebuild every week
+    python ml/model_performance.py --season 2025
+"""
+
+import psycopg2
+import os
+import argparse
+from psycopg2.extras import RealDictCursor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TABLE = 'hcl.model_performance_weekly'
+STATE_TABLE = 'hcl.model_performance_state'
+
+SOURCE_TABLES = ('hcl.games', 'hcl.ml_predictions', 'hcl.ml_predictions_elo')
+
+COUNTER_COLUMNS = [
+    'completed_games',
+    'predicted_games',
+    'scored_games',
+    'correct_predictions',
+    'margin_error_sum',
+    'margin_error_count',
+    'spread_games',
+    'spread_ai_wins',
+    'spread_vegas_wins',
+    'agreements',
+    'agreed_correct',
+    'xgb_head_to_head_wins',
+    'elo_head_to_head_wins',
+]
+
+_REFRESH_LOCK_KEY = "hashtext('hcl.model_performance_weekly')"
+
+# Pregame rules shared with api_routes_ml.get_performance_stats.
+XGB_KICKOFF_PREGAME = (
+    "x.predicted_at IS NOT NULL "
+    "AND ((g.kickoff_time_utc IS NOT NULL AND x.predicted_at <= g.kickoff_time_utc) "
+    "OR (g.kickoff_time_utc IS NULL "
+    "AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL "
+    "AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)))"
+)
+ELO_KICKOFF_PREGAME = (
+    "e.prediction_date IS NOT NULL "
+    "AND ((g.kickoff_time_utc IS NOT NULL AND e.prediction_date <= g.kickoff_time_utc) "
+    "OR (g.kickoff_time_utc IS NULL "
+    "AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL "
+    "AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)))"
+)
+XGB_DATED_PREGAME = (
+    "x.predicted_at IS NOT NULL "
+    "AND COALESCE(x.game_date::date, g.game_date::date) IS NOT NULL "
+    "AND x.predicted_at::date <= COALESCE(x.game_date::date, g.game_date::date)"
+)
+ELO_DATED_PREGAME = (
+    "e.prediction_date IS NOT NULL "
+    "AND COALESCE(e.game_date::date, g.game_date::date) IS NOT NULL "
+    "AND e.prediction_date::date <= COALESCE(e.game_date::date, g.game_date::date)"
+)
+
+FINAL_GAME = "g.home_score IS NOT NULL AND g.away_score IS NOT NULL"
+XGB_RECORDED = "x.result_recorded_at IS NOT NULL"
+XGB_SPREADS = "x.ai_spread IS NOT NULL AND COALESCE(x.vegas_spread, g.spread_line) IS NOT NULL"
+XGB_PICKED_WINNER = (
+    "((g.home_score > g.away_score AND x.predicted_winner = g.home_team) "
+    "OR (g.away_score > g.home_score AND x.predicted_winner = g.away_team))"
+)
+ELO_PICKED_WINNER = (
+    "((g.home_score > g.away_score AND e.predicted_winner = g.home_team) "
+    "OR (g.away_score > g.home_score AND e.predicted_winner = g.away_team))"
+)
+XGB_LEGACY_MARGIN_ERROR = (
+    "COALESCE(x.margin_prediction_error, "
+    "ABS(COALESCE(x.predicted_margin, x.ai_spread, 0) - (g.home_score - g.away_score)))"
+)
+
+# ATS outcome per did_home_cover(): cover when margin + spread > 0, push at 0.
+_AI_COVER = "((g.home_score - g.away_score) + x.ai_spread)"
+_VEGAS_COVER = "((g.home_score - g.away_score) + COALESCE(x.vegas_spread, g.spread_line))"
+
+# scope -> (row filter, scored filter, correct filter, margin error expression, ATS filter)
+XGB_SCOPES = {
+    'xgb': (XGB_KICKOFF_PREGAME, XGB_RECORDED, "x.win_prediction_correct",
+            "x.margin_prediction_error", f"{XGB_RECORDED} AND {XGB_SPREADS}"),
+    'xgb_final': (f"{XGB_KICKOFF_PREGAME} AND {FINAL_GAME}", None, None, None, XGB_SPREADS),
+    'xgb_dated': (XGB_DATED_PREGAME, XGB_RECORDED, "x.win_prediction_correct", None, None),
+    'xgb_legacy': (f"x.predicted_winner IS NOT NULL AND {FINAL_GAME}", "TRUE", XGB_PICKED_WINNER,
+                   XGB_LEGACY_MARGIN_ERROR, XGB_SPREADS),
+    'xgb_any': (FINAL_GAME, None, None, None, XGB_SPREADS),
+}
+
+# scope -> (row filter, scored filter, margin error expression)
+ELO_SCOPES = {
+    'elo': (ELO_KICKOFF_PREGAME, f"e.predicted_winner IS NOT NULL AND {FINAL_GAME}",
+            "ABS(e.elo_spread - (g.home_score - g.away_score))"),
+    'elo_dated': (ELO_DATED_PREGAME, f"e.predicted_winner IS NOT NULL AND {FINAL_GAME}", None),
+}
+
+
+def _schema_sql():
+    counters = ',\n    '.join(
+        f"{col} NUMERIC NOT NULL DEFAULT 0" if col == 'margin_error_sum' else f"{col} INTEGER NOT NULL DEFAULT 0"
+        for col in COUNTER_COLUMNS
+    )
+    return f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    model TEXT NOT NULL,
+
+    -- Additive counters; rates are derived at read time from the sums
+    {counters},
+
+    refreshed_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (season, week, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_model_performance_weekly_model
+    ON {TABLE} (model, season);
+
+CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    source_version BIGINT NOT NULL DEFAULT 1,
+    built_version BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP,
+    PRIMARY KEY (season, week)
+);
+
+CREATE OR REPLACE FUNCTION hcl.mark_model_performance_stale()
+RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {STATE_TABLE} AS s (season, week)
+    SELECT DISTINCT season, week
+    FROM changed_rows
+    WHERE season IS NOT NULL AND week IS NOT NULL
+    ON CONFLICT (season, week) DO UPDATE SET source_version = s.source_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE {TABLE} IS 'Per-(season, week, scope) scoring counters behind /api/ml/performance-stats';
+"""
+
+
+def _trigger_sql(table):
+    name = table.split('.')[-1]
+    statements = []
+    for suffix, event, transition in (('ins', 'INSERT', 'NEW'), ('upd', 'UPDATE', 'NEW'), ('del', 'DELETE', 'OLD')):
+        trigger = f"trg_{name}_model_performance_{suffix}"
+        statements.append(f"DROP TRIGGER IF EXISTS {trigger} ON {table};")
+        statements.append(
+            f"CREATE TRIGGER {trigger} AFTER {event} ON {table} "
+            f"REFERENCING {transition} TABLE AS changed_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION hcl.mark_model_performance_stale();"
+        )
+    return '\n'.join(statements)
+
+
+def _existing_tables(conn, tables):
+    cur = conn.cursor()
+    cur.execute("SELECT t FROM unnest(%s::text[]) AS t WHERE to_regclass(t) IS NOT NULL", (list(tables),))
+    existing = [row[0] for row in cur.fetchall()]
+    cur.close()
+    return existing
+
+
+def model_performance_installed(conn):
+    """True when the aggregate table exists and every existing source table carries its triggers."""
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (TABLE,))
+    installed = cur.fetchone()[0]
+    if installed:
+        cur.execute("""
+            SELECT COUNT(*) FILTER (WHERE tr.oid IS NULL)
+            FROM unnest(%s::text[]) AS t
+            LEFT JOIN pg_trigger tr
+              ON tr.tgrelid = to_regclass(t)
+             AND tr.tgname = 'trg_' || split_part(t, '.', 2) || '_model_performance_ins'
+            WHERE to_regclass(t) IS NOT NULL
+        """, (list(SOURCE_TABLES),))
+        installed = cur.fetchone()[0] == 0
+    cur.close()
+    return installed
+
+
+def ensure_model_performance(conn):
+    """Create the aggregate table, state table and staleness triggers; mark unbuilt weeks stale."""
+    cur = conn.cursor()
+    cur.execute(_schema_sql())
+    sources = _existing_tables(conn, SOURCE_TABLES)
+    for table in sources:
+        cur.execute(_trigger_sql(table))
+
+    # Version the aggregate for response_cache.py once create_data_versions.sql is installed.
+    cur.execute("SELECT to_regprocedure('hcl.bump_data_version()') IS NOT NULL")
+    if cur.fetchone()[0]:
+        cur.execute(f"""
+            DROP TRIGGER IF EXISTS trg_model_performance_weekly_data_version ON {TABLE};
+            CREATE TRIGGER trg_model_performance_weekly_data_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {TABLE}
+            FOR EACH STATEMENT EXECUTE FUNCTION hcl.bump_data_version();
+        """)
+
+    # Weeks that already have data but were never built start out stale.
+    seed = ' UNION '.join(f"SELECT DISTINCT season, week FROM {table}" for table in sources)
+    cur.execute(f"""
+        INSERT INTO {STATE_TABLE} (season, week)
+        SELECT season, week FROM ({seed}) src
+        WHERE season IS NOT NULL AND week IS NOT NULL
+        ON CONFLICT (season, week) DO NOTHING
+    """)
+    cur.close()
+    conn.commit()
+
+
+def stale_weeks(conn, seasons=None):
+    """(season, week) pairs whose source rows changed since their last rebuild."""
+    params = []
+    season_filter = ''
+    if seasons is not None:
+        season_filter = 'AND season = ANY(%s)'
+        params.append(sorted({int(s) for s in seasons}))
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT season, week FROM {STATE_TABLE}
+        WHERE source_version > built_version
+          {season_filter}
+        ORDER BY season, week
+    """, tuple(params))
+    pairs = [(row[0], row[1]) for row in cur.fetchall()]
+    cur.close()
+    return pairs
+
+
+def _xgb_columns(scope, base, scored, correct, error, spread):
+    def where(*parts):
+        return ' AND '.join(f'({part})' for part in (base,) + parts if part)
+
+    columns = [f"COUNT(*) FILTER (WHERE {where()}) AS {scope}__predicted_games"]
+    if scored:
+        columns.append(f"COUNT(*) FILTER (WHERE {where(scored)}) AS {scope}__scored_games")
+        columns.append(f"COUNT(*) FILTER (WHERE {where(scored, correct)}) AS {scope}__correct_predictions")
+    if error:
+        columns.append(f"COALESCE(SUM(({error})::numeric) FILTER (WHERE {where(scored)}), 0) AS {scope}__margin_error_sum")
+        columns.append(f"COUNT({error}) FILTER (WHERE {where(scored)}) AS {scope}__margin_error_count")
+    if spread:
+        columns.append(f"COUNT(*) FILTER (WHERE {where(spread)}) AS {scope}__spread_games")
+        columns.append(
+            f"COUNT(*) FILTER (WHERE {where(spread)} AND {_AI_COVER} > 0 AND {_VEGAS_COVER} < 0) "
+            f"AS {scope}__spread_ai_wins"
+        )
+        columns.append(
+            f"COUNT(*) FILTER (WHERE {where(spread)} AND {_AI_COVER} < 0 AND {_VEGAS_COVER} > 0) "
+            f"AS {scope}__spread_vegas_wins"
+        )
+    return columns
+
+
+def _elo_columns(scope, base, scored, error):
+    columns = [
+        f"COUNT(*) FILTER (WHERE {base}) AS {scope}__predicted_games",
+        f"COUNT(*) FILTER (WHERE ({base}) AND {scored}) AS {scope}__scored_games",
+        f"COUNT(*) FILTER (WHERE ({base}) AND {scored} AND {ELO_PICKED_WINNER}) AS {scope}__correct_predictions",
+    ]
+    if error:
+        columns.append(f"COALESCE(SUM({error}) FILTER (WHERE ({base}) AND {scored}), 0) AS {scope}__margin_error_sum")
+        columns.append(f"COUNT({error}) FILTER (WHERE ({base}) AND {scored}) AS {scope}__margin_error_count")
+    return columns
+
+
+def _agreement_sql():
+    both_scored = (
+        f"x.result_recorded_at IS NOT NULL AND x.predicted_winner IS NOT NULL "
+        f"AND e.predicted_winner IS NOT NULL AND {FINAL_GAME}"
+    )
+    xgb_only = f"x.predicted_winner <> e.predicted_winner AND {XGB_PICKED_WINNER} AND NOT {ELO_PICKED_WINNER}"
+    elo_only = f"x.predicted_winner <> e.predicted_winner AND {ELO_PICKED_WINNER} AND NOT {XGB_PICKED_WINNER}"
+    kickoff = f"({XGB_KICKOFF_PREGAME}) AND ({ELO_KICKOFF_PREGAME})"
+    dated = f"({XGB_DATED_PREGAME}) AND ({ELO_DATED_PREGAME})"
+    # agreement_dated.predicted_games keeps the coverage-contract pairing, which
+    # does not require an XGBoost pick.
+    return f"""
+        SELECT
+            x.week,
+            COUNT(*) FILTER (WHERE {kickoff} AND {both_scored}) AS agreement__scored_games,
+            COUNT(*) FILTER (WHERE {kickoff} AND {both_scored}
+                             AND x.predicted_winner = e.predicted_winner) AS agreement__agreements,
+            COUNT(*) FILTER (WHERE {kickoff} AND {both_scored}
+                             AND x.predicted_winner = e.predicted_winner
+                             AND {XGB_PICKED_WINNER}) AS agreement__agreed_correct,
+            COUNT(*) FILTER (WHERE {kickoff} AND {both_scored} AND {xgb_only}) AS agreement__xgb_head_to_head_wins,
+            COUNT(*) FILTER (WHERE {kickoff} AND {both_scored} AND {elo_only}) AS agreement__elo_head_to_head_wins,
+            COUNT(*) FILTER (WHERE {dated} AND x.result_recorded_at IS NOT NULL
+                             AND e.predicted_winner IS NOT NULL AND {FINAL_GAME}) AS agreement_dated__predicted_games,
+            COUNT(*) FILTER (WHERE {dated} AND {both_scored}) AS agreement_dated__scored_games,
+            COUNT(*) FILTER (WHERE {dated} AND {both_scored}
+                             AND x.predicted_winner = e.predicted_winner) AS agreement_dated__agreements
+        FROM hcl.ml_predictions x
+        JOIN hcl.ml_predictions_elo e ON e.game_id = x.game_id
+        JOIN hcl.games g ON g.game_id = x.game_id
+        WHERE x.season = %s
+          AND x.week = ANY(%s)
+          AND COALESCE(g.is_postseason, FALSE) = FALSE
+        GROUP BY x.week
+    """
+
+
+def _week_scope_rows(cur, sql, params, rows_by_key):
+    """Run one grouped source query and split its `scope__counter` columns into scope rows."""
+    cur.execute(sql, params)
+    for row in cur.fetchall():
+        week = row['week']
+        for column, value in row.items():
+            if '__' not in column:
+                continue
+            scope, counter = column.split('__', 1)
+            rows_by_key.setdefault((week, scope), {})[counter] = value or 0
+
+
+def week_scope_counters(conn, season, weeks):
+    """Aggregate every scope of the given weeks straight from the tracking tables: {(week, scope): counters}."""
+    weeks = sorted({int(w) for w in weeks})
+    rows_by_key = {}
+    if not weeks:
+        return rows_by_key
+
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    elo_ready = bool(_existing_tables(conn, ['hcl.ml_predictions_elo']))
+
+    _week_scope_rows(cur, """
+        SELECT
+            week,
+            COUNT(*) AS vegas__completed_games,
+            COUNT(*) FILTER (WHERE spread_line IS NOT NULL AND spread_line <> 0) AS vegas__scored_games,
+            COUNT(*) FILTER (
+                WHERE (spread_line > 0 AND home_score > away_score)
+                   OR (spread_line < 0 AND away_score > home_score)
+            ) AS vegas__correct_predictions
+        FROM hcl.games
+        WHERE season = %s
+          AND week = ANY(%s)
+          AND home_score IS NOT NULL
+          AND away_score IS NOT NULL
+          AND COALESCE(is_postseason, FALSE) = FALSE
+        GROUP BY week
+    """, (season, weeks), rows_by_key)
+
+    xgb_columns = []
+    for scope, spec in XGB_SCOPES.items():
+        xgb_columns.extend(_xgb_columns(scope, *spec))
+    _week_scope_rows(cur, f"""
+        SELECT
+            x.week,
+            {', '.join(xgb_columns)}
+        FROM hcl.ml_predictions x
+        JOIN hcl.games g ON g.game_id = x.game_id
+        WHERE x.season = %s
+          AND x.week = ANY(%s)
+          AND COALESCE(g.is_postseason, FALSE) = FALSE
+        GROUP BY x.week
+    """, (season, weeks), rows_by_key)
+
+    if elo_ready:
+        elo_columns = []
+        for scope, spec in ELO_SCOPES.items():
+            elo_columns.extend(_elo_columns(scope, *spec))
+        _week_scope_rows(cur, f"""
+            SELECT
+                e.week,
+                {', '.join(elo_columns)}
+            FROM hcl.ml_predictions_elo e
+            JOIN hcl.games g ON g.game_id = e.game_id
+            WHERE e.season = %s
+              AND e.week = ANY(%s)
+              AND COALESCE(g.is_postseason, FALSE) = FALSE
+            GROUP BY e.week
+        """, (season, weeks), rows_by_key)
+        _week_scope_rows(cur, _agreement_sql(), (season, weeks), rows_by_key)
+    cur.close()
+
+    return {key: counters for key, counters in rows_by_key.items() if any(counters.values())}
+
+
+def rebuild_weeks(conn, season, weeks):
+    """Replace every scope row of the given weeks inside the caller's transaction. Returns rows written."""
+    weeks = sorted({int(w) for w in weeks})
+    if not weeks:
+        return 0
+
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute(
+        f"SELECT week, source_version FROM {STATE_TABLE} WHERE season = %s AND week = ANY(%s)",
+        (season, weeks)
+    )
+    versions = {row['week']: row['source_version'] for row in cur.fetchall()}
+    rows_by_key = week_scope_counters(conn, season, weeks)
+
+    cur.execute(f"DELETE FROM {TABLE} WHERE season = %s AND week = ANY(%s)", (season, weeks))
+
+    columns = ['season', 'week', 'model'] + COUNTER_COLUMNS
+    placeholders = ', '.join(['%s'] * len(columns))
+    written = 0
+    for (week, scope), counters in sorted(rows_by_key.items()):
+        cur.execute(
+            f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({placeholders})",
+            [season, week, scope] + [counters.get(col, 0) for col in COUNTER_COLUMNS]
+        )
+        written += 1
+
+    for week in weeks:
+        version = versions.get(week, 1)
+        cur.execute(f"""
+            INSERT INTO {STATE_TABLE} AS s (season, week, source_version, built_version, refreshed_at)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON CONFLICT (season, week) DO UPDATE
+            SET built_version = GREATEST(s.built_version, EXCLUDED.built_version),
+                refreshed_at = NOW()
+        """, (season, week, version, version))
+    cur.close()
+    return written
+
+
+def refresh_model_performance(conn, seasons=None, full=False, wait=True):
+    """
+    Rebuild stale weeks (optionally limited to `seasons`, or every week with full=True).
+
+    Refreshes are serialized with an advisory lock; with wait=False a caller
+    that finds another refresh in progress skips it and returns {}.
+    Returns {season: [weeks rebuilt]}.
+    """
+    cur = conn.cursor()
+    if wait:
+        cur.execute(f"SELECT pg_advisory_xact_lock({_REFRESH_LOCK_KEY})")
+    else:
+        cur.execute(f"SELECT pg_try_advisory_xact_lock({_REFRESH_LOCK_KEY})")
+        if not cur.fetchone()[0]:
+            cur.close()
+            conn.rollback()
+            return {}
+
+    targets = {}
+    if full:
+        season_filter = 'WHERE season = ANY(%s)' if seasons is not None else ''
+        params = (sorted({int(s) for s in seasons}),) if seasons is not None else ()
+        cur.execute(f"""
+            SELECT season, week FROM {STATE_TABLE} {season_filter}
+            UNION
+            SELECT DISTINCT season, week FROM hcl.games {season_filter}
+        """, params * 2)
+        pairs = cur.fetchall()
+    else:
+        pairs = stale_weeks(conn, seasons)
+    cur.close()
+    for season, week in pairs:
+        if season is not None and week is not None:
+            targets.setdefault(season, []).append(week)
+
+    refreshed = {}
+    try:
+        for season in sorted(targets):
+            rebuild_weeks(conn, season, targets[season])
+            refreshed[season] = sorted(targets[season])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return refreshed
+
+
+def _totals_select(win_scale=2):
+    return f"""
+        SUM(completed_games)::int AS completed_games,
+        SUM(predicted_games)::int AS predicted_games,
+        SUM(scored_games)::int AS scored_games,
+        SUM(correct_predictions)::int AS correct_predictions,
+        COALESCE(CAST(SUM(correct_predictions) * 100.0 / NULLIF(SUM(scored_games), 0) AS NUMERIC(10,{win_scale})), 0) AS win_accuracy,
+        COALESCE(CAST(SUM(margin_error_sum) / NULLIF(SUM(margin_error_count), 0) AS NUMERIC(10,{win_scale})), 0) AS avg_margin_error,
+        SUM(spread_games)::int AS spread_games,
+        SUM(spread_ai_wins)::int AS spread_ai_wins,
+        SUM(spread_vegas_wins)::int AS spread_vegas_wins,
+        SUM(agreements)::int AS agreements,
+        SUM(agreed_correct)::int AS agreed_correct,
+        SUM(xgb_head_to_head_wins)::int AS xgb_head_to_head_wins,
+        SUM(elo_head_to_head_wins)::int AS elo_head_to_head_wins
+    """
+
+
+def _counter_values(conn, weeks_by_season):
+    """
+    {season: weeks} aggregated from the tracking tables as a VALUES list with
+    TABLE's columns. Returns (values sql, params), or (None, ()) for no rows.
+    """
+    rows = []
+    for season, weeks in sorted(weeks_by_season.items()):
+        for (source_week, scope), counters in sorted(week_scope_counters(conn, season, weeks).items()):
+            rows.append([season, source_week, scope] + [counters.get(col, 0) for col in COUNTER_COLUMNS])
+    if not rows:
+        return None, ()
+
+    placeholder = '(' + ', '.join(['%s'] * (3 + len(COUNTER_COLUMNS))) + ')'
+    return f"VALUES {', '.join([placeholder] * len(rows))}", tuple(value for row in rows for value in row)
+
+
+def _live_source(conn, seasons, week=None):
+    """
+    The rows TABLE would hold for `seasons`, aggregated from the tracking tables
+    as a VALUES list so the readers below run the same SQL over them.
+    Returns (from clause, params), or (None, ()) when there is nothing to read.
+    """
+    sources = _existing_tables(conn, SOURCE_TABLES)
+    cur = conn.cursor()
+    cur.execute(
+        ' UNION '.join(f"SELECT DISTINCT season, week FROM {table} WHERE season = ANY(%s)" for table in sources),
+        (sorted(seasons),) * len(sources)
+    )
+    weeks_by_season = {}
+    for season, source_week in cur.fetchall():
+        if source_week is not None and (week is None or source_week == week):
+            weeks_by_season.setdefault(season, []).append(source_week)
+    cur.close()
+
+    values, params = _counter_values(conn, weeks_by_season)
+    if values is None:
+        return None, ()
+    columns = ['season', 'week', 'model'] + COUNTER_COLUMNS
+    return f"({values}) AS live ({', '.join(columns)})", params
+
+
+def _current_source(conn, seasons, week=None):
+    """
+    TABLE with the weeks still marked stale replaced by live aggregates.
+
+    Writers that don't refresh (live score saves, backfills, loaders) leave
+    their weeks stale until the next refresh; readers must not serve the old
+    counters meanwhile. Returns (from clause, params).
+    """
+    pairs = [
+        (season, stale_week) for season, stale_week in stale_weeks(conn, seasons)
+        if week is None or stale_week == week
+    ]
+    if not pairs:
+        return TABLE, ()
+
+    weeks_by_season = {}
+    for season, stale_week in pairs:
+        weeks_by_season.setdefault(season, []).append(stale_week)
+    values, params = _counter_values(conn, weeks_by_season)
+
+    columns = ', '.join(['season', 'week', 'model'] + COUNTER_COLUMNS)
+    stale_list = ', '.join(['(%s, %s)'] * len(pairs))
+    built = f"SELECT {columns} FROM {TABLE} WHERE (season, week) NOT IN ({stale_list})"
+    pair_params = tuple(value for pair in pairs for value in pair)
+    if values is None:
+        return f"({built}) AS current_rows", pair_params
+    return (
+        f"({built} UNION ALL SELECT * FROM ({values}) AS live ({columns})) AS current_rows",
+        pair_params + params,
+    )
+
+
+def _source(conn, seasons, week, live):
+    if live:
+        return _live_source(conn, seasons, week)
+    return _current_source(conn, seasons, week)
+
+
+def fetch_performance_totals(conn, seasons, week=None, live=False):
+    """
+    Sum every scope over a season (or one week of it).
+
+    Returns {season: {model: totals}} with win_accuracy / avg_margin_error rounded
+    to 2 places like the live AVG queries, plus the first/latest scored week.
+    Scopes without rows are simply absent. live=True aggregates the tracking
+    tables instead of reading TABLE.
+    """
+    seasons = sorted({int(s) for s in seasons})
+    source, params = _source(conn, seasons, week, live)
+    if source is None:
+        return {}
+    params = list(params) + [seasons]
+    week_filter = ''
+    if week is not None:
+        week_filter = 'AND week = %s'
+        params.append(week)
+
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute(f"""
+        SELECT
+            season,
+            model,
+            {_totals_select()},
+            MIN(week) FILTER (WHERE scored_games > 0) AS first_week,
+            MAX(week) FILTER (WHERE scored_games > 0) AS latest_week
+        FROM {source}
+        WHERE season = ANY(%s)
+          {week_filter}
+        GROUP BY season, model
+    """, tuple(params))
+    totals = {}
+    for row in cur.fetchall():
+        totals.setdefault(row.pop('season'), {})[row.pop('model')] = dict(row)
+    cur.close()
+    return totals
+
+
+def fetch_performance_weeks(conn, season, models, week=None, live=False):
+    """Per-week scored rows ({model: [rows by week]}) with rates rounded to 1 place."""
+    weeks = {model: [] for model in models}
+    source, params = _source(conn, [season], week, live)
+    if source is None:
+        return weeks
+    params = list(params) + [season, list(models)]
+    week_filter = ''
+    if week is not None:
+        week_filter = 'AND week = %s'
+        params.append(week)
+
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute(f"""
+        SELECT
+            model,
+            week,
+            {_totals_select(win_scale=1)}
+        FROM {source}
+        WHERE season = %s
+          AND model = ANY(%s)
+          AND scored_games > 0
+          {week_filter}
+        GROUP BY model, week
+        ORDER BY model, week ASC
+    """, tuple(params))
+    for row in cur.fetchall():
+        weeks[row.pop('model')].append(dict(row))
+    cur.close()
+    return weeks
+
+
+def completed_seasons(conn, limit=None, live=False):
+    """Seasons with completed regular-season games, newest first."""
+    cur = conn.cursor()
+    if live:
+        cur.execute(f"""
+            SELECT season
+            FROM hcl.games
+            WHERE home_score IS NOT NULL
+              AND away_score IS NOT NULL
+              AND COALESCE(is_postseason, FALSE) = FALSE
+            GROUP BY season
+            ORDER BY season DESC
+            {'LIMIT %s' if limit else ''}
+        """, (limit,) if limit else ())
+    else:
+        source, params = _current_source(conn, None)
+        cur.execute(f"""
+            SELECT season
+            FROM {source}
+            WHERE model = 'vegas'
+            GROUP BY season
+            HAVING SUM(completed_games) > 0
+            ORDER BY season DESC
+            {'LIMIT %s' if limit else ''}
+        """, params + ((limit,) if limit else ()))
+    seasons = [row[0] for row in cur.fetchall()]
+    cur.close()
+    return seasons
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh hcl.model_performance_weekly')
+    parser.add_argument('--full', action='store_true', help='Rebuild every week')
+    parser.add_argument('--season', type=int, nargs='+', help='Limit the refresh to specific seasons')
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        dbname=os.getenv('DB_NAME', 'nfl_analytics'),
+        user=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD', ''),
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432')
+    )
+    try:
+        ensure_model_performance(conn)
+        refreshed = refresh_model_performance(conn, seasons=args.season, full=args.full)
+        if not refreshed:
+            print("[OK] Model performance aggregates already up to date")
+        for season, weeks in refreshed.items():
+            print(f"[OK] Rebuilt {season}: weeks {weeks[0]}-{weeks[-1]} ({len(weeks)} weeks)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Process-wide registry for the XGBoost prediction models.
+
+preload() loads xgb_winner/xgb_spread once and checks each model against its
+feature file. api_server calls it at import, so under `gunicorn --preload` the
+master loads the models before forking and every worker starts with them in
+memory, sharing the pages copy-on-write (gc.freeze() keeps the collector from
+dirtying them).
+
+Artifacts are fingerprinted by size + mtime. When a new model version lands in
+the model directory, each worker notices within MODEL_RELOAD_CHECK_SECONDS,
+loads and validates it on the side and swaps it in with one reference
+assignment. Requests already running finish on the bundle they started with;
+a version that fails to load or validate is rejected and the current one keeps
+serving.
+
+Environment:
+    ML_MODEL_DIR                 artifact directory (default: models/ next to this file)
+    MODEL_RELOAD_CHECK_SECONDS   how often to look for a new version (default 30, 0 disables)
+
+Usage:
+    from model_registry import model_registry
+    predictor = model_registry.get_predictor()
+"""
+
+import gc
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+import joblib
+
+MODEL_DIR = os.getenv('ML_MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+RELOAD_CHECK_SECONDS = float(os.getenv('MODEL_RELOAD_CHECK_SECONDS', '30'))
+
+WINNER_MODEL = 'xgb_winner.pkl'
+WINNER_FEATURES = 'xgb_winner_features.txt'
+SPREAD_MODEL = 'xgb_spread.pkl'
+SPREAD_FEATURES = 'xgb_spread_features.txt'
+XGB_ARTIFACTS = (WINNER_MODEL, WINNER_FEATURES, SPREAD_MODEL, SPREAD_FEATURES)
+
+
+def artifact_fingerprint(model_dir=MODEL_DIR):
+    """Short hash of the XGBoost artifacts' sizes and mtimes (changes with every deploy)."""
+    parts = []
+    for name in XGB_ARTIFACTS:
+        try:
+            stat = os.stat(os.path.join(model_dir, name))
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{name}:missing")
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+def read_feature_names(path):
+    with open(path, 'r') as f:
+        return [line.strip() for line in f.readlines() if line.strip()]
+
+
+def validate_features(model, feature_names, label):
+    """Raise ValueError when a model was trained on a different feature set than its feature file lists."""
+    expected = getattr(model, 'n_features_in_', None)
+    if expected is not None and expected != len(feature_names):
+        raise ValueError(f"{label}: model expects {expected} features, feature file lists {len(feature_names)}")
+
+    trained_names = getattr(model, 'feature_names_in_', None)
+    if trained_names is None and hasattr(model, 'get_booster'):
+        trained_names = model.get_booster().feature_names
+    if trained_names is not None and list(trained_names) != list(feature_names):
+        raise ValueError(f"{label}: feature file names/order differ from the names the model was trained on")
+
+
+class ModelBundle:
+    """One loaded, validated version of the winner and spread models."""
+
+    def __init__(self, model_dir=MODEL_DIR):
+        self.model_dir = model_dir
+        self.version = artifact_fingerprint(model_dir)
+        self.load_seconds = {}
+
+        started = time.perf_counter()
+        self.win_model = joblib.load(os.path.join(model_dir, WINNER_MODEL))
+        self.load_seconds[WINNER_MODEL] = time.perf_counter() - started
+        self.win_feature_names = read_feature_names(os.path.join(model_dir, WINNER_FEATURES))
+        validate_features(self.win_model, self.win_feature_names, WINNER_MODEL)
+
+        started = time.perf_counter()
+        self.spread_model = joblib.load(os.path.join(model_dir, SPREAD_MODEL))
+        self.load_seconds[SPREAD_MODEL] = time.perf_counter() - started
+        self.spread_feature_names = read_feature_names(os.path.join(model_dir, SPREAD_FEATURES))
+        validate_features(self.spread_model, self.spread_feature_names, SPREAD_MODEL)
+
+        self.loaded_at = datetime.now()
+        self.loaded_pid = os.getpid()
+        # Files changed while we were reading them; let the next check load it again
+        if artifact_fingerprint(model_dir) != self.version:
+            raise ValueError('model artifacts changed while loading')
+
+    def info(self):
+        return {
+            'version': self.version,
+            'model_dir': self.model_dir,
+            'loaded_at': self.loaded_at.isoformat(),
+            # Loaded before fork: the worker reads the master's pages
+            'shared_with_master': self.loaded_pid != os.getpid(),
+            'load_seconds': {name: round(seconds, 4) for name, seconds in self.load_seconds.items()},
+            'win_features': len(self.win_feature_names),
+            'spread_features': len(self.spread_feature_names),
+        }
+
+
+class ModelRegistry:
+    """Holds the current WeeklyPredictor and swaps it when a new model version is deployed."""
+
+    def __init__(self, model_dir=MODEL_DIR, reload_check_seconds=RELOAD_CHECK_SECONDS, connect=None):
+        self.model_dir = model_dir
+        # Connection factory handed to each WeeklyPredictor (the API sets db_pool.get_db_connection)
+        self.connect = connect
+        self.reload_check_seconds = reload_check_seconds
+        self._predictor = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._rejected_version = None
+        self._stats = {'loads': 0, 'swaps': 0, 'rejected': 0, 'last_error': None, 'preloaded_pid': None}
+
+    def _build_predictor(self):
+        try:
+            from predict_week import WeeklyPredictor
+        except ImportError:
+            from ml.predict_week import WeeklyPredictor
+        bundle = ModelBundle(self.model_dir)
+        predictor = WeeklyPredictor(bundle=bundle, connect=self.connect)
+        self._stats['loads'] += 1
+        return predictor
+
+    def preload(self):
+        """Load the models now (in the gunicorn master with --preload) and freeze them out of GC."""
+        self.get_predictor()
+        self._stats['preloaded_pid'] = os.getpid()
+        gc.freeze()
+        return self.info()
+
+    def get_predictor(self):
+        """Current WeeklyPredictor; loads on first use and picks up new versions on the check interval."""
+        predictor = self._predictor
+        if predictor is None:
+            with self._lock:
+                if self._predictor is None:
+                    self._predictor = self._build_predictor()
+                    self._last_check = time.monotonic()
+                return self._predictor
+        if self.reload_check_seconds > 0 and time.monotonic() - self._last_check >= self.reload_check_seconds:
+            self._check_for_new_version()
+        return self._predictor
+
+    def _check_for_new_version(self):
+        # Only one thread checks; the others keep serving the current bundle
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_check = time.monotonic()
+            version = artifact_fingerprint(self.model_dir)
+            if version in (self._predictor.bundle.version, self._rejected_version):
+                return
+            self._swap()
+        finally:
+            self._lock.release()
+
+    def _swap(self):
+        """Load a new bundle beside the current one and swap it in; caller holds _lock."""
+        previous = self._predictor.bundle.version if self._predictor is not None else None
+        try:
+            predictor = self._build_predictor()
+        except Exception as e:
+            self._rejected_version = artifact_fingerprint(self.model_dir)
+            self._stats['rejected'] += 1
+            self._stats['last_error'] = str(e)
+            print(f"⚠️  Rejected model version {self._rejected_version}: {e}")
+            return False
+        self._predictor = predictor
+        self._rejected_version = None
+        self._stats['swaps'] += 1
+        self._stats['last_error'] = None
+        print(f"✅ Swapped XGBoost models {previous} -> {predictor.bundle.version}")
+        return True
+
+    def reload(self):
+        """Load the artifacts on disk now; returns True when they were swapped in."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            return self._swap()
+
+    def version(self):
+        predictor = self._predictor
+        return predictor.bundle.version if predictor is not None else artifact_fingerprint(self.model_dir)
+
+    def info(self):
+        predictor = self._predictor
+        info = dict(self._stats)
+        info['pid'] = os.getpid()
+        info['reload_check_seconds'] = self.reload_check_seconds
+        info['current'] = predictor.bundle.info() if predictor is not None else None
+        return info
+
+
+model_registry = ModelRegistry()
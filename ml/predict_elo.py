@@ -22,13 +22,31 @@ from datetime import datetime
 from dotenv import load_dotenv
 from elo_ratings import EloRatingSystem
 from elo_tracker import EloTracker
+from prediction_writer import save_elo_predictions
 
 load_dotenv()
 
+# Columns predict_games copies from the input frame when present
+PASSTHROUGH_COLUMNS = ['game_id', 'season', 'week', 'game_date']
+
+PREDICTION_COLUMNS = [
+    'home_team', 'away_team', 'home_elo', 'away_elo', 'elo_diff',
+    'home_win_prob', 'away_win_prob', 'predicted_winner', 'confidence',
+    'elo_spread', 'vegas_spread', 'spread_diff', 'split_prediction', 'vegas_implied_prob',
+]
+
+
+def _rounded(values, digits, present=None):
+    """Python round() per value (matching predict_game), None where present is False"""
+    if present is None:
+        return [round(float(v), digits) for v in values]
+    return [round(float(v), digits) if ok else None for v, ok in zip(values, present)]
+
+
 class EloPredictionSystem:
     """Generate game predictions using Elo ratings"""
     
-    def __init__(self):
+    def __init__(self, connect=None):
         self.db_config = {
             'dbname': os.getenv('DB_NAME', 'nfl_analytics'),
             'user': os.getenv('DB_USER', 'postgres'),
@@ -36,9 +54,11 @@ class EloPredictionSystem:
             'host': os.getenv('DB_HOST', 'localhost'),
             'port': os.getenv('DB_PORT', '5432')
         }
+        # The API passes db_pool.get_db_connection; scripts open direct connections.
+        self._connect = connect or (lambda: psycopg2.connect(**self.db_config))
         
         # Initialize Elo tracker
-        self.tracker = EloTracker()
+        self.tracker = EloTracker(connect=connect)
         
         # Load current ratings
         ratings_file = 'ml/models/elo_ratings_current.json'
@@ -47,9 +67,9 @@ class EloPredictionSystem:
             print("   Run: python ml/elo_tracker.py --rebuild")
             self.tracker.initialize_all_teams()
     
-    def get_scheduled_games(self, season: int, week: int):
-        """Get games scheduled for a specific week"""
-        conn = psycopg2.connect(**self.db_config)
+    def get_scheduled_games(self, season: int, week: int = None):
+        """Get games scheduled for a specific week (or the whole season when week is None)"""
+        conn = self._connect()
         
         query = """
         SELECT 
@@ -65,11 +85,11 @@ class EloPredictionSystem:
             total_line
         FROM hcl.games
         WHERE season = %s 
-          AND week = %s
+          AND (%s IS NULL OR week = %s)
         ORDER BY game_date, game_id
         """
         
-        df = pd.read_sql(query, conn, params=(season, week))
+        df = pd.read_sql(query, conn, params=(season, week, week))
         conn.close()
         
         # Normalize team names
@@ -152,6 +172,82 @@ class EloPredictionSystem:
         
         return prediction
     
+    def predict_games(self, games_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict a batch of games (a week, a season, ...) in one vectorized pass
+
+        Args:
+            games_df: DataFrame with home_team and away_team, plus optional
+                spread_line and is_neutral columns. game_id, season, week and
+                game_date are copied through when present.
+
+        Returns:
+            DataFrame with one predict_game-style row per input row (same index);
+            Vegas-derived fields are None where spread_line is missing
+        """
+        passthrough = [c for c in PASSTHROUGH_COLUMNS if c in games_df.columns]
+        if len(games_df) == 0:
+            return pd.DataFrame(columns=passthrough + PREDICTION_COLUMNS)
+
+        elo = self.tracker.elo
+
+        # Normalize and rate each distinct team string once
+        raw_teams = pd.unique(pd.concat([games_df['home_team'], games_df['away_team']]))
+        canonical = {team: self.tracker.normalize_team(team) for team in raw_teams}
+        ratings = {team: elo.get_rating(team) for team in set(canonical.values())}
+
+        home_team = games_df['home_team'].map(canonical).to_numpy(dtype=object)
+        away_team = games_df['away_team'].map(canonical).to_numpy(dtype=object)
+        home_elo = np.array([ratings[t] for t in home_team], dtype=np.float64)
+        away_elo = np.array([ratings[t] for t in away_team], dtype=np.float64)
+
+        if 'is_neutral' in games_df.columns:
+            is_neutral = games_df['is_neutral'].fillna(False).astype(bool).to_numpy()
+        else:
+            is_neutral = np.zeros(len(games_df), dtype=bool)
+
+        # Same formulas as EloRatingSystem.predict_game / predict_spread
+        home_adj = home_elo + np.where(is_neutral, 0, elo.home_advantage)
+        home_win_prob = 1.0 / (1.0 + np.power(10.0, (away_elo - home_adj) / 400.0))
+        away_win_prob = 1.0 - home_win_prob
+        elo_spread = (home_adj - away_elo) / 25.0
+
+        home_pick = home_win_prob > 0.5
+        predicted_winner = np.where(home_pick, home_team, away_team)
+        confidence = np.where(home_pick, home_win_prob, away_win_prob)
+
+        if 'spread_line' in games_df.columns:
+            spread_line = pd.to_numeric(games_df['spread_line'], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            spread_line = np.full(len(games_df), np.nan)
+        has_line = ~np.isnan(spread_line)
+        spread_diff = np.abs(elo_spread - spread_line)
+
+        # Vegas spread to implied probability (approximate): spread of -3 ≈ 60% favorite
+        vegas_implied_prob = np.clip(0.5 + spread_line / 22.0, 0.1, 0.9)
+
+        # Split: Elo picks against the Vegas favorite by 3+ points of spread
+        split_prediction = has_line & (home_pick != (spread_line > 0)) & (spread_diff >= 3.0)
+
+        result = pd.DataFrame({c: games_df[c].to_numpy() for c in passthrough}, index=games_df.index)
+        result['home_team'] = home_team
+        result['away_team'] = away_team
+        result['home_elo'] = _rounded(home_elo, 1)
+        result['away_elo'] = _rounded(away_elo, 1)
+        result['elo_diff'] = _rounded(home_elo - away_elo, 1)
+        result['home_win_prob'] = _rounded(home_win_prob, 3)
+        result['away_win_prob'] = _rounded(away_win_prob, 3)
+        result['predicted_winner'] = predicted_winner
+        result['confidence'] = _rounded(confidence, 3)
+        result['elo_spread'] = _rounded(elo_spread, 1)
+        result['vegas_spread'] = pd.Series(_rounded(spread_line, 1, has_line), index=games_df.index, dtype=object)
+        result['spread_diff'] = pd.Series(_rounded(spread_diff, 1, has_line), index=games_df.index, dtype=object)
+        result['split_prediction'] = split_prediction.tolist()
+        result['vegas_implied_prob'] = pd.Series(
+            _rounded(vegas_implied_prob, 3, has_line), index=games_df.index, dtype=object
+        )
+        return result
+
     def predict_week(self, season: int, week: int, save_to_db: bool = True):
         """
         Predict all games for a specific week
@@ -177,32 +273,15 @@ class EloPredictionSystem:
         
         print(f"📊 Predicting {len(games_df)} games...\n")
         
-        predictions = []
-        
-        for _, game in games_df.iterrows():
-            # Check if game already played
-            if pd.notna(game['home_score']) and pd.notna(game['away_score']):
-                print(f"⏭️  {game['away_team']} @ {game['home_team']} - Already played")
-                continue
-            
-            # Neutral site detection (assume regular season games have home field)
-            is_neutral = False
-            
-            # Make prediction
-            pred = self.predict_game(
-                game['home_team'],
-                game['away_team'],
-                spread_line=game['spread_line'] if pd.notna(game['spread_line']) else None,
-                is_neutral=is_neutral
-            )
-            
-            pred['game_id'] = game['game_id']
+        played = games_df['home_score'].notna() & games_df['away_score'].notna()
+        for _, game in games_df[played].iterrows():
+            print(f"⏭️  {game['away_team']} @ {game['home_team']} - Already played")
+
+        predictions = self.predict_games(games_df[~played]).to_dict('records')
+        for pred in predictions:
             pred['season'] = season
             pred['week'] = week
-            pred['game_date'] = game['game_date']
-            
-            predictions.append(pred)
-            
+
             # Display prediction
             self._display_prediction(pred)
         
@@ -249,52 +328,15 @@ class EloPredictionSystem:
         """Save predictions to database"""
         print(f"\n💾 Saving {len(predictions)} predictions to database...")
         
-        conn = psycopg2.connect(**self.db_config)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        # Use upsert to handle existing predictions
-        insert_query = """
-        INSERT INTO hcl.ml_predictions_elo (
-            game_id, season, week, 
-            home_team, away_team,
-            home_elo, away_elo, elo_diff,
-            home_win_prob, away_win_prob,
-            predicted_winner, confidence,
-            elo_spread, vegas_spread, spread_diff,
-            split_prediction,
-            prediction_date
-        ) VALUES (
-            %(game_id)s, %(season)s, %(week)s,
-            %(home_team)s, %(away_team)s,
-            %(home_elo)s, %(away_elo)s, %(elo_diff)s,
-            %(home_win_prob)s, %(away_win_prob)s,
-            %(predicted_winner)s, %(confidence)s,
-            %(elo_spread)s, %(vegas_spread)s, %(spread_diff)s,
-            %(split_prediction)s,
-            NOW()
-        )
-        ON CONFLICT (game_id) 
-        DO UPDATE SET
-            home_elo = EXCLUDED.home_elo,
-            away_elo = EXCLUDED.away_elo,
-            elo_diff = EXCLUDED.elo_diff,
-            home_win_prob = EXCLUDED.home_win_prob,
-            away_win_prob = EXCLUDED.away_win_prob,
-            predicted_winner = EXCLUDED.predicted_winner,
-            confidence = EXCLUDED.confidence,
-            elo_spread = EXCLUDED.elo_spread,
-            vegas_spread = EXCLUDED.vegas_spread,
-            spread_diff = EXCLUDED.spread_diff,
-            split_prediction = EXCLUDED.split_prediction,
-            prediction_date = NOW()
-        """
-        
         try:
-            for pred in predictions:
-                cursor.execute(insert_query, pred)
+            saved = save_elo_predictions(cursor, predictions)
             
             conn.commit()
-            print(f"✅ Saved {len(predictions)} predictions")
+            print(f"✅ Saved {saved['rows']} predictions "
+                  f"({saved['inserted']} new, {saved['updated']} updated)")
             
         except Exception as e:
             conn.rollback()
@@ -307,7 +349,7 @@ class EloPredictionSystem:
     def predict_upcoming(self):
         """Predict next week's games"""
         # Find the current/next week with unplayed games
-        conn = psycopg2.connect(**self.db_config)
+        conn = self._connect()
         
         query = """
         SELECT season, week, COUNT(*) as game_count
@@ -18,7 +18,6 @@ from __future__ import annotations
 import psycopg2
 import pandas as pd
 import numpy as np
-import joblib
 import os
 import argparse
 import json
@@ -26,6 +25,15 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from team_rolling_features import fetch_team_rolling_features
+except ImportError:
+    from ml.team_rolling_features import fetch_team_rolling_features
+try:
+    from model_registry import ModelBundle
+except ImportError:
+    from ml.model_registry import ModelBundle
+
 load_dotenv()
 
 
@@ -56,10 +64,15 @@ def _resolve_ta078_runtime(summary_path: str | None = None):
 
     return float(bias), float(scale), str(candidate)
 
+def _round_scores(values, digits=1):
+    """Elementwise round() with Python's rounding so batched scores match the scalar path exactly."""
+    return np.array([round(float(value), digits) for value in np.asarray(values, dtype=float)], dtype=float)
+
+
 class WeeklyPredictor:
     """Predict NFL games for a given week using trained model"""
     
-    def __init__(self):
+    def __init__(self, bundle=None, connect=None):
         self.db_config = {
             'dbname': os.getenv('DB_NAME', 'nfl_analytics'),
             'user': os.getenv('DB_USER', 'postgres'),
@@ -67,23 +80,26 @@ class WeeklyPredictor:
             'host': os.getenv('DB_HOST', 'localhost'),
             'port': os.getenv('DB_PORT', '5432')
         }
-        
-        # Load XGBoost WIN/LOSS model (classification)
-        model_dir = 'ml/models'
-        self.win_model = joblib.load(f'{model_dir}/xgb_winner.pkl')
-        
-        with open(f'{model_dir}/xgb_winner_features.txt', 'r') as f:
-            self.win_feature_names = [line.strip() for line in f.readlines()]
-        
-        # Load XGBoost POINT SPREAD model (regression)
-        self.spread_model = joblib.load(f'{model_dir}/xgb_spread.pkl')
-        
-        with open(f'{model_dir}/xgb_spread_features.txt', 'r') as f:
-            self.spread_feature_names = [line.strip() for line in f.readlines()]
+        # The API passes db_pool.get_db_connection; scripts open direct connections.
+        self._connect = connect or (lambda: psycopg2.connect(**self.db_config))
+        
+        # XGBoost WIN/LOSS (classification) and POINT SPREAD (regression) models,
+        # validated against their feature files. The API passes the registry's
+        # preloaded bundle; scripts load ml/models directly.
+        if bundle is None:
+            bundle = ModelBundle()
+        self.bundle = bundle
+        self.win_model = bundle.win_model
+        self.win_feature_names = bundle.win_feature_names
+        self.spread_model = bundle.spread_model
+        self.spread_feature_names = bundle.spread_feature_names
 
         # Optional TA-078 runtime calibration. Defaults preserve current behavior.
         self.ai_spread_cal_bias = float(os.getenv('AI_SPREAD_CAL_BIAS', '0') or '0')
         self.ai_spread_cal_scale = float(os.getenv('AI_SPREAD_CAL_SCALE', '1') or '1')
+
+        # Read pre-game team stats from hcl.team_rolling_features when it exists.
+        self.use_rolling_features = os.getenv('TEAM_ROLLING_FEATURES', '1') != '0'
         
         print(f"[OK] Loaded XGBoost win/loss model with {len(self.win_feature_names)} features")
         print(f"[OK] Loaded XGBoost point spread model with {len(self.spread_feature_names)} features")
@@ -93,27 +109,29 @@ class WeeklyPredictor:
                 f"(scale={self.ai_spread_cal_scale}, bias={self.ai_spread_cal_bias})"
             )
 
-    def estimate_independent_total(self, features):
-        """Estimate game total from team performance features, independent of vegas_total."""
-        home_ppg = float(features.get('home_ppg', 20.0))
-        away_ppg = float(features.get('away_ppg', 20.0))
-        home_ypp = float(features.get('home_ypp', 5.0))
-        away_ypp = float(features.get('away_ypp', 5.0))
-        home_success = float(features.get('home_success', 45.0))
-        away_success = float(features.get('away_success', 45.0))
-        home_epa = float(features.get('home_epa', 0.0))
-        away_epa = float(features.get('away_epa', 0.0))
-        home_explosive = float(features.get('home_explosive', 10.0))
-        away_explosive = float(features.get('away_explosive', 10.0))
-        home_turnovers = float(features.get('home_turnovers', 1.0))
-        away_turnovers = float(features.get('away_turnovers', 1.0))
-
-        offense_total = home_ppg + away_ppg
-        ypp_component = ((home_ypp + away_ypp) - 10.0) * 2.4
-        success_component = ((home_success + away_success) - 90.0) * 0.18
-        epa_component = (home_epa + away_epa) * 20.0
-        explosive_component = ((home_explosive + away_explosive) - 20.0) * 0.15
-        turnover_drag = ((home_turnovers + away_turnovers) - 2.0) * 1.6
+    # Feature name -> fallback used when a column is absent from the feature frame.
+    TOTAL_FEATURE_DEFAULTS = {
+        'home_ppg': 20.0, 'away_ppg': 20.0,
+        'home_ypp': 5.0, 'away_ypp': 5.0,
+        'home_success': 45.0, 'away_success': 45.0,
+        'home_epa': 0.0, 'away_epa': 0.0,
+        'home_explosive': 10.0, 'away_explosive': 10.0,
+        'home_turnovers': 1.0, 'away_turnovers': 1.0,
+    }
+
+    def estimate_independent_totals(self, feature_frame):
+        """Vectorized game-total estimate for every row of a feature frame (independent of vegas_total)."""
+        def col(name):
+            if name in feature_frame:
+                return feature_frame[name].to_numpy(dtype=float)
+            return np.full(len(feature_frame), self.TOTAL_FEATURE_DEFAULTS[name])
+
+        offense_total = col('home_ppg') + col('away_ppg')
+        ypp_component = ((col('home_ypp') + col('away_ypp')) - 10.0) * 2.4
+        success_component = ((col('home_success') + col('away_success')) - 90.0) * 0.18
+        epa_component = (col('home_epa') + col('away_epa')) * 20.0
+        explosive_component = ((col('home_explosive') + col('away_explosive')) - 20.0) * 0.15
+        turnover_drag = ((col('home_turnovers') + col('away_turnovers')) - 2.0) * 1.6
 
         total_estimate = (
             offense_total
@@ -124,11 +142,16 @@ class WeeklyPredictor:
             - turnover_drag
         )
 
-        return float(np.clip(total_estimate, 28.0, 62.0))
+        return np.clip(total_estimate, 28.0, 62.0)
+
+    def estimate_independent_total(self, features):
+        """Estimate game total from team performance features, independent of vegas_total."""
+        frame = pd.DataFrame([{key: features.get(key, default) for key, default in self.TOTAL_FEATURE_DEFAULTS.items()}])
+        return float(self.estimate_independent_totals(frame)[0])
     
     def fetch_schedule(self, season, week):
         """Fetch games scheduled for the given week"""
-        conn = psycopg2.connect(**self.db_config)
+        conn = self._connect()
         
         query = """
             SELECT
@@ -158,84 +181,152 @@ class WeeklyPredictor:
         
         return df
     
-    def fetch_team_cumulative_stats(self, season, week, team):
-        """Fetch pre-game team stats with prior-season carryover for early-season weeks."""
-        stats_keys = [
-            'avg_ppg', 'avg_yards', 'avg_pass_yards', 'avg_rush_yards', 'avg_ypp',
-            'avg_turnovers', 'avg_3rd_pct', 'avg_rz_pct', 'avg_epa', 'avg_success',
-            'avg_pass_epa', 'avg_rush_epa', 'avg_cpoe', 'avg_pass_success',
-            'avg_rush_success', 'avg_comp_pct', 'avg_qb_rating', 'avg_ints',
-            'avg_sacks', 'avg_ypc', 'avg_explosive', 'avg_top'
-        ]
-
-        def _fetch_stat_row(conn, target_season, target_team, week_limit=None):
-            week_clause = ''
-            params = [target_season, target_team]
-            if week_limit is not None:
-                week_clause = 'AND g.week < %s'
-                params.append(week_limit)
-
-            query = f"""
-                WITH game_stats AS (
-                    SELECT
-                        tgs.points, tgs.total_yards, tgs.passing_yards, tgs.rushing_yards,
-                        tgs.yards_per_play, tgs.turnovers, tgs.third_down_pct, tgs.red_zone_pct,
-                        tgs.epa_per_play, tgs.success_rate, tgs.pass_epa, tgs.rush_epa,
-                        tgs.cpoe, tgs.pass_success_rate, tgs.rush_success_rate,
-                        tgs.completion_pct, tgs.qb_rating, tgs.interceptions, tgs.sacks_taken,
-                        tgs.yards_per_carry, tgs.explosive_play_pct, tgs.time_of_possession_pct
-                    FROM hcl.team_game_stats tgs
-                    JOIN hcl.games g ON tgs.game_id = g.game_id
-                    WHERE g.season = %s
-                      AND tgs.team = %s
-                      AND COALESCE(g.is_postseason, FALSE) = FALSE
-                      {week_clause}
-                )
-                SELECT
-                    COUNT(*) AS games_played,
-                    AVG(points) as avg_ppg,
-                    AVG(total_yards) as avg_yards,
-                    AVG(passing_yards) as avg_pass_yards,
-                    AVG(rushing_yards) as avg_rush_yards,
-                    AVG(yards_per_play) as avg_ypp,
-                    AVG(turnovers) as avg_turnovers,
-                    AVG(third_down_pct) as avg_3rd_pct,
-                    AVG(red_zone_pct) as avg_rz_pct,
-                    AVG(epa_per_play) as avg_epa,
-                    AVG(success_rate) as avg_success,
-                    AVG(pass_epa) as avg_pass_epa,
-                    AVG(rush_epa) as avg_rush_epa,
-                    AVG(cpoe) as avg_cpoe,
-                    AVG(pass_success_rate) as avg_pass_success,
-                    AVG(rush_success_rate) as avg_rush_success,
-                    AVG(completion_pct) as avg_comp_pct,
-                    AVG(qb_rating) as avg_qb_rating,
-                    AVG(interceptions) as avg_ints,
-                    AVG(sacks_taken) as avg_sacks,
-                    AVG(yards_per_carry) as avg_ypc,
-                    AVG(explosive_play_pct) as avg_explosive,
-                    AVG(time_of_possession_pct) as avg_top
-                FROM game_stats
-            """
+    def fetch_season_schedule(self, season):
+        """Fetch every regular-season game of a season, ordered by week then kickoff"""
+        conn = self._connect()
+        
+        query = """
+            SELECT
+                game_id,
+                season,
+                week,
+                home_team,
+                away_team,
+                game_date,
+                kickoff_time_utc,
+                home_score,
+                away_score,
+                spread_line,
+                total_line,
+                home_moneyline,
+                away_moneyline,
+                is_postseason
+            FROM hcl.games
+            WHERE season = %s
+            AND is_postseason = false
+            ORDER BY week, game_date, kickoff_time_utc;
+        """
+        
+        df = pd.read_sql(query, conn, params=(season,))
+        conn.close()
+        
+        return df
+    
+    TEAM_STAT_KEYS = [
+        'avg_ppg', 'avg_yards', 'avg_pass_yards', 'avg_rush_yards', 'avg_ypp',
+        'avg_turnovers', 'avg_3rd_pct', 'avg_rz_pct', 'avg_epa', 'avg_success',
+        'avg_pass_epa', 'avg_rush_epa', 'avg_cpoe', 'avg_pass_success',
+        'avg_rush_success', 'avg_comp_pct', 'avg_qb_rating', 'avg_ints',
+        'avg_sacks', 'avg_ypc', 'avg_explosive', 'avg_top'
+    ]
+
+    def fetch_week_team_stats(self, season, week, teams=None, conn=None):
+        """
+        Fetch blended pre-game stats for every team in a (season, week).
 
-            df = pd.read_sql(query, conn, params=tuple(params))
-            if len(df) == 0:
-                return None, 0
+        Returns {team: stats_dict_or_None} using the same current-season (weeks
+        before `week`) plus prior-season carryover blend as fetch_team_cumulative_stats.
+        Reads the last build of hcl.team_rolling_features when the week is
+        materialized (writers keep it fresh), otherwise aggregates team_game_stats
+        in one query.
+        """
+        owns_conn = conn is None
+        if owns_conn:
+            conn = self._connect()
+        try:
+            if self.use_rolling_features:
+                try:
+                    stats = fetch_team_rolling_features(conn, season, week, teams)
+                except psycopg2.errors.UndefinedTable:
+                    conn.rollback()
+                    self.use_rolling_features = False
+                    print("[WARN] hcl.team_rolling_features not found; aggregating team_game_stats directly")
+                    stats = None
+                if stats is not None:
+                    return stats
+            return self._aggregate_week_team_stats(season, week, teams, conn)
+        finally:
+            if owns_conn:
+                conn.close()
+
+    def _aggregate_week_team_stats(self, season, week, teams, conn):
+        """Aggregate blended pre-game stats for a (season, week) straight from team_game_stats."""
+        team_filter = ''
+        params = [season, season, week, season - 1]
+        if teams is not None:
+            teams = sorted({t for t in teams if t})
+            if not teams:
+                return {}
+            team_filter = 'AND tgs.team = ANY(%s)'
+            params.append(teams)
+
+        query = f"""
+            SELECT
+                tgs.team,
+                (g.season = %s) AS is_current,
+                COUNT(*) AS games_played,
+                AVG(tgs.points) as avg_ppg,
+                AVG(tgs.total_yards) as avg_yards,
+                AVG(tgs.passing_yards) as avg_pass_yards,
+                AVG(tgs.rushing_yards) as avg_rush_yards,
+                AVG(tgs.yards_per_play) as avg_ypp,
+                AVG(tgs.turnovers) as avg_turnovers,
+                AVG(tgs.third_down_pct) as avg_3rd_pct,
+                AVG(tgs.red_zone_pct) as avg_rz_pct,
+                AVG(tgs.epa_per_play) as avg_epa,
+                AVG(tgs.success_rate) as avg_success,
+                AVG(tgs.pass_epa) as avg_pass_epa,
+                AVG(tgs.rush_epa) as avg_rush_epa,
+                AVG(tgs.cpoe) as avg_cpoe,
+                AVG(tgs.pass_success_rate) as avg_pass_success,
+                AVG(tgs.rush_success_rate) as avg_rush_success,
+                AVG(tgs.completion_pct) as avg_comp_pct,
+                AVG(tgs.qb_rating) as avg_qb_rating,
+                AVG(tgs.interceptions) as avg_ints,
+                AVG(tgs.sacks_taken) as avg_sacks,
+                AVG(tgs.yards_per_carry) as avg_ypc,
+                AVG(tgs.explosive_play_pct) as avg_explosive,
+                AVG(tgs.time_of_possession_pct) as avg_top
+            FROM hcl.team_game_stats tgs
+            JOIN hcl.games g ON tgs.game_id = g.game_id
+            WHERE ((g.season = %s AND g.week < %s) OR g.season = %s)
+              AND COALESCE(g.is_postseason, FALSE) = FALSE
+              {team_filter}
+            GROUP BY tgs.team, g.season
+        """
 
-            row = df.iloc[0].to_dict()
-            games_played = int(row.get('games_played') or 0)
+        cur = conn.cursor()
+        cur.execute(query, tuple(params))
+        columns = [desc[0] for desc in cur.description]
+        rows = cur.fetchall()
+        cur.close()
+
+        current_by_team = {}
+        prior_by_team = {}
+        for raw in rows:
+            row = dict(zip(columns, raw))
+            games_played = int(row.pop('games_played') or 0)
+            team = row.pop('team')
+            is_current = row.pop('is_current')
             if games_played == 0 or row.get('avg_ppg') is None:
-                return None, 0
-
-            return row, games_played
+                continue
+            # AVG over integer columns comes back as Decimal; match pandas' float coercion.
+            stats = {key: (float(value) if value is not None else None) for key, value in row.items()}
+            stats['games_played'] = games_played
+            if is_current:
+                current_by_team[team] = (stats, games_played)
+            else:
+                prior_by_team[team] = stats
 
-        conn = psycopg2.connect(**self.db_config)
-        try:
-            current_stats, current_games = _fetch_stat_row(conn, season, team, week_limit=week)
-            prior_stats, _ = _fetch_stat_row(conn, season - 1, team)
-        finally:
-            conn.close()
+        result_teams = teams if teams is not None else sorted(set(current_by_team) | set(prior_by_team))
+        results = {}
+        for team in result_teams:
+            current_stats, current_games = current_by_team.get(team, (None, 0))
+            results[team] = self._blend_team_stats(current_stats, current_games, prior_by_team.get(team))
+        return results
 
+    def _blend_team_stats(self, current_stats, current_games, prior_stats):
+        """Blend current-season averages with prior-season carryover for early-season weeks."""
         if current_stats is None and prior_stats is None:
             return None
 
@@ -251,7 +342,7 @@ class WeeklyPredictor:
         prior_weight = 1.0 - current_weight
 
         blended = {}
-        for key in stats_keys:
+        for key in self.TEAM_STAT_KEYS:
             current_value = current_stats.get(key)
             prior_value = prior_stats.get(key)
 
@@ -268,14 +359,22 @@ class WeeklyPredictor:
             blended[key] = (float(current_value) * current_weight) + (float(prior_value) * prior_weight)
 
         return blended
+
+    def fetch_team_cumulative_stats(self, season, week, team):
+        """Fetch pre-game team stats with prior-season carryover for early-season weeks."""
+        return self.fetch_week_team_stats(season, week, [team]).get(team)
     
-    def compute_rolling_features(self, season, week, home_team, away_team):
+    def compute_rolling_features(self, season, week, home_team, away_team, team_stats=None):
         """
         Compute features matching the 46-feature XGBoost model
+
+        team_stats: optional {team: stats} map from fetch_week_team_stats; when
+        omitted, both teams are fetched together in a single query.
         """
-        # Fetch cumulative stats for both teams
-        home_stats = self.fetch_team_cumulative_stats(season, week, home_team)
-        away_stats = self.fetch_team_cumulative_stats(season, week, away_team)
+        if team_stats is None:
+            team_stats = self.fetch_week_team_stats(season, week, [home_team, away_team])
+        home_stats = team_stats.get(home_team)
+        away_stats = team_stats.get(away_team)
         
         # Default values (league averages) if no prior games
         defaults = {
@@ -317,134 +416,246 @@ class WeeklyPredictor:
         
         return features
     
-    def predict_game(self, season, week, home_team, away_team, spread_line=None, total_line=None):
+    def predict_game(self, season, week, home_team, away_team, spread_line=None, total_line=None,
+                     team_stats=None):
         """
         Predict outcome of a single game using BOTH models
         Returns: dict with win probability, predicted scores, and point differential
         """
-        # Compute features
-        features = self.compute_rolling_features(season, week, home_team, away_team)
-        
+        frame = self.build_games_frame([{
+            'season': season,
+            'week': week,
+            'home_team': home_team,
+            'away_team': away_team,
+            'spread_line': spread_line,
+            'total_line': total_line,
+        }])
+        team_stats_by_week = None
+        if team_stats is not None:
+            team_stats_by_week = {(int(season), int(week)): team_stats}
+        prediction = self.predict_games(frame, team_stats_by_week=team_stats_by_week)[0]
+        if prediction is None:
+            raise ValueError(f"Cannot build features for {away_team} @ {home_team} ({season} week {week})")
+        return prediction
+
+    GAME_FRAME_COLUMNS = ['season', 'week', 'home_team', 'away_team', 'spread_line', 'total_line']
+
+    @classmethod
+    def build_games_frame(cls, games):
+        """
+        Build a predict_games input frame from dict rows.
+
+        Object dtype keeps missing lines as None (model defaults) instead of
+        letting pandas coerce them to NaN.
+        """
+        return pd.DataFrame(
+            [{column: game.get(column) for column in cls.GAME_FRAME_COLUMNS} for game in games],
+            columns=cls.GAME_FRAME_COLUMNS,
+            dtype=object
+        )
+
+    def _team_stats_for_frame(self, records):
+        """Fetch {(season, week): {team: stats}} for every slate in the batch over one connection."""
+        teams_by_week = {}
+        for rec in records:
+            try:
+                key = (int(rec['season']), int(rec['week']))
+            except (TypeError, ValueError):
+                continue  # predict_games skips the row
+            teams_by_week.setdefault(key, set()).update((rec['home_team'], rec['away_team']))
+
+        conn = self._connect()
+        try:
+            return {
+                (season, week): self.fetch_week_team_stats(season, week, teams, conn=conn)
+                for (season, week), teams in teams_by_week.items()
+            }
+        finally:
+            conn.close()
+
+    def _game_feature_row(self, rec, team_stats_by_week):
+        """Model features for one game row; raises ValueError when the row can't be scored."""
+        home_team = rec.get('home_team')
+        away_team = rec.get('away_team')
+        if not isinstance(home_team, str) or not isinstance(away_team, str) or not home_team or not away_team:
+            raise ValueError(f"missing team ({away_team} @ {home_team})")
+        try:
+            season, week = int(rec['season']), int(rec['week'])
+        except (TypeError, ValueError):
+            raise ValueError(f"bad season/week ({rec.get('season')}, {rec.get('week')})")
+
+        features = self.compute_rolling_features(
+            season,
+            week,
+            home_team,
+            away_team,
+            team_stats=team_stats_by_week.get((season, week), {})
+        )
+
         # Add betting lines if available
+        spread_line = rec.get('spread_line')
+        total_line = rec.get('total_line')
         if 'spread_line' in self.win_feature_names:
             features['spread_line'] = spread_line if spread_line is not None else 0.0
         if 'total_line' in self.win_feature_names:
             features['total_line'] = total_line if total_line is not None else 44.0
-        
-        # PREDICT WIN/LOSS (XGBoost Classification)
-        X_win = np.array([[features.get(name, 0.0) for name in self.win_feature_names]])
-        
-        win_prediction = self.win_model.predict(X_win)[0]  # 1 = home win, 0 = away win
-        win_confidence = self.win_model.predict_proba(X_win)[0]
-        
-        # PREDICT POINT SPREAD (XGBoost Regression)
-        X_spread = np.array([[features.get(name, 0.0) for name in self.spread_feature_names]])
-        
-        predicted_margin = self.spread_model.predict(X_spread)[0]  # Positive = home favored
-        
+
+        # NaN lines are passed to the models as missing; anything else must be a finite number.
+        for name in set(self.win_feature_names) | set(self.spread_feature_names):
+            try:
+                value = float(features.get(name, 0.0))
+            except (TypeError, ValueError):
+                raise ValueError(f"non-numeric {name}={features.get(name)!r}")
+            if np.isinf(value):
+                raise ValueError(f"infinite {name}")
+        return features
+
+    def predict_games(self, frame, team_stats_by_week=None):
+        """
+        Predict a batch of games with one call per model.
+
+        frame: DataFrame with season, week, home_team, away_team, spread_line and
+        total_line columns (one row per game, any mix of weeks/seasons).
+        team_stats_by_week: optional {(season, week): {team: stats}} to skip the DB fetch.
+
+        Returns a list of predict_game-style dicts in frame row order. A spread/total
+        of None falls back to the model defaults; NaN is passed through as missing.
+        Rows that can't be turned into features (no team, bad week, non-numeric
+        line) get None instead of failing the whole batch.
+        """
+        if frame is None or len(frame) == 0:
+            return []
+
+        records = frame.to_dict('records')
+        if team_stats_by_week is None:
+            team_stats_by_week = self._team_stats_for_frame(records)
+
+        results = [None] * len(records)
+        feature_rows = []
+        row_indexes = []
+        for idx, rec in enumerate(records):
+            try:
+                features = self._game_feature_row(rec, team_stats_by_week)
+            except ValueError as e:
+                print(f"[WARN] Skipping {rec.get('away_team')} @ {rec.get('home_team')} "
+                      f"({rec.get('season')} week {rec.get('week')}): {e}")
+                continue
+            feature_rows.append(features)
+            row_indexes.append(idx)
+
+        if not feature_rows:
+            return results
+        records = [records[idx] for idx in row_indexes]
+
+        features_df = pd.DataFrame(feature_rows)
+
+        # Model inputs follow the persisted feature order; unknown names are zero-filled.
+        X_win = features_df.reindex(columns=self.win_feature_names, fill_value=0.0).to_numpy(dtype=float)
+        X_spread = features_df.reindex(columns=self.spread_feature_names, fill_value=0.0).to_numpy(dtype=float)
+
+        # PREDICT WIN/LOSS (XGBoost Classification) - 1 = home win, 0 = away win
+        win_predictions = self.win_model.predict(X_win)
+        win_confidences = self.win_model.predict_proba(X_win)
+
+        # PREDICT POINT SPREAD (XGBoost Regression) - positive = home favored
+        raw_margins = self.spread_model.predict(X_spread)
+        predicted_margins = raw_margins.astype(float)
+
         # Derive total from model features instead of anchoring to vegas_total.
-        independent_total = round(self.estimate_independent_total(features), 1)
-        predicted_home_score = round((independent_total + predicted_margin) / 2, 1)
-        predicted_away_score = round((independent_total - predicted_margin) / 2, 1)
+        independent_totals = _round_scores(self.estimate_independent_totals(features_df))
+        predicted_home_scores = _round_scores((independent_totals + predicted_margins) / 2)
+        predicted_away_scores = _round_scores((independent_totals - predicted_margins) / 2)
 
         # Keep both team scores non-negative while preserving score differential.
-        min_score = min(predicted_home_score, predicted_away_score)
-        if min_score < 0:
-            predicted_home_score = round(predicted_home_score - min_score, 1)
-            predicted_away_score = round(predicted_away_score - min_score, 1)
-            independent_total = round(predicted_home_score + predicted_away_score, 1)
-        
+        min_scores = np.minimum(predicted_home_scores, predicted_away_scores)
+        negative = min_scores < 0
+        if negative.any():
+            predicted_home_scores[negative] = _round_scores(predicted_home_scores[negative] - min_scores[negative])
+            predicted_away_scores[negative] = _round_scores(predicted_away_scores[negative] - min_scores[negative])
+            independent_totals[negative] = _round_scores(
+                predicted_home_scores[negative] + predicted_away_scores[negative]
+            )
+
         # AI-generated spread (negative means home favored)
-        raw_ai_spread = -predicted_margin
-        ai_spread = (raw_ai_spread * self.ai_spread_cal_scale) + self.ai_spread_cal_bias
-        
-        # Headline winner should come from the winner classifier output.
-        classifier_predicted_winner = home_team if win_prediction == 1 else away_team
-        
-        # Compare to Vegas spread
-        spread_difference = None
-        if spread_line is not None:
-            spread_difference = round(ai_spread - spread_line, 1)
-        
-        # Build comprehensive result
-        result = {
-            'home_team': home_team,
-            'away_team': away_team,
-            
-            # Win/Loss prediction from classification model
-            'win_model_prediction': home_team if win_prediction == 1 else away_team,
-            'home_win_prob': float(win_confidence[1]),
-            'away_win_prob': float(win_confidence[0]),
-            'confidence': float(max(win_confidence)),
-            
-            # Headline winner is sourced from the winner classifier.
-            'predicted_winner': classifier_predicted_winner,
-            
-            # Score predictions
-            'predicted_home_score': float(predicted_home_score),
-            'predicted_away_score': float(predicted_away_score),
-            'predicted_total': float(independent_total),
-            'predicted_margin': float(predicted_margin),
-            
-            # Spread analysis
-            'raw_ai_spread': float(raw_ai_spread),
-            'ai_spread': float(ai_spread),
-            'vegas_spread': float(spread_line) if spread_line is not None else None,
-            'spread_difference': float(spread_difference) if spread_difference is not None else None,
-            'total_line': float(total_line) if total_line is not None else None,
-            
-            # Key factors
-            'key_factors': {
-                'home_epa': features.get('home_epa', 0),
-                'away_epa': features.get('away_epa', 0),
-                'epa_advantage': features.get('epa_differential', 0),
-                'home_recent_epa': features.get('home_epa_l3', 0),
-                'away_recent_epa': features.get('away_epa_l3', 0),
+        raw_ai_spreads = -predicted_margins
+        ai_spreads = (raw_ai_spreads * self.ai_spread_cal_scale) + self.ai_spread_cal_bias
+
+        for idx, rec in enumerate(records):
+            home_team = rec['home_team']
+            away_team = rec['away_team']
+            spread_line = rec.get('spread_line')
+            total_line = rec.get('total_line')
+            features = feature_rows[idx]
+            win_prediction = win_predictions[idx]
+            win_confidence = win_confidences[idx]
+            ai_spread = ai_spreads[idx]
+
+            # Headline winner should come from the winner classifier output.
+            classifier_predicted_winner = home_team if win_prediction == 1 else away_team
+
+            # Compare to Vegas spread
+            spread_difference = None
+            if spread_line is not None:
+                spread_difference = round(ai_spread - spread_line, 1)
+
+            results[row_indexes[idx]] = {
+                'home_team': home_team,
+                'away_team': away_team,
+
+                # Win/Loss prediction from classification model
+                'win_model_prediction': home_team if win_prediction == 1 else away_team,
+                'home_win_prob': float(win_confidence[1]),
+                'away_win_prob': float(win_confidence[0]),
+                'confidence': float(max(win_confidence)),
+
+                # Headline winner is sourced from the winner classifier.
+                'predicted_winner': classifier_predicted_winner,
+
+                # Score predictions
+                'predicted_home_score': float(predicted_home_scores[idx]),
+                'predicted_away_score': float(predicted_away_scores[idx]),
+                'predicted_total': float(independent_totals[idx]),
+                'predicted_margin': float(raw_margins[idx]),
+
+                # Spread analysis
+                'raw_ai_spread': float(raw_ai_spreads[idx]),
+                'ai_spread': float(ai_spread),
+                'vegas_spread': float(spread_line) if spread_line is not None else None,
+                'spread_difference': float(spread_difference) if spread_difference is not None else None,
+                'total_line': float(total_line) if total_line is not None else None,
+
+                # Key factors
+                'key_factors': {
+                    'home_epa': features.get('home_epa', 0),
+                    'away_epa': features.get('away_epa', 0),
+                    'epa_advantage': features.get('epa_differential', 0),
+                    'home_recent_epa': features.get('home_epa_l3', 0),
+                    'away_recent_epa': features.get('away_epa_l3', 0),
+                }
             }
-        }
-        
-        return result
-    
-    def predict_week(self, season, week):
-        """Predict all games for a given week"""
-        print(f"\n{'='*80}")
-        print(f"PREDICTING WEEK {week} of {season} SEASON")
-        print(f"{'='*80}\n")
-        
-        # Fetch schedule
-        schedule = self.fetch_schedule(season, week)
-        
+
+        return results
+
+    def predict_schedule(self, schedule):
+        """Predict every row of a fetch_schedule-style frame in one batch and attach game metadata."""
         if len(schedule) == 0:
-            print(f"[ERROR] No games found for Week {week}")
             return []
-        
-        print(f"Found {len(schedule)} games\n")
-        
-        predictions = []
-        
-        for idx, game in schedule.iterrows():
-            print(f"Predicting: {game['away_team']} @ {game['home_team']}")
-            
-            # Use stored spread orientation directly to match training feature semantics.
-            raw_spread = game.get('spread_line')
-            model_spread_line = raw_spread if raw_spread is not None else None
-            
-            result = self.predict_game(
-                season=season,
-                week=week,
-                home_team=game['home_team'],
-                away_team=game['away_team'],
-                spread_line=model_spread_line,
-                total_line=game.get('total_line')
-            )
 
+        frame = schedule[self.GAME_FRAME_COLUMNS]
+        results = self.predict_games(frame)
+
+        predictions = []
+        for game, result in zip(schedule.to_dict('records'), results):
+            if result is None:
+                continue
             # Persist vegas spread using the historical ml_predictions convention.
+            raw_spread = game.get('spread_line')
             result['vegas_spread'] = float(-raw_spread) if raw_spread is not None else None
             
             # Add game metadata
             result['game_id'] = game['game_id']
-            result['season'] = season
-            result['week'] = week
+            result['season'] = int(game['season'])
+            result['week'] = int(game['week'])
             result['game_date'] = str(game['game_date']) if pd.notna(game['game_date']) else None
             result['kickoff_time'] = str(game['kickoff_time_utc']) if pd.notna(game['kickoff_time_utc']) else None
             
@@ -462,6 +673,32 @@ class WeeklyPredictor:
                 result['status'] = 'scheduled'
             
             predictions.append(result)
+
+        return predictions
+
+    def predict_season(self, season):
+        """Predict every regular-season game of a season in a single batch."""
+        return self.predict_schedule(self.fetch_season_schedule(season))
+
+    def predict_week(self, season, week):
+        """Predict all games for a given week"""
+        print(f"\n{'='*80}")
+        print(f"PREDICTING WEEK {week} of {season} SEASON")
+        print(f"{'='*80}\n")
+        
+        # Fetch schedule
+        schedule = self.fetch_schedule(season, week)
+        
+        if len(schedule) == 0:
+            print(f"[ERROR] No games found for Week {week}")
+            return []
+        
+        print(f"Found {len(schedule)} games\n")
+        
+        predictions = self.predict_schedule(schedule)
+        
+        for result in predictions:
+            print(f"Predicting: {result['away_team']} @ {result['home_team']}")
             
             # Print summary
             winner = result['predicted_winner']
@@ -487,7 +724,7 @@ class WeeklyPredictor:
     
     def predict_upcoming(self):
         """Predict the next upcoming week (games that haven't been played yet)"""
-        conn = psycopg2.connect(**self.db_config)
+        conn = self._connect()
         
         # Find upcoming games based on game_date >= today
         query = """
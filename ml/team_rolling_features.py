@@ -0,0 +1,439 @@
+"""
+Precomputed Team Rolling Features
+
+Persists each team's pre-game averages as of every (season, week) in
+hcl.team_rolling_features so training and inference can read features with an
+indexed lookup instead of re-aggregating hcl.team_game_stats on every call.
+
+Each row carries two views of the same history:
+    season_avg_*  current-season averages from regular-season games before `week`
+                  (what the training queries used to compute with window functions)
+    avg_*         the inference blend: current season phased in over the first
+                  four games with the prior season carried over until then
+
+Triggers on hcl.team_game_stats and on the feature-relevant columns of
+hcl.games bump a per-season version in hcl.team_rolling_features_state;
+refresh_team_rolling_features() rebuilds only seasons whose version moved (plus
+seasons never built). Writers (ingestion, the EPA update, update-results and the
+weekly pipeline) run the refresh; readers only look up the last build.
+Every function takes a schema so hcl_test gets its own copy.
+
+Usage:
+    python ml/team_rolling_features.py            # Create objects, refresh stale seasons
+    python ml/team_rolling_features.py --full     # Rebuild every season
+    python ml/team_rolling_features.py --season 2025
+    python ml/team_rolling_features.py --schema hcl_test
+"""
+
+import psycopg2
+import os
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Feature key (WeeklyPredictor.TEAM_STAT_KEYS) -> hcl.team_game_stats column
+TEAM_STAT_COLUMNS = {
+    'avg_ppg': 'points',
+    'avg_yards': 'total_yards',
+    'avg_pass_yards': 'passing_yards',
+    'avg_rush_yards': 'rushing_yards',
+    'avg_ypp': 'yards_per_play',
+    'avg_turnovers': 'turnovers',
+    'avg_3rd_pct': 'third_down_pct',
+    'avg_rz_pct': 'red_zone_pct',
+    'avg_epa': 'epa_per_play',
+    'avg_success': 'success_rate',
+    'avg_pass_epa': 'pass_epa',
+    'avg_rush_epa': 'rush_epa',
+    'avg_cpoe': 'cpoe',
+    'avg_pass_success': 'pass_success_rate',
+    'avg_rush_success': 'rush_success_rate',
+    'avg_comp_pct': 'completion_pct',
+    'avg_qb_rating': 'qb_rating',
+    'avg_ints': 'interceptions',
+    'avg_sacks': 'sacks_taken',
+    'avg_ypc': 'yards_per_carry',
+    'avg_explosive': 'explosive_play_pct',
+    'avg_top': 'time_of_possession_pct',
+}
+
+TABLE = 'team_rolling_features'
+STATE_TABLE = 'team_rolling_features_state'
+
+# hcl.games columns the rebuild reads; score/clock/line updates leave features alone.
+GAME_FEATURE_COLUMNS = ('game_id', 'season', 'week', 'home_team', 'away_team', 'is_postseason')
+
+# Games needed before the current season fully replaces the prior-season carryover.
+TRANSITION_GAMES = 4.0
+
+def _stat_columns(prefix=''):
+    return [f'{prefix}{key}' for key in TEAM_STAT_COLUMNS]
+
+
+def _schema_sql(schema):
+    table = f'{schema}.{TABLE}'
+    state_table = f'{schema}.{STATE_TABLE}'
+    game_columns = ', '.join(GAME_FEATURE_COLUMNS)
+    old_game_row = ', '.join(f'OLD.{col}' for col in GAME_FEATURE_COLUMNS)
+    new_game_row = ', '.join(f'NEW.{col}' for col in GAME_FEATURE_COLUMNS)
+    blended = ',\n    '.join(f'{col} DOUBLE PRECISION' for col in _stat_columns())
+    current = ',\n    '.join(f'{col} DOUBLE PRECISION' for col in _stat_columns('season_'))
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team TEXT NOT NULL,
+
+    -- Usable games behind each side of the blend (0 = no data)
+    games_played INTEGER NOT NULL DEFAULT 0,
+    prior_games_played INTEGER NOT NULL DEFAULT 0,
+
+    -- Inference features: current season blended with prior-season carryover
+    {blended},
+
+    -- Training features: current-season averages only (NULL before the first game)
+    {current},
+
+    refreshed_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (season, week, team)
+);
+
+CREATE TABLE IF NOT EXISTS {state_table} (
+    season INTEGER PRIMARY KEY,
+    source_version BIGINT NOT NULL DEFAULT 1,
+    built_version BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP
+);
+
+-- A change to season N also moves the carryover seen by season N + 1.
+CREATE OR REPLACE FUNCTION {schema}.mark_team_rolling_features_stale()
+RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {state_table} AS s (season)
+    SELECT DISTINCT affected.season
+    FROM (
+        SELECT season FROM changed_rows
+        UNION
+        SELECT season + 1 FROM changed_rows
+    ) affected
+    WHERE affected.season IS NOT NULL
+    ON CONFLICT (season) DO UPDATE SET source_version = s.source_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Row-level variant for games updates (transition tables can't be combined with UPDATE OF).
+CREATE OR REPLACE FUNCTION {schema}.mark_team_rolling_features_stale_row()
+RETURNS trigger AS $$
+BEGIN
+    INSERT INTO {state_table} AS s (season)
+    SELECT DISTINCT affected.season
+    FROM (VALUES (OLD.season), (OLD.season + 1), (NEW.season), (NEW.season + 1)) affected(season)
+    WHERE affected.season IS NOT NULL
+    ON CONFLICT (season) DO UPDATE SET source_version = s.source_version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tgs_rolling_features_ins ON {schema}.team_game_stats;
+DROP TRIGGER IF EXISTS trg_tgs_rolling_features_upd ON {schema}.team_game_stats;
+DROP TRIGGER IF EXISTS trg_tgs_rolling_features_del ON {schema}.team_game_stats;
+CREATE TRIGGER trg_tgs_rolling_features_ins AFTER INSERT ON {schema}.team_game_stats
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale();
+CREATE TRIGGER trg_tgs_rolling_features_upd AFTER UPDATE ON {schema}.team_game_stats
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale();
+CREATE TRIGGER trg_tgs_rolling_features_del AFTER DELETE ON {schema}.team_game_stats
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale();
+
+DROP TRIGGER IF EXISTS trg_games_rolling_features_ins ON {schema}.games;
+DROP TRIGGER IF EXISTS trg_games_rolling_features_upd ON {schema}.games;
+DROP TRIGGER IF EXISTS trg_games_rolling_features_del ON {schema}.games;
+CREATE TRIGGER trg_games_rolling_features_ins AFTER INSERT ON {schema}.games
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale();
+CREATE TRIGGER trg_games_rolling_features_upd AFTER UPDATE OF {game_columns} ON {schema}.games
+    FOR EACH ROW
+    WHEN (({old_game_row}) IS DISTINCT FROM ({new_game_row}))
+    EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale_row();
+CREATE TRIGGER trg_games_rolling_features_del AFTER DELETE ON {schema}.games
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {schema}.mark_team_rolling_features_stale();
+
+COMMENT ON TABLE {table} IS 'Pre-game team averages per (season, week, team); refreshed from team_game_stats';
+"""
+
+
+def _season_rebuild_sql(schema):
+    """INSERT ... SELECT that rebuilds one season; params: (season x4, season - 1, season)."""
+    aggs = ',\n                '.join(
+        f'AVG(tgs.{column})::double precision AS {key}' for key, column in TEAM_STAT_COLUMNS.items()
+    )
+    weight = f'LEAST(GREATEST(c.games_played::double precision / {TRANSITION_GAMES}, 0.0), 1.0)'
+
+    blended = []
+    for key in TEAM_STAT_COLUMNS:
+        # Mirrors WeeklyPredictor._blend_team_stats key-by-key.
+        blended.append(f"""CASE
+                WHEN c.usable AND p.usable THEN
+                    CASE
+                        WHEN c.{key} IS NULL THEN p.{key}
+                        WHEN p.{key} IS NULL THEN c.{key}
+                        ELSE (c.{key} * {weight}) + (p.{key} * (1.0 - {weight}))
+                    END
+                WHEN c.usable THEN c.{key}
+                WHEN p.usable THEN p.{key}
+            END""")
+    blended_select = ',\n            '.join(blended)
+    current_select = ',\n            '.join(f'c.{key}' for key in TEAM_STAT_COLUMNS)
+    insert_columns = ', '.join(
+        ['season', 'week', 'team', 'games_played', 'prior_games_played']
+        + _stat_columns() + _stat_columns('season_')
+    )
+
+    return f"""
+        WITH weeks AS (
+            SELECT DISTINCT week FROM {schema}.games WHERE season = %s
+        ),
+        teams AS (
+            SELECT home_team AS team FROM {schema}.games WHERE season = %s
+            UNION
+            SELECT away_team FROM {schema}.games WHERE season = %s
+        ),
+        season_rows AS (
+            SELECT tgs.*, g.week AS game_week
+            FROM {schema}.team_game_stats tgs
+            JOIN {schema}.games g ON tgs.game_id = g.game_id
+            WHERE g.season = %s
+              AND COALESCE(g.is_postseason, FALSE) = FALSE
+        ),
+        current_stats AS (
+            SELECT
+                w.week,
+                tgs.team,
+                COUNT(*) AS games_played,
+                {aggs}
+            FROM weeks w
+            JOIN season_rows tgs ON tgs.game_week < w.week
+            GROUP BY w.week, tgs.team
+        ),
+        prior_stats AS (
+            SELECT
+                tgs.team,
+                COUNT(*) AS games_played,
+                {aggs}
+            FROM {schema}.team_game_stats tgs
+            JOIN {schema}.games g ON tgs.game_id = g.game_id
+            WHERE g.season = %s
+              AND COALESCE(g.is_postseason, FALSE) = FALSE
+            GROUP BY tgs.team
+        )
+        INSERT INTO {schema}.{TABLE} ({insert_columns})
+        SELECT
+            %s,
+            w.week,
+            t.team,
+            CASE WHEN c.usable THEN c.games_played ELSE 0 END,
+            CASE WHEN p.usable THEN p.games_played ELSE 0 END,
+            {blended_select},
+            {current_select}
+        FROM weeks w
+        CROSS JOIN teams t
+        LEFT JOIN LATERAL (
+            SELECT cs.*, (cs.games_played > 0 AND cs.avg_ppg IS NOT NULL) AS usable
+            FROM current_stats cs
+            WHERE cs.week = w.week AND cs.team = t.team
+        ) c ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT ps.*, (ps.games_played > 0 AND ps.avg_ppg IS NOT NULL) AS usable
+            FROM prior_stats ps
+            WHERE ps.team = t.team
+        ) p ON TRUE
+        WHERE t.team IS NOT NULL
+    """
+
+
+def ensure_team_rolling_features(conn, schema='hcl'):
+    """Create the feature table, state table and staleness triggers (DDL; run from writers, not requests)."""
+    cur = conn.cursor()
+    cur.execute(_schema_sql(schema))
+    cur.close()
+    conn.commit()
+
+
+def stale_seasons(conn, schema='hcl'):
+    """Seasons whose source data changed since their last rebuild, or that were never built."""
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT season FROM {schema}.{STATE_TABLE} WHERE source_version > built_version
+        UNION
+        SELECT season FROM (SELECT DISTINCT season FROM {schema}.games) g
+        WHERE NOT EXISTS (SELECT 1 FROM {schema}.{STATE_TABLE} s WHERE s.season = g.season)
+        ORDER BY season
+    """)
+    seasons = [row[0] for row in cur.fetchall()]
+    cur.close()
+    return seasons
+
+
+def season_source_version(conn, season, schema='hcl'):
+    """Change counter for the games/team_game_stats rows that feed `season` (0 if never touched)."""
+    return season_versions(conn, season, schema)[0]
+
+
+def season_versions(conn, season, schema='hcl'):
+    """(source_version, built_version) for `season`; the rows readers see match built_version."""
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT source_version, built_version FROM {schema}.{STATE_TABLE} WHERE season = %s",
+        (season,)
+    )
+    row = cur.fetchone()
+    cur.close()
+    return (int(row[0]), int(row[1])) if row else (0, 0)
+
+
+def rebuild_season(conn, season, schema='hcl'):
+    """Replace every row of one season inside the caller's transaction. Returns rows written."""
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT source_version FROM {schema}.{STATE_TABLE} WHERE season = %s",
+        (season,)
+    )
+    row = cur.fetchone()
+    version = row[0] if row else 1
+
+    cur.execute(f"DELETE FROM {schema}.{TABLE} WHERE season = %s", (season,))
+    cur.execute(_season_rebuild_sql(schema), (season, season, season, season, season - 1, season))
+    written = cur.rowcount
+
+    cur.execute(f"""
+        INSERT INTO {schema}.{STATE_TABLE} AS s (season, source_version, built_version, refreshed_at)
+        VALUES (%s, %s, %s, NOW())
+        ON CONFLICT (season) DO UPDATE
+        SET built_version = GREATEST(s.built_version, EXCLUDED.built_version),
+            refreshed_at = NOW()
+    """, (season, version, version))
+    cur.close()
+    return written
+
+
+def refresh_team_rolling_features(conn, seasons=None, full=False, wait=True, schema='hcl'):
+    """
+    Rebuild stale seasons (or the given seasons / everything with full=True).
+
+    Refreshes are serialized per schema with an advisory lock; with wait=False a
+    caller that finds another refresh in progress skips it (that refresh picks
+    up the same stale seasons). Returns {season: rows_written}.
+    """
+    lock_key = f"hashtext('{schema}.{TABLE}')"
+    cur = conn.cursor()
+    if wait:
+        cur.execute(f"SELECT pg_advisory_xact_lock({lock_key})")
+    else:
+        cur.execute(f"SELECT pg_try_advisory_xact_lock({lock_key})")
+        if not cur.fetchone()[0]:
+            cur.close()
+            conn.rollback()
+            return {}
+
+    if full:
+        cur.execute(f"SELECT DISTINCT season FROM {schema}.games ORDER BY season")
+        targets = [row[0] for row in cur.fetchall()]
+    elif seasons is not None:
+        targets = sorted({int(season) for season in seasons})
+    else:
+        targets = stale_seasons(conn, schema)
+    cur.close()
+
+    refreshed = {}
+    try:
+        for season in targets:
+            refreshed[season] = rebuild_season(conn, season, schema)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return refreshed
+
+
+def fetch_team_rolling_features(conn, season, week, teams=None, schema='hcl'):
+    """
+    Look up blended pre-game stats for one (season, week).
+
+    Returns {team: stats_dict_or_None} in the WeeklyPredictor.fetch_week_team_stats
+    shape, or None when the week has not been materialized (caller falls back
+    to aggregating team_game_stats directly).
+    """
+    params = [season, week]
+    team_filter = ''
+    if teams is not None:
+        teams = sorted({t for t in teams if t})
+        if not teams:
+            return {}
+        team_filter = 'AND team = ANY(%s)'
+        params.append(teams)
+
+    columns = ['team', 'games_played', 'prior_games_played'] + _stat_columns()
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT {', '.join(columns)}
+        FROM {schema}.{TABLE}
+        WHERE season = %s AND week = %s
+          {team_filter}
+    """, tuple(params))
+    rows = cur.fetchall()
+    cur.close()
+
+    if not rows:
+        return None
+
+    results = {}
+    for raw in rows:
+        row = dict(zip(columns, raw))
+        team = row.pop('team')
+        games_played = row.pop('games_played')
+        prior_games_played = row.pop('prior_games_played')
+        if not games_played and not prior_games_played:
+            results[team] = None
+            continue
+        row['games_played'] = games_played or prior_games_played
+        results[team] = row
+
+    if teams is not None:
+        if any(team not in results for team in teams):
+            return None
+        return {team: results[team] for team in teams}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh hcl.team_rolling_features')
+    parser.add_argument('--full', action='store_true', help='Rebuild every season')
+    parser.add_argument('--season', type=int, nargs='+', help='Rebuild specific seasons')
+    parser.add_argument('--schema', default='hcl', help='Schema holding games/team_game_stats (default: hcl)')
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        dbname=os.getenv('DB_NAME', 'nfl_analytics'),
+        user=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD', ''),
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432')
+    )
+    try:
+        ensure_team_rolling_features(conn, args.schema)
+        refreshed = refresh_team_rolling_features(conn, seasons=args.season, full=args.full, schema=args.schema)
+        if not refreshed:
+            print("[OK] Team rolling features already up to date")
+        for season, rows in refreshed.items():
+            print(f"[OK] Rebuilt {season}: {rows} team-week rows")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 # Import database configuration
 from db_config import DATABASE_CONFIG
+from team_rolling_features import ensure_team_rolling_features, refresh_team_rolling_features
 
 def print_header(text):
     """Print formatted header"""
@@ -38,61 +39,28 @@ def load_data(schema='hcl'):
         user=DATABASE_CONFIG['user'],
         password=DATABASE_CONFIG['password']
     )
+
+    # Pre-game averages come from {schema}.team_rolling_features; rebuild any stale seasons first.
+    ensure_team_rolling_features(conn, schema)
+    refreshed = refresh_team_rolling_features(conn, schema=schema)
+    if refreshed:
+        print(f"✓ Refreshed team rolling features for seasons {sorted(refreshed)}")
     
     query = f"""
-        WITH game_stats AS (
-            SELECT 
-                tgs.game_id, tgs.team, g.season, g.week, g.game_date,
-                -- Basic Scoring & Yardage
-                tgs.points, tgs.total_yards, tgs.passing_yards, tgs.rushing_yards,
-                tgs.yards_per_play, tgs.turnovers,
-                -- Efficiency Metrics
-                tgs.third_down_pct, tgs.red_zone_pct, tgs.fourth_down_pct,
-                -- EPA & Advanced Metrics
-                tgs.epa_per_play, tgs.success_rate, tgs.pass_epa, tgs.rush_epa,
-                tgs.cpoe, tgs.pass_success_rate, tgs.rush_success_rate,
-                -- Passing Stats
-                tgs.completion_pct, tgs.qb_rating, tgs.interceptions, tgs.sacks_taken,
-                tgs.air_yards_per_att,
-                -- Rushing Stats
-                tgs.yards_per_carry, tgs.explosive_play_pct,
-                -- Time & Drives
-                tgs.time_of_possession_pct, tgs.early_down_success_rate
-            FROM {schema}.team_game_stats tgs
-            JOIN {schema}.games g ON tgs.game_id = g.game_id
-            WHERE g.season >= 2020 AND g.is_postseason = FALSE
-        ),
-        cumulative_stats AS (
-            SELECT 
-                game_id, team, season, week,
-                -- All metrics averaged from PRIOR games only
-                AVG(points) OVER w as avg_ppg,
-                AVG(total_yards) OVER w as avg_yards,
-                AVG(passing_yards) OVER w as avg_pass_yards,
-                AVG(rushing_yards) OVER w as avg_rush_yards,
-                AVG(yards_per_play) OVER w as avg_yards_per_play,
-                AVG(turnovers) OVER w as avg_turnovers,
-                AVG(third_down_pct) OVER w as avg_third_down_pct,
-                AVG(red_zone_pct) OVER w as avg_red_zone_pct,
-                AVG(fourth_down_pct) OVER w as avg_fourth_down_pct,
-                AVG(epa_per_play) OVER w as avg_epa,
-                AVG(success_rate) OVER w as avg_success_rate,
-                AVG(pass_epa) OVER w as avg_pass_epa,
-                AVG(rush_epa) OVER w as avg_rush_epa,
-                AVG(cpoe) OVER w as avg_cpoe,
-                AVG(pass_success_rate) OVER w as avg_pass_success,
-                AVG(rush_success_rate) OVER w as avg_rush_success,
-                AVG(completion_pct) OVER w as avg_completion_pct,
-                AVG(qb_rating) OVER w as avg_qb_rating,
-                AVG(interceptions) OVER w as avg_interceptions,
-                AVG(sacks_taken) OVER w as avg_sacks,
-                AVG(air_yards_per_att) OVER w as avg_air_yards,
-                AVG(yards_per_carry) OVER w as avg_ypc,
-                AVG(explosive_play_pct) OVER w as avg_explosive,
-                AVG(time_of_possession_pct) OVER w as avg_top,
-                AVG(early_down_success_rate) OVER w as avg_early_down_success
-            FROM game_stats
-            WINDOW w AS (PARTITION BY team, season ORDER BY week ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+        WITH cumulative_stats AS (
+            -- Current-season averages from PRIOR games only (see ml/team_rolling_features.py)
+            SELECT
+                season, week, team,
+                season_avg_ppg as avg_ppg,
+                season_avg_yards as avg_yards,
+                season_avg_pass_yards as avg_pass_yards,
+                season_avg_rush_yards as avg_rush_yards,
+                season_avg_ypp as avg_yards_per_play,
+                season_avg_turnovers as avg_turnovers,
+                season_avg_3rd_pct as avg_third_down_pct,
+                season_avg_rz_pct as avg_red_zone_pct
+            FROM {schema}.team_rolling_features
+            WHERE season >= 2020
         )
         SELECT 
             g.game_id,
@@ -129,8 +97,8 @@ def load_data(schema='hcl'):
             COALESCE(g.total_line, 44) as total_line
             
         FROM {schema}.games g
-        LEFT JOIN cumulative_stats h ON g.game_id = h.game_id AND g.home_team = h.team
-        LEFT JOIN cumulative_stats a ON g.game_id = a.game_id AND g.away_team = a.team
+        LEFT JOIN cumulative_stats h ON g.season = h.season AND g.week = h.week AND g.home_team = h.team
+        LEFT JOIN cumulative_stats a ON g.season = a.season AND g.week = a.week AND g.away_team = a.team
         WHERE g.season >= 2020
           AND g.is_postseason = FALSE
           AND g.home_score IS NOT NULL
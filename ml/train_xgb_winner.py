@@ -20,6 +20,7 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 
 # Import database configuration
 from db_config import DATABASE_CONFIG
+from team_rolling_features import ensure_team_rolling_features, refresh_team_rolling_features
 
 def print_header(text):
     """Print formatted header"""
@@ -38,69 +39,27 @@ def load_data(schema='hcl'):
         user=DATABASE_CONFIG['user'],
         password=DATABASE_CONFIG['password']
     )
+
+    # Pre-game averages come from {schema}.team_rolling_features; rebuild any stale seasons first.
+    ensure_team_rolling_features(conn, schema)
+    refreshed = refresh_team_rolling_features(conn, schema=schema)
+    if refreshed:
+        print(f"✓ Refreshed team rolling features for seasons {sorted(refreshed)}")
     
     query = f"""
-        WITH game_stats AS (
-            SELECT 
-                tgs.game_id,
-                tgs.team,
-                g.season,
-                g.week,
-                g.game_date,
-                tgs.points,
-                tgs.total_yards,
-                tgs.passing_yards,
-                tgs.rushing_yards,
-                tgs.yards_per_play,
-                tgs.turnovers,
-                tgs.third_down_pct
-            FROM {schema}.team_game_stats tgs
-            JOIN {schema}.games g ON tgs.game_id = g.game_id
-            WHERE g.season >= 2020
-        ),
-        cumulative_stats AS (
-            SELECT 
-                game_id,
-                team,
-                season,
-                week,
-                -- Calculate averages from PRIOR games only (exclude current game)
-                AVG(points) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_ppg,
-                AVG(total_yards) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_yards,
-                AVG(passing_yards) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_pass_yards,
-                AVG(rushing_yards) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_rush_yards,
-                AVG(yards_per_play) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_yards_per_play,
-                AVG(turnovers) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_turnovers,
-                AVG(third_down_pct) OVER (
-                    PARTITION BY team, season 
-                    ORDER BY week 
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-                ) as avg_third_down_pct
-            FROM game_stats
+        WITH cumulative_stats AS (
+            -- Current-season averages from PRIOR games only (see ml/team_rolling_features.py)
+            SELECT
+                season, week, team,
+                season_avg_ppg as avg_ppg,
+                season_avg_yards as avg_yards,
+                season_avg_pass_yards as avg_pass_yards,
+                season_avg_rush_yards as avg_rush_yards,
+                season_avg_ypp as avg_yards_per_play,
+                season_avg_turnovers as avg_turnovers,
+                season_avg_3rd_pct as avg_third_down_pct
+            FROM {schema}.team_rolling_features
+            WHERE season >= 2020
         )
         SELECT 
             g.game_id,
@@ -134,8 +93,8 @@ def load_data(schema='hcl'):
             COALESCE(g.total_line, 44) as total_line
             
         FROM {schema}.games g
-        LEFT JOIN cumulative_stats h ON g.game_id = h.game_id AND g.home_team = h.team
-        LEFT JOIN cumulative_stats a ON g.game_id = a.game_id AND g.away_team = a.team
+        LEFT JOIN cumulative_stats h ON g.season = h.season AND g.week = h.week AND g.home_team = h.team
+        LEFT JOIN cumulative_stats a ON g.season = a.season AND g.week = a.week AND g.away_team = a.team
         WHERE g.season >= 2020
           AND g.home_score IS NOT NULL
           AND g.away_score IS NOT NULL
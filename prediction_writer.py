@@ -0,0 +1,135 @@
+"""
+Bulk writers for the prediction tracking tables.
+
+hcl.ml_predictions and hcl.ml_predictions_elo rows are sent with execute_values
+as multi-row INSERT ... ON CONFLICT statements (PAGE_SIZE rows per round trip)
+instead of one statement per game. Each statement returns `xmax = 0` for the
+rows it touched, so every write reports how many rows were inserted, updated
+or skipped.
+
+Callers own the transaction: pass a cursor, then commit the connection.
+"""
+from psycopg2.extras import execute_values
+
+XGB_TABLE = 'hcl.ml_predictions'
+ELO_TABLE = 'hcl.ml_predictions_elo'
+
+# Rows per INSERT statement; a full season of predictions fits in one.
+PAGE_SIZE = 5000
+
+XGB_COLUMNS = [
+    'game_id', 'season', 'week', 'home_team', 'away_team', 'game_date',
+    'predicted_winner', 'win_confidence', 'home_win_prob', 'away_win_prob',
+    'predicted_home_score', 'predicted_away_score', 'predicted_margin',
+    'ai_spread', 'vegas_spread', 'vegas_total',
+]
+# Re-predicting a game refreshes the model outputs, not the game's identity.
+XGB_UPDATE_COLUMNS = XGB_COLUMNS[6:]
+
+ELO_COLUMNS = [
+    'game_id', 'season', 'week', 'game_date', 'home_team', 'away_team',
+    'home_elo', 'away_elo', 'elo_diff',
+    'home_win_prob', 'away_win_prob',
+    'predicted_winner', 'confidence',
+    'elo_spread', 'vegas_spread', 'spread_diff',
+    'split_prediction',
+]
+ELO_UPDATE_COLUMNS = ELO_COLUMNS[6:]
+
+
+def write_rows(cur, table, columns, rows, conflict='update', update_columns=None,
+               now_columns=(), page_size=PAGE_SIZE):
+    """
+    Insert `rows` (tuples in `columns` order) keyed on game_id.
+
+    conflict='update' overwrites `update_columns` (default: every column except
+    game_id) on existing games; conflict='nothing' leaves them alone.
+    `now_columns` are set to NOW() on insert and on update.
+
+    Returns {'rows', 'inserted', 'updated', 'skipped'}.
+    """
+    if conflict not in ('update', 'nothing'):
+        raise ValueError(f"conflict must be 'update' or 'nothing', got {conflict!r}")
+
+    # One statement cannot update the same game twice; keep the row a per-row
+    # loop would have left behind (last for updates, first for do-nothing).
+    by_game = {}
+    for row in rows:
+        if conflict == 'update' or row[0] not in by_game:
+            by_game[row[0]] = row
+    unique_rows = list(by_game.values())
+    result = {'rows': len(unique_rows), 'inserted': 0, 'updated': 0, 'skipped': 0}
+    if not unique_rows:
+        return result
+
+    insert_columns = list(columns) + list(now_columns)
+    template = '(' + ', '.join(['%s'] * len(columns) + ['NOW()'] * len(now_columns)) + ')'
+
+    if conflict == 'update':
+        assignments = [f"{col} = EXCLUDED.{col}" for col in (update_columns or columns[1:])]
+        assignments += [f"{col} = NOW()" for col in now_columns]
+        on_conflict = f"DO UPDATE SET {', '.join(assignments)}"
+    else:
+        on_conflict = 'DO NOTHING'
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(insert_columns)}) VALUES %s "
+        f"ON CONFLICT (game_id) {on_conflict} "
+        f"RETURNING (xmax = 0) AS inserted"
+    )
+    touched = execute_values(cur, sql, unique_rows, template=template, page_size=page_size, fetch=True)
+
+    result['inserted'] = sum(1 for (inserted,) in touched if inserted)
+    result['updated'] = len(touched) - result['inserted']
+    result['skipped'] = len(unique_rows) - len(touched)
+    return result
+
+
+def xgb_prediction_rows(predictions):
+    """WeeklyPredictor prediction dicts -> XGB_COLUMNS tuples"""
+    return [
+        (
+            p.get('game_id'),
+            p.get('season'),
+            p.get('week'),
+            p.get('home_team'),
+            p.get('away_team'),
+            p.get('game_date'),
+            p.get('predicted_winner'),
+            p.get('confidence'),
+            p.get('home_win_prob'),
+            p.get('away_win_prob'),
+            p.get('predicted_home_score'),
+            p.get('predicted_away_score'),
+            p.get('predicted_margin'),
+            p.get('ai_spread'),
+            p.get('vegas_spread'),
+            p.get('total_line'),
+        )
+        for p in predictions
+    ]
+
+
+def elo_prediction_rows(predictions):
+    """EloPredictionSystem prediction dicts -> ELO_COLUMNS tuples"""
+    return [tuple(p.get(col) for col in ELO_COLUMNS) for p in predictions]
+
+
+def save_xgb_predictions(cur, predictions, conflict='update'):
+    """Upsert WeeklyPredictor predictions; updates stamp predicted_at with NOW()."""
+    return write_rows(
+        cur, XGB_TABLE, XGB_COLUMNS, xgb_prediction_rows(predictions),
+        conflict=conflict,
+        update_columns=XGB_UPDATE_COLUMNS,
+        now_columns=('predicted_at',),
+    )
+
+
+def save_elo_predictions(cur, predictions, conflict='update'):
+    """Upsert EloPredictionSystem predictions; prediction_date is stamped with NOW()."""
+    return write_rows(
+        cur, ELO_TABLE, ELO_COLUMNS, elo_prediction_rows(predictions),
+        conflict=conflict,
+        update_columns=ELO_UPDATE_COLUMNS,
+        now_columns=('prediction_date',),
+    )
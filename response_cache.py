@@ -0,0 +1,394 @@
+"""
+Response cache for read-heavy API endpoints.
+
+Cached payloads are keyed by request path + query string + a data-version
+stamp read from hcl.data_versions. Statement-level triggers bump a per-table
+counter in the same transaction as the write, so a cached response stays valid
+exactly until one of the tables it depends on changes. The table and triggers
+are installed by create_data_versions.sql; until they are, requests are served
+uncached. A view can call skip_caching() to keep a response out of both layers.
+
+Entries live in a per-process LRU; when RESPONSE_CACHE_REDIS_URL is set (and
+the redis package is installed) they are also shared across gunicorn workers.
+
+conditional_get() uses the same stamps for HTTP caching: a strong ETag per
+resource version, 304 answers to If-None-Match/If-Modified-Since before the
+view runs, and Cache-Control that marks completed seasons as immutable
+unless the response also depends on a salt (model version) that can change.
+
+Environment:
+    RESPONSE_CACHE_ENABLED        0 disables caching entirely (default 1)
+    RESPONSE_CACHE_MAX_ENTRIES    in-process LRU size per worker (default 256)
+    RESPONSE_CACHE_TTL_SECONDS    upper bound on entry age (default 3600)
+    RESPONSE_CACHE_REDIS_URL      optional shared backend, e.g. redis://localhost:6379/0
+    RESPONSE_CACHE_RECHECK_SECONDS  how often to look for the triggers again while missing (default 300)
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response, g, has_request_context
+
+from db_pool import get_db_connection
+
+try:
+    import redis
+except ModuleNotFoundError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', '1') != '0'
+CACHE_MAX_ENTRIES = max(1, int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256') or 256))
+CACHE_TTL_SECONDS = max(1, int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '3600') or 3600))
+REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL', '')
+RECHECK_SECONDS = float(os.getenv('RESPONSE_CACHE_RECHECK_SECONDS', '300') or 300)
+
+# Tables with a data_versions trigger (see create_data_versions.sql).
+VERSIONED_TABLES = (
+    'hcl.games', 'hcl.team_game_stats', 'hcl.ml_predictions', 'hcl.ml_predictions_elo', 'public.teams',
+    'hcl.model_performance_weekly'
+)
+
+# Cache-Control for seasons whose games all have final scores, on routes without a salt;
+# salted (model-dependent) routes keep max_age + must-revalidate so a hot-swap is seen.
+COMPLETED_SEASON_CACHE_CONTROL = 'public, max-age=86400, immutable'
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized responses with an optional shared redis tier."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS, redis_url=REDIS_URL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0}
+        self._shared = None
+        if redis_url:
+            if redis is None:
+                logger.warning("RESPONSE_CACHE_REDIS_URL is set but redis is not installed; using in-process cache only")
+            else:
+                self._shared = redis.Redis.from_url(redis_url)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self._shared is not None:
+            try:
+                raw = self._shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared response cache read failed: {e}")
+                raw = None
+            if raw is not None:
+                payload = json.loads(raw)
+                self._put_local(key, payload, now)
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                return payload
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key, payload):
+        self._put_local(key, payload, time.monotonic())
+        with self._lock:
+            self._stats['stores'] += 1
+        if self._shared is not None:
+            try:
+                self._shared.setex(key, self.ttl_seconds, json.dumps(payload))
+            except Exception as e:
+                logger.warning(f"Shared response cache write failed: {e}")
+
+    def _put_local(self, key, payload, stored_at):
+        with self._lock:
+            self._entries[key] = (stored_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def note_bypass(self):
+        with self._lock:
+            self._stats['bypassed'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = len(self._entries)
+        snapshot.update({
+            'enabled': CACHE_ENABLED,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'shared_backend': 'redis' if self._shared is not None else None,
+        })
+        return snapshot
+
+
+_cache = ResponseCache()
+_versions_ready = None
+_versions_checked_at = 0.0
+_versions_lock = threading.Lock()
+
+
+def _data_versions_installed(conn):
+    """True when hcl.data_versions exists and every tracked table that exists carries its bump trigger."""
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT to_regclass('hcl.data_versions')")
+        if cur.fetchone()[0] is None:
+            logger.warning("Response cache disabled: hcl.data_versions missing (run create_data_versions.sql)")
+            return False
+        cur.execute("""
+            SELECT t
+            FROM unnest(%s::text[]) AS t
+            WHERE to_regclass(t) IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_trigger tr
+                  WHERE tr.tgrelid = to_regclass(t)
+                    AND tr.tgname = 'trg_' || split_part(t, '.', 2) || '_data_version'
+              )
+        """, (list(VERSIONED_TABLES),))
+        missing = [row[0] for row in cur.fetchall()]
+        if missing:
+            logger.warning(
+                f"Response cache disabled: no data_version trigger on {', '.join(missing)} "
+                "(run create_data_versions.sql)"
+            )
+            return False
+        return True
+    finally:
+        cur.close()
+
+
+def _data_versions_ready(conn):
+    """Whether version stamps can be trusted; rechecked every RECHECK_SECONDS while they can't."""
+    global _versions_ready, _versions_checked_at
+    if _versions_ready or (
+        _versions_ready is False and time.monotonic() - _versions_checked_at < RECHECK_SECONDS
+    ):
+        return _versions_ready
+    with _versions_lock:
+        if _versions_ready is None or (
+            _versions_ready is False and time.monotonic() - _versions_checked_at >= RECHECK_SECONDS
+        ):
+            try:
+                _versions_ready = _data_versions_installed(conn)
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"Response cache disabled; hcl.data_versions unavailable: {e}")
+                _versions_ready = False
+            _versions_checked_at = time.monotonic()
+    return _versions_ready
+
+
+def skip_caching():
+    """Keep the current response out of the response cache and give it no ETag (e.g. a degraded fallback)."""
+    if has_request_context():
+        g.response_cache_skip = True
+
+
+def _read_data_versions(tables, season=None):
+    """
+    Return (stamp, last_modified, season_complete) for `tables`, or None when
+    versions are unavailable. Memoized per request so stacked decorators share one query.
+    """
+    memo_key = (tuple(sorted(tables)), season)
+    memo = g.setdefault('_data_versions', {}) if has_request_context() else {}
+    if memo_key in memo:
+        return memo[memo_key]
+    if season is None:
+        # A lookup that also checked season completeness carries the same stamp.
+        for (memo_tables, _), cached in memo.items():
+            if memo_tables == memo_key[0] and cached is not None:
+                return cached[0], cached[1], False
+
+    conn = get_db_connection()
+    try:
+        if not _data_versions_ready(conn):
+            result = None
+        else:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT table_name, version, updated_at FROM hcl.data_versions WHERE table_name = ANY(%s)",
+                (list(tables),)
+            )
+            rows = {row[0]: row[1:] for row in cur.fetchall()}
+            season_complete = False
+            if season is not None:
+                cur.execute(
+                    """
+                    SELECT COUNT(*) > 0 AND COALESCE(bool_and(home_score IS NOT NULL AND away_score IS NOT NULL), FALSE)
+                    FROM hcl.games
+                    WHERE season = %s
+                    """,
+                    (season,)
+                )
+                season_complete = bool(cur.fetchone()[0])
+            cur.close()
+
+            stamp = ','.join(f"{table}:{rows.get(table, (0,))[0]}" for table in sorted(tables))
+            updated = [row[1] for row in rows.values() if row[1] is not None]
+            result = (stamp, max(updated) if updated else None, season_complete)
+    finally:
+        conn.close()
+
+    memo[memo_key] = result
+    return result
+
+
+def get_data_version(tables):
+    """Return a stamp like 'hcl.games:12,hcl.ml_predictions:4', or None when versions are unavailable."""
+    versions = _read_data_versions(tables)
+    return versions[0] if versions else None
+
+
+def _salt_value(salt):
+    return salt() if callable(salt) else salt
+
+
+def cached_response(tables, salt=''):
+    """
+    Cache a GET view's 200 responses until any of `tables` changes.
+
+    tables: fully qualified table names the view reads (must be in VERSIONED_TABLES).
+    salt: extra key component (or a callable returning one), e.g. the serving model version.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            try:
+                stamp = get_data_version(tables)
+            except Exception as e:
+                logger.warning(f"Data version lookup failed for {request.path}: {e}")
+                stamp = None
+            if stamp is None:
+                _cache.note_bypass()
+                return view(*args, **kwargs)
+
+            query = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+            key = f"resp:{request.path}?{query}|{stamp}|{_salt_value(salt)}"
+
+            payload = _cache.get(key)
+            if payload is not None:
+                response = make_response(payload['body'], payload['status'])
+                response.mimetype = payload['mimetype']
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if g.get('response_cache_skip'):
+                _cache.note_bypass()
+                response.headers['X-Cache'] = 'BYPASS'
+                return response
+            if response.status_code == 200 and not response.is_streamed:
+                _cache.set(key, {
+                    'status': response.status_code,
+                    'mimetype': response.mimetype,
+                    'body': response.get_data(as_text=True),
+                })
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def _request_season(season_arg):
+    value = (request.view_args or {}).get(season_arg)
+    if value is None:
+        value = request.args.get(season_arg, type=int)
+    return value
+
+
+def conditional_get(tables, max_age=60, salt='', season_arg='season'):
+    """
+    Answer conditional GETs from the data version alone.
+
+    The strong ETag hashes the path, query params, table versions and `salt`
+    (e.g. a model version; a callable is evaluated per request). A matching If-None-Match (or an If-Modified-Since
+    at/after the last write) gets a 304 before the view's queries run. 200
+    responses carry ETag, Last-Modified and Cache-Control: `max_age` seconds
+    for live data, a day + immutable once every game of the requested season
+    (`season_arg` view arg or query param) has a final score. Salted responses
+    never go immutable: a model hot-swap or Elo rebuild changes them without a
+    table write, so browsers must keep revalidating (cheap: the ETag answers 304).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            season = _request_season(season_arg) if season_arg else None
+            try:
+                versions = _read_data_versions(tables, season)
+            except Exception as e:
+                logger.warning(f"Data version lookup failed for {request.path}: {e}")
+                versions = None
+            if versions is None:
+                return view(*args, **kwargs)
+
+            stamp, last_modified, season_complete = versions
+            query = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+            etag = hashlib.sha256(f"{request.path}?{query}|{stamp}|{_salt_value(salt)}".encode('utf-8')).hexdigest()[:32]
+            if season_complete and not salt:
+                cache_control = COMPLETED_SEASON_CACHE_CONTROL
+            elif max_age:
+                cache_control = f'public, max-age={int(max_age)}, must-revalidate'
+            else:
+                cache_control = 'no-cache'
+
+            def apply_headers(response):
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = cache_control
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                return response
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.star_tag or request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since is not None and last_modified is not None:
+                not_modified = last_modified.replace(microsecond=0) <= request.if_modified_since
+            else:
+                not_modified = False
+            if not_modified:
+                return apply_headers(make_response('', 304))
+
+            response = make_response(view(*args, **kwargs))
+            if g.get('response_cache_skip'):
+                response.headers['Cache-Control'] = 'no-cache'
+            elif response.status_code == 200:
+                apply_headers(response)
+            return response
+        return wrapper
+    return decorator
+
+
+def get_response_cache_stats():
+    """Return hit/miss counters for this worker's response cache."""
+    return _cache.stats()
+
+
+def clear_response_cache():
+    """Drop every in-process entry (shared entries expire by TTL or version change)."""
+    _cache.clear()
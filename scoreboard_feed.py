@@ -0,0 +1,214 @@
+"""
+Shared ESPN scoreboard snapshot for the live-score endpoints.
+
+Every request reads the in-process snapshot instead of calling ESPN. The
+snapshot expires after an adaptive TTL: short while any game is live or about
+to kick off, long otherwise. An expired snapshot is still served while one
+background thread re-fetches it (stale-while-revalidate); only a cold start, or
+a snapshot older than the hard stale limit, makes a request wait, and then
+concurrent requests share a single fetch. They share a failed fetch too: its
+error is re-raised to every waiter, and for a short backoff afterwards callers
+get that error without another ESPN call.
+
+With ESPN_SCOREBOARD_POLLER=1 each worker starts a daemon thread on first use
+that refreshes the snapshot on its TTL, so requests stop triggering fetches.
+
+Environment:
+    ESPN_SCOREBOARD_URL                 upstream URL (point at a local stub in tests)
+    ESPN_SCOREBOARD_LIVE_TTL_SECONDS    TTL while games are live (default 15)
+    ESPN_SCOREBOARD_IDLE_TTL_SECONDS    TTL otherwise (default 300)
+    ESPN_SCOREBOARD_MAX_STALE_SECONDS   serve stale data at most this old (default 900)
+    ESPN_SCOREBOARD_ERROR_BACKOFF_SECONDS  reuse a failed fetch's error this long (default 5)
+    ESPN_SCOREBOARD_POLLER              1 starts the background poller (default 0)
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+ESPN_SCOREBOARD_URL = os.getenv(
+    'ESPN_SCOREBOARD_URL', 'https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard'
+)
+FETCH_TIMEOUT_SECONDS = 10
+LIVE_TTL_SECONDS = float(os.getenv('ESPN_SCOREBOARD_LIVE_TTL_SECONDS', '15'))
+IDLE_TTL_SECONDS = float(os.getenv('ESPN_SCOREBOARD_IDLE_TTL_SECONDS', '300'))
+MAX_STALE_SECONDS = float(os.getenv('ESPN_SCOREBOARD_MAX_STALE_SECONDS', '900'))
+ERROR_BACKOFF_SECONDS = float(os.getenv('ESPN_SCOREBOARD_ERROR_BACKOFF_SECONDS', '5'))
+POLLER_ENABLED = os.getenv('ESPN_SCOREBOARD_POLLER', '0') == '1'
+
+# Use the live TTL this long before the next kickoff.
+PREGAME_WINDOW = timedelta(minutes=30)
+
+
+def scoreboard_ttl(data, now=None):
+    """Live TTL while any event is in progress or kicks off soon, idle TTL otherwise."""
+    now = now or datetime.now(timezone.utc)
+    for event in data.get('events', []):
+        state = event.get('status', {}).get('type', {}).get('state')
+        if state == 'in':
+            return LIVE_TTL_SECONDS
+        if state == 'pre' and event.get('date'):
+            try:
+                kickoff = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if kickoff - PREGAME_WINDOW <= now:
+                return LIVE_TTL_SECONDS
+    return IDLE_TTL_SECONDS
+
+
+class ScoreboardFeed:
+    """Thread-safe scoreboard snapshot with single-flight refreshes."""
+
+    def __init__(self, url=ESPN_SCOREBOARD_URL, max_stale_seconds=MAX_STALE_SECONDS,
+                 error_backoff_seconds=ERROR_BACKOFF_SECONDS):
+        self.url = url
+        self.max_stale_seconds = max_stale_seconds
+        self.error_backoff_seconds = error_backoff_seconds
+        self._data = None
+        self._fetched_at = None  # time.monotonic() of the last successful fetch
+        self._ttl = 0.0
+        self._version = 0
+        self._attempts = 0  # finished fetch attempts, successful or not
+        self._error = None  # exception of the last attempt if it failed
+        self._error_at = None
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+        self._poller_pid = None
+        self._stats = {'hits': 0, 'stale_hits': 0, 'fetches': 0, 'errors': 0, 'shared_errors': 0}
+
+    def _fetch(self):
+        """Fetch ESPN once and install the snapshot; callers hold _fetch_lock."""
+        response = requests.get(self.url, timeout=FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        data = response.json()
+        with self._lock:
+            self._data = data
+            self._fetched_at = time.monotonic()
+            self._ttl = scoreboard_ttl(data)
+            self._version += 1
+            self._attempts += 1
+            self._error = None
+            self._error_at = None
+            self._stats['fetches'] += 1
+            self._updated.notify_all()
+        return data
+
+    def _backing_off(self):
+        return self._error is not None and time.monotonic() - self._error_at < self.error_backoff_seconds
+
+    def refresh(self):
+        """
+        Fetch now unless another thread already is; returns the newest snapshot.
+
+        Callers queued behind an attempt take its outcome instead of fetching
+        again: the new snapshot, or the attempt's exception re-raised. Within
+        error_backoff_seconds of a failure the recorded exception is raised
+        without calling ESPN.
+        """
+        with self._lock:
+            attempt = self._attempts
+        with self._fetch_lock:
+            with self._lock:
+                if self._attempts != attempt or self._backing_off():
+                    # Someone else fetched (or failed to) while we waited for the lock
+                    if self._error is None:
+                        return self._data
+                    self._stats['shared_errors'] += 1
+                    raise self._error
+            try:
+                return self._fetch()
+            except Exception as e:
+                with self._lock:
+                    self._attempts += 1
+                    self._error = e
+                    self._error_at = time.monotonic()
+                    self._stats['errors'] += 1
+                raise
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Scoreboard refresh failed; serving stale snapshot: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self):
+        """
+        Return the scoreboard JSON, fetching only when the snapshot is missing or
+        older than the stale limit. Raises requests.RequestException when ESPN is
+        unreachable and there is nothing usable to serve.
+        """
+        if POLLER_ENABLED:
+            self.start_poller()
+        with self._lock:
+            data = self._data
+            age = time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+            if data is not None and age <= self._ttl:
+                self._stats['hits'] += 1
+                return data
+            if data is not None and age <= self.max_stale_seconds:
+                self._stats['stale_hits'] += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh_in_background, daemon=True).start()
+                return data
+        return self.refresh()
+
+    def snapshot(self):
+        """(data, version, age_seconds) without triggering a fetch."""
+        with self._lock:
+            age = time.monotonic() - self._fetched_at if self._fetched_at is not None else None
+            return self._data, self._version, age
+
+    def wait_for_version(self, version, timeout):
+        """Block until a snapshot newer than `version` lands or `timeout` passes; returns the current version."""
+        with self._lock:
+            self._updated.wait_for(lambda: self._version != version, timeout=timeout)
+            return self._version
+
+    def ttl(self):
+        with self._lock:
+            return self._ttl
+
+    def start_poller(self):
+        """Refresh on the adaptive TTL from a daemon thread, once per process (threads don't survive fork)."""
+        with self._lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+        threading.Thread(target=self._poll, name='scoreboard-poller', daemon=True).start()
+
+    def _poll(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Scoreboard poll failed: {e}")
+            with self._lock:
+                delay = self._ttl or LIVE_TTL_SECONDS
+            time.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['version'] = self._version
+            stats['ttl_seconds'] = self._ttl
+            stats['age_seconds'] = (
+                round(time.monotonic() - self._fetched_at, 1) if self._fetched_at is not None else None
+            )
+            stats['poller'] = self._poller_pid == os.getpid()
+            stats['last_error'] = str(self._error) if self._error is not None else None
+        return stats
+
+
+scoreboard_feed = ScoreboardFeed()
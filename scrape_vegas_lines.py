@@ -6,6 +6,7 @@ Uses ESPN's odds API which aggregates Vegas lines
 
 import requests
 import psycopg2
+from psycopg2.extras import execute_values
 import argparse
 from datetime import datetime
 from db_config import DATABASE_CONFIG
@@ -123,64 +124,106 @@ def fetch_espn_odds(target_season=None, regular_season_only=True):
             'games': []
         }
 
+# Created by create_vegas_line_history.sql; the scraper never runs DDL itself.
+HISTORY_TABLE = 'hcl.vegas_line_history'
+
+# Staged odds are matched to hcl.games by (season, week, home, away). Only games
+# whose lines differ are updated, and each of those gets one history row; the
+# counts and changed games come back from the same statement.
+APPLY_LINES_SQL = """
+    WITH matched AS (
+        SELECT g.game_id, g.season, g.week, g.home_team, g.away_team,
+               g.spread_line AS old_spread_line, g.total_line AS old_total_line,
+               s.spread_line, s.total_line
+        FROM vegas_lines_staging s
+        JOIN hcl.games g
+          ON g.season = %(season)s
+         AND g.week = s.week
+         AND g.home_team = s.home_team
+         AND g.away_team = s.away_team
+    ),
+    changed AS (
+        UPDATE hcl.games g
+        SET spread_line = m.spread_line,
+            total_line = m.total_line
+        FROM matched m
+        WHERE g.game_id = m.game_id
+          AND (g.spread_line, g.total_line) IS DISTINCT FROM (m.spread_line, m.total_line)
+        RETURNING g.game_id
+    ),
+    history AS (
+        INSERT INTO hcl.vegas_line_history
+            (game_id, season, week, old_spread_line, new_spread_line, old_total_line, new_total_line)
+        SELECT m.game_id, m.season, m.week, m.old_spread_line, m.spread_line, m.old_total_line, m.total_line
+        FROM matched m
+        JOIN changed c ON c.game_id = m.game_id
+        RETURNING game_id
+    )
+    SELECT
+        (SELECT COUNT(*) FROM matched),
+        (SELECT COUNT(*) FROM history),
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'week', m.week, 'home_team', m.home_team, 'away_team', m.away_team,
+                'spread_line', m.spread_line, 'total_line', m.total_line
+            ) ORDER BY m.week, m.game_id)
+            FROM matched m
+            JOIN changed c ON c.game_id = m.game_id
+        ), '[]'::json)
+"""
+
 def update_vegas_lines(games, season):
-    """Update database with Vegas lines"""
-    conn = psycopg2.connect(**DATABASE_CONFIG)
-    cur = conn.cursor()
-    
-    updated = 0
+    """
+    Update database with Vegas lines in one set-based statement
+
+    Returns dict with matched (found in hcl.games), updated (lines changed),
+    skipped (no spread from ESPN) and missing (not in hcl.games) counts.
+    """
+    # One staged row per matchup; a later duplicate wins, like the old per-game loop
+    staged = {}
     skipped = 0
-    missing = 0
-    
     for game in games:
-        try:
-            if game['spread_line'] is None:
-                skipped += 1
-                continue
-
-            # Find matching game in database
-            cur.execute("""
-                SELECT game_id 
-                FROM hcl.games 
-                WHERE season = %s 
-                  AND week = %s
-                  AND home_team = %s 
-                  AND away_team = %s
-            """, (season, game['week'], game['home_team'], game['away_team']))
-            
-            result = cur.fetchone()
-            
-            if result:
-                # Update the game with Vegas lines
-                cur.execute("""
-                    UPDATE hcl.games 
-                    SET spread_line = %s,
-                        total_line = %s
-                    WHERE season = %s 
-                      AND week = %s
-                      AND home_team = %s 
-                      AND away_team = %s
-                """, (
-                    game['spread_line'],
-                    game['total_line'],
-                    season,
-                    game['week'],
-                    game['home_team'],
-                    game['away_team']
-                ))
-                updated += 1
-                print(f"✅ Updated {game['away_team']} @ {game['home_team']} (Week {game['week']}): {game['spread_line']} / O/U {game['total_line']}")
-            else:
-                missing += 1
-                
-        except Exception as e:
-            print(f"❌ Error updating {game['away_team']} @ {game['home_team']}: {e}")
+        if game['spread_line'] is None:
+            skipped += 1
+            continue
+        key = (game['week'], game['home_team'], game['away_team'])
+        staged[key] = key + (game['spread_line'], game['total_line'])
+    
+    result = {'matched': 0, 'updated': 0, 'skipped': skipped, 'missing': 0}
+    if not staged:
+        return result
+    
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT to_regclass(%s)", (HISTORY_TABLE,))
+        if cur.fetchone()[0] is None:
+            raise RuntimeError(
+                f"{HISTORY_TABLE} does not exist; run create_vegas_line_history.sql (psql -f) before scraping"
+            )
+        cur.execute("""
+            CREATE TEMP TABLE vegas_lines_staging (
+                week INTEGER,
+                home_team TEXT,
+                away_team TEXT,
+                spread_line DOUBLE PRECISION,
+                total_line DOUBLE PRECISION
+            ) ON COMMIT DROP
+        """)
+        execute_values(cur, "INSERT INTO vegas_lines_staging VALUES %s", list(staged.values()),
+                       page_size=len(staged))
+        cur.execute(APPLY_LINES_SQL, {'season': season})
+        matched, updated, changed = cur.fetchone()
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
     
-    conn.commit()
-    cur.close()
-    conn.close()
+    for game in changed:
+        print(f"✅ Updated {game['away_team']} @ {game['home_team']} (Week {game['week']}): {game['spread_line']} / O/U {game['total_line']}")
     
-    return updated, skipped, missing
+    result.update(matched=matched, updated=updated, missing=len(staged) - matched)
+    return result
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Scrape and persist ESPN Vegas lines')
@@ -213,9 +256,17 @@ if __name__ == '__main__':
     print(f"✅ Found {len(games)} games for season {payload.get('target_season')}\n")
     
     print("💾 Updating database with Vegas lines...")
-    updated, skipped, missing = update_vegas_lines(games, season=payload.get('target_season'))
+    try:
+        counts = update_vegas_lines(games, season=payload.get('target_season'))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        exit(1)
     
     print()
     print("=" * 60)
-    print(f"✅ COMPLETE: Updated {updated} games, skipped_no_odds {skipped}, missing_in_db {missing}")
+    print(
+        f"✅ COMPLETE: Matched {counts['matched']} games, updated {counts['updated']} "
+        f"(unchanged {counts['matched'] - counts['updated']}), "
+        f"skipped_no_odds {counts['skipped']}, missing_in_db {counts['missing']}"
+    )
     print("=" * 60)
@@ -6,10 +6,14 @@ import json
 import os
 import pathlib
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 import psycopg2
+from psycopg2.extras import execute_values
 
 ROOT_DIR = pathlib.Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
@@ -20,6 +24,24 @@ from team_abbreviations import to_hcl_abbr
 
 ESPN_SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
 
+# Week fetches in flight at once; a full season is ~18 requests.
+DEFAULT_WORKERS = 8
+FETCH_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1.0
+# 429 and 5xx are worth retrying; other HTTP errors are not.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+APPLY_SCORES_SQL = """
+    UPDATE hcl.games AS g
+    SET home_score = v.home_score,
+        away_score = v.away_score,
+        updated_at = NOW()
+    FROM (VALUES %s) AS v(game_id, home_score, away_score)
+    WHERE g.game_id = v.game_id
+      AND (g.home_score IS NULL OR g.away_score IS NULL)
+    RETURNING g.game_id
+"""
+
 
 def load_env_if_available():
     try:
@@ -54,11 +76,79 @@ def get_missing_games(cur, season):
     return cur.fetchall()
 
 
-def fetch_week_scoreboard(season, week):
+def fetch_week_scoreboard(season, week, retries=FETCH_RETRIES):
     url = f"{ESPN_SCOREBOARD_URL}?dates={season}&seasontype=2&week={week}"
     request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urlopen(request, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8"))
+    for attempt in range(retries + 1):
+        try:
+            with urlopen(request, timeout=30) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except HTTPError as exc:
+            if exc.code not in RETRYABLE_STATUS or attempt == retries:
+                raise
+        except (URLError, TimeoutError):
+            if attempt == retries:
+                raise
+        time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+
+def fixture_path(fixtures_dir, season, week):
+    return pathlib.Path(fixtures_dir) / f"scoreboard_{season}_week{week}.json"
+
+
+def load_week_fixture(fixtures_dir, season, week):
+    return json.loads(fixture_path(fixtures_dir, season, week).read_text(encoding="utf-8"))
+
+
+def fetch_weeks(season, weeks, workers=DEFAULT_WORKERS, fixtures_dir=None, record_dir=None):
+    """
+    Fetch the scoreboards for `weeks` concurrently.
+
+    fixtures_dir replaces the ESPN API with recorded scoreboard_<season>_week<N>.json
+    files; record_dir saves every fetched payload in that layout.
+
+    Returns ({week: scoreboard}, {week: error message}).
+    """
+    if fixtures_dir:
+        fetch = lambda week: load_week_fixture(fixtures_dir, season, week)
+    else:
+        fetch = lambda week: fetch_week_scoreboard(season, week)
+
+    scoreboards = {}
+    failures = {}
+    if not weeks:
+        return scoreboards, failures
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(weeks)))) as executor:
+        futures = {week: executor.submit(fetch, week) for week in weeks}
+        for week, future in futures.items():
+            try:
+                scoreboards[week] = future.result()
+            except Exception as exc:
+                failures[week] = str(exc)
+
+    if record_dir:
+        pathlib.Path(record_dir).mkdir(parents=True, exist_ok=True)
+        for week, scoreboard in scoreboards.items():
+            fixture_path(record_dir, season, week).write_text(json.dumps(scoreboard), encoding="utf-8")
+
+    return scoreboards, failures
+
+
+def apply_score_updates(cur, updates):
+    """Write (home_score, away_score, game_id, ...) updates in one statement; returns rows changed."""
+    if not updates:
+        return 0
+    rows = [(game_id, h, a) for h, a, game_id, _, _, _ in updates]
+    changed = execute_values(
+        cur,
+        APPLY_SCORES_SQL,
+        rows,
+        template="(%s, %s::int, %s::int)",
+        page_size=len(rows),
+        fetch=True,
+    )
+    return len(changed)
 
 
 def parse_completed_games(scoreboard_data):
@@ -110,6 +200,9 @@ def main():
     parser = argparse.ArgumentParser(description="Backfill missing scores from ESPN")
     parser.add_argument("--season", type=int, default=None, help="Season to backfill")
     parser.add_argument("--dry-run", action="store_true", help="Print planned updates only")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent ESPN week fetches")
+    parser.add_argument("--fixtures", default=None, help="Read recorded scoreboard JSON from this directory instead of ESPN")
+    parser.add_argument("--record", default=None, help="Save fetched scoreboard JSON to this directory")
     args = parser.parse_args()
 
     load_env_if_available()
@@ -136,9 +229,18 @@ def main():
     updates = []
     unresolved = []
 
-    for week in sorted(missing_by_week.keys()):
-        scoreboard = fetch_week_scoreboard(season, week)
-        completed_games = parse_completed_games(scoreboard)
+    weeks = sorted(missing_by_week.keys())
+    started = time.perf_counter()
+    scoreboards, failed_weeks = fetch_weeks(
+        season, weeks, workers=args.workers, fixtures_dir=args.fixtures, record_dir=args.record
+    )
+    fetch_seconds = time.perf_counter() - started
+
+    for week in weeks:
+        if week not in scoreboards:
+            unresolved.extend((game_id, week, away_team, home_team) for game_id, away_team, home_team in missing_by_week[week])
+            continue
+        completed_games = parse_completed_games(scoreboards[week])
 
         for game_id, away_team, home_team in missing_by_week[week]:
             key = (away_team, home_team)
@@ -149,18 +251,9 @@ def main():
             away_score, home_score = completed_games[key]
             updates.append((home_score, away_score, game_id, week, away_team, home_team))
 
+    applied = 0
     if not args.dry_run and updates:
-        cur.executemany(
-            """
-            UPDATE hcl.games
-            SET home_score = %s,
-                away_score = %s,
-                updated_at = NOW()
-            WHERE game_id = %s
-                            AND (home_score IS NULL OR away_score IS NULL)
-            """,
-            [(h, a, game_id) for h, a, game_id, _, _, _ in updates],
-        )
+        applied = apply_score_updates(cur, updates)
         conn.commit()
 
     cur.execute(
@@ -177,8 +270,14 @@ def main():
     print(f"season={season}")
     print(f"missing_games_before={len(missing_games)}")
     print(f"updates_matched={len(updates)}")
-    print(f"updates_applied={0 if args.dry_run else len(updates)}")
+    print(f"updates_applied={applied}")
     print(f"missing_games_after={missing_after}")
+    print(f"weeks_fetched={len(scoreboards)}/{len(weeks)} fetch_seconds={fetch_seconds:.2f}")
+
+    if failed_weeks:
+        print("failed_weeks=")
+        for week, error in sorted(failed_weeks.items()):
+            print(f"  week={week} error={error}")
 
     if unresolved:
         print("unresolved_games=")
@@ -21,14 +21,22 @@ import argparse
 import csv
 import io
 import logging
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import urllib.request
 
+import numpy as np
+import pandas as pd
 import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
 
+from nflverse_cache import load_seasons
+from pbp_changes import changed_games, game_hashes, save_hashes
+
 try:
     import nfl_data_py as nfl
 except ModuleNotFoundError:
@@ -45,30 +53,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'ml')
+
+# hcl.games / hcl.team_game_stats load columns; *_UPDATE_COLUMNS are overwritten on conflict
+GAMES_KEY = ['game_id']
+GAMES_COLUMNS = [
+    'game_id', 'season', 'week', 'game_date', 'kickoff_time_utc',
+    'home_team', 'away_team', 'stadium', 'city', 'state', 'timezone',
+    'is_postseason', 'home_score', 'away_score',
+    'spread_line', 'total_line', 'home_moneyline', 'away_moneyline',
+    'home_spread_odds', 'away_spread_odds', 'over_odds', 'under_odds',
+    'roof', 'surface', 'temp', 'wind',
+    'away_rest', 'home_rest', 'is_divisional_game', 'overtime',
+    'referee', 'away_coach', 'home_coach', 'away_qb_name', 'home_qb_name',
+]
+GAMES_UPDATE_COLUMNS = GAMES_COLUMNS[GAMES_COLUMNS.index('home_score'):]
+
+TEAM_GAME_STATS_KEY = ['game_id', 'team']
+TEAM_GAME_STATS_COLUMNS = [
+    'game_id', 'team', 'opponent', 'is_home', 'season', 'week',
+    'points', 'touchdowns', 'field_goals_made', 'field_goals_att',
+    'total_yards', 'passing_yards', 'rushing_yards', 'plays', 'yards_per_play',
+    'completions', 'passing_att', 'completion_pct', 'passing_tds', 'interceptions',
+    'sacks_taken', 'sack_yards_lost', 'qb_rating',
+    'rushing_att', 'yards_per_carry', 'rushing_tds',
+    'third_down_conv', 'third_down_att', 'third_down_pct',
+    'fourth_down_conv', 'fourth_down_att', 'fourth_down_pct',
+    'red_zone_conv', 'red_zone_att', 'red_zone_pct',
+    'punt_count', 'punt_avg_yards', 'kickoff_return_yards', 'punt_return_yards',
+    'turnovers', 'fumbles_lost', 'penalties', 'penalty_yards',
+    'time_of_possession_sec', 'time_of_possession_pct',
+    'drives', 'early_down_success_rate', 'starting_field_pos_yds',
+    'result',
+]
+TEAM_GAME_STATS_UPDATE_COLUMNS = ['opponent', 'is_home'] + TEAM_GAME_STATS_COLUMNS[TEAM_GAME_STATS_COLUMNS.index('points'):]
+
+
+def upsert_sql(table: str, columns: List[str], key: List[str], update_columns: List[str],
+               from_table: Optional[str] = None, only_changed: bool = False) -> str:
+    """
+    INSERT ... ON CONFLICT (key) DO UPDATE statement that also stamps updated_at.
+
+    Rows come from execute_values (VALUES %s), or from `from_table` when given.
+    only_changed leaves rows whose update columns already match untouched.
+    """
+    column_list = ', '.join(columns)
+    source = f"SELECT {column_list} FROM {from_table}" if from_table else "VALUES %s"
+    assignments = [f"{col} = EXCLUDED.{col}" for col in update_columns] + ["updated_at = NOW()"]
+    sql = (
+        f"INSERT INTO {table} AS target ({column_list}) {source} "
+        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {', '.join(assignments)}"
+    )
+    if only_changed:
+        current = ', '.join(f"target.{col}" for col in update_columns)
+        incoming = ', '.join(f"EXCLUDED.{col}" for col in update_columns)
+        sql += f" WHERE ({current}) IS DISTINCT FROM ({incoming})"
+    return sql
+
 
-def import_schedule_records(seasons: List[int]) -> List[Dict[str, Any]]:
-    """Import schedule rows from nfl_data_py when available, else fallback to nflverse CSV."""
+def fetch_schedules(seasons: List[int]) -> pd.DataFrame:
+    """Download schedules from nfl_data_py when available, else fallback to nflverse CSV."""
     if nfl is not None:
-        schedules = nfl.import_schedules(seasons)
-        return schedules.to_dict("records")
+        return nfl.import_schedules(seasons)
 
     logger.warning("nfl_data_py not available; using direct nflverse games.csv fallback")
-    season_set = {int(s) for s in seasons}
     url = "https://raw.githubusercontent.com/nflverse/nfldata/master/data/games.csv"
-
-    records: List[Dict[str, Any]] = []
     with urllib.request.urlopen(url, timeout=120) as resp:
-        text_stream = io.TextIOWrapper(resp, encoding="utf-8", newline="")
-        reader = csv.DictReader(text_stream)
-        for row in reader:
-            try:
-                season_val = int((row.get("season") or "").strip())
-            except (TypeError, ValueError):
-                continue
-            if season_val in season_set:
-                records.append(row)
+        schedules = pd.read_csv(resp, low_memory=False)
+    season_values = pd.to_numeric(schedules['season'], errors='coerce')
+    return schedules[season_values.isin([int(s) for s in seasons])].reset_index(drop=True)
+
+
+def fetch_pbp(seasons: List[int]) -> pd.DataFrame:
+    """Download play-by-play from nfl_data_py, reading only PBP_COLUMNS."""
+    if nfl is None:
+        raise RuntimeError("nfl_data_py is required to download play-by-play data")
+    return nfl.import_pbp_data(seasons, columns=PBP_COLUMNS, include_participation=False)
+
 
-    return records
+def import_schedule_records(seasons: List[int], refresh_cache: bool = False) -> List[Dict[str, Any]]:
+    """Schedule rows for seasons, served from the local nflverse cache when fresh."""
+    schedules = load_seasons('schedules', seasons, fetch_schedules, refresh=refresh_cache)
+    return schedules.to_dict("records")
 
 
 def get_db_connection(schema_prefix: str = 'hcl_test') -> psycopg2.extensions.connection:
@@ -108,7 +174,122 @@ def get_db_connection(schema_prefix: str = 'hcl_test') -> psycopg2.extensions.co
         raise
 
 
-def load_schedules(conn, seasons: List[int], schema: str = 'hcl_test') -> int:
+def schedule_rows(schedules: List[Dict[str, Any]]) -> List[tuple]:
+    """Schedule records -> GAMES_COLUMNS tuples."""
+    # Helper function to convert values safely
+    def convert_val(val):
+        """Convert dataframe/csv values safely to Python-native values."""
+        if val is None:
+            return None
+        if isinstance(val, str):
+            stripped = val.strip()
+            if stripped == "" or stripped.lower() in {"na", "nan", "none"}:
+                return None
+            return stripped
+        try:
+            import pandas as pd
+
+            if pd.isna(val):
+                return None
+        except Exception:
+            pass
+        if hasattr(val, 'item'):  # numpy type
+            return val.item()
+        return val
+
+    def to_int(val):
+        val = convert_val(val)
+        if val is None:
+            return None
+        try:
+            return int(float(val))
+        except (TypeError, ValueError):
+            return None
+
+    def to_float(val):
+        val = convert_val(val)
+        if val is None:
+            return None
+        if isinstance(val, str) and val.lower() in {"pk", "pick"}:
+            return 0.0
+        try:
+            return float(val)
+        except (TypeError, ValueError):
+            return None
+    
+    # Prepare insert data
+    games_data = []
+    for row in schedules:
+        # Combine gameday and gametime to create proper timestamp
+        kickoff = None
+        gameday = convert_val(row.get('gameday'))
+        gametime = convert_val(row.get('gametime'))
+        if gameday and gametime:
+            try:
+                kickoff = f"{gameday} {gametime}"
+                if len(str(gametime).split(':')) == 2:
+                    kickoff = f"{kickoff}:00"
+            except Exception:
+                kickoff = None
+
+        game_type = str(convert_val(row.get('game_type')) or 'REG').upper()
+        div_raw = convert_val(row.get('div_game'))
+        if div_raw is None:
+            is_divisional_game = None
+        elif isinstance(div_raw, bool):
+            is_divisional_game = div_raw
+        else:
+            is_divisional_game = str(div_raw).strip().lower() in {'1', 'true', 't', 'yes', 'y'}
+        
+        game_data = (
+            row['game_id'],
+            int(convert_val(row.get('season'))),
+            int(convert_val(row.get('week'))),
+            gameday,
+            kickoff,
+            row['home_team'],
+            row['away_team'],
+            convert_val(row.get('stadium')),
+            None,  # city (not in nflverse)
+            None,  # state (not in nflverse)
+            None,  # timezone (not in nflverse)
+            game_type != 'REG',  # is_postseason
+            to_int(row.get('home_score')),
+            to_int(row.get('away_score')),
+            
+            # Betting Lines (10 columns)
+            to_float(row.get('spread_line')),
+            to_float(row.get('total_line')),
+            to_float(row.get('home_moneyline')),
+            to_float(row.get('away_moneyline')),
+            to_float(row.get('home_spread_odds')),
+            to_float(row.get('away_spread_odds')),
+            to_float(row.get('over_odds')),
+            to_float(row.get('under_odds')),
+            
+            # Weather (4 columns)
+            convert_val(row.get('roof')),
+            convert_val(row.get('surface')),
+            to_float(row.get('temp')),
+            to_float(row.get('wind')),
+            
+            # Context (9 columns)
+            to_int(row.get('away_rest')),
+            to_int(row.get('home_rest')),
+            is_divisional_game,
+            to_int(row.get('overtime')),
+            convert_val(row.get('referee')),
+            convert_val(row.get('away_coach')),
+            convert_val(row.get('home_coach')),
+            convert_val(row.get('away_qb_name')),
+            convert_val(row.get('home_qb_name'))
+        )
+        games_data.append(game_data)
+
+    return games_data
+
+
+def load_schedules(conn, seasons: List[int], schema: str = 'hcl_test', refresh_cache: bool = False) -> int:
     """
     Load game schedule data into games table.
     
@@ -116,6 +297,7 @@ def load_schedules(conn, seasons: List[int], schema: str = 'hcl_test') -> int:
         conn: Database connection
         seasons: List of seasons to load (e.g., [2022, 2023, 2024])
         schema: Database schema ('hcl_test' or 'hcl')
+        refresh_cache: Re-download seasons already in the nflverse cache
         
     Returns:
         Number of games inserted
@@ -124,161 +306,17 @@ def load_schedules(conn, seasons: List[int], schema: str = 'hcl_test') -> int:
     
     try:
         # Fetch schedule data from nflverse
-        schedules = import_schedule_records(seasons)
+        schedules = import_schedule_records(seasons, refresh_cache)
         logger.info(f"Fetched {len(schedules)} games from nflverse")
         
-        # Helper function to convert values safely
-        def convert_val(val):
-            """Convert dataframe/csv values safely to Python-native values."""
-            if val is None:
-                return None
-            if isinstance(val, str):
-                stripped = val.strip()
-                if stripped == "" or stripped.lower() in {"na", "nan", "none"}:
-                    return None
-                return stripped
-            try:
-                import pandas as pd
-
-                if pd.isna(val):
-                    return None
-            except Exception:
-                pass
-            if hasattr(val, 'item'):  # numpy type
-                return val.item()
-            return val
-
-        def to_int(val):
-            val = convert_val(val)
-            if val is None:
-                return None
-            try:
-                return int(float(val))
-            except (TypeError, ValueError):
-                return None
-
-        def to_float(val):
-            val = convert_val(val)
-            if val is None:
-                return None
-            if isinstance(val, str) and val.lower() in {"pk", "pick"}:
-                return 0.0
-            try:
-                return float(val)
-            except (TypeError, ValueError):
-                return None
-        
-        # Prepare insert data
-        games_data = []
-        for row in schedules:
-            # Combine gameday and gametime to create proper timestamp
-            kickoff = None
-            gameday = convert_val(row.get('gameday'))
-            gametime = convert_val(row.get('gametime'))
-            if gameday and gametime:
-                try:
-                    kickoff = f"{gameday} {gametime}"
-                    if len(str(gametime).split(':')) == 2:
-                        kickoff = f"{kickoff}:00"
-                except Exception:
-                    kickoff = None
-
-            game_type = str(convert_val(row.get('game_type')) or 'REG').upper()
-            div_raw = convert_val(row.get('div_game'))
-            if div_raw is None:
-                is_divisional_game = None
-            elif isinstance(div_raw, bool):
-                is_divisional_game = div_raw
-            else:
-                is_divisional_game = str(div_raw).strip().lower() in {'1', 'true', 't', 'yes', 'y'}
-            
-            game_data = (
-                row['game_id'],
-                int(convert_val(row.get('season'))),
-                int(convert_val(row.get('week'))),
-                gameday,
-                kickoff,
-                row['home_team'],
-                row['away_team'],
-                convert_val(row.get('stadium')),
-                None,  # city (not in nflverse)
-                None,  # state (not in nflverse)
-                None,  # timezone (not in nflverse)
-                game_type != 'REG',  # is_postseason
-                to_int(row.get('home_score')),
-                to_int(row.get('away_score')),
-                
-                # Betting Lines (10 columns)
-                to_float(row.get('spread_line')),
-                to_float(row.get('total_line')),
-                to_float(row.get('home_moneyline')),
-                to_float(row.get('away_moneyline')),
-                to_float(row.get('home_spread_odds')),
-                to_float(row.get('away_spread_odds')),
-                to_float(row.get('over_odds')),
-                to_float(row.get('under_odds')),
-                
-                # Weather (4 columns)
-                convert_val(row.get('roof')),
-                convert_val(row.get('surface')),
-                to_float(row.get('temp')),
-                to_float(row.get('wind')),
-                
-                # Context (9 columns)
-                to_int(row.get('away_rest')),
-                to_int(row.get('home_rest')),
-                is_divisional_game,
-                to_int(row.get('overtime')),
-                convert_val(row.get('referee')),
-                convert_val(row.get('away_coach')),
-                convert_val(row.get('home_coach')),
-                convert_val(row.get('away_qb_name')),
-                convert_val(row.get('home_qb_name'))
-            )
-            games_data.append(game_data)
+        games_data = schedule_rows(schedules)
 
         if not games_data:
             logger.warning("No schedule rows resolved for requested seasons")
             return 0
         
         # Insert into database using UPSERT
-        insert_sql = f"""
-            INSERT INTO {schema}.games (
-                game_id, season, week, game_date, kickoff_time_utc,
-                home_team, away_team, stadium, city, state, timezone,
-                is_postseason, home_score, away_score,
-                spread_line, total_line, home_moneyline, away_moneyline,
-                home_spread_odds, away_spread_odds, over_odds, under_odds,
-                roof, surface, temp, wind,
-                away_rest, home_rest, is_divisional_game, overtime,
-                referee, away_coach, home_coach, away_qb_name, home_qb_name
-            ) VALUES %s
-            ON CONFLICT (game_id) DO UPDATE SET
-                home_score = EXCLUDED.home_score,
-                away_score = EXCLUDED.away_score,
-                spread_line = EXCLUDED.spread_line,
-                total_line = EXCLUDED.total_line,
-                home_moneyline = EXCLUDED.home_moneyline,
-                away_moneyline = EXCLUDED.away_moneyline,
-                home_spread_odds = EXCLUDED.home_spread_odds,
-                away_spread_odds = EXCLUDED.away_spread_odds,
-                over_odds = EXCLUDED.over_odds,
-                under_odds = EXCLUDED.under_odds,
-                roof = EXCLUDED.roof,
-                surface = EXCLUDED.surface,
-                temp = EXCLUDED.temp,
-                wind = EXCLUDED.wind,
-                away_rest = EXCLUDED.away_rest,
-                home_rest = EXCLUDED.home_rest,
-                is_divisional_game = EXCLUDED.is_divisional_game,
-                overtime = EXCLUDED.overtime,
-                referee = EXCLUDED.referee,
-                away_coach = EXCLUDED.away_coach,
-                home_coach = EXCLUDED.home_coach,
-                away_qb_name = EXCLUDED.away_qb_name,
-                home_qb_name = EXCLUDED.home_qb_name,
-                updated_at = NOW()
-        """
+        insert_sql = upsert_sql(f"{schema}.games", GAMES_COLUMNS, GAMES_KEY, GAMES_UPDATE_COLUMNS)
         
         with conn.cursor() as cur:
             execute_values(cur, insert_sql, games_data)
@@ -293,7 +331,26 @@ def load_schedules(conn, seasons: List[int], schema: str = 'hcl_test') -> int:
         raise
 
 
-def calculate_team_game_stats(pbp_data, game_id: str, team: str, opponent: str, 
+def passer_rating(completions: int, attempts: int, yards: int, tds: int, interceptions: int) -> Optional[float]:
+    """NFL passer rating, or None without pass attempts."""
+    if attempts <= 0:
+        return None
+
+    a = ((completions / attempts) - 0.3) * 5
+    b = ((yards / attempts) - 3) * 0.25
+    c = (tds / attempts) * 20
+    d = 2.375 - ((interceptions / attempts) * 25)
+
+    # Clamp each component between 0 and 2.375
+    a = max(0, min(a, 2.375))
+    b = max(0, min(b, 2.375))
+    c = max(0, min(c, 2.375))
+    d = max(0, min(d, 2.375))
+
+    return round(((a + b + c + d) / 6) * 100, 1)
+
+
+def calculate_team_game_stats(pbp_data, game_id: str, team: str, opponent: str,
                               is_home: bool, season: int, week: int) -> Dict[str, Any]:
     """
     Calculate comprehensive team statistics from play-by-play data for a single game.
@@ -352,21 +409,10 @@ def calculate_team_game_stats(pbp_data, game_id: str, team: str, opponent: str,
         stats['sack_yards_lost'] = abs(int(pass_plays[pass_plays['sack'] == 1]['yards_gained'].sum()))
         
         # QB Rating (NFL Passer Rating formula)
-        if stats['passing_att'] > 0:
-            a = ((stats['completions'] / stats['passing_att']) - 0.3) * 5
-            b = ((stats['passing_yards'] / stats['passing_att']) - 3) * 0.25
-            c = (stats['passing_tds'] / stats['passing_att']) * 20
-            d = 2.375 - ((stats['interceptions'] / stats['passing_att']) * 25)
-            
-            # Clamp each component between 0 and 2.375
-            a = max(0, min(a, 2.375))
-            b = max(0, min(b, 2.375))
-            c = max(0, min(c, 2.375))
-            d = max(0, min(d, 2.375))
-            
-            stats['qb_rating'] = round(((a + b + c + d) / 6) * 100, 1)
-        else:
-            stats['qb_rating'] = None
+        stats['qb_rating'] = passer_rating(
+            stats['completions'], stats['passing_att'], stats['passing_yards'],
+            stats['passing_tds'], stats['interceptions']
+        )
         
         # Rushing Stats
         rush_plays = team_plays[team_plays['play_type'] == 'run']
@@ -451,7 +497,284 @@ def calculate_team_game_stats(pbp_data, game_id: str, team: str, opponent: str,
     return stats
 
 
-def load_team_game_stats(conn, seasons: List[int], schema: str = 'hcl_test') -> int:
+# Play-by-play columns aggregate_team_game_stats reads
+PBP_STAT_COLUMNS = [
+    'game_id', 'posteam', 'play_type', 'yards_gained', 'touchdown', 'field_goal_result',
+    'complete_pass', 'pass_attempt', 'interception', 'sack', 'down', 'first_down',
+    'yardline_100', 'drive', 'kick_distance', 'return_yards', 'fumble_lost', 'penalty',
+    'penalty_yards', 'game_seconds_remaining', 'ydstogo', 'total_home_score', 'total_away_score',
+]
+
+# Play-by-play columns load_team_game_stats downloads and caches
+PBP_COLUMNS = PBP_STAT_COLUMNS[:1] + ['season', 'week', 'home_team', 'away_team'] + PBP_STAT_COLUMNS[1:]
+
+
+def aggregate_team_game_stats(pbp_data, games=None) -> List[Dict[str, Any]]:
+    """
+    Calculate team-game statistics for every team in every game at once.
+
+    Produces the same dictionaries as calling calculate_team_game_stats() for
+    the home and then the away team of each game, but from a handful of
+    groupby passes over the whole play-by-play frame instead of re-filtering
+    it per game and per team.
+
+    Args:
+        pbp_data: Play-by-play DataFrame (any number of games and seasons)
+        games: DataFrame of game_id, season, week, home_team, away_team
+            (defaults to the distinct games in pbp_data)
+
+    Returns:
+        List of statistics dictionaries, home then away for each game
+    """
+    if games is None:
+        games = pbp_data[['game_id', 'season', 'week', 'home_team', 'away_team']].drop_duplicates()
+
+    keys = ['game_id', 'posteam']
+    plays = pbp_data.loc[pbp_data['posteam'].notna().to_numpy(), PBP_STAT_COLUMNS].reset_index(drop=True)
+
+    play_type = plays['play_type']
+    yards = plays['yards_gained']
+    is_pass = play_type == 'pass'
+    is_run = play_type == 'run'
+    is_punt = play_type == 'punt'
+    is_fg = play_type == 'field_goal'
+    touchdown = plays['touchdown'] == 1
+    sack = is_pass & (plays['sack'] == 1)
+    third_down = plays['down'] == 3
+    fourth_down = plays['down'] == 4
+    early_down = plays['down'].isin([1, 2])
+    penalty = plays['penalty'] == 1
+
+    # Per-play indicators and values; one groupby sum turns them into counts and totals
+    per_play = pd.DataFrame({
+        'game_id': plays['game_id'],
+        'posteam': plays['posteam'],
+        'touchdowns': touchdown,
+        'field_goals_att': is_fg,
+        'field_goals_made': is_fg & (plays['field_goal_result'] == 'made'),
+        'total_yards': yards,
+        'passing_yards': yards.where(is_pass),
+        'rushing_yards': yards.where(is_run),
+        'plays': is_pass | is_run,
+        'completions': is_pass & (plays['complete_pass'] == 1),
+        'passing_att': is_pass & (plays['pass_attempt'] == 1),
+        'passing_tds': is_pass & touchdown,
+        'interceptions': is_pass & (plays['interception'] == 1),
+        'sacks_taken': sack,
+        'sack_yards': yards.where(sack),
+        'rushing_att': is_run,
+        'rushing_tds': is_run & touchdown,
+        'third_down_att': third_down,
+        'third_down_conv': third_down & (plays['first_down'] == 1),
+        'fourth_down_att': fourth_down,
+        'fourth_down_conv': fourth_down & (plays['first_down'] == 1),
+        'red_zone_conv': (plays['yardline_100'] <= 20) & touchdown,
+        'punt_count': is_punt,
+        'punt_distance_sum': plays['kick_distance'].where(is_punt),
+        'punt_distance_count': is_punt & plays['kick_distance'].notna(),
+        'kickoff_return_yards': plays['return_yards'].where(play_type == 'kickoff'),
+        'punt_return_yards': plays['return_yards'].where(is_punt),
+        'fumbles_lost': plays['fumble_lost'] == 1,
+        'penalties': penalty,
+        'penalty_yards': plays['penalty_yards'].where(penalty),
+        'clock_plays': plays['game_seconds_remaining'].notna(),
+        'early_downs': early_down,
+        'early_down_successes': early_down & (yards >= plays['ydstogo'] * 0.5),
+    })
+    totals = per_play.groupby(keys, sort=False).sum()
+
+    # Drive counts and starting field position (first known yardline of each drive)
+    drive_plays = plays[plays['drive'].notna()]
+    drive_starts = drive_plays.groupby(keys + ['drive'], sort=False)['yardline_100'].first()
+    by_team = drive_starts.groupby(level=[0, 1], sort=False)
+    totals['drives'] = by_team.size()
+    totals['drive_start_sum'] = by_team.sum()
+    totals['drive_start_count'] = by_team.count()
+    red_zone_drives = drive_plays[drive_plays['yardline_100'] <= 20].drop_duplicates(keys + ['drive'])
+    totals['red_zone_att'] = red_zone_drives.groupby(keys, sort=False).size()
+
+    # Scoreboard as of each team's final snap
+    last_play = plays.drop_duplicates(keys, keep='last').set_index(keys)
+    totals['last_home_score'] = last_play['total_home_score']
+    totals['last_away_score'] = last_play['total_away_score']
+    totals['has_plays'] = True
+
+    # One row per team per game: home then away
+    games = games.reset_index(drop=True)
+    home = games['home_team'].to_numpy(dtype=object)
+    away = games['away_team'].to_numpy(dtype=object)
+    teams = pd.DataFrame({
+        'game_id': np.repeat(games['game_id'].to_numpy(), 2),
+        'team': np.column_stack([home, away]).ravel(),
+        'opponent': np.column_stack([away, home]).ravel(),
+        'is_home': np.tile([True, False], len(games)),
+        'season': np.repeat(games['season'].to_numpy(), 2),
+        'week': np.repeat(games['week'].to_numpy(), 2),
+    })
+    own = totals.reindex(pd.MultiIndex.from_arrays([teams['game_id'], teams['team']]))
+    opp = totals.reindex(pd.MultiIndex.from_arrays([teams['game_id'], teams['opponent']]))
+
+    def counts(frame, column):
+        return frame[column].fillna(0).astype('int64').tolist()
+
+    count_columns = [
+        'touchdowns', 'field_goals_att', 'field_goals_made', 'total_yards', 'passing_yards',
+        'rushing_yards', 'plays', 'completions', 'passing_att', 'passing_tds', 'interceptions',
+        'sacks_taken', 'sack_yards', 'rushing_att', 'rushing_tds', 'third_down_att',
+        'third_down_conv', 'fourth_down_att', 'fourth_down_conv', 'red_zone_att', 'red_zone_conv',
+        'punt_count', 'fumbles_lost', 'penalties', 'penalty_yards', 'clock_plays', 'drives',
+        'early_downs', 'early_down_successes',
+    ]
+    own_counts = {column: counts(own, column) for column in count_columns}
+    kickoff_return_yards = counts(opp, 'kickoff_return_yards')
+    punt_return_yards = counts(opp, 'punt_return_yards')
+
+    # Means are rounded as numpy floats, like the per-team calculation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        punt_avg = np.round(own['punt_distance_sum'] / own['punt_distance_count'], 1).tolist()
+        start_pos = np.round(100 - own['drive_start_sum'] / own['drive_start_count'], 1).tolist()
+
+    is_home = teams['is_home'].tolist()
+    has_plays = own['has_plays'].notna().tolist()
+    own_score = np.where(teams['is_home'], own['last_home_score'], own['last_away_score']).tolist()
+    opp_has_plays = opp['has_plays'].notna().tolist()
+    opp_score = np.where(teams['is_home'], opp['last_away_score'], opp['last_home_score']).tolist()
+
+    all_stats = []
+    for i, row in enumerate(teams.itertuples(index=False)):
+        if has_plays[i] and own_score[i] != own_score[i]:
+            # NaN score: defer to the per-team calculation and its fallback handling
+            game_pbp = pbp_data[pbp_data['game_id'] == row.game_id]
+            all_stats.append(calculate_team_game_stats(
+                game_pbp, row.game_id, row.team, row.opponent, row.is_home, row.season, row.week
+            ))
+            continue
+
+        c = {column: values[i] for column, values in own_counts.items()}
+        stats = {
+            'game_id': row.game_id,
+            'team': row.team,
+            'opponent': row.opponent,
+            'is_home': is_home[i],
+            'season': row.season,
+            'week': row.week,
+            'points': int(own_score[i]) if has_plays[i] else 0,
+            'touchdowns': c['touchdowns'],
+            'field_goals_att': c['field_goals_att'],
+            'field_goals_made': c['field_goals_made'],
+            'total_yards': c['total_yards'],
+            'passing_yards': c['passing_yards'],
+            'rushing_yards': c['rushing_yards'],
+            'plays': c['plays'],
+        }
+        stats['yards_per_play'] = round(c['total_yards'] / c['plays'], 2) if c['plays'] > 0 else 0.0
+
+        stats['completions'] = c['completions']
+        stats['passing_att'] = c['passing_att']
+        stats['completion_pct'] = round((c['completions'] / c['passing_att'] * 100), 1) if c['passing_att'] > 0 else 0.0
+        stats['passing_tds'] = c['passing_tds']
+        stats['interceptions'] = c['interceptions']
+        stats['sacks_taken'] = c['sacks_taken']
+        stats['sack_yards_lost'] = abs(c['sack_yards'])
+        stats['qb_rating'] = passer_rating(
+            c['completions'], c['passing_att'], c['passing_yards'], c['passing_tds'], c['interceptions']
+        )
+
+        stats['rushing_att'] = c['rushing_att']
+        stats['yards_per_carry'] = round(c['rushing_yards'] / c['rushing_att'], 2) if c['rushing_att'] > 0 else 0.0
+        stats['rushing_tds'] = c['rushing_tds']
+
+        stats['third_down_att'] = c['third_down_att']
+        stats['third_down_conv'] = c['third_down_conv']
+        stats['third_down_pct'] = round((c['third_down_conv'] / c['third_down_att'] * 100), 1) if c['third_down_att'] > 0 else 0.0
+        stats['fourth_down_att'] = c['fourth_down_att']
+        stats['fourth_down_conv'] = c['fourth_down_conv']
+        stats['fourth_down_pct'] = round((c['fourth_down_conv'] / c['fourth_down_att'] * 100), 1) if c['fourth_down_att'] > 0 else 0.0
+
+        stats['red_zone_att'] = c['red_zone_att']
+        stats['red_zone_conv'] = c['red_zone_conv']
+        stats['red_zone_pct'] = round((c['red_zone_conv'] / c['red_zone_att'] * 100), 1) if c['red_zone_att'] > 0 else 0.0
+
+        stats['punt_count'] = c['punt_count']
+        stats['punt_avg_yards'] = punt_avg[i] if c['punt_count'] > 0 else 0.0
+        stats['kickoff_return_yards'] = kickoff_return_yards[i]
+        stats['punt_return_yards'] = punt_return_yards[i]
+
+        stats['fumbles_lost'] = c['fumbles_lost']
+        stats['turnovers'] = c['interceptions'] + c['fumbles_lost']
+        stats['penalties'] = c['penalties']
+        stats['penalty_yards'] = c['penalty_yards']
+
+        stats['time_of_possession_sec'] = c['clock_plays'] * 40  # Approximate
+        stats['time_of_possession_pct'] = round((stats['time_of_possession_sec'] / 3600 * 100), 1)
+
+        stats['drives'] = c['drives']
+        stats['early_down_success_rate'] = round((c['early_down_successes'] / c['early_downs'] * 100), 1) if c['early_downs'] > 0 else 0.0
+        stats['starting_field_pos_yds'] = start_pos[i] if c['drives'] > 0 else 50.0
+
+        if not opp_has_plays[i]:
+            stats['result'] = 'T'
+        elif stats['points'] > opp_score[i]:
+            stats['result'] = 'W'
+        elif stats['points'] < opp_score[i]:
+            stats['result'] = 'L'
+        else:
+            stats['result'] = 'T'
+
+        all_stats.append(stats)
+
+    return all_stats
+
+
+def team_game_stats_rows(all_stats: List[Dict[str, Any]]) -> List[tuple]:
+    """Team-game stats dictionaries -> TEAM_GAME_STATS_COLUMNS tuples."""
+    # Prepare insert data (convert numpy types to Python types)
+    insert_data = []
+    for stats in all_stats:
+        def convert_val(val, default):
+            """Convert numpy types to Python types"""
+            if val is None:
+                return default
+            # Handle numpy types
+            if hasattr(val, 'item'):
+                return val.item()
+            return val
+        
+        record = (
+            stats['game_id'], stats['team'], stats['opponent'], stats['is_home'],
+            stats['season'], stats['week'],
+            convert_val(stats.get('points'), 0), convert_val(stats.get('touchdowns'), 0),
+            convert_val(stats.get('field_goals_made'), 0), convert_val(stats.get('field_goals_att'), 0),
+            convert_val(stats.get('total_yards'), 0), convert_val(stats.get('passing_yards'), 0),
+            convert_val(stats.get('rushing_yards'), 0), convert_val(stats.get('plays'), 0),
+            convert_val(stats.get('yards_per_play'), 0.0),
+            convert_val(stats.get('completions'), 0), convert_val(stats.get('passing_att'), 0),
+            convert_val(stats.get('completion_pct'), 0.0), convert_val(stats.get('passing_tds'), 0),
+            convert_val(stats.get('interceptions'), 0), convert_val(stats.get('sacks_taken'), 0),
+            convert_val(stats.get('sack_yards_lost'), 0), convert_val(stats.get('qb_rating'), None),
+            convert_val(stats.get('rushing_att'), 0), convert_val(stats.get('yards_per_carry'), 0.0),
+            convert_val(stats.get('rushing_tds'), 0),
+            convert_val(stats.get('third_down_conv'), 0), convert_val(stats.get('third_down_att'), 0),
+            convert_val(stats.get('third_down_pct'), 0.0),
+            convert_val(stats.get('fourth_down_conv'), 0), convert_val(stats.get('fourth_down_att'), 0),
+            convert_val(stats.get('fourth_down_pct'), 0.0),
+            convert_val(stats.get('red_zone_conv'), 0), convert_val(stats.get('red_zone_att'), 0),
+            convert_val(stats.get('red_zone_pct'), 0.0),
+            convert_val(stats.get('punt_count'), 0), convert_val(stats.get('punt_avg_yards'), 0.0),
+            convert_val(stats.get('kickoff_return_yards'), 0), convert_val(stats.get('punt_return_yards'), 0),
+            convert_val(stats.get('turnovers'), 0), convert_val(stats.get('fumbles_lost'), 0),
+            convert_val(stats.get('penalties'), 0), convert_val(stats.get('penalty_yards'), 0),
+            convert_val(stats.get('time_of_possession_sec'), 0), convert_val(stats.get('time_of_possession_pct'), 0.0),
+            convert_val(stats.get('drives'), 0), convert_val(stats.get('early_down_success_rate'), 0.0),
+            convert_val(stats.get('starting_field_pos_yds'), 50.0),
+            stats.get('result', 'L')
+        )
+        insert_data.append(record)
+
+    return insert_data
+
+
+def load_team_game_stats(conn, seasons: List[int], schema: str = 'hcl_test', refresh_cache: bool = False) -> int:
     """
     Load team-game statistics from play-by-play data.
     
@@ -459,6 +782,7 @@ def load_team_game_stats(conn, seasons: List[int], schema: str = 'hcl_test') ->
         conn: Database connection
         seasons: List of seasons to load
         schema: Database schema ('hcl_test' or 'hcl')
+        refresh_cache: Re-download seasons already in the nflverse cache
         
     Returns:
         Number of team-game records inserted
@@ -467,11 +791,11 @@ def load_team_game_stats(conn, seasons: List[int], schema: str = 'hcl_test') ->
     total_records = 0
     
     try:
-        # Fetch play-by-play data from nflverse
-        logger.info("Fetching play-by-play data from nflverse... (this may take a few minutes)")
+        # Fetch play-by-play data (nflverse, or the local cache for seasons already downloaded)
+        logger.info("Loading play-by-play data... (downloads from nflverse may take a few minutes)")
         import traceback
         try:
-            pbp_data = nfl.import_pbp_data(seasons)
+            pbp_data = load_seasons('pbp', seasons, fetch_pbp, columns=PBP_COLUMNS, refresh=refresh_cache)
         except Exception as pbp_error:
             logger.error(f"PBP import error: {pbp_error}")
             logger.error("Full traceback:")
@@ -483,144 +807,17 @@ def load_team_game_stats(conn, seasons: List[int], schema: str = 'hcl_test') ->
         games = pbp_data[['game_id', 'season', 'week', 'home_team', 'away_team']].drop_duplicates()
         logger.info(f"Processing {len(games)} unique games")
         
-        # Process each game
-        all_stats = []
-        for idx, game in games.iterrows():
-            game_id = game['game_id']
-            season = game['season']
-            week = game['week']
-            home_team = game['home_team']
-            away_team = game['away_team']
-            
-            # Filter play-by-play for this game
-            game_pbp = pbp_data[pbp_data['game_id'] == game_id]
-            
-            # Calculate stats for home team
-            home_stats = calculate_team_game_stats(
-                game_pbp, game_id, home_team, away_team, True, season, week
-            )
-            all_stats.append(home_stats)
-            
-            # Calculate stats for away team
-            away_stats = calculate_team_game_stats(
-                game_pbp, game_id, away_team, home_team, False, season, week
-            )
-            all_stats.append(away_stats)
-            
-            if (idx + 1) % 50 == 0:
-                logger.info(f"Processed {idx + 1}/{len(games)} games...")
+        # Aggregate every game in one pass
+        all_stats = aggregate_team_game_stats(pbp_data, games)
         
         logger.info(f"Calculated stats for {len(all_stats)} team-game records")
         
-        # Prepare insert data (convert numpy types to Python types)
-        insert_data = []
-        for stats in all_stats:
-            def convert_val(val, default):
-                """Convert numpy types to Python types"""
-                if val is None:
-                    return default
-                # Handle numpy types
-                if hasattr(val, 'item'):
-                    return val.item()
-                return val
-            
-            record = (
-                stats['game_id'], stats['team'], stats['opponent'], stats['is_home'],
-                stats['season'], stats['week'],
-                convert_val(stats.get('points'), 0), convert_val(stats.get('touchdowns'), 0),
-                convert_val(stats.get('field_goals_made'), 0), convert_val(stats.get('field_goals_att'), 0),
-                convert_val(stats.get('total_yards'), 0), convert_val(stats.get('passing_yards'), 0),
-                convert_val(stats.get('rushing_yards'), 0), convert_val(stats.get('plays'), 0),
-                convert_val(stats.get('yards_per_play'), 0.0),
-                convert_val(stats.get('completions'), 0), convert_val(stats.get('passing_att'), 0),
-                convert_val(stats.get('completion_pct'), 0.0), convert_val(stats.get('passing_tds'), 0),
-                convert_val(stats.get('interceptions'), 0), convert_val(stats.get('sacks_taken'), 0),
-                convert_val(stats.get('sack_yards_lost'), 0), convert_val(stats.get('qb_rating'), None),
-                convert_val(stats.get('rushing_att'), 0), convert_val(stats.get('yards_per_carry'), 0.0),
-                convert_val(stats.get('rushing_tds'), 0),
-                convert_val(stats.get('third_down_conv'), 0), convert_val(stats.get('third_down_att'), 0),
-                convert_val(stats.get('third_down_pct'), 0.0),
-                convert_val(stats.get('fourth_down_conv'), 0), convert_val(stats.get('fourth_down_att'), 0),
-                convert_val(stats.get('fourth_down_pct'), 0.0),
-                convert_val(stats.get('red_zone_conv'), 0), convert_val(stats.get('red_zone_att'), 0),
-                convert_val(stats.get('red_zone_pct'), 0.0),
-                convert_val(stats.get('punt_count'), 0), convert_val(stats.get('punt_avg_yards'), 0.0),
-                convert_val(stats.get('kickoff_return_yards'), 0), convert_val(stats.get('punt_return_yards'), 0),
-                convert_val(stats.get('turnovers'), 0), convert_val(stats.get('fumbles_lost'), 0),
-                convert_val(stats.get('penalties'), 0), convert_val(stats.get('penalty_yards'), 0),
-                convert_val(stats.get('time_of_possession_sec'), 0), convert_val(stats.get('time_of_possession_pct'), 0.0),
-                convert_val(stats.get('drives'), 0), convert_val(stats.get('early_down_success_rate'), 0.0),
-                convert_val(stats.get('starting_field_pos_yds'), 50.0),
-                stats.get('result', 'L')
-            )
-            insert_data.append(record)
+        insert_data = team_game_stats_rows(all_stats)
         
         # Insert into database using UPSERT
-        insert_sql = f"""
-            INSERT INTO {schema}.team_game_stats (
-                game_id, team, opponent, is_home, season, week,
-                points, touchdowns, field_goals_made, field_goals_att,
-                total_yards, passing_yards, rushing_yards, plays, yards_per_play,
-                completions, passing_att, completion_pct, passing_tds, interceptions,
-                sacks_taken, sack_yards_lost, qb_rating,
-                rushing_att, yards_per_carry, rushing_tds,
-                third_down_conv, third_down_att, third_down_pct,
-                fourth_down_conv, fourth_down_att, fourth_down_pct,
-                red_zone_conv, red_zone_att, red_zone_pct,
-                punt_count, punt_avg_yards, kickoff_return_yards, punt_return_yards,
-                turnovers, fumbles_lost, penalties, penalty_yards,
-                time_of_possession_sec, time_of_possession_pct,
-                drives, early_down_success_rate, starting_field_pos_yds,
-                result
-            ) VALUES %s
-            ON CONFLICT (game_id, team) DO UPDATE SET
-                opponent = EXCLUDED.opponent,
-                is_home = EXCLUDED.is_home,
-                points = EXCLUDED.points,
-                touchdowns = EXCLUDED.touchdowns,
-                field_goals_made = EXCLUDED.field_goals_made,
-                field_goals_att = EXCLUDED.field_goals_att,
-                total_yards = EXCLUDED.total_yards,
-                passing_yards = EXCLUDED.passing_yards,
-                rushing_yards = EXCLUDED.rushing_yards,
-                plays = EXCLUDED.plays,
-                yards_per_play = EXCLUDED.yards_per_play,
-                completions = EXCLUDED.completions,
-                passing_att = EXCLUDED.passing_att,
-                completion_pct = EXCLUDED.completion_pct,
-                passing_tds = EXCLUDED.passing_tds,
-                interceptions = EXCLUDED.interceptions,
-                sacks_taken = EXCLUDED.sacks_taken,
-                sack_yards_lost = EXCLUDED.sack_yards_lost,
-                qb_rating = EXCLUDED.qb_rating,
-                rushing_att = EXCLUDED.rushing_att,
-                yards_per_carry = EXCLUDED.yards_per_carry,
-                rushing_tds = EXCLUDED.rushing_tds,
-                third_down_conv = EXCLUDED.third_down_conv,
-                third_down_att = EXCLUDED.third_down_att,
-                third_down_pct = EXCLUDED.third_down_pct,
-                fourth_down_conv = EXCLUDED.fourth_down_conv,
-                fourth_down_att = EXCLUDED.fourth_down_att,
-                fourth_down_pct = EXCLUDED.fourth_down_pct,
-                red_zone_conv = EXCLUDED.red_zone_conv,
-                red_zone_att = EXCLUDED.red_zone_att,
-                red_zone_pct = EXCLUDED.red_zone_pct,
-                punt_count = EXCLUDED.punt_count,
-                punt_avg_yards = EXCLUDED.punt_avg_yards,
-                kickoff_return_yards = EXCLUDED.kickoff_return_yards,
-                punt_return_yards = EXCLUDED.punt_return_yards,
-                turnovers = EXCLUDED.turnovers,
-                fumbles_lost = EXCLUDED.fumbles_lost,
-                penalties = EXCLUDED.penalties,
-                penalty_yards = EXCLUDED.penalty_yards,
-                time_of_possession_sec = EXCLUDED.time_of_possession_sec,
-                time_of_possession_pct = EXCLUDED.time_of_possession_pct,
-                drives = EXCLUDED.drives,
-                early_down_success_rate = EXCLUDED.early_down_success_rate,
-                starting_field_pos_yds = EXCLUDED.starting_field_pos_yds,
-                result = EXCLUDED.result,
-                updated_at = NOW()
-        """
+        insert_sql = upsert_sql(
+            f"{schema}.team_game_stats", TEAM_GAME_STATS_COLUMNS, TEAM_GAME_STATS_KEY, TEAM_GAME_STATS_UPDATE_COLUMNS
+        )
         
         with conn.cursor() as cur:
             execute_values(cur, insert_sql, insert_data, page_size=100)
@@ -738,6 +935,29 @@ def refresh_views(conn, schema: str = 'hcl_test'):
         conn.rollback()
 
 
+def refresh_rolling_features(conn, schema: str = 'hcl'):
+    """
+    Rebuild the team_rolling_features seasons this load made stale. Predictions
+    only read the last build, so every load that writes games/team stats runs this.
+
+    Args:
+        conn: Database connection
+        schema: Database schema
+    """
+    if ML_DIR not in sys.path:
+        sys.path.insert(0, ML_DIR)
+    from team_rolling_features import ensure_team_rolling_features, refresh_team_rolling_features
+
+    logger.info("Refreshing team rolling features...")
+    try:
+        ensure_team_rolling_features(conn, schema)
+        refreshed = refresh_team_rolling_features(conn, schema=schema)
+        logger.info(f"Team rolling features refreshed for seasons: {sorted(refreshed) or 'none stale'}")
+    except Exception as e:
+        logger.error(f"Failed to refresh team rolling features: {e}")
+        conn.rollback()
+
+
 def verify_data_load(conn, schema: str = 'hcl_test'):
     """
     Run verification queries to check data integrity.
@@ -787,6 +1007,243 @@ def verify_data_load(conn, schema: str = 'hcl_test'):
         logger.error(f"Verification failed: {e}")
 
 
+def _last_per_key(rows: List[tuple], key_len: int) -> List[tuple]:
+    """Drop repeated keys (last row wins), as successive upserts would."""
+    return list({row[:key_len]: row for row in rows}.values())
+
+
+def prepare_season(season: int, refresh_cache: bool = False, include_schedules: bool = True,
+                   include_stats: bool = True) -> Dict[str, Any]:
+    """
+    Pipeline worker: fetch one season and build its games / team_game_stats rows.
+
+    Runs in a pool process, so it only touches the nflverse cache, never the database.
+    """
+    timings = {}
+    game_rows = []
+    stat_rows = []
+
+    if include_schedules:
+        started = time.perf_counter()
+        game_rows = _last_per_key(schedule_rows(import_schedule_records([season], refresh_cache)), len(GAMES_KEY))
+        timings['schedules'] = time.perf_counter() - started
+
+    if include_stats:
+        started = time.perf_counter()
+        pbp_data = load_seasons('pbp', [season], fetch_pbp, columns=PBP_COLUMNS, refresh=refresh_cache)
+        timings['pbp_fetch'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stat_rows = team_game_stats_rows(aggregate_team_game_stats(pbp_data))
+        stat_rows = _last_per_key(stat_rows, len(TEAM_GAME_STATS_KEY))
+        timings['aggregate'] = time.perf_counter() - started
+
+    return {'season': season, 'game_rows': game_rows, 'stat_rows': stat_rows, 'timings': timings}
+
+
+def copy_rows(cur, table: str, columns: List[str], rows: List[tuple]):
+    """Stream rows into table with COPY FROM STDIN (CSV; None loads as NULL)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def run_pipeline(conn, seasons: List[int], schema: str = 'hcl_test', workers: Optional[int] = None,
+                 refresh_cache: bool = False, include_schedules: bool = True,
+                 include_stats: bool = True) -> Dict[str, Any]:
+    """
+    Load seasons through the parallel pipeline.
+
+    Seasons are fetched and aggregated in a process pool (play-by-play team
+    stats via aggregate_team_game_stats). Each finished season is COPY'd into
+    temp staging tables while the others are still running; one set-based
+    upsert per table then merges everything in a single transaction, followed
+    by one view refresh.
+
+    Args:
+        conn: Database connection
+        seasons: Seasons to load
+        schema: Database schema ('hcl_test' or 'hcl')
+        workers: Pool size (default: one per season, capped at CPU count)
+        refresh_cache: Re-download seasons already in the nflverse cache
+        include_schedules: Load hcl.games
+        include_stats: Load hcl.team_game_stats from play-by-play
+
+    Returns:
+        {'games', 'team_game_stats', 'timings'} with per-stage seconds
+    """
+    total_started = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(seasons)))
+    logger.info(f"Pipeline: {len(seasons)} seasons, {workers} workers")
+
+    timings = {'schedules': 0.0, 'pbp_fetch': 0.0, 'aggregate': 0.0, 'copy': 0.0}
+    counts = {'games': 0, 'team_game_stats': 0}
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TEMP TABLE games_stage ON COMMIT DROP AS
+                SELECT {', '.join(GAMES_COLUMNS)} FROM {schema}.games WITH NO DATA
+            """)
+            cur.execute(f"""
+                CREATE TEMP TABLE team_game_stats_stage ON COMMIT DROP AS
+                SELECT {', '.join(TEAM_GAME_STATS_COLUMNS)} FROM {schema}.team_game_stats WITH NO DATA
+            """)
+
+            def stage(result):
+                for key, seconds in result['timings'].items():
+                    timings[key] += seconds
+                started = time.perf_counter()
+                copy_rows(cur, 'games_stage', GAMES_COLUMNS, result['game_rows'])
+                copy_rows(cur, 'team_game_stats_stage', TEAM_GAME_STATS_COLUMNS, result['stat_rows'])
+                timings['copy'] += time.perf_counter() - started
+                counts['games'] += len(result['game_rows'])
+                counts['team_game_stats'] += len(result['stat_rows'])
+                logger.info(
+                    f"  {result['season']}: {len(result['game_rows'])} games, "
+                    f"{len(result['stat_rows'])} team-game records staged"
+                )
+
+            started = time.perf_counter()
+            if workers == 1:
+                for season in seasons:
+                    stage(prepare_season(season, refresh_cache, include_schedules, include_stats))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(prepare_season, season, refresh_cache, include_schedules, include_stats)
+                        for season in seasons
+                    ]
+                    for future in as_completed(futures):
+                        stage(future.result())
+            timings['prepare_wall'] = time.perf_counter() - started
+
+            # games first: team_game_stats rows reference them
+            started = time.perf_counter()
+            cur.execute(upsert_sql(f"{schema}.games", GAMES_COLUMNS, GAMES_KEY, GAMES_UPDATE_COLUMNS,
+                                   from_table='games_stage'))
+            timings['merge_games'] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            cur.execute(upsert_sql(f"{schema}.team_game_stats", TEAM_GAME_STATS_COLUMNS, TEAM_GAME_STATS_KEY,
+                                   TEAM_GAME_STATS_UPDATE_COLUMNS, from_table='team_game_stats_stage'))
+            timings['merge_team_game_stats'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        conn.commit()
+        timings['commit'] = time.perf_counter() - started
+
+    except Exception as e:
+        logger.error(f"Pipeline load failed: {e}")
+        conn.rollback()
+        raise
+
+    logger.info(f"Merged {counts['games']} games and {counts['team_game_stats']} team-game records into {schema}")
+
+    started = time.perf_counter()
+    refresh_views(conn, schema)
+    timings['refresh_views'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    refresh_rolling_features(conn, schema)
+    timings['rolling_features'] = time.perf_counter() - started
+
+    timings['total'] = time.perf_counter() - total_started
+
+    # Worker stages are summed across processes; prepare_wall is the elapsed time of the pool
+    logger.info("Pipeline stage timings (seconds):")
+    for stage_name, seconds in timings.items():
+        logger.info(f"  {stage_name:<24} {seconds:8.2f}")
+
+    return {**counts, 'timings': {name: round(seconds, 3) for name, seconds in timings.items()}}
+
+
+def run_incremental(conn, seasons: List[int], schema: str = 'hcl_test', refresh_cache: bool = False,
+                    include_schedules: bool = True, include_stats: bool = True) -> Dict[str, Any]:
+    """
+    In-season update that only touches games whose data changed since the last run.
+
+    Schedule rows are upserted with only_changed, so unchanged games are not
+    rewritten. Team-game stats are recomputed only for games whose
+    play-by-play slice hash (pbp_changes, consumer 'team_game_stats') differs
+    from the one recorded by the previous run, and the hashes commit with the
+    rows. The matchup view is refreshed only if a row changed; REFRESH ...
+    CONCURRENTLY then rewrites just the view rows that differ.
+
+    Args:
+        conn: Database connection
+        seasons: Seasons to check (normally the current one)
+        schema: Database schema ('hcl_test' or 'hcl')
+        refresh_cache: Re-download seasons already in the nflverse cache
+        include_schedules: Update hcl.games
+        include_stats: Update hcl.team_game_stats from play-by-play
+
+    Returns:
+        {'games_changed', 'pbp_games', 'pbp_games_changed', 'team_game_stats_changed'}
+    """
+    result = {'games_changed': 0, 'pbp_games': 0, 'pbp_games_changed': 0, 'team_game_stats_changed': 0}
+
+    hashes = {}
+    changed = []
+    stat_rows = []
+    if include_stats:
+        pbp_data = load_seasons('pbp', seasons, fetch_pbp, columns=PBP_COLUMNS, refresh=refresh_cache)
+        hashes = game_hashes(pbp_data, PBP_COLUMNS)
+        changed = changed_games(conn, 'team_game_stats', hashes, schema)
+        result['pbp_games'] = len(hashes)
+        result['pbp_games_changed'] = len(changed)
+        logger.info(f"Play-by-play: {len(changed)} of {len(hashes)} games new or changed")
+
+        if changed:
+            changed_pbp = pbp_data[pbp_data['game_id'].isin(changed)]
+            stat_rows = team_game_stats_rows(aggregate_team_game_stats(changed_pbp))
+            stat_rows = _last_per_key(stat_rows, len(TEAM_GAME_STATS_KEY))
+
+    try:
+        with conn.cursor() as cur:
+            if include_schedules:
+                game_rows = _last_per_key(schedule_rows(import_schedule_records(seasons, refresh_cache)),
+                                          len(GAMES_KEY))
+                written = execute_values(
+                    cur,
+                    upsert_sql(f"{schema}.games", GAMES_COLUMNS, GAMES_KEY, GAMES_UPDATE_COLUMNS,
+                               only_changed=True) + " RETURNING game_id",
+                    game_rows, fetch=True
+                )
+                result['games_changed'] = len(written)
+
+            if stat_rows:
+                written = execute_values(
+                    cur,
+                    upsert_sql(f"{schema}.team_game_stats", TEAM_GAME_STATS_COLUMNS, TEAM_GAME_STATS_KEY,
+                               TEAM_GAME_STATS_UPDATE_COLUMNS, only_changed=True) + " RETURNING game_id",
+                    stat_rows, fetch=True
+                )
+                result['team_game_stats_changed'] = len(written)
+
+            save_hashes(cur, 'team_game_stats', hashes, changed, schema)
+        conn.commit()
+
+    except Exception as e:
+        logger.error(f"Incremental load failed: {e}")
+        conn.rollback()
+        raise
+
+    logger.info(
+        f"Incremental: {result['games_changed']} games and "
+        f"{result['team_game_stats_changed']} team-game records changed in {schema}"
+    )
+
+    if result['games_changed'] or result['team_game_stats_changed']:
+        refresh_views(conn, schema)
+        refresh_rolling_features(conn, schema)
+    else:
+        logger.info("No changes; skipped view refresh")
+
+    return result
+
+
 def main():
     """Main execution function."""
     parser = argparse.ArgumentParser(description='Load historical NFL game data into HCL schema')
@@ -795,6 +1252,12 @@ def main():
     parser.add_argument('--seasons', nargs='+', type=int, required=True, help='Seasons to load (e.g., 2022 2023 2024)')
     parser.add_argument('--skip-schedules', action='store_true', help='Skip schedule loading (if already loaded)')
     parser.add_argument('--skip-stats', action='store_true', help='Skip stats loading (if already loaded)')
+    parser.add_argument('--refresh-cache', action='store_true', help='Re-download seasons already in the local nflverse cache')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Fetch/aggregate seasons in parallel (play-by-play team stats) and load via COPY + merge')
+    parser.add_argument('--workers', type=int, default=None, help='Pipeline process count (default: one per season, up to CPU count)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only update games whose schedule row or play-by-play changed since the last run')
     
     args = parser.parse_args()
     
@@ -803,6 +1266,10 @@ def main():
         logger.error("Cannot specify both --testbed and --production")
         sys.exit(1)
     
+    if args.pipeline and args.incremental:
+        logger.error("Cannot specify both --pipeline and --incremental")
+        sys.exit(1)
+    
     schema = 'hcl_test' if args.testbed else 'hcl'
     
     logger.info("="*80)
@@ -817,9 +1284,35 @@ def main():
     conn = get_db_connection(schema)
     
     try:
+        if args.pipeline:
+            result = run_pipeline(
+                conn, args.seasons, schema, args.workers, args.refresh_cache,
+                include_schedules=not args.skip_schedules, include_stats=not args.skip_stats
+            )
+            logger.info(f"✓ Loaded {result['games']} games and {result['team_game_stats']} team-game records")
+            verify_data_load(conn, schema)
+            logger.info("="*80)
+            logger.info("DATA LOAD COMPLETE!")
+            logger.info("="*80)
+            return
+
+        if args.incremental:
+            result = run_incremental(
+                conn, args.seasons, schema, args.refresh_cache,
+                include_schedules=not args.skip_schedules, include_stats=not args.skip_stats
+            )
+            logger.info(
+                f"✓ {result['games_changed']} games and {result['team_game_stats_changed']} team-game records updated "
+                f"({result['pbp_games_changed']} of {result['pbp_games']} play-by-play games recomputed)"
+            )
+            logger.info("="*80)
+            logger.info("INCREMENTAL UPDATE COMPLETE!")
+            logger.info("="*80)
+            return
+
         # Load schedules (game metadata)
         if not args.skip_schedules:
-            games_loaded = load_schedules(conn, args.seasons, schema)
+            games_loaded = load_schedules(conn, args.seasons, schema, args.refresh_cache)
             logger.info(f"✓ Loaded {games_loaded} games")
         else:
             logger.info("Skipped schedule loading")
@@ -838,6 +1331,8 @@ def main():
         # Refresh materialized views
         refresh_views(conn, schema)
         logger.info("✓ Refreshed materialized views")
+
+        refresh_rolling_features(conn, schema)
         
         # Verify data
         verify_data_load(conn, schema)
@@ -0,0 +1,156 @@
+"""
+Local Parquet cache for nflverse play-by-play and schedule imports.
+
+Each season of a dataset is stored as one file (pbp_2024.parquet,
+schedules_2024.parquet) under NFLVERSE_CACHE_DIR. Completed seasons are
+downloaded once and read from disk afterwards; the current season is
+re-fetched whenever its file is older than NFLVERSE_CACHE_MAX_AGE_MINUTES
+(default 0: every run, so live scores stay current). Files only hold the
+columns the loader asked for, and pyarrow reads them memory-mapped.
+
+NFLVERSE_SOURCE_DIR replaces the remote source with a local directory of
+<dataset>_<season>.parquet or .csv files (tests, offline loads).
+NFLVERSE_CACHE=0 disables the cache.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_ENGINE = 'pyarrow'
+except ModuleNotFoundError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_ENGINE = 'fastparquet'
+    except ModuleNotFoundError:
+        PARQUET_ENGINE = None
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CACHE_ENABLED = os.getenv('NFLVERSE_CACHE', '1') != '0'
+CACHE_DIR = os.getenv('NFLVERSE_CACHE_DIR', os.path.join(REPO_ROOT, 'data', 'nflverse_cache'))
+SOURCE_DIR = os.getenv('NFLVERSE_SOURCE_DIR')
+CURRENT_SEASON_MAX_AGE_MINUTES = float(os.getenv('NFLVERSE_CACHE_MAX_AGE_MINUTES', '0'))
+
+
+def current_season(today: Optional[datetime] = None) -> int:
+    """NFL season in progress; January and February belong to the previous season."""
+    today = today or datetime.now()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def cache_path(dataset: str, season: int) -> str:
+    return os.path.join(CACHE_DIR, f'{dataset}_{season}.parquet')
+
+
+def _is_fresh(path: str, season: int) -> bool:
+    """Past seasons never change; the current season expires after the max age."""
+    if not os.path.exists(path):
+        return False
+    if season < current_season():
+        return True
+    age_minutes = (time.time() - os.path.getmtime(path)) / 60
+    return age_minutes < CURRENT_SEASON_MAX_AGE_MINUTES
+
+
+def _read_parquet(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    options = {'memory_map': True} if PARQUET_ENGINE == 'pyarrow' else {}
+    return pd.read_parquet(path, columns=columns, engine=PARQUET_ENGINE, **options)
+
+
+def _write_parquet(frame: pd.DataFrame, path: str):
+    """Write through a temp file so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    frame.to_parquet(tmp_path, engine=PARQUET_ENGINE, index=False)
+    os.replace(tmp_path, path)
+
+
+def _read_source_dir(dataset: str, seasons: List[int]) -> pd.DataFrame:
+    """Read <dataset>_<season>.parquet/.csv sample files from NFLVERSE_SOURCE_DIR."""
+    frames = []
+    for season in seasons:
+        base = os.path.join(SOURCE_DIR, f'{dataset}_{season}')
+        if os.path.exists(f'{base}.parquet'):
+            frames.append(_read_parquet(f'{base}.parquet'))
+        elif os.path.exists(f'{base}.csv'):
+            frames.append(pd.read_csv(f'{base}.csv', low_memory=False))
+        else:
+            raise FileNotFoundError(f'No {dataset} file for {season} in {SOURCE_DIR}')
+    return pd.concat(frames, ignore_index=True)
+
+
+def _prune(frame: pd.DataFrame, dataset: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    if columns is None:
+        return frame
+    missing = [col for col in columns if col not in frame.columns]
+    if missing:
+        logger.warning(f"{dataset} source is missing columns: {missing}")
+    return frame[[col for col in columns if col in frame.columns]]
+
+
+def load_seasons(dataset: str, seasons: List[int], fetch: Callable[[List[int]], pd.DataFrame],
+                 columns: Optional[List[str]] = None, refresh: bool = False) -> pd.DataFrame:
+    """
+    Load `dataset` rows for `seasons`, serving what it can from the local cache.
+
+    Args:
+        dataset: Cache file prefix ('pbp', 'schedules')
+        seasons: Seasons to load
+        fetch: Downloads a list of seasons as one DataFrame with a 'season' column
+        columns: Columns to keep (None keeps everything)
+        refresh: Re-fetch every requested season
+
+    Returns:
+        DataFrame of the requested seasons in season order
+    """
+    seasons = [int(season) for season in seasons]
+    source = (lambda missing: _read_source_dir(dataset, missing)) if SOURCE_DIR else fetch
+
+    if not CACHE_ENABLED or PARQUET_ENGINE is None:
+        if CACHE_ENABLED:
+            logger.warning("pyarrow/fastparquet not installed; nflverse cache disabled")
+        return _prune(source(seasons), dataset, columns).reset_index(drop=True)
+
+    frames = {}
+    missing = []
+    for season in seasons:
+        path = cache_path(dataset, season)
+        if refresh or not _is_fresh(path, season):
+            missing.append(season)
+            continue
+        try:
+            frames[season] = _read_parquet(path, columns)
+        except Exception as e:
+            # Corrupt file or a column the cached copy was pruned without
+            logger.warning(f"Ignoring cached {dataset} {season}: {str(e).splitlines()[0]}")
+            missing.append(season)
+
+    if frames:
+        logger.info(f"{dataset}: seasons {sorted(frames)} read from {CACHE_DIR}")
+
+    if missing:
+        logger.info(f"{dataset}: fetching seasons {missing}")
+        # Keep 'season' for the per-season split even when the caller didn't ask for it
+        keep = columns if columns is None or 'season' in columns else columns + ['season']
+        fetched = _prune(source(missing), dataset, keep)
+        for season in missing:
+            season_rows = fetched[fetched['season'] == season].reset_index(drop=True)
+            if len(season_rows) == 0:
+                logger.warning(f"{dataset}: no rows for {season}")
+                continue
+            _write_parquet(season_rows, cache_path(dataset, season))
+            frames[season] = season_rows if keep is columns else season_rows.drop(columns='season')
+
+    ordered = [frames[season] for season in seasons if season in frames]
+    if not ordered:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(ordered, ignore_index=True)
@@ -0,0 +1,99 @@
+"""
+Play-by-play change detection for incremental loads.
+
+Each consumer (team_game_stats, epa, ...) records a content hash of the
+play-by-play columns it reads for every game it has processed in
+<schema>.pbp_game_hashes. On the next run only games whose slice hashes
+differ (new games, nflverse corrections) need to be recomputed.
+"""
+
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+HASH_TABLE = 'pbp_game_hashes'
+
+HASH_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {schema}.pbp_game_hashes (
+    consumer VARCHAR(40) NOT NULL,
+    game_id VARCHAR(50) NOT NULL,
+    play_count INTEGER NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (consumer, game_id)
+)
+"""
+
+
+def ensure_hash_table(conn, schema: str = 'hcl'):
+    with conn.cursor() as cur:
+        cur.execute(HASH_TABLE_SQL.format(schema=schema))
+    conn.commit()
+
+
+def game_hashes(pbp_data: pd.DataFrame, columns: List[str]) -> Dict[str, Tuple[str, int]]:
+    """
+    Hash each game's play-by-play slice over `columns` (those present).
+
+    Returns:
+        {game_id: (sha256 hex digest, play count)}; sensitive to play order
+        and to which columns were hashed
+    """
+    columns = [col for col in columns if col in pbp_data.columns]
+    if len(pbp_data) == 0:
+        return {}
+
+    row_hashes = pd.util.hash_pandas_object(pbp_data[columns], index=False).to_numpy()
+    codes, game_ids = pd.factorize(pbp_data['game_id'])
+    order = np.argsort(codes, kind='stable')
+    row_hashes = row_hashes[order]
+    ends = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(game_ids)))
+    # NaN game_ids (code -1) sort first; skip them
+    offset = int((codes < 0).sum())
+
+    seed = ','.join(columns).encode()
+    hashes = {}
+    start = offset
+    for game_id, end in zip(game_ids, ends + offset):
+        digest = hashlib.sha256(seed)
+        digest.update(row_hashes[start:end].tobytes())
+        hashes[game_id] = (digest.hexdigest(), int(end - start))
+        start = end
+    return hashes
+
+
+def changed_games(conn, consumer: str, hashes: Dict[str, Tuple[str, int]], schema: str = 'hcl') -> List[str]:
+    """game_ids in `hashes` that `consumer` has not processed with the same content."""
+    ensure_hash_table(conn, schema)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT game_id, content_hash FROM {schema}.{HASH_TABLE} "
+            f"WHERE consumer = %s AND game_id = ANY(%s)",
+            (consumer, list(hashes)),
+        )
+        stored = dict(cur.fetchall())
+    return [game_id for game_id, (content_hash, _) in hashes.items() if stored.get(game_id) != content_hash]
+
+
+def save_hashes(cur, consumer: str, hashes: Dict[str, Tuple[str, int]], game_ids: List[str],
+                schema: str = 'hcl') -> int:
+    """Record `game_ids` as processed; commit together with the rows they produced."""
+    rows = [(consumer, game_id, hashes[game_id][1], hashes[game_id][0]) for game_id in game_ids]
+    if not rows:
+        return 0
+    execute_values(
+        cur,
+        f"""
+        INSERT INTO {schema}.{HASH_TABLE} (consumer, game_id, play_count, content_hash)
+        VALUES %s
+        ON CONFLICT (consumer, game_id) DO UPDATE SET
+            play_count = EXCLUDED.play_count,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = NOW()
+        """,
+        rows,
+    )
+    return len(rows)
@@ -5,12 +5,18 @@ Uses nflverse play-by-play data to calculate EPA stats
 Updates existing team_game_stats records with EPA values
 """
 
+import argparse
 import psycopg2
 from psycopg2.extras import execute_values
 import nfl_data_py as nfl
 import pandas as pd
 from datetime import datetime
 import os
+import sys
+from pbp_changes import changed_games, game_hashes, save_hashes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'ml'))
+from team_rolling_features import refresh_team_rolling_features
 
 # Only load .env if environment variables aren't already set
 if not os.getenv('DB_HOST'):
@@ -20,7 +26,18 @@ if not os.getenv('DB_HOST'):
     except ImportError:
         print("Warning: python-dotenv not installed, using environment variables only")
 
+# Play-by-play columns the EPA calculations read (hashed for --incremental)
+EPA_PBP_COLUMNS = [
+    'game_id', 'posteam', 'play_type', 'epa', 'success', 'wpa', 'cpoe',
+    'air_yards', 'complete_pass', 'yards_after_catch', 'yards_gained',
+]
+
 def main():
+    parser = argparse.ArgumentParser(description='Update 2025 team_game_stats with EPA stats')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only recalculate games whose play-by-play changed since the last run')
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("📊 UPDATING DATABASE WITH EPA CALCULATIONS FOR 2025")
     print("="*80)
@@ -63,6 +80,12 @@ def main():
     games = cur.fetchall()
     print(f"   ✅ Found {len(games)} games")
     
+    if args.incremental:
+        hashes = game_hashes(pbp, EPA_PBP_COLUMNS)
+        changed = set(changed_games(conn, 'epa', hashes))
+        games = [game for game in games if game[0] in changed]
+        print(f"   ✅ {len(games)} games new or changed since the last run")
+    
     # Calculate EPA for each game
     print("\n🧮 Calculating EPA stats for each team-game...")
     updates = []
@@ -130,7 +153,10 @@ def main():
     # Update database
     print("\n💾 Updating database with EPA stats...")
     count = 0
+    expected = {}
+    matched = {}
     for stats in updates:
+        expected[stats['game_id']] = expected.get(stats['game_id'], 0) + 1
         try:
             cur.execute("""
                 UPDATE hcl.team_game_stats
@@ -168,11 +194,25 @@ def main():
                 stats['team']
             ))
             count += cur.rowcount
+            matched[stats['game_id']] = matched.get(stats['game_id'], 0) + cur.rowcount
         except Exception as e:
             print(f"   ⚠️  Error updating {stats['game_id']} {stats['team']}: {e}")
     
+    if args.incremental:
+        # Games whose team rows don't exist yet are retried next run
+        done = [game_id for game_id, n in expected.items() if matched.get(game_id) == n]
+        save_hashes(cur, 'epa', hashes, done)
+    
     conn.commit()
     print(f"   ✅ Updated {count} records")
+
+    # Predictions read the last feature build; rebuild the seasons these updates made stale
+    try:
+        refreshed = refresh_team_rolling_features(conn)
+        print(f"   ✅ Rebuilt team rolling features for seasons {sorted(refreshed) or 'none stale'}")
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"   ⚠️  Could not refresh team rolling features: {e}")
     
     # Verify
     print("\n✅ Verifying EPA data...")
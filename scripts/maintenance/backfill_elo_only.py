@@ -16,7 +16,6 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
 import psycopg2
 from psycopg2.extensions import connection as PgConnection
 
@@ -29,6 +28,7 @@ if str(ml_dir) not in sys.path:
 
 from db_config import DATABASE_CONFIG
 from ml.predict_elo import EloPredictionSystem
+from prediction_writer import save_elo_predictions
 
 
 def _connect() -> PgConnection:
@@ -91,63 +91,16 @@ def _insert_elo_for_week(
     if len(games_df) == 0:
         return {"generated": 0, "inserted": 0}
 
-    insert_sql = """
-        INSERT INTO hcl.ml_predictions_elo (
-            game_id, season, week, game_date, home_team, away_team,
-            home_elo, away_elo, elo_diff,
-            home_win_prob, away_win_prob,
-            predicted_winner, confidence,
-            elo_spread, vegas_spread, spread_diff,
-            split_prediction, prediction_date
-        ) VALUES (
-            %(game_id)s, %(season)s, %(week)s, %(game_date)s, %(home_team)s, %(away_team)s,
-            %(home_elo)s, %(away_elo)s, %(elo_diff)s,
-            %(home_win_prob)s, %(away_win_prob)s,
-            %(predicted_winner)s, %(confidence)s,
-            %(elo_spread)s, %(vegas_spread)s, %(spread_diff)s,
-            %(split_prediction)s, NOW()
-        )
-        ON CONFLICT (game_id) DO NOTHING
-    """
+    predictions = elo.predict_games(games_df).to_dict("records")
+    for pred in predictions:
+        pred["season"] = season
+        pred["week"] = week
 
     cur = conn.cursor()
-    inserted = 0
-    generated = 0
-
-    for _, game in games_df.iterrows():
-        spread_line = game["spread_line"] if pd.notna(game["spread_line"]) else None
-        pred = elo.predict_game(
-            game["home_team"],
-            game["away_team"],
-            spread_line=spread_line,
-            is_neutral=False,
-        )
-        row = {
-            "game_id": game["game_id"],
-            "season": season,
-            "week": week,
-            "game_date": game["game_date"],
-            "home_team": pred["home_team"],
-            "away_team": pred["away_team"],
-            "home_elo": pred["home_elo"],
-            "away_elo": pred["away_elo"],
-            "elo_diff": pred["elo_diff"],
-            "home_win_prob": pred["home_win_prob"],
-            "away_win_prob": pred["away_win_prob"],
-            "predicted_winner": pred["predicted_winner"],
-            "confidence": pred["confidence"],
-            "elo_spread": pred["elo_spread"],
-            "vegas_spread": pred["vegas_spread"],
-            "spread_diff": pred["spread_diff"],
-            "split_prediction": pred["split_prediction"],
-        }
-        cur.execute(insert_sql, row)
-        inserted += cur.rowcount
-        generated += 1
-
+    saved = save_elo_predictions(cur, predictions, conflict="nothing")
     conn.commit()
     cur.close()
-    return {"generated": generated, "inserted": inserted}
+    return {"generated": len(predictions), "inserted": saved["inserted"]}
 
 
 def _coverage_by_season(conn: PgConnection, start_season: int, end_season: int) -> list[dict[str, int]]:
@@ -9,8 +9,6 @@ against final game outcomes, and writes a JSON summary artifact.
 from __future__ import annotations
 
 import argparse
-import contextlib
-import io
 import json
 import os
 import sys
@@ -19,7 +17,6 @@ from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
@@ -36,6 +33,15 @@ if str(ml_dir) not in sys.path:
 
 from db_config import DATABASE_CONFIG
 from ml.predict_elo import EloPredictionSystem
+from prediction_writer import (
+    ELO_COLUMNS,
+    ELO_TABLE,
+    XGB_COLUMNS,
+    XGB_TABLE,
+    elo_prediction_rows,
+    write_rows,
+    xgb_prediction_rows,
+)
 from ml.predict_week import WeeklyPredictor
 
 
@@ -117,141 +123,39 @@ def _upsert_xgb_predictions(conn, predictions: list[dict[str, Any]]) -> int:
     if not predictions:
         return 0
 
-    sql = """
-        INSERT INTO hcl.ml_predictions (
-            game_id, season, week, home_team, away_team, game_date,
-            predicted_winner, win_confidence, home_win_prob, away_win_prob,
-            predicted_home_score, predicted_away_score, predicted_margin,
-            ai_spread, vegas_spread, vegas_total, predicted_at
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s, %s,
-            %s, %s, %s, %s
+    rows = []
+    for row, p in zip(xgb_prediction_rows(predictions), predictions):
+        game_dt = _parse_datetime(p.get("game_date"))
+        rows.append(
+            row[:5]
+            + (game_dt.date() if game_dt else None,)
+            + row[6:]
+            + (_predicted_at_from_game_date(p.get("game_date")),)
         )
-        ON CONFLICT (game_id) DO UPDATE SET
-            season = EXCLUDED.season,
-            week = EXCLUDED.week,
-            home_team = EXCLUDED.home_team,
-            away_team = EXCLUDED.away_team,
-            game_date = EXCLUDED.game_date,
-            predicted_winner = EXCLUDED.predicted_winner,
-            win_confidence = EXCLUDED.win_confidence,
-            home_win_prob = EXCLUDED.home_win_prob,
-            away_win_prob = EXCLUDED.away_win_prob,
-            predicted_home_score = EXCLUDED.predicted_home_score,
-            predicted_away_score = EXCLUDED.predicted_away_score,
-            predicted_margin = EXCLUDED.predicted_margin,
-            ai_spread = EXCLUDED.ai_spread,
-            vegas_spread = EXCLUDED.vegas_spread,
-            vegas_total = EXCLUDED.vegas_total,
-            predicted_at = EXCLUDED.predicted_at
-    """
 
     cur = conn.cursor()
-    affected = 0
-    for p in predictions:
-        game_dt = _parse_datetime(p.get("game_date"))
-        game_date_only = game_dt.date() if game_dt else None
-        cur.execute(
-            sql,
-            (
-                p.get("game_id"),
-                p.get("season"),
-                p.get("week"),
-                p.get("home_team"),
-                p.get("away_team"),
-                game_date_only,
-                p.get("predicted_winner"),
-                p.get("confidence"),
-                p.get("home_win_prob"),
-                p.get("away_win_prob"),
-                p.get("predicted_home_score"),
-                p.get("predicted_away_score"),
-                p.get("predicted_margin"),
-                p.get("ai_spread"),
-                p.get("vegas_spread"),
-                p.get("total_line"),
-                _predicted_at_from_game_date(p.get("game_date")),
-            ),
-        )
-        affected += cur.rowcount
+    result = write_rows(cur, XGB_TABLE, XGB_COLUMNS + ["predicted_at"], rows)
     cur.close()
-    return affected
+    return result["inserted"] + result["updated"]
 
 
 def _upsert_elo_predictions(conn, rows: list[dict[str, Any]]) -> int:
     if not rows:
         return 0
 
-    sql = """
-        INSERT INTO hcl.ml_predictions_elo (
-            game_id, season, week, game_date,
-            home_team, away_team,
-            home_elo, away_elo, elo_diff,
-            home_win_prob, away_win_prob,
-            predicted_winner, confidence,
-            elo_spread, vegas_spread, spread_diff,
-            split_prediction, prediction_date
-        ) VALUES (
-            %s, %s, %s, %s,
-            %s, %s,
-            %s, %s, %s,
-            %s, %s,
-            %s, %s,
-            %s, %s, %s,
-            %s, %s
+    values = []
+    for row, p in zip(elo_prediction_rows(rows), rows):
+        values.append(
+            row[:3]
+            + (_parse_datetime(p.get("game_date")),)
+            + row[4:]
+            + (_predicted_at_from_game_date(p.get("game_date")),)
         )
-        ON CONFLICT (game_id) DO UPDATE SET
-            season = EXCLUDED.season,
-            week = EXCLUDED.week,
-            game_date = EXCLUDED.game_date,
-            home_team = EXCLUDED.home_team,
-            away_team = EXCLUDED.away_team,
-            home_elo = EXCLUDED.home_elo,
-            away_elo = EXCLUDED.away_elo,
-            elo_diff = EXCLUDED.elo_diff,
-            home_win_prob = EXCLUDED.home_win_prob,
-            away_win_prob = EXCLUDED.away_win_prob,
-            predicted_winner = EXCLUDED.predicted_winner,
-            confidence = EXCLUDED.confidence,
-            elo_spread = EXCLUDED.elo_spread,
-            vegas_spread = EXCLUDED.vegas_spread,
-            spread_diff = EXCLUDED.spread_diff,
-            split_prediction = EXCLUDED.split_prediction,
-            prediction_date = EXCLUDED.prediction_date
-    """
 
     cur = conn.cursor()
-    affected = 0
-    for row in rows:
-        game_dt = _parse_datetime(row.get("game_date"))
-        cur.execute(
-            sql,
-            (
-                row.get("game_id"),
-                row.get("season"),
-                row.get("week"),
-                game_dt,
-                row.get("home_team"),
-                row.get("away_team"),
-                row.get("home_elo"),
-                row.get("away_elo"),
-                row.get("elo_diff"),
-                row.get("home_win_prob"),
-                row.get("away_win_prob"),
-                row.get("predicted_winner"),
-                row.get("confidence"),
-                row.get("elo_spread"),
-                row.get("vegas_spread"),
-                row.get("spread_diff"),
-                row.get("split_prediction"),
-                _predicted_at_from_game_date(row.get("game_date")),
-            ),
-        )
-        affected += cur.rowcount
+    result = write_rows(cur, ELO_TABLE, ELO_COLUMNS + ["prediction_date"], values)
     cur.close()
-    return affected
+    return result["inserted"] + result["updated"]
 
 
 def _rescore_predictions(conn, start_season: int, end_season: int) -> tuple[int, int]:
@@ -467,33 +371,27 @@ def main() -> None:
     xgb_affected = 0
     elo_affected = 0
 
+    # Replay each season through one batched XGBoost pass, then upsert week by week.
+    xgb_by_week: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    for season in sorted({season for season, _ in weeks}):
+        for pred in predictor.predict_season(season):
+            xgb_by_week.setdefault((pred["season"], pred["week"]), []).append(pred)
+
+    # Elo predictions for every season come from one vectorized predict_games pass each.
+    elo_by_week: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    if elo_predictor is not None:
+        for season in sorted({season for season, _ in weeks}):
+            season_games = elo_predictor.get_scheduled_games(season)
+            for pred in elo_predictor.predict_games(season_games).to_dict("records"):
+                elo_by_week.setdefault((pred["season"], pred["week"]), []).append(pred)
+
     total_weeks = len(weeks)
     for idx, (season, week) in enumerate(weeks, start=1):
-        # Predict-week emits per-game logs; silence during bulk historical replay.
-        with contextlib.redirect_stdout(io.StringIO()):
-            xgb_predictions = predictor.predict_week(season, week)
+        xgb_predictions = xgb_by_week.get((season, week), [])
         xgb_affected += _upsert_xgb_predictions(conn, xgb_predictions)
 
         if elo_predictor is not None:
-            games_df = elo_predictor.get_scheduled_games(season, week)
-            elo_rows: list[dict[str, Any]] = []
-            for _, game in games_df.iterrows():
-                spread_line = game["spread_line"] if pd.notna(game["spread_line"]) else None
-                pred = elo_predictor.predict_game(
-                    game["home_team"],
-                    game["away_team"],
-                    spread_line=spread_line,
-                    is_neutral=False,
-                )
-                pred.update(
-                    {
-                        "game_id": game["game_id"],
-                        "season": season,
-                        "week": week,
-                        "game_date": game["game_date"],
-                    }
-                )
-                elo_rows.append(pred)
+            elo_rows = elo_by_week.get((season, week), [])
             elo_affected += _upsert_elo_predictions(conn, elo_rows)
 
         conn.commit()
@@ -10,6 +10,7 @@ This runs as a background service during game days to keep scores updated.
 
 import requests
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import datetime, timedelta
 import time
 import sys
@@ -18,6 +19,23 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# One statement for every changed game; NULL scores/spreads leave the column as is
+# and a closing spread is only ever written once.
+APPLY_CHANGES_SQL = """
+    UPDATE hcl.games AS g
+    SET home_score = COALESCE(v.home_score, g.home_score),
+        away_score = COALESCE(v.away_score, g.away_score),
+        closing_spread = COALESCE(g.closing_spread, v.closing_spread),
+        updated_at = NOW()
+    FROM (VALUES %s) AS v(game_id, home_score, away_score, closing_spread)
+    WHERE g.game_id = v.game_id
+"""
+APPLY_CHANGES_TEMPLATE = "(%s, %s::int, %s::int, %s::double precision)"
+
+# Re-read the week's rows from the database this often, picking up edits made
+# by other loaders to games the snapshot thinks are unchanged.
+MAPPING_MAX_AGE = timedelta(hours=1)
+
 class LiveScoreSaver:
     """Saves live NFL scores and locks spreads before kickoff"""
     
@@ -29,6 +47,13 @@ class LiveScoreSaver:
             'host': os.getenv('DB_HOST', 'localhost'),
             'port': os.getenv('DB_PORT', '5432')
         }
+        # ESPN event id -> hcl.games game_id for the games on the scoreboard
+        self.event_game_ids = {}
+        # Every event id the mapping was built from, matched or not
+        self.known_events = set()
+        # game_id -> last-written state (home_score, away_score, closing_spread, kickoff_time)
+        self.snapshot = {}
+        self.mapping_loaded_at = None
         
     def get_espn_scores(self):
         """Fetch current scores from ESPN API"""
@@ -72,6 +97,7 @@ class LiveScoreSaver:
                         current_spread = float(odds['spread'])
                 
                 games.append({
+                    'event_id': event.get('id'),
                     'home_team': home_team,
                     'away_team': away_team,
                     'home_score': home_score,
@@ -87,79 +113,118 @@ class LiveScoreSaver:
             print(f"[ERROR] Failed to fetch ESPN scores: {e}")
             return []
     
+    def _connect(self):
+        # Use Unix socket with peer authentication (no password needed)
+        return psycopg2.connect(
+            dbname=self.db_config['dbname'],
+            user=self.db_config['user'],
+            host='',  # Empty host = Unix socket
+        )
+    
+    def load_week_mapping(self, cur, games):
+        """Map the scoreboard's ESPN events to game_ids and snapshot their current DB state"""
+        game_dates = sorted({game['game_date'] for game in games})
+        cur.execute("""
+            SELECT game_id, home_team, away_team, game_date::text,
+                   home_score, away_score, closing_spread, kickoff_time_utc
+            FROM hcl.games
+            WHERE game_date = ANY(%s::date[])
+        """, (game_dates,))
+        
+        by_matchup = {}
+        for game_id, home_team, away_team, game_date, home_score, away_score, closing_spread, kickoff in cur.fetchall():
+            by_matchup[(home_team, away_team, game_date)] = game_id
+            self.snapshot[game_id] = (home_score, away_score, closing_spread, kickoff)
+        
+        self.event_game_ids = {}
+        self.known_events = {game['event_id'] for game in games}
+        for game in games:
+            game_id = by_matchup.get((game['home_team'], game['away_team'], game['game_date']))
+            if game_id:
+                self.event_game_ids[game['event_id']] = game_id
+            else:
+                print(f"  ⚠️  No match: {game['away_team']}@{game['home_team']} on {game['game_date']}")
+        self.mapping_loaded_at = datetime.now()
+    
+    def _mapping_stale(self, games):
+        if self.mapping_loaded_at is None or datetime.now() - self.mapping_loaded_at > MAPPING_MAX_AGE:
+            return True
+        # A new week brings events the mapping has never seen
+        return any(game['event_id'] not in self.known_events for game in games)
+    
+    def diff_games(self, games):
+        """Compare ESPN games with the snapshot; returns (game_id, home, away, spread, game) changes"""
+        changes = []
+        for game in games:
+            game_id = self.event_game_ids.get(game['event_id'])
+            if not game_id:
+                continue
+            db_home_score, db_away_score, closing_spread, kickoff_time = self.snapshot[game_id]
+            
+            # Lock spread before kickoff (if not already locked)
+            lock_spread = None
+            if closing_spread is None and game['current_spread'] is not None and kickoff_time:
+                # Check if game is about to start (within 1 hour of kickoff)
+                now = datetime.now(kickoff_time.tzinfo)
+                if now >= kickoff_time - timedelta(hours=1):
+                    lock_spread = game['current_spread']
+            
+            # Update scores if they've changed
+            home_score = away_score = None
+            if game['home_score'] is not None and game['away_score'] is not None:
+                if db_home_score != game['home_score'] or db_away_score != game['away_score']:
+                    home_score, away_score = game['home_score'], game['away_score']
+            
+            if lock_spread is not None or home_score is not None:
+                changes.append((game_id, home_score, away_score, lock_spread, game))
+        return changes
+    
     def save_scores_to_db(self, games):
-        """Save scores and lock spreads in database"""
+        """Save changed scores and lock spreads in one batched UPDATE"""
         if not games:
             return
         
+        conn = None
         try:
-            # Use Unix socket with peer authentication (no password needed)
-            conn = psycopg2.connect(
-                dbname=self.db_config['dbname'],
-                user=self.db_config['user'],
-                host='',  # Empty host = Unix socket
-            )
-            cur = conn.cursor()
+            if self._mapping_stale(games):
+                conn = self._connect()
+                cur = conn.cursor()
+                self.load_week_mapping(cur, games)
             
-            updates = 0
-            spread_locks = 0
-            
-            for game in games:
-                # Find matching game in database
-                cur.execute("""
-                    SELECT game_id, home_score, away_score, closing_spread, kickoff_time_utc
-                    FROM hcl.games
-                    WHERE home_team = %s 
-                      AND away_team = %s
-                      AND game_date = %s
-                      AND season = EXTRACT(YEAR FROM CURRENT_DATE)
-                """, (game['home_team'], game['away_team'], game['game_date']))
-                
-                result = cur.fetchone()
-                if not result:
-                    print(f"  ⚠️  No match: {game['away_team']}@{game['home_team']} on {game['game_date']}")
-                    continue
-                
-                game_id, db_home_score, db_away_score, closing_spread, kickoff_time = result
-                
-                # Lock spread before kickoff (if not already locked)
-                if closing_spread is None and game['current_spread'] is not None:
-                    # Check if game is about to start (within 1 hour of kickoff)
-                    if kickoff_time:
-                        now = datetime.now(kickoff_time.tzinfo)
-                        if now >= kickoff_time - timedelta(hours=1):
-                            cur.execute("""
-                                UPDATE hcl.games 
-                                SET closing_spread = %s,
-                                    updated_at = NOW()
-                                WHERE game_id = %s
-                            """, (game['current_spread'], game_id))
-                            spread_locks += 1
-                            print(f"  🔒 Locked spread for {game['away_team']}@{game['home_team']}: {game['current_spread']}")
-                
-                # Update scores if they've changed
-                if game['home_score'] is not None and game['away_score'] is not None:
-                    if db_home_score != game['home_score'] or db_away_score != game['away_score']:
-                        cur.execute("""
-                            UPDATE hcl.games 
-                            SET home_score = %s,
-                                away_score = %s,
-                                updated_at = NOW()
-                            WHERE game_id = %s
-                        """, (game['home_score'], game['away_score'], game_id))
-                        updates += 1
-                        print(f"  ✅ Updated {game['away_team']} {game['away_score']} @ {game['home_team']} {game['home_score']}")
+            changes = self.diff_games(games)
+            if not changes:
+                return
             
+            if conn is None:
+                conn = self._connect()
+                cur = conn.cursor()
+            execute_values(cur, APPLY_CHANGES_SQL, [change[:4] for change in changes],
+                           template=APPLY_CHANGES_TEMPLATE, page_size=len(changes))
             conn.commit()
             
-            if updates > 0 or spread_locks > 0:
-                print(f"\n[SUCCESS] Updated {updates} scores, locked {spread_locks} spreads")
+            updates = 0
+            spread_locks = 0
+            for game_id, home_score, away_score, lock_spread, game in changes:
+                db_home_score, db_away_score, closing_spread, kickoff_time = self.snapshot[game_id]
+                if lock_spread is not None:
+                    closing_spread = lock_spread
+                    spread_locks += 1
+                    print(f"  🔒 Locked spread for {game['away_team']}@{game['home_team']}: {lock_spread}")
+                if home_score is not None:
+                    db_home_score, db_away_score = home_score, away_score
+                    updates += 1
+                    print(f"  ✅ Updated {game['away_team']} {away_score} @ {game['home_team']} {home_score}")
+                self.snapshot[game_id] = (db_home_score, db_away_score, closing_spread, kickoff_time)
             
-            cur.close()
-            conn.close()
+            print(f"\n[SUCCESS] Updated {updates} scores, locked {spread_locks} spreads")
             
         except Exception as e:
             print(f"[ERROR] Database save failed: {e}")
+            # Unknown what was written; re-read the week on the next poll
+            self.mapping_loaded_at = None
+        finally:
+            if conn is not None:
+                conn.close()
     
     def run_once(self):
         """Run a single update cycle"""
@@ -24,7 +24,6 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
@@ -36,8 +35,12 @@ if str(ML_DIR) not in sys.path:
     sys.path.insert(0, str(ML_DIR))
 
 from db_config import DATABASE_CONFIG
+from ml.elo_tracker import update_elo_ratings
+from ml.model_performance import ensure_model_performance, refresh_model_performance
 from ml.predict_elo import EloPredictionSystem
 from ml.predict_week import WeeklyPredictor
+from ml.team_rolling_features import ensure_team_rolling_features, refresh_team_rolling_features
+from prediction_writer import save_elo_predictions, save_xgb_predictions
 
 DEFAULT_OUT_DIR = PROJECT_ROOT / "docs" / "sprints" / "phase4_weekly_ops"
 DEFAULT_TA078_OUT_DIR = PROJECT_ROOT / "docs" / "sprints" / "ta078_vegas_tuning"
@@ -177,53 +180,36 @@ def _insert_xgb_predictions(conn, season: int, week: int) -> dict[str, Any]:
     predictions = predictor.predict_week(season, week)
 
     cur = conn.cursor()
-    inserted = 0
-
-    insert_sql = """
-        INSERT INTO hcl.ml_predictions (
-            game_id, season, week, home_team, away_team, game_date,
-            predicted_winner, win_confidence, home_win_prob, away_win_prob,
-            predicted_home_score, predicted_away_score, predicted_margin,
-            ai_spread, vegas_spread, vegas_total
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (game_id) DO NOTHING
-    """
-
-    for p in predictions:
-        cur.execute(
-            insert_sql,
-            (
-                p.get("game_id"),
-                p.get("season"),
-                p.get("week"),
-                p.get("home_team"),
-                p.get("away_team"),
-                p.get("game_date"),
-                p.get("predicted_winner"),
-                p.get("confidence"),
-                p.get("home_win_prob"),
-                p.get("away_win_prob"),
-                p.get("predicted_home_score"),
-                p.get("predicted_away_score"),
-                p.get("predicted_margin"),
-                p.get("ai_spread"),
-                p.get("vegas_spread"),
-                p.get("total_line"),
-            ),
-        )
-        inserted += cur.rowcount
-
+    saved = save_xgb_predictions(cur, predictions, conflict="nothing")
     conn.commit()
     cur.close()
 
     return {
         "generated": len(predictions),
-        "inserted": inserted,
+        "inserted": saved["inserted"],
         "skipped_existing_week": False,
         "existing_rows": existing,
     }
 
 
+def _refresh_rolling_features(conn) -> dict[str, Any]:
+    # Predictions read the last feature build, so rebuild stale seasons before generating.
+    ensure_team_rolling_features(conn)
+    refreshed = refresh_team_rolling_features(conn)
+    return {"seasons_refreshed": sorted(refreshed), "rows": sum(refreshed.values())}
+
+
+def _update_elo_ratings(conn) -> dict[str, Any]:
+    # Advance the saved ratings past every game completed since the last run.
+    result = update_elo_ratings(conn)
+    return {
+        "status": result["status"],
+        "games_applied": result["games_applied"],
+        "missed_games": result["missed_games"],
+        "watermark": result["watermark"],
+    }
+
+
 def _insert_elo_predictions(conn, season: int, week: int) -> dict[str, Any]:
     existing = _count_week_rows(conn, "ml_predictions_elo", season, week)
     if existing > 0:
@@ -246,68 +232,19 @@ def _insert_elo_predictions(conn, season: int, week: int) -> dict[str, Any]:
             "message": "No games found for target week",
         }
 
-    cur = conn.cursor()
-    inserted = 0
-    generated = 0
-
-    insert_sql = """
-        INSERT INTO hcl.ml_predictions_elo (
-            game_id, season, week, game_date, home_team, away_team,
-            home_elo, away_elo, elo_diff,
-            home_win_prob, away_win_prob,
-            predicted_winner, confidence,
-            elo_spread, vegas_spread, spread_diff,
-            split_prediction, prediction_date
-        ) VALUES (
-            %(game_id)s, %(season)s, %(week)s, %(game_date)s, %(home_team)s, %(away_team)s,
-            %(home_elo)s, %(away_elo)s, %(elo_diff)s,
-            %(home_win_prob)s, %(away_win_prob)s,
-            %(predicted_winner)s, %(confidence)s,
-            %(elo_spread)s, %(vegas_spread)s, %(spread_diff)s,
-            %(split_prediction)s, NOW()
-        )
-        ON CONFLICT (game_id) DO NOTHING
-    """
-
-    for _, game in games_df.iterrows():
-        spread_line = game["spread_line"] if pd.notna(game["spread_line"]) else None
-        pred = elo.predict_game(
-            game["home_team"],
-            game["away_team"],
-            spread_line=spread_line,
-            is_neutral=False,
-        )
-
-        row = {
-            "game_id": game["game_id"],
-            "season": season,
-            "week": week,
-            "game_date": game["game_date"],
-            "home_team": pred["home_team"],
-            "away_team": pred["away_team"],
-            "home_elo": pred["home_elo"],
-            "away_elo": pred["away_elo"],
-            "elo_diff": pred["elo_diff"],
-            "home_win_prob": pred["home_win_prob"],
-            "away_win_prob": pred["away_win_prob"],
-            "predicted_winner": pred["predicted_winner"],
-            "confidence": pred["confidence"],
-            "elo_spread": pred["elo_spread"],
-            "vegas_spread": pred["vegas_spread"],
-            "spread_diff": pred["spread_diff"],
-            "split_prediction": pred["split_prediction"],
-        }
-
-        cur.execute(insert_sql, row)
-        inserted += cur.rowcount
-        generated += 1
+    predictions = elo.predict_games(games_df).to_dict("records")
+    for pred in predictions:
+        pred["season"] = season
+        pred["week"] = week
 
+    cur = conn.cursor()
+    saved = save_elo_predictions(cur, predictions, conflict="nothing")
     conn.commit()
     cur.close()
 
     return {
-        "generated": generated,
-        "inserted": inserted,
+        "generated": len(predictions),
+        "inserted": saved["inserted"],
         "skipped_existing_week": False,
         "existing_rows": existing,
     }
@@ -384,7 +321,16 @@ def _score_pending_rows(conn) -> dict[str, int]:
     conn.commit()
     cur.close()
 
-    return {"xgb_updated": xgb_updated, "elo_updated": elo_updated}
+    # Recompute the performance-stats aggregates for the weeks scoring touched.
+    ensure_model_performance(conn)
+    refreshed = refresh_model_performance(conn)
+    performance_weeks = sum(len(weeks) for weeks in refreshed.values())
+
+    return {
+        "xgb_updated": xgb_updated,
+        "elo_updated": elo_updated,
+        "performance_weeks_refreshed": performance_weeks,
+    }
 
 
 def _season_snapshot(conn, season: int) -> dict[str, Any]:
@@ -1048,8 +994,10 @@ def _write_markdown(path: Path, report: dict[str, Any]) -> None:
         f"Target source: {report['target'].get('source')}",
         "",
         "## Operations",
+        f"- Rolling features rebuilt: {report['rolling_features']['seasons_refreshed'] or 'none stale'}",
         f"- XGBoost generated: {report['xgb_generation']['generated']}",
         f"- XGBoost inserted: {report['xgb_generation']['inserted']}",
+        f"- Elo ratings: {report['elo_ratings']['status']} ({report['elo_ratings']['games_applied']} games applied)",
         f"- Elo generated: {report['elo_generation']['generated']}",
         f"- Elo inserted: {report['elo_generation']['inserted']}",
         f"- XGBoost rows scored this run: {report['scoring']['xgb_updated']}",
@@ -1129,7 +1077,9 @@ def run_pipeline(args: argparse.Namespace) -> dict[str, Any]:
     try:
         season, week, target_source = _determine_target_week(conn, args.season, args.week)
 
+        rolling_features = _refresh_rolling_features(conn)
         xgb_generation = _insert_xgb_predictions(conn, season, week)
+        elo_ratings = _update_elo_ratings(conn)
         elo_generation = _insert_elo_predictions(conn, season, week)
         scoring = _score_pending_rows(conn)
 
@@ -1145,7 +1095,9 @@ def run_pipeline(args: argparse.Namespace) -> dict[str, Any]:
                 "week": week,
                 "source": target_source,
             },
+            "rolling_features": rolling_features,
             "xgb_generation": xgb_generation,
+            "elo_ratings": elo_ratings,
             "elo_generation": elo_generation,
             "scoring": scoring,
             "snapshot": snapshot,
@@ -1426,6 +1378,10 @@ def main() -> int:
         "XGB generated/inserted: "
         f"{report['xgb_generation']['generated']} / {report['xgb_generation']['inserted']}"
     )
+    print(
+        "Elo ratings: "
+        f"{report['elo_ratings']['status']} ({report['elo_ratings']['games_applied']} games applied)"
+    )
     print(
         "Elo generated/inserted: "
         f"{report['elo_generation']['generated']} / {report['elo_generation']['inserted']}"
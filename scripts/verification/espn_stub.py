@@ -0,0 +1,132 @@
+"""
+Local stand-in for the ESPN scoreboard API.
+
+Serves fixtures/espn/scoreboard_live.json (or whatever set_payload() installed)
+for any request. With a weeks directory, a request carrying ?dates=<season>&week=<N>
+(the backfill script's URL) gets scoreboard_<season>_week<N>.json from it instead,
+or a 404 when there is no such file. Tests can make the next requests fail, slow
+every response down, and count what reached the "upstream".
+
+In-process:
+    with EspnStub() as stub:
+        feed = ScoreboardFeed(url=stub.url)
+
+Standalone, for the API server:
+    python scripts/verification/espn_stub.py --port 8765
+    ESPN_SCOREBOARD_URL=http://127.0.0.1:8765/scoreboard python api_server.py
+"""
+
+import argparse
+import json
+import pathlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = pathlib.Path(__file__).resolve().parent / 'fixtures'
+DEFAULT_PAYLOAD = FIXTURES_DIR / 'espn' / 'scoreboard_live.json'
+
+
+class EspnStub:
+    """Threaded HTTP server answering scoreboard requests from fixtures."""
+
+    def __init__(self, payload_path=DEFAULT_PAYLOAD, weeks_dir=None, delay_seconds=0.0, port=0):
+        self.payload = json.loads(pathlib.Path(payload_path).read_text(encoding='utf-8'))
+        self.weeks_dir = pathlib.Path(weeks_dir) if weeks_dir else None
+        self.delay_seconds = delay_seconds
+        self.requests = 0
+        self._failures = []  # status codes for the next requests
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/scoreboard"
+
+    def set_payload(self, payload):
+        with self._lock:
+            self.payload = payload
+
+    def fail_next(self, count=1, status=503):
+        """Answer the next `count` requests with `status`."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self._failures = []
+
+    def _respond(self, query):
+        """(status, body) for one request; counts it."""
+        with self._lock:
+            self.requests += 1
+            if self._failures:
+                return self._failures.pop(0), {'error': 'stub failure'}
+            payload = self.payload
+        if self.weeks_dir and 'week' in query and 'dates' in query:
+            path = self.weeks_dir / f"scoreboard_{query['dates'][0]}_week{query['week'][0]}.json"
+            if not path.exists():
+                return 404, {'error': f'no fixture {path.name}'}
+            return 200, json.loads(path.read_text(encoding='utf-8'))
+        return 200, payload
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if stub.delay_seconds:
+                    time.sleep(stub.delay_seconds)
+                status, body = stub._respond(parse_qs(urlparse(self.path).query))
+                encoded = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve ESPN scoreboard fixtures locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixture', default=str(DEFAULT_PAYLOAD), help='Scoreboard JSON served by default')
+    parser.add_argument('--weeks-dir', help='Directory of scoreboard_<season>_week<N>.json files')
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to sleep before each response')
+    args = parser.parse_args()
+
+    stub = EspnStub(args.fixture, weeks_dir=args.weeks_dir, delay_seconds=args.delay, port=args.port)
+    print(f"ESPN stub serving {args.fixture} at {stub.url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Checks for scripts/data_loading/backfill_missing_scores_from_espn.py.
+
+fixtures/espn_weeks holds scoreboard_2023_week1.json and week2.json in the
+layout --fixtures/--record use: trimmed ESPN-format payloads built from the
+2023 rows of hcl.games, with ESPN's WSH/LAR abbreviations and one week-2 game
+still in progress. The live fetch path runs against espn_stub.py.
+
+The database check nulls the 2023 week-1 scores inside a transaction, writes
+them back from the fixture with apply_score_updates() and rolls back; skip it
+with --no-db.
+
+    python scripts/verification/test_backfill_fixtures.py
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+from urllib.error import HTTPError
+
+VERIFICATION_DIR = pathlib.Path(__file__).resolve().parent
+ROOT_DIR = VERIFICATION_DIR.parents[1]
+sys.path.insert(0, str(ROOT_DIR / 'scripts' / 'data_loading'))
+sys.path.insert(0, str(VERIFICATION_DIR))
+
+import backfill_missing_scores_from_espn as backfill
+from espn_stub import EspnStub
+
+FIXTURES_DIR = VERIFICATION_DIR / 'fixtures' / 'espn_weeks'
+SEASON = 2023
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def check_fixture_mode():
+    scoreboards, failures = backfill.fetch_weeks(SEASON, [1, 2, 3], fixtures_dir=FIXTURES_DIR)
+    require(sorted(scoreboards) == [1, 2], f"Expected weeks 1 and 2 from fixtures, got {sorted(scoreboards)}")
+    require(list(failures) == [3], f"Expected week 3 to fail, got {failures}")
+    print(f"PASS --fixtures mode: weeks {sorted(scoreboards)} loaded, missing week 3 reported: {failures[3][:60]}")
+    return scoreboards
+
+
+def check_parse(scoreboards):
+    week1 = backfill.parse_completed_games(scoreboards[1])
+    week2 = backfill.parse_completed_games(scoreboards[2])
+    require(len(week1) == len(scoreboards[1]['events']), "Every completed week-1 game should parse")
+    require(('WAS', 'ATL') in week1, "ESPN WSH not mapped to hcl WAS")
+    require(('MIA', 'LA') in week2, "ESPN LAR not mapped to hcl LA")
+    require(('NE', 'GB') not in week2, "In-progress game parsed as completed")
+    require(len(week2) == len(scoreboards[2]['events']) - 1, "Week 2 should skip exactly the in-progress game")
+    print(f"PASS parse_completed_games: {len(week1)} + {len(week2)} finals, WSH/LAR mapped, in-progress game skipped")
+    return week1
+
+
+def check_record_round_trip(scoreboards):
+    with tempfile.TemporaryDirectory() as record_dir:
+        backfill.fetch_weeks(SEASON, [1, 2], fixtures_dir=FIXTURES_DIR, record_dir=record_dir)
+        for week in (1, 2):
+            recorded = json.loads(backfill.fixture_path(record_dir, SEASON, week).read_text(encoding='utf-8'))
+            require(recorded == scoreboards[week], f"Recorded week {week} differs from its source")
+        replayed, failures = backfill.fetch_weeks(SEASON, [1, 2], fixtures_dir=record_dir)
+        require(not failures and replayed == scoreboards, "Recorded files don't replay as fixtures")
+    print("PASS --record writes files that --fixtures replays unchanged")
+
+
+def check_live_fetch():
+    url, backoff = backfill.ESPN_SCOREBOARD_URL, backfill.RETRY_BACKOFF_SECONDS
+    with EspnStub(weeks_dir=FIXTURES_DIR) as stub:
+        backfill.ESPN_SCOREBOARD_URL = stub.url
+        backfill.RETRY_BACKOFF_SECONDS = 0.01
+        try:
+            stub.fail_next(2, status=503)
+            data = backfill.fetch_week_scoreboard(SEASON, 1)
+            require(data['week']['number'] == 1, "Stub returned the wrong week")
+            require(stub.requests == 3, f"Expected 2 retries then success (3 requests), got {stub.requests}")
+            print("PASS fetch_week_scoreboard retries 503s and succeeds")
+
+            stub.reset()
+            stub.fail_next(1, status=400)
+            try:
+                backfill.fetch_week_scoreboard(SEASON, 1)
+                raise AssertionError("400 did not raise")
+            except HTTPError as exc:
+                require(exc.code == 400 and stub.requests == 1, "A 400 was retried")
+            print("PASS fetch_week_scoreboard does not retry a 400")
+
+            stub.reset()
+            scoreboards, failures = backfill.fetch_weeks(SEASON, [1, 2, 3], workers=3)
+            require(sorted(scoreboards) == [1, 2] and list(failures) == [3], f"Unexpected live fetch result: {failures}")
+            require(stub.requests == 3, f"Expected one request per week, got {stub.requests}")
+            print("PASS fetch_weeks over HTTP: 3 concurrent week requests, unknown week reported as a failure")
+        finally:
+            backfill.ESPN_SCOREBOARD_URL = url
+            backfill.RETRY_BACKOFF_SECONDS = backoff
+
+
+def check_apply(completed):
+    conn = backfill.get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE hcl.games SET home_score = NULL, away_score = NULL "
+            "WHERE season = %s AND week = 1 RETURNING game_id, away_team, home_team",
+            (SEASON,),
+        )
+        missing = cur.fetchall()
+        require(missing, "No 2023 week-1 games in hcl.games")
+        updates = [
+            (completed[(away, home)][1], completed[(away, home)][0], game_id, 1, away, home)
+            for game_id, away, home in missing
+            if (away, home) in completed
+        ]
+        require(len(updates) == len(missing), f"Only {len(updates)}/{len(missing)} games matched the fixture")
+        applied = backfill.apply_score_updates(cur, updates)
+        require(applied == len(missing), f"Expected {len(missing)} rows updated, got {applied}")
+        require(backfill.get_missing_games(cur, SEASON) == [], "Games still missing scores after the update")
+        require(backfill.apply_score_updates(cur, updates) == 0, "Second apply overwrote existing scores")
+        print(f"PASS apply_score_updates filled {applied} week-1 games from the fixture (rolled back)")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the ESPN score backfill against recorded fixtures')
+    parser.add_argument('--no-db', action='store_true', help='Skip the hcl.games apply check')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("ESPN BACKFILL FIXTURE CHECK")
+    print("=" * 80)
+
+    try:
+        scoreboards = check_fixture_mode()
+        week1 = check_parse(scoreboards)
+        check_record_round_trip(scoreboards)
+        check_live_fetch()
+        if not args.no_db:
+            backfill.load_env_if_available()
+            check_apply(week1)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Checks for live_score_events.py and /api/live-scores/stream.
+
+Covers diff_games() event types, the broadcaster's snapshot/diff log, Last-Event-ID
+resume (same log, foreign log, ids older than the buffer), the per-worker
+subscriber cap (503 + Retry-After above it), and the route end to end: a ScoreboardFeed on the local ESPN stub (espn_stub.py) feeds a broadcaster,
+the stub's score changes, and the stream delivers the snapshot and then the score
+event. Games are built from the ESPN payload without predictions, so no database
+is needed.
+
+    python scripts/verification/test_live_score_events.py
+"""
+
+import argparse
+import copy
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+
+VERIFICATION_DIR = pathlib.Path(__file__).resolve().parent
+ROOT_DIR = VERIFICATION_DIR.parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(VERIFICATION_DIR))
+
+# Short TTL and stream lifetime so changes and reconnects happen within the check
+os.environ['ESPN_SCOREBOARD_LIVE_TTL_SECONDS'] = '0.3'
+os.environ['ESPN_SCOREBOARD_POLLER'] = '0'
+os.environ['LIVE_STREAM_MAX_SECONDS'] = '3'
+os.environ['LIVE_STREAM_HEARTBEAT_SECONDS'] = '0.5'
+
+from flask import Flask
+
+import api_routes_live_scores
+from espn_stub import EspnStub
+from live_score_events import LiveScoreBroadcaster, diff_games
+from scoreboard_feed import ScoreboardFeed
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+GAME = {
+    'game_id': 'g1', 'home_team': 'CHI', 'away_team': 'WAS', 'home_score': 14, 'away_score': 10,
+    'status': 'in_progress', 'period': 3, 'clock': '7:42',
+    'ai_prediction': 'CHI', 'ai_spread': -3.5, 'elo_prediction': 'CHI', 'elo_spread': -2.0,
+    'vegas_spread': -1.5, 'vegas_total': 41.0,
+    'ai_correct': None, 'elo_correct': None, 'vegas_covered': None,
+    'ai_spread_covered': None, 'elo_spread_covered': None,
+}
+
+
+def game(**changes):
+    return {**GAME, **changes}
+
+
+def event_types(before, after):
+    return [event_type for event_type, _ in diff_games({'g1': before}, {'g1': after})]
+
+
+def parse_sse(text):
+    """[(id, event, data)] from SSE text, ignoring retry/keepalive lines."""
+    events = []
+    for block in text.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith((':', 'retry')))
+        if 'event' in fields:
+            events.append((fields.get('id'), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class IdleFeed:
+    """Feed with no data, so the broadcaster thread never publishes on its own."""
+
+    def get(self):
+        return None
+
+    def snapshot(self):
+        return None, 0, None
+
+    def ttl(self):
+        return 0
+
+    def wait_for_version(self, version, timeout):
+        time.sleep(min(timeout, 0.1))
+        return 0
+
+
+def espn_games(data):
+    """ESPN payload -> (games, week_info), like build_live_games without predictions."""
+    games = []
+    for event in data.get('events', []):
+        competition = event['competitions'][0]
+        teams = {c['homeAway']: c for c in competition['competitors']}
+        status = competition['status']
+        games.append({
+            'game_id': event['id'],
+            'home_team': teams['home']['team']['abbreviation'],
+            'away_team': teams['away']['team']['abbreviation'],
+            'home_score': int(teams['home']['score']),
+            'away_score': int(teams['away']['score']),
+            'status': status['type']['name'].lower(),
+            'period': status.get('period'),
+            'clock': status.get('displayClock'),
+        })
+    return games, {'week': data['week']['number'], 'season': data['season']['year']}
+
+
+def check_diff_games():
+    cases = [
+        ('unchanged', game(), []),
+        ('score', game(home_score=17, clock='6:01'), ['score']),
+        ('status', game(status='halftime', period=2, clock='0:00'), ['status']),
+        ('score+status', game(status='final', home_score=21, clock='0:00'), ['score', 'status']),
+        ('clock', game(clock='6:30'), ['clock']),
+        ('prediction', game(vegas_spread=-2.5), ['prediction']),
+        ('result', game(ai_correct=True, elo_correct=False), ['result']),
+    ]
+    for name, after, expected in cases:
+        got = event_types(GAME, after)
+        require(got == expected, f"diff_games {name}: expected {expected}, got {got}")
+    (_, payload), = diff_games({'g1': GAME}, {'g1': game(status='halftime')})
+    require(payload['previous_status'] == 'in_progress', "status event lacks previous_status")
+    print(f"PASS diff_games: {len(cases)} cases map to the expected event types")
+
+
+def check_publish():
+    broadcaster = LiveScoreBroadcaster(IdleFeed(), espn_games)
+    week = {'week': 6, 'season': 2025}
+    require(broadcaster.publish([GAME], week) == 1, "First publish should emit a snapshot")
+    require(broadcaster.publish([GAME], week) == 0, "Unchanged publish emitted events")
+    require(broadcaster.publish([game(home_score=17)], week) == 1, "Score change not published")
+    require(broadcaster.publish([game(home_score=17)], {'week': 7, 'season': 2025}) == 1, "New week: no snapshot")
+    require(broadcaster.publish([game(home_score=17), game(game_id='g2')], {'week': 7, 'season': 2025}) == 1,
+            "New game set: no snapshot")
+    types = [event_type for _, event_type, _ in broadcaster._events]
+    require(types == ['snapshot', 'score', 'snapshot', 'snapshot'], f"Unexpected log: {types}")
+    print(f"PASS publish log: {types}")
+
+
+def read_stream(broadcaster, last_event_id=None, max_seconds=0.3):
+    return parse_sse(''.join(broadcaster.stream(last_event_id, max_seconds=max_seconds, heartbeat_seconds=0.1)))
+
+
+def check_resume():
+    broadcaster = LiveScoreBroadcaster(IdleFeed(), espn_games, buffer_events=3)
+    week = {'week': 6, 'season': 2025}
+    broadcaster.publish([GAME], week)
+    broadcaster.publish([game(home_score=17)], week)
+    broadcaster.publish([game(home_score=17, status='halftime')], week)
+    epoch = broadcaster.stats()['last_event_id'].split('-')[0]
+
+    events = read_stream(broadcaster)
+    require([e[1] for e in events] == ['snapshot'] and events[0][0] == f"{epoch}-3", f"No-id stream: {events}")
+
+    events = read_stream(broadcaster, f"{epoch}-1")
+    require([(e[0], e[1]) for e in events] == [(f"{epoch}-2", 'score'), (f"{epoch}-3", 'status')],
+            f"Resume from -1 should replay 2 and 3: {events}")
+    require(read_stream(broadcaster, f"{epoch}-3") == [], "Resume from the latest id replayed events")
+
+    for label, event_id in (('foreign epoch', 'abc123-2'), ('future seq', f"{epoch}-9"), ('malformed', 'junk')):
+        events = read_stream(broadcaster, event_id)
+        require([e[1] for e in events] == ['snapshot'], f"{label} id should get a snapshot: {events}")
+
+    broadcaster.publish([game(home_score=24, status='halftime')], week)
+    broadcaster.publish([game(home_score=24, status='in_progress', period=3)], week)
+    events = read_stream(broadcaster, f"{epoch}-1")
+    require([e[1] for e in events] == ['snapshot'], f"Id older than the buffer should get a snapshot: {events}")
+    require(events[0][2]['games'][0]['home_score'] == 24, "Snapshot is not the current state")
+    print("PASS Last-Event-ID: exact replay from the same log; snapshot for no/foreign/future/expired ids")
+
+    chunks = []
+    consumer = threading.Thread(target=lambda: chunks.extend(broadcaster.stream(f"{epoch}-5", 1.0, 0.2)))
+    consumer.start()
+    time.sleep(0.3)
+    broadcaster.publish([game(home_score=31, status='in_progress', period=3)], week)
+    consumer.join()
+    events = parse_sse(''.join(chunks))
+    require([e[1] for e in events] == ['score'], f"Connected subscriber missed the live event: {events}")
+    require(chunks[0].startswith('retry:') and ': keepalive\n\n' in chunks, "Missing retry or keepalive lines")
+    print("PASS connected subscriber receives events as they are published, with keepalives between")
+
+
+def check_capacity():
+    broadcaster = LiveScoreBroadcaster(IdleFeed(), espn_games, max_subscribers=2)
+    first, second = broadcaster.stream(), broadcaster.stream()
+    require(first is not None and second is not None, "Streams under the cap were refused")
+    require(broadcaster.stream() is None, "Third stream accepted above max_subscribers=2")
+    require(broadcaster.stats()['subscribers'] == 2, f"Refused stream took a slot: {broadcaster.stats()}")
+    # Closed before it was ever iterated, as when a client drops before the first byte
+    first.close()
+    third = broadcaster.stream()
+    require(third is not None, "Closing a stream did not free its slot")
+    second.close()
+    third.close()
+    require(broadcaster.stats()['subscribers'] == 0, f"Slots leaked: {broadcaster.stats()}")
+    print("PASS subscriber cap: streams above max_subscribers refused, closing a stream frees its slot")
+
+
+def check_route_capacity(client, threaded_worker):
+    broadcaster = LiveScoreBroadcaster(IdleFeed(), espn_games, max_subscribers=1)
+    route_broadcaster = api_routes_live_scores.live_score_broadcaster
+    api_routes_live_scores.live_score_broadcaster = broadcaster
+    try:
+        open_stream = client.get('/api/live-scores/stream', environ_overrides=threaded_worker, buffered=False)
+        require(open_stream.status_code == 200, f"First stream: {open_stream.status_code}")
+        refused = client.get('/api/live-scores/stream', environ_overrides=threaded_worker)
+        retry_after = str(max(1, int(api_routes_live_scores.STREAM_MAX_SECONDS)))
+        require(refused.status_code == 503 and refused.headers.get('Retry-After') == retry_after,
+                f"Stream above the cap: {refused.status_code} Retry-After={refused.headers.get('Retry-After')}")
+        require('poll /api/live-scores' in refused.get_json()['error'], "503 body does not point at polling")
+        open_stream.close()
+        reopened = client.get('/api/live-scores/stream', environ_overrides=threaded_worker, buffered=False)
+        require(reopened.status_code == 200, f"Slot not freed after the stream closed: {reopened.status_code}")
+        reopened.close()
+        require(broadcaster.stats()['subscribers'] == 0, f"Route leaked slots: {broadcaster.stats()}")
+        print(f"PASS route over the cap: 503 + Retry-After {retry_after}; a closed stream frees the slot")
+    finally:
+        api_routes_live_scores.live_score_broadcaster = route_broadcaster
+
+
+def check_route(stub):
+    app = Flask(__name__)
+    app.register_blueprint(api_routes_live_scores.live_scores_api)
+    client = app.test_client()
+
+    sync_worker = {'gunicorn.socket': object(), 'wsgi.multithread': False}
+    response = client.get('/api/live-scores/stream', environ_overrides=sync_worker)
+    require(response.status_code == 503 and response.headers.get('Retry-After') == '300',
+            f"Sync worker should get 503, got {response.status_code}")
+    print("PASS stream refused with 503 + Retry-After on a gunicorn sync worker")
+
+    threaded_worker = {'gunicorn.socket': object(), 'wsgi.multithread': True}
+    check_route_capacity(client, threaded_worker)
+
+    broadcaster = LiveScoreBroadcaster(ScoreboardFeed(url=stub.url), espn_games)
+    route_broadcaster = api_routes_live_scores.live_score_broadcaster
+    api_routes_live_scores.live_score_broadcaster = broadcaster
+    try:
+        response = client.get('/api/live-scores/stream', environ_overrides=threaded_worker, buffered=False)
+        require(response.status_code == 200 and response.mimetype == 'text/event-stream',
+                f"Threaded worker stream: {response.status_code} {response.mimetype}")
+
+        changed = copy.deepcopy(stub.payload)
+        changed['events'][1]['competitions'][0]['competitors'][0]['score'] = '21'
+        received = ''
+        for chunk in response.response:
+            received += chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+            types = [e[1] for e in parse_sse(received)]
+            if types == ['snapshot']:
+                stub.set_payload(changed)
+            if 'score' in types:
+                break
+        response.close()
+
+        events = parse_sse(received)
+        require([e[1] for e in events] == ['snapshot', 'score'], f"Expected snapshot then score, got {events}")
+        score = events[1][2]
+        require(score['game_id'] == '401772801' and score['home_score'] == 21, f"Unexpected score event: {score}")
+        print(f"PASS route streams the ESPN stub: snapshot of {events[0][2]['total_games']} games, "
+              f"then {score['away_team']} @ {score['home_team']} {score['away_score']}-{score['home_score']}")
+
+        resumed = client.get('/api/live-scores/stream', environ_overrides=threaded_worker,
+                             headers={'Last-Event-ID': events[0][0]})
+        replay = parse_sse(resumed.get_data(as_text=True))
+        require(replay and replay[0][0] == events[1][0] and replay[0][1] == 'score',
+                f"Last-Event-ID header did not resume after the snapshot: {replay[:2]}")
+        print("PASS Last-Event-ID header resumes the route stream after the snapshot")
+    finally:
+        api_routes_live_scores.live_score_broadcaster = route_broadcaster
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify live score SSE events and the stream route')
+    parser.add_argument('--no-route', action='store_true', help='Skip the Flask route checks')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("LIVE SCORE EVENTS CHECK")
+    print("=" * 80)
+
+    try:
+        check_diff_games()
+        check_publish()
+        check_resume()
+        check_capacity()
+        if not args.no_route:
+            with EspnStub() as stub:
+                check_route(stub)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Checks for scripts/data_loading/nflverse_cache.py using the sample nflverse files.
+
+fixtures/nflverse_sample holds pbp_2023.csv and schedules_2023.csv: three week-1
+games of synthetic plays whose running scores end at the schedule's final scores.
+NFLVERSE_SOURCE_DIR points the loader at them and NFLVERSE_CACHE_DIR at a temp
+dir, so nothing is downloaded and no database is needed.
+
+    python scripts/verification/test_nflverse_cache.py
+"""
+
+import argparse
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[2]
+DATA_LOADING_DIR = ROOT_DIR / 'scripts' / 'data_loading'
+SAMPLE_DIR = pathlib.Path(__file__).resolve().parent / 'fixtures' / 'nflverse_sample'
+SEASON = 2023
+
+CACHE_DIR = tempfile.mkdtemp(prefix='nflverse_cache_')
+os.environ['NFLVERSE_SOURCE_DIR'] = str(SAMPLE_DIR)
+os.environ['NFLVERSE_CACHE_DIR'] = CACHE_DIR
+os.environ['NFLVERSE_CACHE'] = '1'
+sys.path.insert(0, str(DATA_LOADING_DIR))
+
+import pandas as pd
+
+import nflverse_cache
+from ingest_historical_games import PBP_COLUMNS, aggregate_team_game_stats, prepare_season
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def no_download(seasons):
+    raise AssertionError(f"fetch called for {seasons}; NFLVERSE_SOURCE_DIR should replace it")
+
+
+def check_source_dir_load():
+    pbp = nflverse_cache.load_seasons('pbp', [SEASON], no_download, columns=PBP_COLUMNS)
+    sample = pd.read_csv(SAMPLE_DIR / f'pbp_{SEASON}.csv')
+    require(len(pbp) == len(sample), f"Expected {len(sample)} plays, got {len(pbp)}")
+    require(list(pbp.columns) == PBP_COLUMNS, f"Columns not pruned to PBP_COLUMNS: {list(pbp.columns)}")
+    path = nflverse_cache.cache_path('pbp', SEASON)
+    require(os.path.exists(path), f"No cache file written at {path}")
+    print(f"PASS source dir load: {len(pbp)} plays, pruned to {len(PBP_COLUMNS)} columns, cached at {path}")
+    return pbp
+
+
+def check_cache_hit(expected):
+    source_dir = nflverse_cache.SOURCE_DIR
+    nflverse_cache.SOURCE_DIR = os.path.join(CACHE_DIR, 'no_source')
+    try:
+        cached = nflverse_cache.load_seasons('pbp', [SEASON], no_download, columns=PBP_COLUMNS)
+        require(cached.equals(expected), "Cached frame differs from the source load")
+
+        narrow = nflverse_cache.load_seasons('pbp', [SEASON], no_download, columns=['game_id', 'posteam'])
+        require(list(narrow.columns) == ['game_id', 'posteam'], "Column subset not applied to the cached read")
+
+        try:
+            nflverse_cache.load_seasons('pbp', [SEASON], no_download, columns=PBP_COLUMNS, refresh=True)
+            raise AssertionError("refresh=True was served from the cache")
+        except FileNotFoundError:
+            pass
+    finally:
+        nflverse_cache.SOURCE_DIR = source_dir
+    print("PASS completed season served from cache without the source; refresh=True bypasses it")
+
+
+def check_uncached_column():
+    # 'desc' was pruned from the cached file, so the cache can't answer and the source is re-read
+    frame = nflverse_cache.load_seasons('pbp', [SEASON], no_download, columns=['game_id', 'desc'])
+    require('desc' in frame.columns and frame['desc'].notna().all(), "Column missing from the cache was not re-read")
+    print("PASS a column the cached file lacks triggers a re-read from the source")
+
+
+def check_missing_season():
+    try:
+        nflverse_cache.load_seasons('pbp', [SEASON - 4], no_download)
+        raise AssertionError("Missing season did not raise")
+    except FileNotFoundError as exc:
+        print(f"PASS missing season raises FileNotFoundError: {exc}")
+
+
+def check_pipeline(pbp):
+    result = prepare_season(SEASON)
+    schedules = pd.read_csv(SAMPLE_DIR / f'schedules_{SEASON}.csv')
+    require(len(result['game_rows']) == len(schedules), f"Expected {len(schedules)} game rows")
+    require(len(result['stat_rows']) == 2 * len(schedules), f"Expected {2 * len(schedules)} team-game rows")
+
+    points = {(row['game_id'], row['team']): row['points'] for row in aggregate_team_game_stats(pbp)}
+    for game in schedules.itertuples():
+        require(points[(game.game_id, game.home_team)] == game.home_score, f"{game.game_id} home points mismatch")
+        require(points[(game.game_id, game.away_team)] == game.away_score, f"{game.game_id} away points mismatch")
+    print(f"PASS prepare_season({SEASON}) on the sample: {len(result['game_rows'])} games, "
+          f"{len(result['stat_rows'])} team-game rows, points match the schedule")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the nflverse cache against the sample source dir')
+    parser.parse_args()
+
+    print("=" * 80)
+    print("NFLVERSE CACHE CHECK")
+    print("=" * 80)
+    print(f"source={SAMPLE_DIR} cache={CACHE_DIR}")
+
+    try:
+        require(nflverse_cache.PARQUET_ENGINE is not None, "pyarrow or fastparquet is required")
+        pbp = check_source_dir_load()
+        check_cache_hit(pbp)
+        check_uncached_column()
+        check_missing_season()
+        check_pipeline(pbp)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Checks for scripts/data_loading/pbp_changes.py on the sample nflverse plays.
+
+game_hashes() must give each game a hash that only moves when that game's
+hashed plays change: not with row interleaving across games, the frame index or
+a parquet round trip. The database part runs changed_games()/save_hashes()
+against a pg_temp copy of the hash table; skip it with --no-db.
+
+    python scripts/verification/test_pbp_changes.py
+"""
+
+import argparse
+import io
+import pathlib
+import sys
+
+VERIFICATION_DIR = pathlib.Path(__file__).resolve().parent
+ROOT_DIR = VERIFICATION_DIR.parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / 'scripts' / 'data_loading'))
+
+import numpy as np
+import pandas as pd
+
+from pbp_changes import changed_games, game_hashes, save_hashes
+
+SAMPLE_PBP = VERIFICATION_DIR / 'fixtures' / 'nflverse_sample' / 'pbp_2023.csv'
+COLUMNS = [
+    'game_id', 'posteam', 'play_type', 'yards_gained', 'touchdown', 'down', 'ydstogo',
+    'game_seconds_remaining', 'total_home_score', 'total_away_score',
+]
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def changed(before, after):
+    return sorted(game_id for game_id in after if before.get(game_id) != after[game_id])
+
+
+def check_hashes(pbp):
+    hashes = game_hashes(pbp, COLUMNS)
+    counts = pbp.groupby('game_id').size()
+    require(sorted(hashes) == sorted(counts.index), "Not one hash per game")
+    require(all(hashes[g][1] == counts[g] for g in hashes), "Play counts don't match the frame")
+    require(game_hashes(pbp, COLUMNS) == hashes, "Hashes not stable across calls")
+    require(game_hashes(pbp.set_index(pbp.index + 1000), COLUMNS) == hashes, "Hash depends on the index")
+    require(game_hashes(pbp.iloc[:0], COLUMNS) == {}, "Empty frame should hash to {}")
+    print(f"PASS {len(hashes)} games hashed, play counts match, stable across calls and index changes")
+    return hashes
+
+
+def check_isolation(pbp, hashes):
+    game_a, game_b = sorted(hashes)[:2]
+
+    edited = pbp.copy()
+    edited.loc[edited.index[edited['game_id'] == game_a][3], 'yards_gained'] += 1
+    after = game_hashes(edited, COLUMNS)
+    require(changed(hashes, after) == [game_a], f"Editing one play of {game_a} changed {changed(hashes, after)}")
+    require(after[game_a][1] == hashes[game_a][1], "Edit changed the play count")
+
+    appended = pd.concat([pbp, pbp[pbp['game_id'] == game_b].tail(1)], ignore_index=True)
+    after = game_hashes(appended, COLUMNS)
+    require(changed(hashes, after) == [game_b], "Appending a play changed another game")
+    require(after[game_b][1] == hashes[game_b][1] + 1, "Appended play not counted")
+
+    plays_a = pbp.index[pbp['game_id'] == game_a]
+    swapped = pbp.reindex(list(plays_a[1:2]) + list(plays_a[:1]) + list(pbp.index.drop(plays_a[:2])))
+    require(changed(hashes, game_hashes(swapped, COLUMNS)) == [game_a], "Reordering a game's plays not detected")
+
+    unhashed = pbp.copy()
+    unhashed['desc'] = 'rewritten'
+    require(game_hashes(unhashed, COLUMNS) == hashes, "A column outside `columns` changed the hash")
+    print("PASS a one-play edit, an appended play and a reorder each change only their game")
+
+
+def check_interleaving(pbp, hashes):
+    # Deal plays round-robin across games, keeping each game's own order
+    rank = pbp.groupby('game_id').cumcount()
+    interleaved = pbp.assign(_rank=rank).sort_values(['_rank', 'game_id'], kind='stable').drop(columns='_rank')
+    require(not interleaved.index.equals(pbp.index), "Interleaving didn't reorder the frame")
+    require(game_hashes(interleaved, COLUMNS) == hashes, "Interleaving games changed the hashes")
+    print("PASS interleaving plays across games leaves every hash unchanged")
+
+
+def check_columns(pbp, hashes):
+    require(game_hashes(pbp, COLUMNS + ['not_a_column']) == hashes, "An absent column changed the hash")
+    fewer = game_hashes(pbp, COLUMNS[:-1])
+    require(all(fewer[g][0] != hashes[g][0] for g in hashes), "Hashing fewer columns gave the same hash")
+    print("PASS absent columns are ignored; a different column set changes every hash")
+
+
+def check_missing_game_ids(pbp, hashes):
+    with_nan = pbp.copy()
+    with_nan.loc[len(with_nan)] = with_nan.iloc[0]
+    with_nan.loc[len(with_nan) - 1, 'game_id'] = np.nan
+    with_nan = pd.concat([with_nan.iloc[-1:], with_nan.iloc[:-1]])  # NaN row first
+    require(game_hashes(with_nan, COLUMNS) == hashes, "A NaN game_id row changed other games' hashes")
+    print("PASS rows without a game_id are skipped")
+
+
+def check_parquet_round_trip(pbp, hashes):
+    buffer = io.BytesIO()
+    pbp.to_parquet(buffer, index=False)
+    buffer.seek(0)
+    require(game_hashes(pd.read_parquet(buffer), COLUMNS) == hashes, "Parquet round trip changed the hashes")
+    print("PASS hashes survive a parquet round trip (the nflverse cache format)")
+
+
+def check_db(pbp, hashes):
+    import psycopg2
+    from db_config import DATABASE_CONFIG
+
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        schema = 'pg_temp'
+        require(sorted(changed_games(conn, 'team_game_stats', hashes, schema)) == sorted(hashes),
+                "Unprocessed games not reported as changed")
+        with conn.cursor() as cur:
+            saved = save_hashes(cur, 'team_game_stats', hashes, list(hashes), schema)
+        require(saved == len(hashes), f"save_hashes wrote {saved} rows")
+        require(changed_games(conn, 'team_game_stats', hashes, schema) == [], "Saved games still reported changed")
+        require(sorted(changed_games(conn, 'epa', hashes, schema)) == sorted(hashes),
+                "Another consumer's hashes leaked across")
+
+        game_a = sorted(hashes)[0]
+        edited = pbp.copy()
+        edited.loc[edited.index[edited['game_id'] == game_a][0], 'play_type'] = 'no_play'
+        new_hashes = game_hashes(edited, COLUMNS)
+        require(changed_games(conn, 'team_game_stats', new_hashes, schema) == [game_a], "Edited game not detected")
+        with conn.cursor() as cur:
+            save_hashes(cur, 'team_game_stats', new_hashes, [game_a], schema)
+        require(changed_games(conn, 'team_game_stats', new_hashes, schema) == [], "Re-saved hash not picked up")
+        print("PASS changed_games/save_hashes on pg_temp: new, saved, per-consumer and edited games")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify play-by-play change detection hashes')
+    parser.add_argument('--no-db', action='store_true', help='Skip the changed_games/save_hashes check')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PBP CHANGE DETECTION CHECK")
+    print("=" * 80)
+
+    try:
+        pbp = pd.read_csv(SAMPLE_PBP)
+        hashes = check_hashes(pbp)
+        check_isolation(pbp, hashes)
+        check_interleaving(pbp, hashes)
+        check_columns(pbp, hashes)
+        check_missing_game_ids(pbp, hashes)
+        check_parquet_round_trip(pbp, hashes)
+        if not args.no_db:
+            check_db(pbp, hashes)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Checks for prediction_writer.py against temp copies of the prediction tables.
+
+hcl.ml_predictions and hcl.ml_predictions_elo are cloned into pg_temp (same
+columns and unique game_id index) and the writers are pointed at the clones, so
+the real tables are never touched. Everything runs in one transaction that is
+rolled back.
+
+    python scripts/verification/test_prediction_writer.py
+"""
+
+import argparse
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR))
+
+import psycopg2
+
+import prediction_writer
+from db_config import DATABASE_CONFIG
+from prediction_writer import XGB_COLUMNS, save_elo_predictions, save_xgb_predictions, write_rows
+
+XGB_TEMP = 'pg_temp.ml_predictions'
+ELO_TEMP = 'pg_temp.ml_predictions_elo'
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def create_temp_tables(cur):
+    for table, temp in ((prediction_writer.XGB_TABLE, XGB_TEMP), (prediction_writer.ELO_TABLE, ELO_TEMP)):
+        name = temp.split('.')[1]
+        # INCLUDING DEFAULTS would draw prediction_id from the real table's sequence
+        cur.execute(f"CREATE TEMP TABLE {name} (LIKE {table} INCLUDING INDEXES)")
+        cur.execute(f"ALTER TABLE {temp} ALTER COLUMN prediction_id ADD GENERATED BY DEFAULT AS IDENTITY")
+
+
+def sample_games(cur, count):
+    cur.execute(
+        """
+        SELECT game_id, season, week, home_team, away_team, game_date, spread_line, total_line
+        FROM hcl.games
+        ORDER BY season, week, game_id
+        LIMIT %s
+        """,
+        (count,),
+    )
+    return cur.fetchall()
+
+
+def xgb_prediction(game, home_win_prob=0.6):
+    game_id, season, week, home, away, game_date, spread, total = game
+    return {
+        'game_id': game_id, 'season': season, 'week': week, 'home_team': home, 'away_team': away,
+        'game_date': game_date, 'predicted_winner': home if home_win_prob >= 0.5 else away,
+        'confidence': max(home_win_prob, 1 - home_win_prob), 'home_win_prob': home_win_prob,
+        'away_win_prob': 1 - home_win_prob, 'predicted_home_score': 24.0, 'predicted_away_score': 20.0,
+        'predicted_margin': 4.0, 'ai_spread': -4.0, 'vegas_spread': spread, 'total_line': total,
+    }
+
+
+def elo_prediction(game):
+    game_id, season, week, home, away, game_date, spread, _ = game
+    return {
+        'game_id': game_id, 'season': season, 'week': week, 'game_date': game_date,
+        'home_team': home, 'away_team': away, 'home_elo': 1550, 'away_elo': 1500, 'elo_diff': 50,
+        'home_win_prob': 0.57, 'away_win_prob': 0.43, 'predicted_winner': home, 'confidence': 0.57,
+        'elo_spread': -2.0, 'vegas_spread': spread, 'spread_diff': None, 'split_prediction': False,
+    }
+
+
+def stored(cur, table, game_id, column):
+    cur.execute(f"SELECT {column} FROM {table} WHERE game_id = %s", (game_id,))
+    return cur.fetchone()[0]
+
+
+def check_xgb_upserts(cur, games):
+    first = [xgb_prediction(game) for game in games[:5]]
+    result = save_xgb_predictions(cur, first)
+    require(result == {'rows': 5, 'inserted': 5, 'updated': 0, 'skipped': 0}, f"Initial insert: {result}")
+    require(stored(cur, XGB_TEMP, games[0][0], 'predicted_at') is not None, "predicted_at not stamped on insert")
+    print(f"PASS insert: {result}")
+
+    cur.execute(f"UPDATE {XGB_TEMP} SET predicted_at = NOW() - INTERVAL '1 day'")
+    renamed = dict(xgb_prediction(games[0], home_win_prob=0.3), home_team='XXX')
+    second = (
+        [xgb_prediction(games[0], home_win_prob=0.9), renamed]  # duplicate game: the last row wins
+        + [xgb_prediction(game) for game in games[1:6]]
+    )
+    result = save_xgb_predictions(cur, second)
+    require(result == {'rows': 6, 'inserted': 1, 'updated': 5, 'skipped': 0}, f"Upsert: {result}")
+    require(stored(cur, XGB_TEMP, games[0][0], 'home_win_prob') == 0.3, "Duplicate game_id: last row did not win")
+    require(stored(cur, XGB_TEMP, games[0][0], 'home_team') == games[0][3], "Identity column overwritten on update")
+    cur.execute(f"SELECT COUNT(*) FROM {XGB_TEMP} WHERE predicted_at < NOW()")
+    require(cur.fetchone()[0] == 0, "predicted_at not refreshed on update")
+    print(f"PASS upsert with a duplicate game_id: {result}; last row wins, identity columns kept")
+
+    third = [xgb_prediction(game, home_win_prob=0.1) for game in games[6:7] + games[0:2]]
+    third.append(xgb_prediction(games[6], home_win_prob=0.95))  # duplicate new game: the first row wins
+    result = save_xgb_predictions(cur, third, conflict='nothing')
+    require(result == {'rows': 3, 'inserted': 1, 'updated': 0, 'skipped': 2}, f"Do-nothing: {result}")
+    require(stored(cur, XGB_TEMP, games[1][0], 'home_win_prob') == 0.6, "conflict='nothing' changed an existing row")
+    require(stored(cur, XGB_TEMP, games[6][0], 'home_win_prob') == 0.1, "Duplicate game_id: first row did not win")
+    print(f"PASS conflict='nothing': {result}; existing rows untouched, first duplicate wins")
+
+
+def check_paging(cur, games):
+    rows = prediction_writer.xgb_prediction_rows([xgb_prediction(game, home_win_prob=0.55) for game in games])
+    result = write_rows(cur, XGB_TEMP, XGB_COLUMNS, rows, page_size=3)
+    expected_new = len(games) - 7
+    require(result['inserted'] == expected_new and result['updated'] == 7, f"Paged upsert counts: {result}")
+    cur.execute(f"SELECT COUNT(*) FROM {XGB_TEMP} WHERE home_win_prob = 0.55")
+    require(cur.fetchone()[0] == len(games), "Not every page was written")
+    print(f"PASS {len(games)} rows over {-(-len(games) // 3)} pages: {result}")
+
+
+def check_elo(cur, games):
+    result = save_elo_predictions(cur, [elo_prediction(game) for game in games[:4]])
+    require(result == {'rows': 4, 'inserted': 4, 'updated': 0, 'skipped': 0}, f"Elo insert: {result}")
+    result = save_elo_predictions(cur, [elo_prediction(game) for game in games[2:6]], conflict='nothing')
+    require(result == {'rows': 4, 'inserted': 2, 'updated': 0, 'skipped': 2}, f"Elo do-nothing: {result}")
+    require(stored(cur, ELO_TEMP, games[0][0], 'prediction_date') is not None, "prediction_date not stamped")
+    print(f"PASS Elo writer: {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify prediction_writer bulk upserts on temp tables')
+    parser.add_argument('--games', type=int, default=20, help='Games used for the paging check')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PREDICTION WRITER CHECK")
+    print("=" * 80)
+
+    xgb_table, elo_table = prediction_writer.XGB_TABLE, prediction_writer.ELO_TABLE
+    conn = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        cur = conn.cursor()
+        create_temp_tables(cur)
+        prediction_writer.XGB_TABLE, prediction_writer.ELO_TABLE = XGB_TEMP, ELO_TEMP
+
+        try:
+            write_rows(cur, XGB_TEMP, XGB_COLUMNS, [], conflict='replace')
+            raise AssertionError("Unknown conflict mode accepted")
+        except ValueError:
+            pass
+
+        games = sample_games(cur, max(args.games, 8))
+        require(len(games) >= 8, "Need at least 8 games in hcl.games")
+        check_xgb_upserts(cur, games)
+        check_paging(cur, games)
+        check_elo(cur, games)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+    finally:
+        prediction_writer.XGB_TABLE, prediction_writer.ELO_TABLE = xgb_table, elo_table
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Checks for scoreboard_feed.ScoreboardFeed against the local ESPN stub (espn_stub.py).
+
+Covers TTL hits, stale-while-revalidate, single-flight cold fetches, a failed
+fetch shared by every waiter, the error backoff and recovery. Needs no network
+or database.
+
+    python scripts/verification/test_scoreboard_feed.py
+"""
+
+import argparse
+import copy
+import os
+import pathlib
+import sys
+import threading
+import time
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+# Short TTLs so expiry can be observed; read by scoreboard_feed at import
+TTL_SECONDS = 0.3
+os.environ['ESPN_SCOREBOARD_LIVE_TTL_SECONDS'] = str(TTL_SECONDS)
+os.environ['ESPN_SCOREBOARD_IDLE_TTL_SECONDS'] = str(TTL_SECONDS)
+os.environ['ESPN_SCOREBOARD_POLLER'] = '0'
+
+import requests
+
+from espn_stub import EspnStub
+from scoreboard_feed import ScoreboardFeed
+
+
+def require(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def concurrent(target, count):
+    """Run target() on `count` threads at once; returns [(result, exception)]."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = (target(), None)
+        except Exception as exc:
+            results[i] = (None, exc)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def with_score(payload, away_score):
+    changed = copy.deepcopy(payload)
+    changed['events'][1]['competitions'][0]['competitors'][1]['score'] = str(away_score)
+    return changed
+
+
+def away_score(data):
+    return data['events'][1]['competitions'][0]['competitors'][1]['score']
+
+
+def check_single_flight(stub, threads):
+    feed = ScoreboardFeed(url=stub.url)
+    stub.delay_seconds = 0.3
+    results = concurrent(feed.get, threads)
+    require(all(exc is None for _, exc in results), f"Cold gets failed: {[str(e) for _, e in results if e]}")
+    require(stub.requests == 1, f"Expected 1 upstream fetch for {threads} cold gets, got {stub.requests}")
+    require(all(data is results[0][0] for data, _ in results), "Waiters did not share the fetched snapshot")
+
+    feed.get()
+    require(stub.requests == 1, "A get within the TTL reached upstream")
+    require(feed.stats()['hits'] >= 1, "TTL hit not counted")
+    print(f"PASS single flight: {threads} concurrent cold gets -> 1 fetch; TTL hit served from memory")
+    return feed
+
+
+def check_stale_while_revalidate(stub, feed):
+    stub.set_payload(with_score(stub.payload, 21))
+    time.sleep(TTL_SECONDS + 0.1)
+
+    started = time.monotonic()
+    _, version, _ = feed.snapshot()
+    data = feed.get()
+    elapsed = time.monotonic() - started
+    require(away_score(data) == '10', "Expired snapshot was not served while revalidating")
+    require(elapsed < stub.delay_seconds, f"Stale get waited on the fetch ({elapsed:.2f}s)")
+
+    feed.wait_for_version(version, timeout=5)
+    require(away_score(feed.get()) == '21', "Background refresh did not install the new snapshot")
+    require(stub.requests == 2, f"Expected 2 upstream fetches, got {stub.requests}")
+    require(feed.stats()['stale_hits'] == 1, "Stale hit not counted")
+    print(f"PASS stale-while-revalidate: stale get returned in {elapsed * 1000:.0f}ms, refresh landed in background")
+
+
+def check_failed_background_refresh(stub, feed):
+    before = stub.requests
+    stub.fail_next(1, status=500)
+    time.sleep(TTL_SECONDS + 0.1)
+    data = feed.get()
+    require(away_score(data) == '21', "Stale snapshot not served while ESPN fails")
+    deadline = time.monotonic() + 5
+    while feed.stats()['errors'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    require(stub.requests == before + 1, "Background refresh did not reach upstream")
+    require(feed.stats()['errors'] == 1, "Failed background refresh not recorded")
+    require(away_score(feed.snapshot()[0]) == '21', "Failed refresh replaced the snapshot")
+    print("PASS failed background refresh keeps serving the stale snapshot")
+
+
+def check_shared_failure(stub, threads, backoff):
+    stub.reset()
+    stub.delay_seconds = 0.3
+    feed = ScoreboardFeed(url=stub.url, error_backoff_seconds=backoff)
+    stub.fail_next(1, status=503)
+
+    results = concurrent(feed.get, threads)
+    errors = [exc for _, exc in results if exc is not None]
+    require(len(errors) == threads, f"Expected {threads} errors, got {len(errors)}")
+    require(all(isinstance(exc, requests.HTTPError) for exc in errors), "Waiters did not get the fetch's HTTPError")
+    require(stub.requests == 1, f"Expected 1 upstream fetch for {threads} failing gets, got {stub.requests}")
+    stats = feed.stats()
+    require(stats['errors'] == 1 and stats['shared_errors'] == threads - 1, f"Unexpected error stats: {stats}")
+    print(f"PASS shared failure: {threads} concurrent gets -> 1 failed fetch, error re-raised to all")
+
+    try:
+        feed.get()
+        raise AssertionError("get() inside the backoff window succeeded")
+    except requests.HTTPError:
+        pass
+    require(stub.requests == 1, "get() inside the backoff window reached upstream")
+    print(f"PASS backoff: no upstream call within {backoff}s of the failure")
+
+    time.sleep(backoff + 0.1)
+    data = feed.get()
+    require(data is not None and stub.requests == 2, "get() after the backoff did not refetch")
+    require(feed.stats()['last_error'] is None, "Recovered feed still reports last_error")
+    print("PASS recovery after the backoff window")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify ScoreboardFeed caching against a local ESPN stub')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent requests per check')
+    parser.add_argument('--backoff', type=float, default=0.5, help='Error backoff used by the failure checks')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SCOREBOARD FEED CHECK")
+    print("=" * 80)
+
+    try:
+        with EspnStub() as stub:
+            feed = check_single_flight(stub, args.threads)
+            check_stale_while_revalidate(stub, feed)
+            check_failed_background_refresh(stub, feed)
+            check_shared_failure(stub, args.threads, args.backoff)
+        return 0
+    except Exception as exc:
+        print(f"FAIL: {exc}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,4 +3,11 @@
 # This script starts the Gunicorn API server on EC2
 
 # Start gunicorn on port 5000 (Nginx proxies to this)
-exec gunicorn api_server:app --bind 0.0.0.0:5000 --workers 2 --timeout 120
+# Threaded workers: each /api/live-scores/stream client holds a thread until it recycles
+# (LIVE_STREAM_MAX_SECONDS). At most LIVE_STREAM_MAX_SUBSCRIBERS (8) threads per worker go
+# to streams, over the cap the route answers 503; the other 8 serve the API and stay within
+# DB_POOL_MAX (10). Raise GUNICORN_THREADS and DB_POOL_MAX together.
+# GUNICORN_WORKER_CLASS=gevent (pip install gevent) makes streams greenlets instead of threads;
+# plain sync workers answer the stream with 503 so clients stay on /api/live-scores polling
+# --preload imports the app (and loads the ML models) once in the master; workers share them copy-on-write
+exec gunicorn api_server:app --preload --bind 0.0.0.0:5000 --workers 2 --timeout 120 --worker-class "${GUNICORN_WORKER_CLASS:-gthread}" --threads "${GUNICORN_THREADS:-16}"